@@ -26,6 +26,7 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from sqlmodel import select
+from wfx.interface.utils import setup_llm_caching
 from wfx.log.logger import configure, logger
 from wfx.services.settings.constants import DEFAULT_SUPERUSER, DEFAULT_SUPERUSER_PASSWORD
 
@@ -35,11 +36,12 @@ from primeagent.main import setup_app
 from primeagent.services.auth.utils import check_key, get_current_user_by_jwt
 from primeagent.services.deps import (
     get_db_service,
+    get_run_queue_service,
     get_settings_service,
     is_settings_service_initialized,
     session_scope,
 )
-from primeagent.services.utils import initialize_services
+from primeagent.services.utils import initialize_services, teardown_services
 from primeagent.utils.version import fetch_latest_version, get_version_info
 from primeagent.utils.version import is_pre_release as primeagent_is_pre_release
 
@@ -905,6 +907,84 @@ def api_key(
         api_key_banner(unmasked_api_key)
 
 
+@app.command()
+def worker(
+    processes: int = typer.Option(1, min=1, help="Number of worker processes."),
+    concurrency: int | None = typer.Option(
+        None,
+        min=1,
+        help="Number of queued runs each process runs at once. Defaults to PRIMEAGENT_JOB_QUEUE_WORKERS.",
+        show_default=False,
+    ),
+    env_file: Path | None = typer.Option(
+        None,
+        help="Path to the .env file containing environment variables.",
+        show_default=False,
+    ),
+    log_level: str = typer.Option("info", help="Logging level.", envvar="PRIMEAGENT_LOG_LEVEL"),
+) -> None:
+    """Run worker processes that take queued flow runs, such as webhook runs, from the job queue.
+
+    Workers only need access to the server's database, so they can run on other machines.
+    Set PRIMEAGENT_JOB_QUEUE_WORKERS=0 on the server to leave every queued run to the workers.
+    """
+    if env_file:
+        load_dotenv(env_file, override=True)
+    if processes == 1:
+        _run_job_worker(concurrency, log_level)
+        return
+
+    configure(log_level=log_level)
+    # The database is migrated once, so the worker processes do not race each other to migrate it
+    asyncio.run(_prepare_job_workers())
+    worker_processes = [Process(target=_run_job_worker, args=(concurrency, log_level)) for _ in range(processes)]
+    for worker_process in worker_processes:
+        worker_process.start()
+    try:
+        for worker_process in worker_processes:
+            worker_process.join()
+    finally:
+        for worker_process in worker_processes:
+            if worker_process.is_alive():
+                worker_process.terminate()
+        for worker_process in worker_processes:
+            worker_process.join()
+
+
+async def _prepare_job_workers() -> None:
+    await initialize_services()
+    await teardown_services()
+
+
+def _run_job_worker(concurrency: int | None, log_level: str) -> None:
+    configure(log_level=log_level)
+    asyncio.run(_job_worker(concurrency))
+
+
+async def _job_worker(concurrency: int | None) -> None:
+    await initialize_services()
+    setup_llm_caching()
+    queue_service = get_run_queue_service()
+    if concurrency is None:
+        concurrency = get_settings_service().settings.job_queue_workers or 1
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        # Signal handlers cannot be added to the event loop on Windows
+        with suppress(NotImplementedError):
+            loop.add_signal_handler(signum, stop.set)
+
+    queue_service.start(concurrency)
+    await logger.ainfo(f"Worker {queue_service.worker_id} running {concurrency} queued runs at once")
+    try:
+        await stop.wait()
+    finally:
+        # Runs in progress are handed back to the queue before the database is closed
+        await queue_service.teardown()
+        await teardown_services()
+
+
 def show_version(*, value: bool):
     if value:
         default = "DEV"
@@ -0,0 +1,42 @@
+"""Add vertex build retention indexes
+
+Revision ID: 4f7c2a9e1b3d
+Revises: 182e5471b900
+Create Date: 2026-10-18 10:12:41.518203
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "4f7c2a9e1b3d"
+down_revision: str | None = "182e5471b900"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+INDEXES = {
+    "ix_vertex_build_timestamp": ["timestamp"],
+    "ix_vertex_build_flow_id_id_timestamp": ["flow_id", "id", "timestamp"],
+}
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)  # type: ignore
+    indexes_names = [index["name"] for index in inspector.get_indexes("vertex_build")]
+    with op.batch_alter_table("vertex_build", schema=None) as batch_op:
+        for name, columns in INDEXES.items():
+            if name not in indexes_names:
+                batch_op.create_index(name, columns, unique=False)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)  # type: ignore
+    indexes_names = [index["name"] for index in inspector.get_indexes("vertex_build")]
+    with op.batch_alter_table("vertex_build", schema=None) as batch_op:
+        for name in INDEXES:
+            if name in indexes_names:
+                batch_op.drop_index(name)
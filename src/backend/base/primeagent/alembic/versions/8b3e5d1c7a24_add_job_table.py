@@ -0,0 +1,56 @@
+"""Add job table
+
+Revision ID: 8b3e5d1c7a24
+Revises: 4f7c2a9e1b3d
+Create Date: 2026-10-18 14:03:22.671045
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+from primeagent.utils import migration
+
+# revision identifiers, used by Alembic.
+revision: str = "8b3e5d1c7a24"
+down_revision: str | None = "4f7c2a9e1b3d"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if not migration.table_exists("job", conn):
+        op.create_table(
+            "job",
+            sa.Column("id", sqlmodel.sql.sqltypes.types.Uuid(), nullable=False),
+            sa.Column("flow_id", sqlmodel.sql.sqltypes.types.Uuid(), nullable=False),
+            sa.Column("user_id", sqlmodel.sql.sqltypes.types.Uuid(), nullable=True),
+            sa.Column("kind", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.Column("payload", sa.JSON(), nullable=True),
+            sa.Column("status", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("max_attempts", sa.Integer(), nullable=False),
+            sa.Column("available_at", sa.DateTime(), nullable=False),
+            sa.Column("lease_expires_at", sa.DateTime(), nullable=True),
+            sa.Column("worker_id", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("result", sa.JSON(), nullable=True),
+            sa.Column("error", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+            sa.Column("finished_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        with op.batch_alter_table("job", schema=None) as batch_op:
+            batch_op.create_index(batch_op.f("ix_job_flow_id"), ["flow_id"], unique=False)
+            batch_op.create_index(batch_op.f("ix_job_user_id"), ["user_id"], unique=False)
+            batch_op.create_index(batch_op.f("ix_job_finished_at"), ["finished_at"], unique=False)
+            batch_op.create_index("ix_job_status_available_at", ["status", "available_at"], unique=False)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if migration.table_exists("job", conn):
+        op.drop_table("job")
@@ -8,6 +8,7 @@ from primeagent.api.v1 import (
     files_router,
     flows_router,
     folders_router,
+    jobs_router,
     knowledge_bases_router,
     login_router,
     mcp_projects_router,
@@ -39,6 +40,7 @@ router_v2 = APIRouter(
 
 router_v1.include_router(chat_router)
 router_v1.include_router(endpoints_router)
+router_v1.include_router(jobs_router)
 router_v1.include_router(validate_router)
 router_v1.include_router(store_router)
 router_v1.include_router(flows_router)
@@ -32,6 +32,7 @@ from primeagent.api.utils.core import (
     get_suggestion_message,
     get_top_level_vertices,
     has_api_terms,
+    infer_is_component,
     parse_exception,
     parse_value,
     raise_error_if_astra_cloud_env,
@@ -71,6 +72,7 @@ __all__ = [
     "get_top_level_vertices",
     # Functions
     "has_api_terms",
+    "infer_is_component",
     "parse_exception",
     "parse_value",
     "raise_error_if_astra_cloud_env",
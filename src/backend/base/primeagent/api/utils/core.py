@@ -21,6 +21,7 @@ from primeagent.services.database.models.message.model import MessageTable
 from primeagent.services.database.models.transactions.model import TransactionTable
 from primeagent.services.database.models.user.model import User
 from primeagent.services.database.models.vertex_builds.model import VertexBuildTable
+from primeagent.services.deps import get_transaction_service, get_vertex_build_service
 from primeagent.services.store.utils import get_lf_version_from_pypi
 from primeagent.utils.constants import PRIMEAGENT_GLOBAL_VAR_HEADER_PREFIX
 
@@ -115,14 +116,18 @@ def validate_is_component(flows: list[Flow]):
         if not flow.data or flow.is_component is not None:
             continue
 
-        is_component = get_is_component_from_data(flow.data)
-        if is_component is not None:
-            flow.is_component = is_component
-        else:
-            flow.is_component = len(flow.data.get("nodes", [])) == 1
+        flow.is_component = infer_is_component(flow.data)
     return flows
 
 
+def infer_is_component(data: dict) -> bool:
+    """Returns whether flow data is a component, for flows whose is_component is not set."""
+    is_component = get_is_component_from_data(data)
+    if is_component is not None:
+        return is_component
+    return len(data.get("nodes", [])) == 1
+
+
 def get_is_component_from_data(data: dict):
     """Returns True if the data is a component."""
     return data.get("is_component")
@@ -325,7 +330,9 @@ async def cascade_delete_flow(session: AsyncSession, flow_id: uuid.UUID) -> None
         # it might cause unexpected behaviors because the session id could still be
         # used elsewhere to search for these messages.
         await session.exec(delete(MessageTable).where(MessageTable.flow_id == flow_id))
+        get_transaction_service().discard_flow(flow_id)
         await session.exec(delete(TransactionTable).where(TransactionTable.flow_id == flow_id))
+        get_vertex_build_service().discard_flow(flow_id)
         await session.exec(delete(VertexBuildTable).where(VertexBuildTable.flow_id == flow_id))
         await session.exec(delete(Flow).where(Flow.id == flow_id))
     except Exception as e:
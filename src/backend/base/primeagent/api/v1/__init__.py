@@ -4,6 +4,7 @@ from primeagent.api.v1.endpoints import router as endpoints_router
 from primeagent.api.v1.files import router as files_router
 from primeagent.api.v1.flows import router as flows_router
 from primeagent.api.v1.folders import router as folders_router
+from primeagent.api.v1.jobs import router as jobs_router
 from primeagent.api.v1.knowledge_bases import router as knowledge_bases_router
 from primeagent.api.v1.login import router as login_router
 from primeagent.api.v1.mcp import router as mcp_router
@@ -27,6 +28,7 @@ __all__ = [
     "files_router",
     "flows_router",
     "folders_router",
+    "jobs_router",
     "knowledge_bases_router",
     "login_router",
     "mcp_projects_router",
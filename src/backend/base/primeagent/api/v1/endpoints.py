@@ -42,14 +42,21 @@ from primeagent.exceptions.api import APIException, InvalidChatInputError
 from primeagent.exceptions.serialization import SerializationError
 from primeagent.helpers.flow import get_flow_by_id_or_endpoint_name
 from primeagent.interface.initialize.loading import update_params_with_load_from_db_fields
+from primeagent.processing.graph_templates import build_graph_from_flow
 from primeagent.processing.process import process_tweaks, run_graph_internal
 from primeagent.schema.graph import Tweaks
 from primeagent.services.auth.utils import api_key_security, get_current_active_user, get_webhook_user
 from primeagent.services.cache.utils import save_uploaded_file
 from primeagent.services.database.models.flow.model import Flow, FlowRead
 from primeagent.services.database.models.flow.utils import get_all_webhook_components_in_flow
+from primeagent.services.database.models.job.model import JobKind
 from primeagent.services.database.models.user.model import User, UserRead
-from primeagent.services.deps import get_session_service, get_settings_service, get_telemetry_service
+from primeagent.services.deps import (
+    get_run_queue_service,
+    get_session_service,
+    get_settings_service,
+    get_telemetry_service,
+)
 from primeagent.services.telemetry.schema import RunPayload
 from primeagent.utils.compression import compress_response
 from primeagent.utils.version import get_version_info
@@ -147,13 +154,8 @@ async def simple_run_flow(
         task_result: list[RunOutputs] = []
         user_id = api_key_user.id if api_key_user else None
         flow_id_str = str(flow.id)
-        if flow.data is None:
-            msg = f"Flow {flow_id_str} has no data"
-            raise ValueError(msg)
-        graph_data = flow.data.copy()
-        graph_data = process_tweaks(graph_data, input_request.tweaks or {}, stream=stream)
-        graph = Graph.from_payload(
-            graph_data, flow_id=flow_id_str, user_id=str(user_id), flow_name=flow.name, context=context
+        graph = build_graph_from_flow(
+            flow, input_request.tweaks or {}, stream=stream, user_id=str(user_id), context=context
         )
         if run_id is None:
             run_id = str(uuid4())
@@ -195,54 +197,6 @@ async def simple_run_flow(
         raise ValueError(str(exc)) from exc
 
 
-async def simple_run_flow_task(
-    flow: Flow,
-    input_request: SimplifiedAPIRequest,
-    *,
-    stream: bool = False,
-    api_key_user: User | None = None,
-    event_manager: EventManager | None = None,
-    telemetry_service=None,
-    start_time: float | None = None,
-    run_id: str | None = None,
-):
-    """Run a flow task as a BackgroundTask, therefore it should not throw exceptions."""
-    try:
-        result = await simple_run_flow(
-            flow=flow,
-            input_request=input_request,
-            stream=stream,
-            api_key_user=api_key_user,
-            event_manager=event_manager,
-            run_id=run_id,
-        )
-        if telemetry_service and start_time is not None:
-            await telemetry_service.log_package_run(
-                RunPayload(
-                    run_is_webhook=True,
-                    run_seconds=int(time.perf_counter() - start_time),
-                    run_success=True,
-                    run_error_message="",
-                    run_id=run_id,
-                )
-            )
-        return result  # noqa: TRY300
-
-    except Exception as exc:  # noqa: BLE001
-        await logger.aexception(f"Error running flow {flow.id} task")
-        if telemetry_service and start_time is not None:
-            await telemetry_service.log_package_run(
-                RunPayload(
-                    run_is_webhook=True,
-                    run_seconds=int(time.perf_counter() - start_time),
-                    run_success=False,
-                    run_error_message=str(exc),
-                    run_id=run_id,
-                )
-            )
-        return None
-
-
 async def consume_and_yield(queue: asyncio.Queue, client_consumed_queue: asyncio.Queue) -> AsyncGenerator:
     """Consumes events from a queue and yields them to the client while tracking timing metrics.
 
@@ -613,24 +567,24 @@ async def webhook_run_flow(
     flow_id_or_name: str,
     flow: Annotated[Flow, Depends(get_flow_by_id_or_endpoint_name)],
     request: Request,
-    background_tasks: BackgroundTasks,
 ):
     """Run a flow using a webhook request.
 
+    The run is added to the job queue, so it survives a restart. It is only retried if it fails when
+    ``job_queue_webhook_max_attempts`` allows it. Its status can be followed with the returned ``job_id`` at
+    ``/jobs/{job_id}``.
+
     Args:
         flow_id_or_name (str): The flow ID or endpoint name.
         flow (Flow): The flow to be executed.
         request (Request): The incoming HTTP request.
-        background_tasks (BackgroundTasks): The background tasks manager.
 
     Returns:
-        dict: A dictionary containing the status of the task.
+        dict: A dictionary containing the status of the task and the ID of its job.
 
     Raises:
         HTTPException: If the flow is not found or if there is an error processing the request.
     """
-    telemetry_service = get_telemetry_service()
-    start_time = time.perf_counter()
     await logger.adebug("Received webhook request")
     error_msg = ""
 
@@ -662,22 +616,15 @@ async def webhook_run_flow(
             session_id=None,
         )
 
-        await logger.adebug("Starting background task")
-        run_id = str(uuid4())
-        background_tasks.add_task(
-            simple_run_flow_task,
-            flow=flow,
-            input_request=input_request,
-            api_key_user=webhook_user,
-            telemetry_service=telemetry_service,
-            start_time=start_time,
-            run_id=run_id,
+        await logger.adebug("Queueing webhook run")
+        job = await get_run_queue_service().enqueue(
+            flow.id, input_request, user_id=webhook_user.id if webhook_user else None, kind=JobKind.WEBHOOK
         )
     except Exception as exc:
         error_msg = str(exc)
         raise HTTPException(status_code=500, detail=error_msg) from exc
 
-    return {"message": "Task started in the background", "status": "in progress"}
+    return {"message": "Task started in the background", "status": "in progress", "job_id": str(job.id)}
 
 
 @router.post(
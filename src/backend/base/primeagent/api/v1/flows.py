@@ -1,36 +1,38 @@
 from __future__ import annotations
 
-import io
 import json
 import re
-import zipfile
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path as StdlibPath
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated, Any
 from uuid import UUID
 
 import orjson
 from aiofile import async_open
 from anyio import Path
-from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import StreamingResponse
 from fastapi_pagination import Page, Params
 from fastapi_pagination.ext.sqlmodel import apaginate
+from sqlalchemy import case, null
 from sqlmodel import and_, col, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 from wfx.log import logger
+from wfx.services.deps import session_scope_readonly
 
 from primeagent.api.utils import (
     CurrentActiveUser,
     DbSession,
     cascade_delete_flow,
+    infer_is_component,
     remove_api_keys,
-    validate_is_component,
 )
 from primeagent.api.v1.schemas import FlowListCreate
 from primeagent.helpers.user import get_user_by_flow_id_or_endpoint_name
 from primeagent.initial_setup.constants import STARTER_FOLDER_NAME
+from primeagent.processing.graph_templates import invalidate_graph_templates
 from primeagent.services.database.models.flow.model import (
     AccessTypeEnum,
     Flow,
@@ -44,11 +46,20 @@ from primeagent.services.database.models.folder.constants import DEFAULT_FOLDER_
 from primeagent.services.database.models.folder.model import Folder
 from primeagent.services.deps import get_settings_service, get_storage_service
 from primeagent.services.storage.service import StorageService
-from primeagent.utils.compression import compress_response
+from primeagent.utils.compression import compress_response, compress_streaming_response
+from primeagent.utils.zip_stream import ZipEntry, iter_bytes, stream_zip
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Mapping
 
 # build router
 router = APIRouter(prefix="/flows", tags=["Flows"])
 
+# Flows read from the database per round trip when a flow list is streamed
+FLOW_LIST_BATCH_SIZE = 200
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 def _get_safe_flow_path(fs_path: str, user_id: UUID, storage_service: StorageService) -> Path:
     """Get a safe filesystem path for flow storage, restricted to user's flows directory.
@@ -289,6 +300,45 @@ async def create_flow(
     return flow_read
 
 
+def _flow_list_columns(*, header_flows: bool) -> list:
+    """The columns read to list flows, rather than whole rows.
+
+    Headers carry ``data`` only for components, so it is not read for other flows. Flows saved before
+    ``is_component`` was stored leave it unset, and their ``data`` is read to tell.
+    """
+    if not header_flows:
+        return [col(getattr(Flow, name)) for name in FlowRead.model_fields]
+    columns = [col(getattr(Flow, name)) for name in FlowHeader.model_fields if name != "data"]
+    data = case((col(Flow.is_component).is_not(False), col(Flow.data)), else_=null()).label("data")
+    return [*columns, data]
+
+
+def _encode_flow_row(row: Mapping[str, Any], *, header_flows: bool) -> bytes:
+    flow = dict(row)
+    if flow["is_component"] is None and flow["data"]:
+        flow["is_component"] = infer_is_component(flow["data"])
+    if header_flows:
+        # Same as FlowHeader, without validating a model per flow
+        if not flow["is_component"]:
+            flow["data"] = None
+        return orjson.dumps(flow)
+    return orjson.dumps(FlowRead.model_validate(flow).model_dump())
+
+
+async def _iter_flow_list(session: AsyncSession, stmt, *, header_flows: bool) -> AsyncIterator[bytes]:
+    """Yield the JSON of each flow selected by ``stmt``, reading rows from the database in batches."""
+    result = await session.stream(stmt.execution_options(yield_per=FLOW_LIST_BATCH_SIZE))
+    async for row in result.mappings():
+        yield _encode_flow_row(row, header_flows=header_flows)
+
+
+async def _stream_flow_list(stmt, *, header_flows: bool) -> AsyncIterator[bytes]:
+    # The request's session may be closed before the response is streamed, so read with a session of its own
+    async with session_scope_readonly() as session:
+        async for flow in _iter_flow_list(session, stmt, header_flows=header_flows):
+            yield flow
+
+
 @router.get("/", response_model=list[FlowRead] | Page[FlowRead] | list[FlowHeader], status_code=200)
 async def read_flows(
     *,
@@ -300,6 +350,8 @@ async def read_flows(
     folder_id: UUID | None = None,
     params: Annotated[Params, Depends()],
     header_flows: bool = False,
+    limit: Annotated[int | None, Query(ge=1)] = None,
+    cursor: UUID | None = None,
 ):
     """Retrieve a list of flows with pagination support.
 
@@ -316,6 +368,9 @@ async def read_flows(
         params (Params): Pagination parameters.
         remove_example_flows (bool, optional): Whether to remove example flows. Defaults to False.
         header_flows (bool, optional): Whether to return only specific headers of the flows. Defaults to False.
+        limit (int, optional): With get_all, the maximum number of flows to return, ordered by ID. If more flows
+            follow, the ID to pass as ``cursor`` for the next page is returned in the X-Next-Cursor header.
+        cursor (UUID, optional): With limit, return only flows after this ID.
 
     Returns:
         list[FlowRead] | Page[FlowRead] | list[FlowHeader]
@@ -353,20 +408,19 @@ async def read_flows(
             stmt = stmt.where(Flow.is_component == True)  # noqa: E712
 
         if get_all:
-            flows = (await session.exec(stmt)).all()
-            flows = validate_is_component(flows)
-            if components_only:
-                flows = [flow for flow in flows if flow.is_component]
-            if remove_example_flows and starter_folder_id:
-                flows = [flow for flow in flows if flow.folder_id != starter_folder_id]
-            if header_flows:
-                # Convert to FlowHeader objects and compress the response
-                flow_headers = [FlowHeader.model_validate(flow, from_attributes=True) for flow in flows]
-                return compress_response(flow_headers)
-
-            # Convert to FlowRead while session is still active to avoid detached instance errors
-            flow_reads = [FlowRead.model_validate(flow, from_attributes=True) for flow in flows]
-            return compress_response(flow_reads)
+            headers = {}
+            if limit is not None:
+                stmt = stmt.order_by(col(Flow.id))
+                if cursor is not None:
+                    stmt = stmt.where(col(Flow.id) > cursor)
+                # Look one flow past the page to tell whether there is a next one
+                id_stmt = stmt.with_only_columns(col(Flow.id)).offset(limit - 1).limit(2)
+                page_end = (await session.exec(id_stmt)).all()
+                if len(page_end) > 1:
+                    headers[NEXT_CURSOR_HEADER] = str(page_end[0])
+                stmt = stmt.limit(limit)
+            stmt = stmt.with_only_columns(*_flow_list_columns(header_flows=header_flows))
+            return compress_streaming_response(_stream_flow_list(stmt, header_flows=header_flows), headers=headers)
 
         stmt = stmt.where(Flow.folder_id == folder_id)
 
@@ -471,6 +525,7 @@ async def update_flow(
         session.add(db_flow)
         await session.flush()
         await session.refresh(db_flow)
+        invalidate_graph_templates(db_flow.id)
         await _save_flow_to_fs(db_flow, current_user.id, storage_service)
 
         # Convert to FlowRead while session is still active to avoid detached instance errors
@@ -511,6 +566,7 @@ async def delete_flow(
     if not flow:
         raise HTTPException(status_code=404, detail="Flow not found")
     await cascade_delete_flow(session, flow.id)
+    invalidate_graph_templates(flow.id)
     return {"message": "Flow deleted successfully"}
 
 
@@ -608,6 +664,7 @@ async def delete_multiple_flows(
         ).all()
         for flow in flows_to_delete:
             await cascade_delete_flow(db, flow.id)
+            invalidate_graph_templates(flow.id)
 
         await db.flush()
         return {"deleted": len(flows_to_delete)}
@@ -630,27 +687,17 @@ async def download_multiple_file(
     flows_without_api_keys = [remove_api_keys(flow.model_dump()) for flow in flows]
 
     if len(flows_without_api_keys) > 1:
-        # Create a byte stream to hold the ZIP file
-        zip_stream = io.BytesIO()
-
-        # Create a ZIP file
-        with zipfile.ZipFile(zip_stream, "w") as zip_file:
-            for flow in flows_without_api_keys:
-                # Convert the flow object to JSON
-                flow_json = json.dumps(jsonable_encoder(flow))
-
-                # Write the JSON to the ZIP file
-                zip_file.writestr(f"{flow['name']}.json", flow_json)
-
-        # Seek to the beginning of the byte stream
-        zip_stream.seek(0)
+        entries = (
+            ZipEntry(f"{flow['name']}.json", partial(iter_bytes, json.dumps(jsonable_encoder(flow)).encode()))
+            for flow in flows_without_api_keys
+        )
 
         # Generate the filename with the current datetime
         current_time = datetime.now(tz=timezone.utc).astimezone().strftime("%Y%m%d_%H%M%S")
         filename = f"{current_time}_primeagent_flows.zip"
 
         return StreamingResponse(
-            zip_stream,
+            stream_zip(entries),
             media_type="application/x-zip-compressed",
             headers={"Content-Disposition": f"attachment; filename={filename}"},
         )
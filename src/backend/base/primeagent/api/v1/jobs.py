@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from http import HTTPStatus
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from primeagent.api.v1.endpoints import check_flow_user_permission, validate_input_and_tweaks
+from primeagent.api.v1.schemas import SimplifiedAPIRequest
+from primeagent.exceptions.api import InvalidChatInputError
+from primeagent.helpers.flow import get_flow_by_id_or_endpoint_name
+from primeagent.services.auth.utils import api_key_security
+from primeagent.services.database.models.flow.model import FlowRead
+from primeagent.services.database.models.job.model import Job, JobKind, JobRead, JobStatus
+from primeagent.services.database.models.user.model import UserRead
+from primeagent.services.deps import get_run_queue_service
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+async def _get_user_job(job_id: UUID, user: UserRead) -> Job:
+    job = await get_run_queue_service().get_job(job_id)
+    if job is None or job.user_id != user.id:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Job not found")
+    return job
+
+
+@router.post("/run/{flow_id_or_name}", response_model=JobRead, status_code=HTTPStatus.ACCEPTED)  # noqa: RUF100, FAST003
+async def enqueue_run(
+    *,
+    flow: Annotated[FlowRead | None, Depends(get_flow_by_id_or_endpoint_name)],
+    input_request: SimplifiedAPIRequest | None = None,
+    api_key_user: Annotated[UserRead, Depends(api_key_security)],
+):
+    """Queues a run of a flow and returns its job without waiting for the run.
+
+    The run is taken by the server or by a ``primeagent worker`` process, and is retried if it fails. Follow it
+    with ``GET /jobs/{job_id}`` or ``GET /jobs/{job_id}/events``.
+    """
+    await check_flow_user_permission(flow=flow, api_key_user=api_key_user)
+    if flow is None:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Flow not found")
+    input_request = input_request or SimplifiedAPIRequest()
+    try:
+        validate_input_and_tweaks(input_request)
+    except InvalidChatInputError as exc:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=str(exc)) from exc
+    job = await get_run_queue_service().enqueue(flow.id, input_request, user_id=api_key_user.id, kind=JobKind.RUN)
+    return JobRead.model_validate(job, from_attributes=True)
+
+
+@router.get("/{job_id}", response_model=JobRead)
+async def get_job(
+    job_id: UUID,
+    api_key_user: Annotated[UserRead, Depends(api_key_security)],
+):
+    """Returns the status of a job, and the result of its run once it succeeded."""
+    return JobRead.model_validate(await _get_user_job(job_id, api_key_user), from_attributes=True)
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: UUID,
+    api_key_user: Annotated[UserRead, Depends(api_key_security)],
+):
+    """Streams the job as newline-delimited JSON each time it changes, until it succeeds or fails."""
+    job = await _get_user_job(job_id, api_key_user)
+    queue_service = get_run_queue_service()
+    poll_interval = queue_service.settings_service.settings.job_queue_poll_interval
+
+    async def events() -> AsyncIterator[str]:
+        current: Job | None = job
+        last_update = None
+        while current is not None:
+            if current.updated_at != last_update:
+                last_update = current.updated_at
+                yield JobRead.model_validate(current, from_attributes=True).model_dump_json() + "\n"
+            if JobStatus(current.status).is_finished:
+                return
+            await asyncio.sleep(poll_interval)
+            current = await queue_service.get_job(job_id)
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
@@ -6,10 +6,11 @@ from fastapi_pagination import Page, Params
 from fastapi_pagination.ext.sqlmodel import apaginate
 from sqlalchemy import delete
 from sqlmodel import col, select
+from wfx.services.deps import get_output_cache_service
 
 from primeagent.api.utils import DbSession, custom_params
 from primeagent.schema.message import MessageResponse
-from primeagent.services.auth.utils import get_current_active_user
+from primeagent.services.auth.utils import get_current_active_superuser, get_current_active_user
 from primeagent.services.database.models.flow.model import Flow
 from primeagent.services.database.models.message.model import MessageRead, MessageTable, MessageUpdate
 from primeagent.services.database.models.transactions.crud import transform_transaction_table_for_logs
@@ -20,6 +21,13 @@ from primeagent.services.database.models.vertex_builds.crud import (
     get_vertex_builds_by_flow_id,
 )
 from primeagent.services.database.models.vertex_builds.model import VertexBuildMapModel
+from primeagent.services.deps import (
+    get_cache_service,
+    get_chat_service,
+    get_state_service,
+    get_transaction_service,
+    get_vertex_build_service,
+)
 
 router = APIRouter(prefix="/monitor", tags=["Monitor"])
 
@@ -27,6 +35,8 @@ router = APIRouter(prefix="/monitor", tags=["Monitor"])
 @router.get("/builds", dependencies=[Depends(get_current_active_user)])
 async def get_vertex_builds(flow_id: Annotated[UUID, Query()], session: DbSession) -> VertexBuildMapModel:
     try:
+        # Write the builds still waiting in the write-behind buffer so the latest run is visible
+        await get_vertex_build_service().flush()
         vertex_builds = await get_vertex_builds_by_flow_id(session, flow_id)
         return VertexBuildMapModel.from_list_of_dicts(vertex_builds)
     except Exception as e:
@@ -195,6 +205,8 @@ async def get_transactions(
     params: Annotated[Params | None, Depends(custom_params)],
 ) -> Page[TransactionLogsResponse]:
     try:
+        # Write the transactions still waiting in the queue so the latest run is visible
+        await get_transaction_service().flush()
         stmt = (
             select(TransactionTable)
             .where(TransactionTable.flow_id == flow_id)
@@ -209,3 +221,17 @@ async def get_transactions(
             return await apaginate(session, stmt, params=params, transformer=transform_transaction_table_for_logs)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+@router.get("/metrics", dependencies=[Depends(get_current_active_superuser)])
+async def get_service_metrics() -> dict[str, dict]:
+    """Reports the in-memory footprint and queue counters of the services that hold per-run data."""
+    cache_service = get_cache_service()
+    return {
+        "state_service": get_state_service().stats(),
+        "chat_service": get_chat_service().stats(),
+        "vertex_build_service": get_vertex_build_service().stats(),
+        "transaction_service": get_transaction_service().stats(),
+        "output_cache_service": get_output_cache_service().stats(),
+        **({"cache_service": cache_service.stats()} if hasattr(cache_service, "stats") else {}),
+    }
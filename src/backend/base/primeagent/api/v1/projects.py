@@ -1,7 +1,11 @@
-import io
+import asyncio
 import json
+import re
 import zipfile
+from collections.abc import AsyncIterator
 from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
 from typing import Annotated, cast
 from urllib.parse import quote
 from uuid import UUID
@@ -16,12 +20,13 @@ from sqlalchemy import or_, update
 from sqlalchemy.orm import selectinload
 from sqlmodel import select
 from wfx.log.logger import logger
+from wfx.services.deps import session_scope_readonly
 from wfx.services.mcp_composer.service import MCPComposerService
 
 from primeagent.api.utils import CurrentActiveUser, DbSession, cascade_delete_flow, custom_params, remove_api_keys
 from primeagent.api.utils.mcp.config_utils import validate_mcp_server_for_project
 from primeagent.api.v1.auth_helpers import handle_auth_settings_update
-from primeagent.api.v1.flows import create_flows
+from primeagent.api.v1.flows import FLOW_LIST_BATCH_SIZE, create_flows
 from primeagent.api.v1.mcp_projects import (
     get_project_sse_url,  # noqa: F401
     get_project_streamable_http_url,
@@ -47,9 +52,12 @@ from primeagent.services.database.models.folder.model import (
 from primeagent.services.database.models.folder.pagination_model import FolderWithPaginatedFlows
 from primeagent.services.deps import get_service, get_settings_service, get_storage_service
 from primeagent.services.schema import ServiceType
+from primeagent.utils.zip_stream import ZipEntry, iter_bytes, iter_zip_entries, stream_zip
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
+MAX_ZIP_ENTRIES = 1000  # Maximum number of files in an uploaded project ZIP
+
 
 @router.post("/", response_model=FolderRead, status_code=201)
 async def create_project(
@@ -585,6 +593,16 @@ async def delete_project(
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+async def _iter_project_flow_entries(project_id: UUID) -> AsyncIterator[ZipEntry]:
+    # The request's session may be closed before the response is streamed, so read with a session of its own
+    async with session_scope_readonly() as session:
+        stmt = select(Flow).where(Flow.folder_id == project_id).execution_options(yield_per=FLOW_LIST_BATCH_SIZE)
+        async for flow in await session.stream_scalars(stmt):
+            flow_data = remove_api_keys(FlowRead.model_validate(flow, from_attributes=True).model_dump())
+            flow_json = json.dumps(jsonable_encoder(flow_data)).encode("utf-8")
+            yield ZipEntry(f"{flow_data['name']}.json", partial(iter_bytes, flow_json))
+
+
 @router.get("/download/{project_id}", status_code=200)
 async def download_file(
     *,
@@ -601,23 +619,11 @@ async def download_file(
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
 
-        flows_query = select(Flow).where(Flow.folder_id == project_id)
-        flows_result = await session.exec(flows_query)
-        flows = [FlowRead.model_validate(flow, from_attributes=True) for flow in flows_result.all()]
+        has_flows = (await session.exec(select(Flow.id).where(Flow.folder_id == project_id).limit(1))).first()
 
-        if not flows:
+        if not has_flows:
             raise HTTPException(status_code=404, detail="No flows found in project")
 
-        flows_without_api_keys = [remove_api_keys(flow.model_dump()) for flow in flows]
-        zip_stream = io.BytesIO()
-
-        with zipfile.ZipFile(zip_stream, "w") as zip_file:
-            for flow in flows_without_api_keys:
-                flow_json = json.dumps(jsonable_encoder(flow))
-                zip_file.writestr(f"{flow['name']}.json", flow_json.encode("utf-8"))
-
-        zip_stream.seek(0)
-
         current_time = datetime.now(tz=timezone.utc).astimezone().strftime("%Y%m%d_%H%M%S")
         filename = f"{current_time}_{project.name}_flows.zip"
 
@@ -625,7 +631,7 @@ async def download_file(
         encoded_filename = quote(filename)
 
         return StreamingResponse(
-            zip_stream,
+            stream_zip(_iter_project_flow_entries(project_id)),
             media_type="application/x-zip-compressed",
             headers={"Content-Disposition": f"attachment; filename*=UTF-8''{encoded_filename}"},
         )
@@ -636,6 +642,36 @@ async def download_file(
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+async def _read_project_zip(file: UploadFile) -> dict:
+    """Read a ZIP of flows into project data, parsing one flow at a time from the spooled upload."""
+    max_file_size_upload = get_settings_service().settings.max_file_size_upload
+    max_size = max_file_size_upload * 1024 * 1024
+    flows = []
+    try:
+        # The flows together may not expand past the limit a project uploaded as one JSON file has
+        async for name, content in iter_zip_entries(
+            file.file, max_entry_size=max_size, max_total_size=max_size, max_entries=MAX_ZIP_ENTRIES
+        ):
+            if name.endswith(".json"):
+                flows.append(orjson.loads(content))
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid flow JSON in the file: {e}") from e
+    except zipfile.BadZipFile as e:
+        raise HTTPException(status_code=400, detail=f"Invalid ZIP file: {e}") from e
+    except ValueError as e:
+        raise HTTPException(
+            status_code=413,
+            detail=f"{e}, the maximum is {MAX_ZIP_ENTRIES} files and {max_file_size_upload}MB uncompressed.",
+        ) from e
+
+    if not flows:
+        raise HTTPException(status_code=400, detail="No flows found in the file")
+
+    # Downloads are named "<timestamp>_<project name>_flows.zip"
+    project_name = re.sub(r"^\d{8}_\d{6}_", "", Path(file.filename or "").stem).removesuffix("_flows")
+    return {"folder_name": project_name or "Imported Project", "folder_description": None, "flows": flows}
+
+
 @router.post("/upload/", response_model=list[FlowRead], status_code=201)
 async def upload_file(
     *,
@@ -643,9 +679,13 @@ async def upload_file(
     file: Annotated[UploadFile, File(...)],
     current_user: CurrentActiveUser,
 ):
-    """Upload flows from a file."""
-    contents = await file.read()
-    data = orjson.loads(contents)
+    """Upload flows from a file, either a project JSON or a ZIP of flows as downloaded from a project."""
+    if await asyncio.to_thread(zipfile.is_zipfile, file.file):
+        data = await _read_project_zip(file)
+    else:
+        await file.seek(0)
+        contents = await file.read()
+        data = orjson.loads(contents)
 
     if not data:
         raise HTTPException(status_code=400, detail="No flows found in the file")
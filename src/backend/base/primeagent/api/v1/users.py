@@ -17,7 +17,7 @@ from primeagent.services.auth.utils import (
 )
 from primeagent.services.database.models.user.crud import get_user_by_id, update_user
 from primeagent.services.database.models.user.model import User, UserCreate, UserRead, UserUpdate
-from primeagent.services.deps import get_settings_service
+from primeagent.services.deps import get_auth_service, get_settings_service
 
 router = APIRouter(tags=["Users"], prefix="/users")
 
@@ -147,4 +147,5 @@ async def delete_user(
         raise HTTPException(status_code=404, detail="User not found")
 
     await session.delete(user_db)
+    get_auth_service().invalidate_user(user_id)
     return {"detail": "User deleted"}
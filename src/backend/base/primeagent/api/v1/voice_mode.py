@@ -33,7 +33,7 @@ from primeagent.services.database.models.flow.model import Flow
 from primeagent.services.database.models.message.model import MessageTable
 from primeagent.services.database.models.user.model import User
 from primeagent.services.deps import get_variable_service, session_scope
-from primeagent.utils.voice_utils import BYTES_PER_24K_FRAME, VAD_SAMPLE_RATE_16K, resample_24k_to_16k
+from primeagent.utils.voice_utils import StreamingVad
 
 router = APIRouter(prefix="/voice", tags=["Voice"])
 
@@ -771,34 +771,29 @@ async def flow_as_tool_websocket(
 
             # Setup for VAD processing.
             vad_queue: asyncio.Queue = asyncio.Queue()
-            vad_audio_buffer = bytearray()
             bot_speaking_flag = [False]
 
             async def process_vad_audio() -> None:
-                nonlocal vad_audio_buffer
                 last_speech_time = datetime.now(tz=timezone.utc)
-                vad = get_vad()
+                vad_stream = StreamingVad(get_vad())
                 while True:
-                    base64_data = await vad_queue.get()
-                    raw_chunk_24k = base64.b64decode(base64_data)
-                    vad_audio_buffer.extend(raw_chunk_24k)
-                    has_speech = False
-                    while len(vad_audio_buffer) >= BYTES_PER_24K_FRAME:
-                        frame_24k = vad_audio_buffer[:BYTES_PER_24K_FRAME]
-                        del vad_audio_buffer[:BYTES_PER_24K_FRAME]
-                        try:
-                            frame_16k = resample_24k_to_16k(frame_24k)
-                            is_speech = vad.is_speech(frame_16k, VAD_SAMPLE_RATE_16K)
-                            if is_speech:
-                                has_speech = True
-                                logger.trace("!", end="")
-                                if bot_speaking_flag[0]:
-                                    msg_handler.openai_send({"type": "response.cancel"})
-                                    bot_speaking_flag[0] = False
-                        except Exception as e:  # noqa: BLE001
-                            await logger.aerror(f"[ERROR] VAD processing failed (ValueError): {e}")
-                            continue
+                    # Take every chunk received since the last batch so a backlog is analyzed in one call
+                    chunks = [await vad_queue.get()]
+                    while not vad_queue.empty():
+                        chunks.append(vad_queue.get_nowait())
+                    try:
+                        raw_audio_24k = b"".join(base64.b64decode(chunk) for chunk in chunks)
+                        # Resampling and VAD are CPU-bound, keep them off the event loop
+                        speech_frames = await asyncio.to_thread(vad_stream.process, raw_audio_24k)
+                    except Exception as e:  # noqa: BLE001
+                        await logger.aerror(f"[ERROR] VAD processing failed: {e}")
+                        continue
+                    has_speech = any(speech_frames)
                     if has_speech:
+                        logger.trace("!", end="")
+                        if bot_speaking_flag[0]:
+                            msg_handler.openai_send({"type": "response.cancel"})
+                            bot_speaking_flag[0] = False
                         last_speech_time = datetime.now(tz=timezone.utc)
                         logger.trace(".", end="")
                     else:
@@ -1,9 +1,9 @@
-import io
+import asyncio
 import re
 import uuid
-import zipfile
-from collections.abc import AsyncGenerator, AsyncIterable
+from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator
 from datetime import datetime
+from functools import partial
 from http import HTTPStatus
 from pathlib import Path
 from typing import Annotated
@@ -20,6 +20,7 @@ from primeagent.services.database.models.file.model import File as UserFile
 from primeagent.services.deps import get_settings_service, get_storage_service
 from primeagent.services.settings.service import SettingsService
 from primeagent.services.storage.service import StorageService
+from primeagent.utils.zip_stream import DEFAULT_PREFETCH, ZipEntry, stream_zip
 
 router = APIRouter(tags=["Files"], prefix="/files")
 
@@ -27,6 +28,9 @@ router = APIRouter(tags=["Files"], prefix="/files")
 MCP_SERVERS_FILE = "_mcp_servers"
 SAMPLE_DATA_DIR = Path(__file__).parent / "sample_data"
 
+# Bytes of an upload read into memory at a time while it is saved to storage
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 def is_permanent_storage_failure(error: Exception) -> bool:
     """Check if a storage deletion error is a permanent failure (file/storage gone).
@@ -104,6 +108,12 @@ async def fetch_file_object(file_id: uuid.UUID, current_user: CurrentActiveUser,
     return file
 
 
+async def iter_upload(file: UploadFile, chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Read an uploaded file a chunk at a time."""
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
 async def save_file_routine(
     file,
     storage_service,
@@ -113,16 +123,24 @@ async def save_file_routine(
     *,
     append: bool = False,
 ):
-    """Routine to save the file content to the storage service."""
+    """Routine to save the file content to the storage service.
+
+    Unless the content is given, the upload is streamed to storage a chunk at a time.
+    """
     file_id = uuid.uuid4()
 
-    if not file_content:
-        file_content = await file.read()
     if not file_name:
         file_name = file.filename
 
     # Save the file using the storage service.
-    await storage_service.save_file(flow_id=str(current_user.id), file_name=file_name, data=file_content, append=append)
+    if file_content:
+        await storage_service.save_file(
+            flow_id=str(current_user.id), file_name=file_name, data=file_content, append=append
+        )
+    else:
+        await storage_service.save_file_stream(
+            flow_id=str(current_user.id), file_name=file_name, chunks=iter_upload(file), append=append
+        )
 
     return file_id, file_name
 
@@ -472,38 +490,38 @@ async def download_files_batch(
         if not files:
             raise HTTPException(status_code=404, detail="No files found")
 
-        # Create a byte stream to hold the ZIP file
-        zip_stream = io.BytesIO()
+        file_names = [Path(file.path).name for file in files]
 
-        # Create a ZIP file
-        with zipfile.ZipFile(zip_stream, "w") as zip_file:
-            for file in files:
-                # Get the file content from storage
-                file_content = await storage_service.get_file(
-                    flow_id=str(current_user.id), file_name=Path(file.path).name
-                )
+        # The archive is streamed after the response starts, so check every file is there while a 404 can be sent
+        limiter = asyncio.Semaphore(DEFAULT_PREFETCH)
 
-                # Get the file extension from the original filename
-                file_extension = Path(file.path).suffix
-                # Create the filename with extension
-                filename_with_extension = f"{file.name}{file_extension}"
+        async def check_exists(file_name: str) -> None:
+            async with limiter:
+                await storage_service.get_file_size(flow_id=str(current_user.id), file_name=file_name)
 
-                # Write the file to the ZIP with the proper extension
-                zip_file.writestr(filename_with_extension, file_content)
+        await asyncio.gather(*(check_exists(file_name) for file_name in file_names))
 
-        # Seek to the beginning of the byte stream
-        zip_stream.seek(0)
+        entries = [
+            # Name each entry after the original filename, with the stored file's extension
+            ZipEntry(
+                f"{file.name}{Path(file.path).suffix}",
+                partial(storage_service.get_file_stream, flow_id=str(current_user.id), file_name=file_name),
+            )
+            for file, file_name in zip(files, file_names, strict=True)
+        ]
 
         # Generate the filename with the current datetime
         current_time = datetime.now(tz=ZoneInfo("UTC")).astimezone().strftime("%Y%m%d_%H%M%S")
         filename = f"{current_time}_primeagent_files.zip"
 
         return StreamingResponse(
-            zip_stream,
+            stream_zip(entries),
             media_type="application/x-zip-compressed",
             headers={"Content-Disposition": f"attachment; filename={filename}"},
         )
 
+    except HTTPException:
+        raise
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=f"File not found: {e}") from e
     except Exception as e:
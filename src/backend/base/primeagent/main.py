@@ -39,6 +39,7 @@ from primeagent.initial_setup.setup import (
 from primeagent.middleware import ContentSizeLimitMiddleware
 from primeagent.services.deps import (
     get_queue_service,
+    get_run_queue_service,
     get_service,
     get_settings_service,
     get_telemetry_service,
@@ -275,6 +276,8 @@ def get_lifespan(*, fix_migration=False, version=None):
             queue_service = get_queue_service()
             if not queue_service.is_started():  # Start if not already started
                 queue_service.start()
+            # Runs queued by webhooks and the jobs API, including those left from before a restart
+            get_run_queue_service().start()
             await logger.adebug(f"Flows loaded in {asyncio.get_event_loop().time() - current_time:.2f}s")
 
             total_time = asyncio.get_event_loop().time() - start_time
@@ -373,6 +376,11 @@ def get_lifespan(*, fix_migration=False, version=None):
                         for result in results:
                             if isinstance(result, Exception) and not isinstance(result, asyncio.CancelledError):
                                 await logger.aerror(f"Error during task cleanup: {result}", exc_info=result)
+                    # Hand the runs in progress back to the job queue while the database is still available
+                    try:
+                        await get_run_queue_service().teardown()
+                    except Exception as e:  # noqa: BLE001
+                        await logger.aerror(f"Failed to stop job queue workers: {e}")
 
                 # Step 2: Cleaning Up Services
                 with shutdown_progress.step(2):
@@ -0,0 +1,138 @@
+"""Per-worker cache of compiled graph templates for the run endpoints.
+
+Building a graph from a flow payload (ungrouping, vertex and edge parsing, cycle detection) dominates the
+latency of short flows. Templates are keyed by the flow id, its ``updated_at`` timestamp and a hash of the
+tweaks, so a saved flow is never served from a stale template, even by workers that did not see the save.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+import orjson
+from wfx.graph.graph.base import Graph
+from wfx.graph.graph.template import GraphTemplate
+from wfx.log.logger import logger
+
+from primeagent.processing.process import process_tweaks
+from primeagent.schema.graph import Tweaks
+from primeagent.services.deps import get_settings_service
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from primeagent.services.database.models.flow.model import Flow
+
+TemplateKey = tuple[str, str, str, bool]
+
+
+class GraphTemplateCache:
+    """A bounded LRU cache of ``GraphTemplate`` objects.
+
+    Attributes:
+        max_size (int): Maximum number of templates to keep. 0 disables the cache.
+        hits (int): Number of graphs instantiated from a cached template.
+        misses (int): Number of templates that had to be compiled.
+    """
+
+    def __init__(self, max_size: int = 100) -> None:
+        self._cache: OrderedDict[TemplateKey, GraphTemplate] = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: TemplateKey) -> GraphTemplate | None:
+        with self._lock:
+            template = self._cache.get(key)
+            if template is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return template
+
+    def set(self, key: TemplateKey, template: GraphTemplate) -> None:
+        with self._lock:
+            if self.max_size <= 0:
+                return
+            self._cache[key] = template
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def invalidate(self, flow_id: str | UUID) -> None:
+        """Drops every template compiled for ``flow_id``."""
+        flow_id = str(flow_id)
+        with self._lock:
+            for key in [key for key in self._cache if key[0] == flow_id]:
+                del self._cache[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"size": len(self._cache), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+graph_template_cache = GraphTemplateCache()
+
+
+def invalidate_graph_templates(flow_id: str | UUID) -> None:
+    """Drops the cached templates of a flow. Called when the flow is saved or deleted."""
+    graph_template_cache.invalidate(flow_id)
+
+
+def _hash_tweaks(tweaks: dict[str, Any], *, stream: bool) -> str:
+    payload = orjson.dumps({"tweaks": tweaks, "stream": stream}, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(payload).hexdigest()
+
+
+def build_graph_from_flow(
+    flow: Flow,
+    tweaks: Tweaks | dict[str, Any] | None = None,
+    *,
+    stream: bool = False,
+    user_id: str | None = None,
+    context: dict | None = None,
+) -> Graph:
+    """Builds a fresh graph for a single run of ``flow`` with ``tweaks`` applied.
+
+    The compiled template is reused for subsequent runs of the same flow version with the same tweaks.
+    Set ``graph_template_cache_size`` to 0 to always build the graph from the payload.
+    """
+    flow_id_str = str(flow.id)
+    if flow.data is None:
+        msg = f"Flow {flow_id_str} has no data"
+        raise ValueError(msg)
+    tweaks = tweaks.model_dump() if isinstance(tweaks, Tweaks) else tweaks or {}
+    graph_template_cache.max_size = get_settings_service().settings.graph_template_cache_size
+
+    key: TemplateKey | None = None
+    if graph_template_cache.max_size > 0:
+        try:
+            updated_at = flow.updated_at.isoformat() if flow.updated_at else ""
+            key = (flow_id_str, updated_at, _hash_tweaks(tweaks, stream=stream), stream)
+        except TypeError:
+            logger.debug(f"Tweaks for flow {flow_id_str} are not hashable, skipping the graph template cache")
+        else:
+            if (template := graph_template_cache.get(key)) is not None:
+                return template.instantiate(user_id=user_id, context=context)
+
+    graph_data = process_tweaks(flow.data.copy(), tweaks, stream=stream)
+    if key is None:
+        return Graph.from_payload(
+            graph_data, flow_id=flow_id_str, user_id=user_id, flow_name=flow.name, context=context
+        )
+
+    template = GraphTemplate.compile(graph_data, flow_id=flow_id_str, flow_name=flow.name)
+    graph_template_cache.set(key, template)
+    return template.instantiate(user_id=user_id, context=context)
@@ -1,8 +1,15 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 from typing_extensions import override
 
 from primeagent.services.auth.service import AuthService
 from primeagent.services.factory import ServiceFactory
 
+if TYPE_CHECKING:
+    from wfx.services.settings.service import SettingsService
+
 
 class AuthServiceFactory(ServiceFactory):
     name = "auth_service"
@@ -11,5 +18,5 @@ class AuthServiceFactory(ServiceFactory):
         super().__init__(AuthService)
 
     @override
-    def create(self, settings_service):
+    def create(self, settings_service: SettingsService):
         return AuthService(settings_service)
@@ -1,15 +1,124 @@
 from __future__ import annotations
 
+import hashlib
+import time
+from collections import Counter
+from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
+from sqlalchemy import bindparam, update
+from wfx.services.deps import session_scope
+
 from primeagent.services.base import Service
+from primeagent.services.database.models.api_key.model import ApiKey
+from primeagent.services.database.models.user.model import UserRead
+from primeagent.services.write_behind import WriteBehindBuffer
 
 if TYPE_CHECKING:
+    from uuid import UUID
+
     from wfx.services.settings.service import SettingsService
 
+    from primeagent.services.database.models.user.model import User
+
+# Uses of a single key are summed before they are written, so this bounds the uses waiting in memory,
+# not the number of rows updated per write
+API_KEY_USAGE_BATCH_SIZE = 10_000
+API_KEY_USAGE_QUEUE_SIZE = 100_000
+
+
+def _api_key_digest(api_key: str) -> bytes:
+    return hashlib.sha256(api_key.encode()).digest()
+
 
 class AuthService(Service):
+    """Keeps authenticated API keys in memory and writes their usage in the background.
+
+    The user an API key authenticates as is cached for ``api_key_cache_ttl`` seconds, keyed by a digest of
+    the key, so repeated requests with the key do not open a database session. Deleting the key or updating
+    or deleting its user clears the entry on this worker; other workers see the change once it expires.
+
+    Uses of API keys are counted in memory and written every ``api_key_usage_flush_interval`` seconds,
+    one ``UPDATE`` per key per write, instead of one row write per request.
+    """
+
     name = "auth_service"
 
     def __init__(self, settings_service: SettingsService):
         self.settings_service = settings_service
+        # Users by API key digest, with the key's id (None for the environment key) and expiry
+        self._principals: dict[bytes, tuple[float, UserRead, UUID | None]] = {}
+        self.usage: WriteBehindBuffer[tuple[UUID, datetime]] = WriteBehindBuffer(
+            "API key usage",
+            self._write_api_key_usage,
+            batch_size=API_KEY_USAGE_BATCH_SIZE,
+            flush_interval=settings_service.settings.api_key_usage_flush_interval,
+            max_size=API_KEY_USAGE_QUEUE_SIZE,
+        )
+
+    def get_api_key_user(self, api_key: str) -> UserRead | None:
+        """Return the cached user of an API key, recording the use, or None if the key is not cached."""
+        digest = _api_key_digest(api_key)
+        entry = self._principals.get(digest)
+        if entry is None:
+            return None
+        expires_at, user, api_key_id = entry
+        if time.monotonic() >= expires_at:
+            self._principals.pop(digest, None)
+            return None
+        if api_key_id is not None and self.settings_service.settings.disable_track_apikey_usage is not True:
+            self.record_api_key_use(api_key_id)
+        return user
+
+    def cache_api_key_user(self, api_key: str, user: User | UserRead, api_key_id: UUID | None = None) -> None:
+        """Remember the user an API key authenticated as, with the key's id to count later uses against."""
+        ttl = self.settings_service.settings.api_key_cache_ttl
+        if ttl > 0:
+            user_read = UserRead.model_validate(user, from_attributes=True)
+            self._principals[_api_key_digest(api_key)] = (time.monotonic() + ttl, user_read, api_key_id)
+
+    def invalidate_api_key(self, api_key_id: UUID) -> None:
+        """Forget the cached user of a key, e.g. because the key was deleted."""
+        for digest, (_, _, cached_id) in list(self._principals.items()):
+            if cached_id == api_key_id:
+                self._principals.pop(digest, None)
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        """Forget every cached key of a user, e.g. because the user was deactivated or deleted."""
+        for digest, (_, user, _) in list(self._principals.items()):
+            if user.id == user_id:
+                self._principals.pop(digest, None)
+
+    def record_api_key_use(self, api_key_id: UUID) -> None:
+        self.usage.put_nowait((api_key_id, datetime.now(timezone.utc)))
+
+    @staticmethod
+    async def _write_api_key_usage(uses: list[tuple[UUID, datetime]]) -> None:
+        counts = Counter(api_key_id for api_key_id, _ in uses)
+        last_used = dict(uses)
+        table = ApiKey.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("key_id"))
+            .values(total_uses=table.c.total_uses + bindparam("uses"), last_used_at=bindparam("used_at"))
+        )
+        async with session_scope() as session:
+            await session.execute(
+                statement,
+                [
+                    {"key_id": api_key_id, "uses": uses_count, "used_at": last_used[api_key_id]}
+                    for api_key_id, uses_count in counts.items()
+                ],
+            )
+
+    async def flush(self) -> int:
+        """Write every pending API key use to the database.
+
+        Returns:
+            The number of uses written.
+        """
+        return await self.usage.flush()
+
+    async def teardown(self) -> None:
+        self._principals.clear()
+        await self.usage.close()
@@ -25,7 +25,7 @@ from primeagent.services.database.models.user.crud import (
     update_user_last_login_at,
 )
 from primeagent.services.database.models.user.model import User, UserRead
-from primeagent.services.deps import get_settings_service
+from primeagent.services.deps import get_auth_service, get_settings_service
 
 if TYPE_CHECKING:
     from primeagent.services.database.models.api_key.model import ApiKey
@@ -113,6 +113,10 @@ async def api_key_security(
     settings_service = get_settings_service()
     result: ApiKey | User | None
 
+    # Keys that authenticated recently are answered from memory, without a database session
+    if (query_param or header_param) and (user := get_auth_service().get_api_key_user(query_param or header_param)):
+        return user
+
     async with session_scope() as db:
         if settings_service.auth_settings.AUTO_LOGIN:
             # Get the first user
@@ -158,6 +162,9 @@ async def ws_api_key_security(
     api_key: str | None,
 ) -> UserRead:
     settings = get_settings_service()
+    if api_key and (user := get_auth_service().get_api_key_user(api_key)):
+        return user
+
     async with session_scope() as db:
         if settings.auth_settings.AUTO_LOGIN:
             if not settings.auth_settings.SUPERUSER:
@@ -6,6 +6,7 @@ from typing_extensions import override
 from wfx.log.logger import logger
 
 from primeagent.services.cache.disk import AsyncDiskCache
+from primeagent.services.cache.serializers import get_serializer
 from primeagent.services.cache.service import AsyncInMemoryCache, CacheService, RedisCache, ThreadingInMemoryCache
 from primeagent.services.factory import ServiceFactory
 
@@ -30,6 +31,9 @@ class CacheServiceFactory(ServiceFactory):
                 db=settings_service.settings.redis_db,
                 url=settings_service.settings.redis_url,
                 expiration_time=settings_service.settings.redis_cache_expire,
+                serializer=get_serializer(settings_service.settings.redis_cache_serializer),
+                l1_max_size=settings_service.settings.redis_l1_max_size,
+                l1_ttl=settings_service.settings.redis_l1_ttl,
             )
 
         if settings_service.settings.cache_type == "memory":
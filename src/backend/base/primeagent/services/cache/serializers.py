@@ -0,0 +1,155 @@
+"""Serializers used by the Redis cache to turn values into bytes and back.
+
+``dill`` handles almost any Python object, including the graphs and closures cached during a build, and is
+the default. ``pickle`` (protocol 5) is faster for ordinary objects and keeps large buffers such as numpy
+arrays or bytes out of band, so reading them back slices the Redis reply instead of copying it. ``msgpack``
+is the fastest and most compact for plain data (dicts, lists, strings, numbers) but cannot encode anything else.
+
+Every ``loads`` accepts a ``memoryview`` so the cache can hand over the payload that follows its entry
+header without copying it.
+"""
+
+from __future__ import annotations
+
+import abc
+import pickle
+import struct
+from typing import Any, ClassVar, Literal
+
+import dill
+
+SerializerName = Literal["dill", "pickle", "msgpack"]
+
+# Buffers at least this large are stored out of band by the pickle serializer
+LARGE_BUFFER_THRESHOLD = 64 * 1024
+
+_COUNT = struct.Struct(">I")
+_LENGTH = struct.Struct(">Q")
+
+
+class Serializer(abc.ABC):
+    """Converts cache values to bytes and back."""
+
+    name: ClassVar[str]
+    code: ClassVar[int]
+    """Stored in every cache entry so that an entry is always read back with the serializer that wrote it."""
+
+    @abc.abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        """Serializes ``value``.
+
+        Raises:
+            TypeError: If the value cannot be serialized.
+        """
+
+    @abc.abstractmethod
+    def loads(self, data: bytes | memoryview) -> Any:
+        """Deserializes data produced by :meth:`dumps`."""
+
+
+class DillSerializer(Serializer):
+    name = "dill"
+    code = 1
+
+    def dumps(self, value: Any) -> bytes:
+        try:
+            return dill.dumps(value, recurse=True)
+        except pickle.PicklingError as exc:
+            msg = "The value cannot be serialized with dill."
+            raise TypeError(msg) from exc
+
+    def loads(self, data: bytes | memoryview) -> Any:
+        return dill.loads(data)
+
+
+class PickleSerializer(Serializer):
+    """Pickle protocol 5 with out-of-band buffers for large values.
+
+    The output is a count of out-of-band buffers, their lengths, the pickle stream and then the buffers
+    themselves. When reading from a ``memoryview`` the buffers are slices of it, so a large numpy array is
+    rebuilt on top of the cached bytes (read-only) rather than copied.
+    """
+
+    name = "pickle"
+    code = 2
+
+    def __init__(self, large_buffer_threshold: int = LARGE_BUFFER_THRESHOLD) -> None:
+        self.large_buffer_threshold = large_buffer_threshold
+
+    def dumps(self, value: Any) -> bytes:
+        buffers: list[pickle.PickleBuffer] = []
+
+        def keep_in_band(buffer: pickle.PickleBuffer) -> bool:
+            if buffer.raw().nbytes < self.large_buffer_threshold:
+                return True
+            buffers.append(buffer)
+            return False
+
+        try:
+            stream = pickle.dumps(value, protocol=5, buffer_callback=keep_in_band)
+        except (pickle.PicklingError, TypeError, AttributeError) as exc:
+            msg = "The value cannot be serialized with pickle."
+            raise TypeError(msg) from exc
+        raws = [buffer.raw() for buffer in buffers]
+        parts: list[bytes | memoryview] = [_COUNT.pack(len(raws))]
+        parts.extend(_LENGTH.pack(raw.nbytes) for raw in raws)
+        parts.append(stream)
+        parts.extend(raws)
+        return b"".join(parts)
+
+    def loads(self, data: bytes | memoryview) -> Any:
+        view = memoryview(data)
+        (count,) = _COUNT.unpack_from(view)
+        offset = _COUNT.size
+        lengths = []
+        for _ in range(count):
+            lengths.append(_LENGTH.unpack_from(view, offset)[0])
+            offset += _LENGTH.size
+        end = len(view) - sum(lengths)
+        stream = view[offset:end]
+        buffers = []
+        for length in lengths:
+            buffers.append(view[end : end + length])
+            end += length
+        return pickle.loads(stream, buffers=buffers)
+
+
+class MsgpackSerializer(Serializer):
+    """msgpack for plain data; values of any other type are rejected."""
+
+    name = "msgpack"
+    code = 3
+
+    def __init__(self) -> None:
+        try:
+            import msgpack
+        except ImportError as exc:
+            msg = "msgpack is required for the msgpack cache serializer. Install it with: uv pip install msgpack"
+            raise ImportError(msg) from exc
+        self._msgpack = msgpack
+
+    def dumps(self, value: Any) -> bytes:
+        try:
+            return self._msgpack.packb(value, use_bin_type=True)
+        except (TypeError, ValueError, OverflowError) as exc:
+            msg = "The msgpack cache serializer only accepts plain data (dicts, lists, strings, numbers, bytes)."
+            raise TypeError(msg) from exc
+
+    def loads(self, data: bytes | memoryview) -> Any:
+        return self._msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+SERIALIZERS: dict[str, type[Serializer]] = {
+    DillSerializer.name: DillSerializer,
+    PickleSerializer.name: PickleSerializer,
+    MsgpackSerializer.name: MsgpackSerializer,
+}
+
+
+def get_serializer(name: str) -> Serializer:
+    """Returns a new serializer instance by name."""
+    try:
+        return SERIALIZERS[name]()
+    except KeyError:
+        msg = f"Unknown cache serializer '{name}'. Expected one of: {', '.join(SERIALIZERS)}"
+        raise ValueError(msg) from None
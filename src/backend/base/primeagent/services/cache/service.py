@@ -1,11 +1,12 @@
 import asyncio
+import contextlib
 import pickle
+import struct
 import threading
 import time
 from collections import OrderedDict
 from typing import Generic, Union
 
-import dill
 from typing_extensions import override
 from wfx.log.logger import logger
 from wfx.services.cache.utils import CACHE_MISS
@@ -17,6 +18,18 @@ from primeagent.services.cache.base import (
     ExternalAsyncBaseCacheService,
     LockType,
 )
+from primeagent.services.cache.serializers import SERIALIZERS, DillSerializer, Serializer
+
+# Serializer code and version stored in front of every Redis entry
+_ENTRY_HEADER = struct.Struct(">BQ")
+
+
+def get_serializer_by_code(code: int) -> Serializer:
+    for serializer_class in SERIALIZERS.values():
+        if serializer_class.code == code:
+            return serializer_class()
+    msg = f"Unknown cache serializer code {code}"
+    raise ValueError(msg)
 
 
 class ThreadingInMemoryCache(CacheService, Generic[LockType]):
@@ -176,9 +189,20 @@ class ThreadingInMemoryCache(CacheService, Generic[LockType]):
 
 
 class RedisCache(ExternalAsyncBaseCacheService, Generic[LockType]):
-    """A Redis-based cache implementation.
+    """A Redis-based cache implementation with an optional in-process L1 tier.
 
-    This cache supports setting an expiration time for cached items.
+    This cache supports setting an expiration time for cached items. Values are serialized with a
+    pluggable :class:`~primeagent.services.cache.serializers.Serializer` and stored behind a small header
+    holding the serializer code and the entry version.
+
+    When ``l1_max_size`` is set, each worker keeps the most recently used entries in a bounded LRU in front of
+    Redis, so a hit does not need a Redis read. L1 holds the encoded entries and decodes them on every hit, so
+    each caller gets its own copy of the value, as it would from Redis. Every write takes a new version from a
+    Redis counter and publishes ``(key, version)`` on an invalidation channel once Redis holds the value.
+    Workers drop L1 entries of any other version, as concurrent writes may reach Redis in any order, and
+    remember the highest version so that a read already in flight cannot cache an older value afterwards. An
+    L1 entry can still be stale between another worker's write and the arrival of its invalidation, and for at
+    most ``l1_ttl`` seconds if an invalidation is missed (for example while the subscription reconnects).
 
     Attributes:
         expiration_time (int, optional): Time in seconds after which a cached item expires. Default is 1 hour.
@@ -196,7 +220,22 @@ class RedisCache(ExternalAsyncBaseCacheService, Generic[LockType]):
         b = cache["b"]
     """
 
-    def __init__(self, host="localhost", port=6379, db=0, url=None, expiration_time=60 * 60) -> None:
+    VERSION_KEY = "primeagent:cache:version"
+    INVALIDATION_CHANNEL = "primeagent:cache:invalidate"
+
+    def __init__(
+        self,
+        host="localhost",
+        port=6379,
+        db=0,
+        url=None,
+        expiration_time=60 * 60,
+        *,
+        serializer: Serializer | None = None,
+        l1_max_size: int = 0,
+        l1_ttl: float = 30,
+        client=None,
+    ) -> None:
         """Initialize a new RedisCache instance.
 
         Args:
@@ -206,19 +245,41 @@ class RedisCache(ExternalAsyncBaseCacheService, Generic[LockType]):
             url (str, optional): Redis URL.
             expiration_time (int, optional): Time in seconds after which a
                 cached item expires. Default is 1 hour.
+            serializer (Serializer, optional): Serializer for the values. Defaults to dill.
+            l1_max_size (int, optional): Maximum number of decoded values kept in process. 0 disables the L1 tier.
+            l1_ttl (float, optional): Time in seconds an L1 entry is served without hearing from Redis.
+            client (optional): An existing ``redis.asyncio`` client to use instead of connecting.
         """
-        # Redis is a main dependency, no need to import check
-        from redis.asyncio import StrictRedis
-
         logger.warning(
             "RedisCache is an experimental feature and may not work as expected."
             " Please report any issues to our GitHub repository."
         )
-        if url:
-            self._client = StrictRedis.from_url(url)
+        if client is not None:
+            self._client = client
         else:
-            self._client = StrictRedis(host=host, port=port, db=db)
+            # Redis is a main dependency, no need to import check
+            from redis.asyncio import StrictRedis
+
+            self._client = StrictRedis.from_url(url) if url else StrictRedis(host=host, port=port, db=db)
         self.expiration_time = expiration_time
+        self.serializer = serializer or DillSerializer()
+        self._serializers = {self.serializer.code: self.serializer}
+        self.l1_max_size = l1_max_size
+        self.l1_ttl = l1_ttl
+        self._l1: OrderedDict[str, tuple[int, float, bytes]] = OrderedDict()
+        # Highest version each key was invalidated at, so a read that started before cannot store an older value
+        self._invalidated: OrderedDict[str, int] = OrderedDict()
+        self._listener: asyncio.Task | None = None
+        self._metrics = {
+            "l1_hits": 0,
+            "l2_hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "serialize_seconds": 0.0,
+            "deserialize_seconds": 0.0,
+            "bytes_written": 0,
+            "bytes_read": 0,
+        }
 
     async def is_connected(self) -> bool:
         """Check if the Redis client is connected."""
@@ -232,24 +293,140 @@ class RedisCache(ExternalAsyncBaseCacheService, Generic[LockType]):
             return False
         return True
 
+    def _serialize(self, value) -> bytes:
+        start = time.perf_counter()
+        try:
+            return self.serializer.dumps(value)
+        finally:
+            self._metrics["serialize_seconds"] += time.perf_counter() - start
+
+    def _decode(self, data: bytes) -> tuple[int, object]:
+        code, version = _ENTRY_HEADER.unpack_from(data)
+        serializer = self._serializers.get(code)
+        if serializer is None:
+            serializer = self._serializers[code] = get_serializer_by_code(code)
+        start = time.perf_counter()
+        # Slicing the memoryview hands the payload to the serializer without copying it
+        value = serializer.loads(memoryview(data)[_ENTRY_HEADER.size :])
+        self._metrics["deserialize_seconds"] += time.perf_counter() - start
+        return version, value
+
+    def _l1_get(self, key: str) -> bytes | None:
+        entry = self._l1.get(key)
+        if entry is None:
+            return None
+        _version, stored_at, data = entry
+        if time.monotonic() - stored_at >= self.l1_ttl:
+            del self._l1[key]
+            return None
+        self._l1.move_to_end(key)
+        return data
+
+    def _l1_set(self, key: str, version: int, data: bytes) -> None:
+        current = self._l1.get(key)
+        if (current is not None and current[0] > version) or self._invalidated.get(key, 0) > version:
+            # A newer version was written, yet Redis may hold this one if the writes landed out of order
+            self._l1.pop(key, None)
+            return
+        self._l1[key] = (version, time.monotonic(), data)
+        self._l1.move_to_end(key)
+        while len(self._l1) > self.l1_max_size:
+            self._l1.popitem(last=False)
+
+    def _invalidate(self, key: str | None, version: int) -> None:
+        """Drops the L1 entry of ``key`` unless it is ``version`` itself; a ``None`` key clears the whole tier."""
+        if key is None:
+            self._l1.clear()
+            return
+        if version > self._invalidated.get(key, 0):
+            self._invalidated[key] = version
+            self._invalidated.move_to_end(key)
+            while len(self._invalidated) > self.l1_max_size:
+                self._invalidated.popitem(last=False)
+        entry = self._l1.get(key)
+        if entry is not None and entry[0] != version:
+            del self._l1[key]
+            self._metrics["invalidations"] += 1
+
+    async def _ensure_listener(self) -> None:
+        # Subscribe before anything is cached in L1 so that no invalidation for it can be missed
+        if self.l1_max_size and (self._listener is None or self._listener.done()):
+            pubsub = self._client.pubsub()
+            await pubsub.subscribe(self.INVALIDATION_CHANNEL)
+            self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def _listen(self, pubsub) -> None:
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                key, _, version = bytes(message["data"]).rpartition(b"\x00")
+                self._invalidate(key.decode() if key else None, int(version))
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # noqa: BLE001
+            # Entries cached while unsubscribed may have missed invalidations
+            self._l1.clear()
+            await logger.awarning("RedisCache lost its invalidation subscription, the L1 tier was cleared.")
+        finally:
+            with contextlib.suppress(Exception):
+                await pubsub.aclose()
+
+    async def _next_version(self) -> int:
+        return int(await self._client.incr(self.VERSION_KEY)) if self.l1_max_size else 0
+
+    async def _publish(self, key: str | None, version: int) -> None:
+        if self.l1_max_size:
+            await self._client.publish(self.INVALIDATION_CHANNEL, f"{key or ''}\x00{version}".encode())
+
     @override
     async def get(self, key, lock=None):
         if key is None:
             return CACHE_MISS
-        value = await self._client.get(str(key))
-        return dill.loads(value) if value else CACHE_MISS
+        key = str(key)
+        if self.l1_max_size:
+            await self._ensure_listener()
+            data = self._l1_get(key)
+            if data is not None:
+                self._metrics["l1_hits"] += 1
+                return self._decode(data)[1]
+        data = await self._client.get(key)
+        if not data:
+            self._metrics["misses"] += 1
+            return CACHE_MISS
+        try:
+            version, value = self._decode(data)
+        except Exception:  # noqa: BLE001
+            # E.g. an entry written before values had a header, or by a serializer this worker does not have
+            await logger.adebug(f"RedisCache could not decode the entry for {key}, dropping it.")
+            await self._client.delete(key)
+            self._metrics["misses"] += 1
+            return CACHE_MISS
+        self._metrics["l2_hits"] += 1
+        self._metrics["bytes_read"] += len(data)
+        if self.l1_max_size:
+            self._l1_set(key, version, bytes(data))
+        return value
 
     @override
     async def set(self, key, value, lock=None) -> None:
+        key = str(key)
         try:
-            if pickled := dill.dumps(value, recurse=True):
-                result = await self._client.setex(str(key), self.expiration_time, pickled)
-                if not result:
-                    msg = "RedisCache could not set the value."
-                    raise ValueError(msg)
-        except pickle.PicklingError as exc:
-            msg = "RedisCache only accepts values that can be pickled. "
+            payload = self._serialize(value)
+        except TypeError as exc:
+            msg = f"RedisCache only accepts values that can be serialized with {self.serializer.name}. "
             raise TypeError(msg) from exc
+        version = await self._next_version()
+        encoded = _ENTRY_HEADER.pack(self.serializer.code, version) + payload
+        result = await self._client.setex(key, self.expiration_time, encoded)
+        if not result:
+            msg = "RedisCache could not set the value."
+            raise ValueError(msg)
+        self._metrics["bytes_written"] += len(encoded)
+        if self.l1_max_size:
+            await self._ensure_listener()
+            self._l1_set(key, version, encoded)
+            await self._publish(key, version)
 
     @override
     async def upsert(self, key, value, lock=None) -> None:
@@ -273,19 +450,48 @@ class RedisCache(ExternalAsyncBaseCacheService, Generic[LockType]):
 
     @override
     async def delete(self, key, lock=None) -> None:
+        key = str(key)
         await self._client.delete(key)
+        if self.l1_max_size:
+            version = await self._next_version()
+            self._invalidate(key, version)
+            await self._publish(key, version)
 
     @override
     async def clear(self, lock=None) -> None:
         """Clear all items from the cache."""
         await self._client.flushdb()
+        self._l1.clear()
+        await self._publish(None, 0)
 
     async def contains(self, key) -> bool:
         """Check if the key is in the cache."""
         if key is None:
             return False
+        if self.l1_max_size and self._l1_get(str(key)) is not None:
+            return True
         return bool(await self._client.exists(str(key)))
 
+    def stats(self) -> dict:
+        """Reports the hit ratio of each tier and the time spent serializing values."""
+        lookups = self._metrics["l1_hits"] + self._metrics["l2_hits"] + self._metrics["misses"]
+        return {
+            **self._metrics,
+            "serializer": self.serializer.name,
+            "l1_entries": len(self._l1),
+            "l1_max_size": self.l1_max_size,
+            "l1_hit_ratio": self._metrics["l1_hits"] / lookups if lookups else 0.0,
+            "l2_hit_ratio": self._metrics["l2_hits"] / lookups if lookups else 0.0,
+        }
+
+    async def teardown(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        self._l1.clear()
+
     def __repr__(self) -> str:
         """Return a string representation of the RedisCache instance."""
         return f"RedisCache(expiration_time={self.expiration_time})"
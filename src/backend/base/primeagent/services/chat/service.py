@@ -1,7 +1,7 @@
 import asyncio
-from collections import defaultdict
 from threading import RLock
 from typing import Any
+from weakref import WeakValueDictionary
 
 from primeagent.services.base import Service
 from primeagent.services.cache.base import AsyncBaseCacheService, CacheService
@@ -14,10 +14,27 @@ class ChatService(Service):
     name = "chat_service"
 
     def __init__(self) -> None:
-        self.async_cache_locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
-        self._sync_cache_locks: dict[str, RLock] = defaultdict(RLock)
+        # Locks are only referenced while an operation on their key is in progress, so the tables only hold
+        # the keys in use instead of one lock for every key ever cached
+        self.async_cache_locks: WeakValueDictionary[str, asyncio.Lock] = WeakValueDictionary()
+        self._sync_cache_locks: WeakValueDictionary[str, RLock] = WeakValueDictionary()
         self.cache_service: CacheService | AsyncBaseCacheService = get_cache_service()
 
+    def _async_lock(self, key: str) -> asyncio.Lock:
+        lock = self.async_cache_locks.get(key)
+        if lock is None:
+            lock = self.async_cache_locks[key] = asyncio.Lock()
+        return lock
+
+    def _sync_lock(self, key: str) -> RLock:
+        lock = self._sync_cache_locks.get(key)
+        if lock is None:
+            lock = self._sync_cache_locks[key] = RLock()
+        return lock
+
+    def stats(self) -> dict[str, int]:
+        return {"async_cache_locks": len(self.async_cache_locks), "sync_cache_locks": len(self._sync_cache_locks)}
+
     async def set_cache(self, key: str, data: Any, lock: asyncio.Lock | None = None) -> bool:
         """Set the cache for a client.
 
@@ -34,11 +51,9 @@ class ChatService(Service):
             "type": type(data),
         }
         if isinstance(self.cache_service, AsyncBaseCacheService):
-            await self.cache_service.upsert(str(key), result_dict, lock=lock or self.async_cache_locks[key])
+            await self.cache_service.upsert(str(key), result_dict, lock=lock or self._async_lock(key))
             return await self.cache_service.contains(key)
-        await asyncio.to_thread(
-            self.cache_service.upsert, str(key), result_dict, lock=lock or self._sync_cache_locks[key]
-        )
+        await asyncio.to_thread(self.cache_service.upsert, str(key), result_dict, lock=lock or self._sync_lock(key))
         return key in self.cache_service
 
     async def get_cache(self, key: str, lock: asyncio.Lock | None = None) -> Any:
@@ -52,8 +67,8 @@ class ChatService(Service):
             Any: The cached data.
         """
         if isinstance(self.cache_service, AsyncBaseCacheService):
-            return await self.cache_service.get(key, lock=lock or self.async_cache_locks[key])
-        return await asyncio.to_thread(self.cache_service.get, key, lock=lock or self._sync_cache_locks[key])
+            return await self.cache_service.get(key, lock=lock or self._async_lock(key))
+        return await asyncio.to_thread(self.cache_service.get, key, lock=lock or self._sync_lock(key))
 
     async def clear_cache(self, key: str, lock: asyncio.Lock | None = None) -> None:
         """Clear the cache for a client.
@@ -63,5 +78,5 @@ class ChatService(Service):
             lock (Optional[asyncio.Lock], optional): The lock to use for the cache operation. Defaults to None.
         """
         if isinstance(self.cache_service, AsyncBaseCacheService):
-            return await self.cache_service.delete(key, lock=lock or self.async_cache_locks[key])
-        return await asyncio.to_thread(self.cache_service.delete, key, lock=lock or self._sync_cache_locks[key])
+            return await self.cache_service.delete(key, lock=lock or self._async_lock(key))
+        return await asyncio.to_thread(self.cache_service.delete, key, lock=lock or self._sync_lock(key))
@@ -2,6 +2,7 @@ from .api_key import ApiKey
 from .file import File
 from .flow import Flow
 from .folder import Folder
+from .job import Job
 from .message import MessageTable
 from .transactions import TransactionTable
 from .user import User
@@ -12,6 +13,7 @@ __all__ = [
     "File",
     "Flow",
     "Folder",
+    "Job",
     "MessageTable",
     "TransactionTable",
     "User",
@@ -10,7 +10,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from primeagent.services.database.models.api_key.model import ApiKey, ApiKeyCreate, ApiKeyRead, UnmaskedApiKeyRead
 from primeagent.services.database.models.user.model import User
-from primeagent.services.deps import get_settings_service
+from primeagent.services.deps import get_auth_service, get_settings_service
 
 if TYPE_CHECKING:
     from sqlmodel.sql.expression import SelectOfScalar
@@ -50,6 +50,7 @@ async def delete_api_key(session: AsyncSession, api_key_id: UUID, user_id: UUID)
         msg = "API Key not found"
         raise ValueError(msg)
     await session.delete(api_key)
+    get_auth_service().invalidate_api_key(api_key_id)
 
 
 async def check_key(session: AsyncSession, api_key: str) -> User | None:
@@ -76,11 +77,11 @@ async def _check_key_from_db(session: AsyncSession, api_key: str, settings_servi
     query: SelectOfScalar = select(ApiKey).options(selectinload(ApiKey.user)).where(ApiKey.api_key == api_key)
     api_key_object: ApiKey | None = (await session.exec(query)).first()
     if api_key_object is not None:
+        auth_service = get_auth_service()
         if settings_service.settings.disable_track_apikey_usage is not True:
-            api_key_object.total_uses += 1
-            api_key_object.last_used_at = datetime.datetime.now(datetime.timezone.utc)
-            session.add(api_key_object)
-            await session.flush()
+            # Counted in memory and written in batches, see AuthService
+            auth_service.record_api_key_use(api_key_object.id)
+        auth_service.cache_api_key_user(api_key, api_key_object.user, api_key_object.id)
         return api_key_object.user
     return None
 
@@ -105,5 +106,6 @@ async def _check_key_from_env(session: AsyncSession, api_key: str, settings_serv
     superuser_username = settings_service.auth_settings.SUPERUSER
     user = await get_user_by_username(session, superuser_username)
     if user and user.is_active:
+        get_auth_service().cache_api_key_user(api_key, user)
         return user
     return None
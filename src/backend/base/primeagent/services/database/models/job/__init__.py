@@ -0,0 +1,3 @@
+from .model import Job, JobKind, JobRead, JobStatus
+
+__all__ = ["Job", "JobKind", "JobRead", "JobStatus"]
@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+from enum import Enum
+from uuid import UUID, uuid4
+
+from pydantic import BaseModel, field_validator
+from sqlalchemy import Index
+from sqlmodel import JSON, Column, Field, SQLModel
+
+from primeagent.schema.serialize import UUIDstr
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    @property
+    def is_finished(self) -> bool:
+        return self in {JobStatus.SUCCEEDED, JobStatus.FAILED}
+
+
+class JobKind(str, Enum):
+    RUN = "run"
+    WEBHOOK = "webhook"
+
+
+class Job(SQLModel, table=True):  # type: ignore[call-arg]
+    """A flow run waiting in, or taken from, the job queue."""
+
+    __tablename__ = "job"
+
+    id: UUIDstr = Field(default_factory=uuid4, primary_key=True)
+    flow_id: UUID = Field(index=True)
+    user_id: UUID | None = Field(default=None, index=True)
+    kind: str = Field(default=JobKind.RUN.value)
+    payload: dict = Field(default_factory=dict, sa_column=Column(JSON))
+    status: str = Field(default=JobStatus.QUEUED.value)
+    attempts: int = Field(default=0)
+    max_attempts: int = Field(default=1)
+    available_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    lease_expires_at: datetime | None = Field(default=None)
+    worker_id: str | None = Field(default=None)
+    result: dict | None = Field(default=None, sa_column=Column(JSON))
+    error: str | None = Field(default=None)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: datetime | None = Field(default=None, index=True)
+
+    # Workers look for runs by status and time, see RunQueueService.lease
+    __table_args__ = (Index("ix_job_status_available_at", "status", "available_at"),)
+
+
+class JobRead(BaseModel):
+    id: UUID
+    flow_id: UUID
+    kind: JobKind
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    result: dict | None = None
+    error: str | None = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: datetime | None = None
+
+    @field_validator("created_at", "updated_at", "finished_at")
+    @classmethod
+    def validate_timezone(cls, value: datetime | None) -> datetime | None:
+        # SQLite drops the timezone of stored datetimes, which are all UTC
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
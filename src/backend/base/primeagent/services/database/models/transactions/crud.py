@@ -75,6 +75,47 @@ async def log_transaction(db: AsyncSession, transaction: TransactionBase) -> Tra
     return table
 
 
+async def log_transactions(db: AsyncSession, transactions: list[TransactionBase]) -> list[TransactionTable]:
+    """Log a batch of transactions and maintain a maximum number of transactions per flow.
+
+    All transactions are inserted at once, then the oldest transactions of each flow in the batch
+    are deleted so that no flow keeps more than the limit specified in the settings.
+
+    Args:
+        db: Database session
+        transactions: Transaction data to log
+
+    Returns:
+        The created TransactionTable entries
+    """
+    tables = [TransactionTable(**transaction.model_dump()) for transaction in transactions if transaction.flow_id]
+    if not tables:
+        return []
+
+    try:
+        max_entries = get_settings_service().settings.max_transactions_to_keep
+
+        db.add_all(tables)
+        await db.flush()
+        for flow_id in {table.flow_id for table in tables}:
+            delete_older = delete(TransactionTable).where(
+                TransactionTable.flow_id == flow_id,
+                col(TransactionTable.id).in_(
+                    select(TransactionTable.id)
+                    .where(TransactionTable.flow_id == flow_id)
+                    .order_by(col(TransactionTable.timestamp).desc())
+                    .offset(max_entries)
+                ),
+            )
+            await db.exec(delete_older)
+        await db.commit()
+
+    except Exception:
+        await db.rollback()
+        raise
+    return tables
+
+
 def transform_transaction_table(
     transaction: list[TransactionTable] | TransactionTable,
 ) -> list[TransactionReadResponse] | TransactionReadResponse:
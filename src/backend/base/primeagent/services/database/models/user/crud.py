@@ -9,6 +9,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from wfx.log.logger import logger
 
 from primeagent.services.database.models.user.model import User, UserUpdate
+from primeagent.services.deps import get_auth_service
 
 
 async def get_user_by_username(db: AsyncSession, username: str) -> User | None:
@@ -49,6 +50,7 @@ async def update_user(user_db: User | None, user: UserUpdate, db: AsyncSession)
     except IntegrityError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
 
+    get_auth_service().invalidate_user(user_db.id)
     return user_db
 
 
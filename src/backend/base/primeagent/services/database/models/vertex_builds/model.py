@@ -2,7 +2,7 @@ from datetime import datetime, timezone
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, field_serializer, field_validator
-from sqlalchemy import Text
+from sqlalchemy import Index, Text
 from sqlmodel import JSON, Column, Field, SQLModel
 
 from primeagent.serialization.serialization import get_max_items_length, get_max_text_length, serialize
@@ -67,6 +67,11 @@ class VertexBuildBase(SQLModel):
 
 class VertexBuildTable(VertexBuildBase, table=True):  # type: ignore[call-arg]
     __tablename__ = "vertex_build"
+    # Retention deletes are range deletes on the timestamp, globally and per vertex
+    __table_args__ = (
+        Index("ix_vertex_build_timestamp", "timestamp"),
+        Index("ix_vertex_build_flow_id_id_timestamp", "flow_id", "id", "timestamp"),
+    )
     build_id: UUID | None = Field(default_factory=uuid4, primary_key=True)
 
 
@@ -10,15 +10,19 @@ if TYPE_CHECKING:
 
     from sqlmodel.ext.asyncio.session import AsyncSession
 
+    from primeagent.services.auth.service import AuthService
     from primeagent.services.cache.service import AsyncBaseCacheService, CacheService
     from primeagent.services.chat.service import ChatService
     from primeagent.services.database.service import DatabaseService
+    from primeagent.services.run_queue.service import RunQueueService
     from primeagent.services.session.service import SessionService
     from primeagent.services.state.service import StateService
     from primeagent.services.store.service import StoreService
     from primeagent.services.task.service import TaskService
     from primeagent.services.tracing.service import TracingService
+    from primeagent.services.transaction.service import TransactionService
     from primeagent.services.variable.service import VariableService
+    from primeagent.services.vertex_build.service import VertexBuildService
 
 # These imports MUST be outside TYPE_CHECKING because FastAPI uses eval_str=True
 # to evaluate type annotations, and these types are used as return types for
@@ -244,3 +248,31 @@ def get_queue_service() -> JobQueueService:
     from primeagent.services.job_queue.factory import JobQueueServiceFactory
 
     return get_service(ServiceType.JOB_QUEUE_SERVICE, JobQueueServiceFactory())
+
+
+def get_run_queue_service() -> RunQueueService:
+    """Retrieves the RunQueueService instance from the service manager."""
+    from primeagent.services.run_queue.factory import RunQueueServiceFactory
+
+    return get_service(ServiceType.RUN_QUEUE_SERVICE, RunQueueServiceFactory())
+
+
+def get_vertex_build_service() -> VertexBuildService:
+    """Retrieves the VertexBuildService instance from the service manager."""
+    from primeagent.services.vertex_build.factory import VertexBuildServiceFactory
+
+    return get_service(ServiceType.VERTEX_BUILD_SERVICE, VertexBuildServiceFactory())
+
+
+def get_transaction_service() -> TransactionService:
+    """Retrieves the TransactionService instance from the service manager."""
+    from primeagent.services.transaction.factory import TransactionServiceFactory
+
+    return get_service(ServiceType.TRANSACTION_SERVICE, TransactionServiceFactory())
+
+
+def get_auth_service() -> AuthService:
+    """Retrieves the AuthService instance from the service manager."""
+    from primeagent.services.auth.factory import AuthServiceFactory
+
+    return get_service(ServiceType.AUTH_SERVICE, AuthServiceFactory())
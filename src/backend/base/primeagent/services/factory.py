@@ -76,8 +76,8 @@ def import_all_services_into_a_dict():
         try:
             service_name = ServiceType(service_type).value.replace("_service", "")
 
-            # Special handling for mcp_composer which is now in wfx module
-            if service_name == "mcp_composer":
+            # Special handling for services that live in the wfx module
+            if service_name in {"mcp_composer", "output_cache"}:
                 module_name = f"wfx.services.{service_name}.service"
             else:
                 module_name = f"primeagent.services.{service_name}.service"
@@ -15,9 +15,9 @@ from primeagent.load.utils import replace_tweaks_with_env
 from primeagent.processing.process import process_tweaks, run_graph
 from primeagent.services.auth.utils import get_password_hash
 from primeagent.services.cache.service import AsyncBaseCacheService
-from primeagent.services.database.models import Flow, User, Variable
+from primeagent.services.database.models import Flow, User
 from primeagent.services.database.utils import initialize_database
-from primeagent.services.deps import get_cache_service, get_storage_service, session_scope
+from primeagent.services.deps import get_cache_service, get_storage_service, get_variable_service, session_scope
 
 
 class PrimeagentRunnerExperimental:
@@ -231,7 +231,8 @@ class PrimeagentRunnerExperimental:
             flow_ids: list[UUID] = [fid for fid in flows.scalars().all() if fid is not None]
             for flow_id in flow_ids:
                 await cascade_delete_flow(session, flow_id)
-            await session.exec(delete(Variable).where(Variable.user_id == user_id))
+            # Through the service, so that this worker drops the user's cached variable values
+            await get_variable_service().delete_user_variables(user_id, session)
             await session.exec(delete(User).where(User.id == user_id))
 
     async def init_db_if_needed(self):
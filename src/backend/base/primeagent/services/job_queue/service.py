@@ -319,6 +319,7 @@ class JobQueueService(Service):
             ("on_error", "error"),
             ("on_end", "end"),
             ("on_message", "add_message"),
+            ("on_message_update", "message_update"),
             ("on_remove_message", "remove_message"),
             ("on_end_vertex", "end_vertex"),
             ("on_build_start", "build_start"),
@@ -0,0 +1,6 @@
+"""Run queue service module for primeagent."""
+
+from primeagent.services.run_queue.factory import RunQueueServiceFactory
+from primeagent.services.run_queue.service import RunQueueService
+
+__all__ = ["RunQueueService", "RunQueueServiceFactory"]
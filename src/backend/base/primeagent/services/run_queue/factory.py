@@ -0,0 +1,29 @@
+"""Run queue service factory for primeagent."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from primeagent.services.factory import ServiceFactory
+from primeagent.services.run_queue.service import RunQueueService
+
+if TYPE_CHECKING:
+    from wfx.services.settings.service import SettingsService
+
+
+class RunQueueServiceFactory(ServiceFactory):
+    """Factory for creating RunQueueService instances."""
+
+    def __init__(self):
+        super().__init__(RunQueueService)
+
+    def create(self, settings_service: SettingsService):
+        """Create a new RunQueueService instance.
+
+        Args:
+            settings_service: The settings service holding the worker, lease and retry limits.
+
+        Returns:
+            A new RunQueueService instance.
+        """
+        return RunQueueService(settings_service)
@@ -0,0 +1,411 @@
+"""A durable, database-backed queue of flow runs for primeagent."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import and_, or_
+from sqlmodel import col, delete, select, update
+from wfx.log.logger import logger
+from wfx.services.deps import session_scope
+
+from primeagent.services.base import Service
+from primeagent.services.database.models.flow.model import Flow
+from primeagent.services.database.models.job.model import Job, JobKind, JobStatus
+from primeagent.services.database.models.user.model import User
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from pydantic import BaseModel
+    from wfx.services.settings.service import SettingsService
+
+# Jobs a worker tries to take per lease, so workers racing for the same job move on to the next one
+LEASE_CANDIDATES = 10
+
+# The interval in seconds at which finished jobs past the retention time are deleted
+CLEANUP_INTERVAL = 600.0
+
+
+class JobError(Exception):
+    """A job failed in a way that retrying it cannot fix, e.g. its flow was deleted."""
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class RunQueueService(Service):
+    """Queues flow runs in the database and runs them in worker tasks.
+
+    Jobs survive restarts and are shared by every process using the same database, so runs can be taken by the
+    server itself (``job_queue_workers`` at once) or by separate ``primeagent worker`` processes. A worker leases a
+    job for ``job_queue_visibility_timeout`` seconds and renews the lease while the run is in progress; if the
+    worker dies, the lease expires and another worker runs the job again. Failed runs are retried with an
+    exponential backoff until ``job_queue_max_attempts`` is reached (``job_queue_webhook_max_attempts`` for
+    webhook runs), so a run may happen more than once. The request of a job is cleared once the job finishes.
+    """
+
+    name = "run_queue_service"
+
+    def __init__(self, settings_service: SettingsService):
+        """Initialize the run queue service.
+
+        Args:
+            settings_service: The settings service holding the worker, lease and retry limits.
+        """
+        super().__init__()
+        self.settings_service = settings_service
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._workers: list[asyncio.Task] = []
+        self._cleanup_task: asyncio.Task | None = None
+        # Created by start, on the loop the workers run on
+        self._wakeup: asyncio.Event | None = None
+        self._stopping = False
+
+    async def enqueue(
+        self,
+        flow_id: UUID,
+        input_request: BaseModel,
+        *,
+        user_id: UUID | None = None,
+        kind: JobKind = JobKind.RUN,
+    ) -> Job:
+        """Adds a run of ``flow_id`` to the queue.
+
+        The job is committed before this returns, so it is run even if the server restarts right after.
+        """
+        settings = self.settings_service.settings
+        job = Job(
+            flow_id=flow_id,
+            user_id=user_id,
+            kind=kind.value,
+            payload=input_request.model_dump(mode="json"),
+            max_attempts=(
+                settings.job_queue_webhook_max_attempts if kind == JobKind.WEBHOOK else settings.job_queue_max_attempts
+            ),
+        )
+        async with session_scope() as session:
+            session.add(job)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    async def get_job(self, job_id: UUID) -> Job | None:
+        async with session_scope() as session:
+            return await session.get(Job, job_id)
+
+    @staticmethod
+    def _leasable(now: datetime):
+        return or_(
+            and_(col(Job.status) == JobStatus.QUEUED.value, col(Job.available_at) <= now),
+            and_(col(Job.status) == JobStatus.RUNNING.value, col(Job.lease_expires_at) < now),
+        )
+
+    def _owned(self, job: Job):
+        # A job is only ours while no other worker (or a later lease of this one) has taken it
+        return and_(
+            col(Job.id) == job.id,
+            col(Job.status) == JobStatus.RUNNING.value,
+            col(Job.worker_id) == self.worker_id,
+            col(Job.attempts) == job.attempts,
+        )
+
+    async def lease(self) -> Job | None:
+        """Takes the next job that is due, or whose worker stopped renewing its lease.
+
+        Each candidate is claimed with a conditional update, so two workers never hold the same lease.
+
+        Returns:
+            The leased job, or None if no job is due.
+        """
+        now = _utcnow()
+        visibility_timeout = timedelta(seconds=self.settings_service.settings.job_queue_visibility_timeout)
+        async with session_scope() as session:
+            candidates = (
+                await session.exec(
+                    select(Job.id).where(self._leasable(now)).order_by(col(Job.available_at)).limit(LEASE_CANDIDATES)
+                )
+            ).all()
+            for job_id in candidates:
+                result = await session.exec(
+                    update(Job)
+                    .where(col(Job.id) == job_id, self._leasable(now), col(Job.attempts) < col(Job.max_attempts))
+                    .values(
+                        status=JobStatus.RUNNING.value,
+                        attempts=col(Job.attempts) + 1,
+                        lease_expires_at=now + visibility_timeout,
+                        worker_id=self.worker_id,
+                        updated_at=now,
+                    )
+                )
+                if result.rowcount == 1:
+                    return await session.get(Job, job_id)
+                # The worker running the job died on its last attempt, it is not run again
+                await session.exec(
+                    update(Job)
+                    .where(
+                        col(Job.id) == job_id,
+                        col(Job.status) == JobStatus.RUNNING.value,
+                        col(Job.lease_expires_at) < now,
+                        col(Job.attempts) >= col(Job.max_attempts),
+                    )
+                    .values(
+                        status=JobStatus.FAILED.value,
+                        payload={},
+                        error="The worker running the job stopped before it finished",
+                        lease_expires_at=None,
+                        worker_id=None,
+                        updated_at=now,
+                        finished_at=now,
+                    )
+                )
+        return None
+
+    async def heartbeat(self, job: Job) -> bool:
+        """Renews the lease on ``job``.
+
+        Returns:
+            False if the lease was lost, e.g. because it expired and another worker took the job.
+        """
+        now = _utcnow()
+        visibility_timeout = timedelta(seconds=self.settings_service.settings.job_queue_visibility_timeout)
+        return await self._update_owned(job, lease_expires_at=now + visibility_timeout, updated_at=now)
+
+    async def complete(self, job: Job, result: dict[str, Any] | None) -> bool:
+        """Marks ``job`` as succeeded with ``result``.
+
+        Returns:
+            False if the lease on the job was lost, in which case the result is discarded.
+        """
+        now = _utcnow()
+        return await self._update_owned(
+            job,
+            status=JobStatus.SUCCEEDED.value,
+            payload={},
+            result=result,
+            error=None,
+            lease_expires_at=None,
+            updated_at=now,
+            finished_at=now,
+        )
+
+    async def fail(self, job: Job, error: str, *, retry: bool = True) -> bool:
+        """Queues ``job`` to be retried after a backoff, or marks it as failed if it has no attempts left.
+
+        Returns:
+            False if the lease on the job was lost.
+        """
+        now = _utcnow()
+        if retry and job.attempts < job.max_attempts:
+            delay = self.settings_service.settings.job_queue_retry_delay * 2 ** (job.attempts - 1)
+            return await self._update_owned(
+                job,
+                status=JobStatus.QUEUED.value,
+                error=error,
+                available_at=now + timedelta(seconds=delay),
+                lease_expires_at=None,
+                worker_id=None,
+                updated_at=now,
+            )
+        return await self._update_owned(
+            job,
+            status=JobStatus.FAILED.value,
+            payload={},
+            error=error,
+            lease_expires_at=None,
+            updated_at=now,
+            finished_at=now,
+        )
+
+    async def release(self, job: Job) -> bool:
+        """Hands ``job`` back to the queue without using up an attempt, e.g. because the worker is stopping.
+
+        Returns:
+            False if the lease on the job was lost.
+        """
+        now = _utcnow()
+        return await self._update_owned(
+            job,
+            status=JobStatus.QUEUED.value,
+            attempts=job.attempts - 1,
+            available_at=now,
+            lease_expires_at=None,
+            worker_id=None,
+            updated_at=now,
+        )
+
+    async def _update_owned(self, job: Job, **values) -> bool:
+        async with session_scope() as session:
+            result = await session.exec(update(Job).where(self._owned(job)).values(**values))
+        return result.rowcount == 1
+
+    async def cleanup(self) -> int:
+        """Deletes the jobs that finished more than ``job_queue_retention`` seconds ago.
+
+        Returns:
+            The number of jobs deleted.
+        """
+        cutoff = _utcnow() - timedelta(seconds=self.settings_service.settings.job_queue_retention)
+        async with session_scope() as session:
+            result = await session.exec(delete(Job).where(col(Job.finished_at) < cutoff))
+        deleted = result.rowcount or 0
+        if deleted:
+            await logger.adebug(f"Deleted {deleted} finished jobs")
+        return deleted
+
+    async def run_job(self, job: Job) -> dict[str, Any]:
+        """Runs the flow of ``job`` and returns the JSON-encoded run response.
+
+        Raises:
+            JobError: If the flow or the user of the job no longer exists.
+        """
+        # Imported here as the API modules depend on the services
+        from primeagent.api.v1.endpoints import simple_run_flow
+        from primeagent.api.v1.schemas import SimplifiedAPIRequest
+
+        async with session_scope() as session:
+            flow = await session.get(Flow, job.flow_id)
+            user = await session.get(User, job.user_id) if job.user_id else None
+        if flow is None:
+            msg = f"Flow {job.flow_id} not found"
+            raise JobError(msg)
+        if job.user_id and user is None:
+            msg = f"User {job.user_id} not found"
+            raise JobError(msg)
+        result = await simple_run_flow(
+            flow=flow,
+            input_request=SimplifiedAPIRequest.model_validate(job.payload),
+            api_key_user=user,
+            run_id=str(job.id),
+        )
+        return jsonable_encoder(result)
+
+    async def process(self, job: Job) -> None:
+        """Runs a leased job, renewing its lease until the run ends, and records the outcome."""
+        start_time = time.perf_counter()
+        run_task = asyncio.create_task(self.run_job(job))
+        lease_lost = False
+
+        async def keep_leased() -> None:
+            nonlocal lease_lost
+            while True:
+                await asyncio.sleep(self.settings_service.settings.job_queue_visibility_timeout / 3)
+                try:
+                    renewed = await self.heartbeat(job)
+                except Exception as exc:  # noqa: BLE001
+                    await logger.awarning(f"Error renewing the lease on job {job.id}: {exc!s}")
+                    continue
+                if not renewed:
+                    lease_lost = True
+                    run_task.cancel()
+                    return
+
+        heartbeat_task = asyncio.create_task(keep_leased())
+        try:
+            result = await run_task
+        except asyncio.CancelledError:
+            if not lease_lost:
+                run_task.cancel()
+                # Wait for the run to stop, so the job is not run by another worker while it is still running here
+                await asyncio.gather(run_task, return_exceptions=True)
+                await self.release(job)
+                raise
+            await logger.awarning(f"Lost the lease on job {job.id}, stopped running it")
+            return
+        except Exception as exc:  # noqa: BLE001
+            await logger.aexception(f"Error running job {job.id} of flow {job.flow_id}")
+            error = str(exc) or type(exc).__name__
+            await self.fail(job, error, retry=not isinstance(exc, JobError))
+            await self._log_telemetry(job, start_time, error)
+        else:
+            await self.complete(job, result)
+            await self._log_telemetry(job, start_time)
+        finally:
+            heartbeat_task.cancel()
+
+    async def _log_telemetry(self, job: Job, start_time: float, error: str | None = None) -> None:
+        from primeagent.services.deps import get_telemetry_service
+        from primeagent.services.telemetry.schema import RunPayload
+
+        await get_telemetry_service().log_package_run(
+            RunPayload(
+                run_is_webhook=job.kind == JobKind.WEBHOOK.value,
+                run_seconds=int(time.perf_counter() - start_time),
+                run_success=error is None,
+                run_error_message=error or "",
+                run_id=str(job.id),
+            )
+        )
+
+    async def work(self) -> None:
+        """Leases and runs jobs one at a time until the service is torn down."""
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        while not self._stopping:
+            try:
+                job = await self.lease()
+            except Exception as exc:  # noqa: BLE001
+                await logger.aerror(f"Error leasing a job: {exc!s}")
+                job = None
+            if job is None:
+                self._wakeup.clear()
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), timeout=self.settings_service.settings.job_queue_poll_interval
+                    )
+                continue
+            try:
+                await self.process(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                # The outcome could not be recorded, the lease expires and the job is run again
+                await logger.aerror(f"Error recording the outcome of job {job.id}: {exc!s}")
+
+    async def _cleanup_worker(self) -> None:
+        while not self._stopping:
+            try:
+                await self.cleanup()
+            except Exception as exc:  # noqa: BLE001
+                await logger.aerror(f"Error deleting finished jobs: {exc!s}")
+            await asyncio.sleep(CLEANUP_INTERVAL)
+
+    def start(self, concurrency: int | None = None) -> None:
+        """Starts the worker tasks on the running event loop.
+
+        Args:
+            concurrency: The number of jobs to run at once. Defaults to ``job_queue_workers``; with 0, no jobs
+                are run by this process.
+        """
+        if concurrency is None:
+            concurrency = self.settings_service.settings.job_queue_workers
+        if self.is_started() or concurrency == 0:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        self._workers = [loop.create_task(self.work()) for _ in range(concurrency)]
+        self._cleanup_task = loop.create_task(self._cleanup_worker())
+
+    def is_started(self) -> bool:
+        return any(not task.done() for task in self._workers)
+
+    async def teardown(self) -> None:
+        self._stopping = True
+        tasks = [task for task in [*self._workers, self._cleanup_task] if task is not None and not task.done()]
+        for task in tasks:
+            task.cancel()
+        running_tasks = [task for task in tasks if task.get_loop() is asyncio.get_running_loop()]
+        # Workers hand their jobs back to the queue as they are cancelled
+        await asyncio.gather(*running_tasks, return_exceptions=True)
+        self._workers = []
+        self._cleanup_task = None
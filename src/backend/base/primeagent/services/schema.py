@@ -7,6 +7,7 @@ class ServiceType(str, Enum):
     AUTH_SERVICE = "auth_service"
     CACHE_SERVICE = "cache_service"
     SHARED_COMPONENT_CACHE_SERVICE = "shared_component_cache_service"
+    OUTPUT_CACHE_SERVICE = "output_cache_service"
     SETTINGS_SERVICE = "settings_service"
     DATABASE_SERVICE = "database_service"
     CHAT_SERVICE = "chat_service"
@@ -19,4 +20,7 @@ class ServiceType(str, Enum):
     TRACING_SERVICE = "tracing_service"
     TELEMETRY_SERVICE = "telemetry_service"
     JOB_QUEUE_SERVICE = "job_queue_service"
+    RUN_QUEUE_SERVICE = "run_queue_service"
     MCP_COMPOSER_SERVICE = "mcp_composer_service"
+    VERTEX_BUILD_SERVICE = "vertex_build_service"
+    TRANSACTION_SERVICE = "transaction_service"
@@ -1,4 +1,5 @@
-from collections import defaultdict
+import time
+from collections import OrderedDict
 from collections.abc import Callable
 from threading import Lock
 
@@ -20,7 +21,7 @@ class StateService(Service):
     def get_state(self, key, run_id: str):
         raise NotImplementedError
 
-    def subscribe(self, key, observer: Callable) -> None:
+    def subscribe(self, key, observer: Callable, run_id: str | None = None) -> None:
         raise NotImplementedError
 
     def unsubscribe(self, key, observer: Callable) -> None:
@@ -29,47 +30,120 @@ class StateService(Service):
     def notify_observers(self, key, new_state) -> None:
         raise NotImplementedError
 
+    def release_run(self, run_id: str) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        raise NotImplementedError
+
 
 class InMemoryStateService(StateService):
+    """Keeps the state of each run in memory until the run is released or evicted.
+
+    A run's state and the observers subscribed for it are dropped by :meth:`release_run` when the graph
+    run ends. Runs that are never released are evicted once unused for ``state_ttl`` seconds, or, least
+    recently used first, when more than ``state_max_runs`` runs are held.
+    """
+
     def __init__(self, settings_service: SettingsService):
         self.settings_service = settings_service
-        self.states: dict[str, dict] = {}
-        self.observers: dict[str, list[Callable]] = defaultdict(list)
+        self.ttl = settings_service.settings.state_ttl
+        self.max_runs = settings_service.settings.state_max_runs
+        # Ordered from least to most recently used
+        self.states: OrderedDict[str, dict] = OrderedDict()
+        self._last_used: dict[str, float] = {}
+        self.observers: dict[str, list[Callable]] = {}
+        self._run_observers: dict[str, list[tuple[str, Callable]]] = {}
+        self.released_runs = 0
+        self.evicted_runs = 0
         self.lock = Lock()
 
+    def _run_state(self, run_id: str) -> dict:
+        """Returns the state of a run, creating it, and marks the run as recently used."""
+        if run_id in self.states:
+            self.states.move_to_end(run_id)
+        else:
+            self.states[run_id] = {}
+        self._last_used[run_id] = time.monotonic()
+        self._evict()
+        return self.states[run_id]
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        while self.states:
+            oldest = next(iter(self.states))
+            if len(self.states) <= self.max_runs and now - self._last_used[oldest] < self.ttl:
+                break
+            self._drop_run(oldest)
+            self.evicted_runs += 1
+
+    def _drop_run(self, run_id: str) -> bool:
+        found = self.states.pop(run_id, None) is not None
+        self._last_used.pop(run_id, None)
+        for key, observer in self._run_observers.pop(run_id, []):
+            self._remove_observer(key, observer)
+        return found
+
     def append_state(self, key, new_state, run_id: str) -> None:
         with self.lock:
-            if run_id not in self.states:
-                self.states[run_id] = {}
-            if key not in self.states[run_id]:
-                self.states[run_id][key] = []
-            elif not isinstance(self.states[run_id][key], list):
-                self.states[run_id][key] = [self.states[run_id][key]]
-            self.states[run_id][key].append(new_state)
+            state = self._run_state(run_id)
+            if key not in state:
+                state[key] = []
+            elif not isinstance(state[key], list):
+                state[key] = [state[key]]
+            state[key].append(new_state)
             self.notify_append_observers(key, new_state)
 
     def update_state(self, key, new_state, run_id: str) -> None:
         with self.lock:
-            if run_id not in self.states:
-                self.states[run_id] = {}
-            self.states[run_id][key] = new_state
+            self._run_state(run_id)[key] = new_state
             self.notify_observers(key, new_state)
 
     def get_state(self, key, run_id: str):
         with self.lock:
-            return self.states.get(run_id, {}).get(key, "")
+            self._evict()
+            if run_id not in self.states:
+                return ""
+            return self._run_state(run_id).get(key, "")
+
+    def subscribe(self, key, observer: Callable, run_id: str | None = None) -> None:
+        """Subscribes an observer to changes of a key.
+
+        Observers subscribed with a ``run_id`` are unsubscribed when that run is released or evicted.
+        """
+        with self.lock:
+            observers = self.observers.setdefault(key, [])
+            if observer not in observers:
+                observers.append(observer)
+                if run_id is not None:
+                    # Tracking the run lets eviction drop its observers if it is never released
+                    self._run_state(run_id)
+                    self._run_observers.setdefault(run_id, []).append((key, observer))
+
+    def release_run(self, run_id: str) -> None:
+        """Drops the state of a run that ended and the observers subscribed for it."""
+        with self.lock:
+            if self._drop_run(run_id):
+                self.released_runs += 1
 
-    def subscribe(self, key, observer: Callable) -> None:
+    def stats(self) -> dict:
         with self.lock:
-            if observer not in self.observers[key]:
-                self.observers[key].append(observer)
+            return {
+                "runs": len(self.states),
+                "keys": sum(len(state) for state in self.states.values()),
+                "observers": sum(len(observers) for observers in self.observers.values()),
+                "max_runs": self.max_runs,
+                "ttl": self.ttl,
+                "released_runs": self.released_runs,
+                "evicted_runs": self.evicted_runs,
+            }
 
     def notify_observers(self, key, new_state) -> None:
-        for callback in self.observers[key]:
+        for callback in self.observers.get(key, []):
             callback(key, new_state, append=False)
 
     def notify_append_observers(self, key, new_state) -> None:
-        for callback in self.observers[key]:
+        for callback in self.observers.get(key, []):
             try:
                 callback(key, new_state, append=True)
             except Exception:  # noqa: BLE001
@@ -78,6 +152,12 @@ class InMemoryStateService(StateService):
 
     def unsubscribe(self, key, observer: Callable) -> None:
         with self.lock:
-            if observer in self.observers[key]:
-                # Use list.remove() since observers[key] is a list
-                self.observers[key].remove(observer)
+            self._remove_observer(key, observer)
+
+    def _remove_observer(self, key, observer: Callable) -> None:
+        observers = self.observers.get(key)
+        if observers and observer in observers:
+            observers.remove(observer)
+        if not observers:
+            # Drop empty lists so keys that are no longer observed do not accumulate
+            self.observers.pop(key, None)
@@ -2,16 +2,19 @@
 
 from __future__ import annotations
 
+import contextlib
 from pathlib import Path
 from typing import TYPE_CHECKING
+from uuid import uuid4
 
 from aiofile import async_open
 
 from primeagent.logging.logger import logger
 from primeagent.services.storage.service import StorageService
+from primeagent.utils.zip_stream import iter_bytes
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator
+    from collections.abc import AsyncIterable, AsyncIterator
 
     from primeagent.services.session.service import SessionService
     from primeagent.services.settings.service import SettingsService
@@ -19,6 +22,9 @@ if TYPE_CHECKING:
 # Constants for path parsing
 EXPECTED_PATH_PARTS = 2  # Path format: "flow_id/filename"
 
+# Files are written under a hidden name ending in this, then renamed into place
+PARTIAL_SUFFIX = ".partial"
+
 
 class LocalStorageService(StorageService):
     """A service class for handling local file storage operations."""
@@ -106,6 +112,27 @@ class LocalStorageService(StorageService):
             data: The byte content of the file.
             append: If True, append to existing file; if False, overwrite.
 
+        Raises:
+            FileNotFoundError: If the specified flow does not exist.
+            IsADirectoryError: If the file name is a directory.
+            PermissionError: If there is no permission to write the file.
+        """
+        await self.save_file_stream(flow_id, file_name, iter_bytes(data), append=append)
+
+    async def save_file_stream(
+        self, flow_id: str, file_name: str, chunks: AsyncIterable[bytes], *, append: bool = False
+    ) -> None:
+        """Save a file in the local storage from a stream of chunks.
+
+        Unless appending, the chunks are written to a temporary file next to the file, which is then renamed over
+        it. Readers see either the old file or the whole new one, never a partly written file.
+
+        Args:
+            flow_id: The identifier for the flow.
+            file_name: The name of the file to be saved.
+            chunks: The byte content of the file, in chunks.
+            append: If True, append to existing file; if False, overwrite.
+
         Raises:
             FileNotFoundError: If the specified flow does not exist.
             IsADirectoryError: If the file name is a directory.
@@ -114,15 +141,22 @@ class LocalStorageService(StorageService):
         folder_path = self.data_dir / flow_id
         await folder_path.mkdir(parents=True, exist_ok=True)
         file_path = folder_path / file_name
+        write_path = file_path if append else file_path.with_name(f".{file_path.name}.{uuid4().hex}{PARTIAL_SUFFIX}")
 
         try:
             mode = "ab" if append else "wb"
-            async with async_open(str(file_path), mode) as f:
-                await f.write(data)
+            async with async_open(str(write_path), mode) as f:
+                async for chunk in chunks:
+                    await f.write(chunk)
+            if not append:
+                await write_path.replace(file_path)
             action = "appended to" if append else "saved"
             await logger.ainfo(f"File {file_name} {action} successfully in flow {flow_id}.")
         except Exception:
             logger.exception(f"Error saving file {file_name} in flow {flow_id}")
+            if not append:
+                with contextlib.suppress(OSError):
+                    await write_path.unlink(missing_ok=True)
             raise
 
     async def get_file(self, flow_id: str, file_name: str) -> bytes:
@@ -183,7 +217,9 @@ class LocalStorageService(StorageService):
             return []
 
         try:
-            files = [p.name async for p in folder_path.iterdir() if await p.is_file()]
+            files = [
+                p.name async for p in folder_path.iterdir() if not p.name.endswith(PARTIAL_SUFFIX) and await p.is_file()
+            ]
         except Exception:  # noqa: BLE001
             logger.exception(f"Error listing files in flow {flow_id}")
             return []
@@ -6,16 +6,18 @@ file upload, download, deletion, and listing operations.
 
 from __future__ import annotations
 
+import asyncio
 import contextlib
 import os
 from typing import TYPE_CHECKING, Any
 
 from primeagent.logging.logger import logger
+from primeagent.utils.zip_stream import iter_bytes
 
 from .service import StorageService
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator
+    from collections.abc import AsyncIterable, AsyncIterator
 
     from primeagent.services.session.service import SessionService
     from primeagent.services.settings.service import SettingsService
@@ -49,15 +51,23 @@ class S3StorageService(StorageService):
 
         self.tags = settings_service.settings.object_storage_tags or {}
 
+        self.part_size = settings_service.settings.object_storage_part_size
+
         try:
             import aioboto3
+            from aiobotocore.config import AioConfig
         except ImportError as exc:
             msg = "aioboto3 is required for S3 storage. Install it with: uv pip install aioboto3"
             raise ImportError(msg) from exc
 
         # Create session - AWS credentials are picked up from environment variables
         self.session = aioboto3.Session()
+        self._client_config = AioConfig(
+            max_pool_connections=settings_service.settings.object_storage_max_pool_connections
+        )
         self._client = None
+        self._client_context = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
 
         self.set_ready()
         logger.info(
@@ -122,9 +132,29 @@ class S3StorageService(StorageService):
         """
         return logical_path
 
-    def _get_client(self):
-        """Get or create an S3 client using the async context manager."""
-        return self.session.client("s3")
+    @contextlib.asynccontextmanager
+    async def _get_client(self):
+        """Yield the S3 client, creating it on first use.
+
+        The client is shared by every call, so its pool of connections stays open between them. A client can only
+        be used on the event loop it was created on, so another is created if the loop changes.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            context = self.session.client("s3", config=self._client_config)
+            client = await context.__aenter__()
+            # Another call may have created a client while this one was being created
+            if self._client is None or self._client_loop is not loop:
+                self._client, self._client_context, self._client_loop = client, context, loop
+            else:
+                await context.__aexit__(None, None, None)
+        yield self._client
+
+    def _object_params(self, key: str) -> dict[str, Any]:
+        params: dict[str, Any] = {"Bucket": self.bucket_name, "Key": key}
+        if self.tags:
+            params["Tagging"] = "&".join([f"{k}={v}" for k, v in self.tags.items()])
+        return params
 
     async def save_file(self, flow_id: str, file_name: str, data: bytes, *, append: bool = False) -> None:
         """Save a file to S3.
@@ -135,6 +165,26 @@ class S3StorageService(StorageService):
             data: The byte content of the file
             append: If True, append to existing file (not supported in S3, will raise error)
 
+        Raises:
+            Exception: If the file cannot be saved to S3
+            NotImplementedError: If append=True (not supported in S3)
+        """
+        await self.save_file_stream(flow_id, file_name, iter_bytes(data), append=append)
+
+    async def save_file_stream(
+        self, flow_id: str, file_name: str, chunks: AsyncIterable[bytes], *, append: bool = False
+    ) -> None:
+        """Save a file to S3 from a stream of chunks.
+
+        Files larger than the configured part size are sent as a multipart upload, one part at a time, so at
+        most one part is held in memory. Smaller files are sent in a single request.
+
+        Args:
+            flow_id: The flow/user identifier for namespacing
+            file_name: The name of the file to be saved
+            chunks: The byte content of the file, in chunks
+            append: If True, append to existing file (not supported in S3, will raise error)
+
         Raises:
             Exception: If the file cannot be saved to S3
             NotImplementedError: If append=True (not supported in S3)
@@ -147,17 +197,7 @@ class S3StorageService(StorageService):
 
         try:
             async with self._get_client() as s3_client:
-                put_params: dict[str, Any] = {
-                    "Bucket": self.bucket_name,
-                    "Key": key,
-                    "Body": data,
-                }
-
-                if self.tags:
-                    tag_string = "&".join([f"{k}={v}" for k, v in self.tags.items()])
-                    put_params["Tagging"] = tag_string
-
-                await s3_client.put_object(**put_params)
+                await self._upload(s3_client, key, chunks)
 
             await logger.ainfo(f"File {file_name} saved successfully to S3: s3://{self.bucket_name}/{key}")
 
@@ -184,6 +224,42 @@ class S3StorageService(StorageService):
             msg = f"Failed to save file to S3: {error_msg}"
             raise RuntimeError(msg) from e
 
+    async def _upload(self, s3_client, key: str, chunks: AsyncIterable[bytes]) -> None:
+        buffer = bytearray()
+        upload_id = None
+        parts: list[dict[str, Any]] = []
+
+        async def upload_part() -> None:
+            response = await s3_client.upload_part(
+                Bucket=self.bucket_name, Key=key, UploadId=upload_id, PartNumber=len(parts) + 1, Body=bytes(buffer)
+            )
+            parts.append({"PartNumber": len(parts) + 1, "ETag": response["ETag"]})
+            buffer.clear()
+
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                if len(buffer) >= self.part_size:
+                    if upload_id is None:
+                        upload_id = (await s3_client.create_multipart_upload(**self._object_params(key)))["UploadId"]
+                    await upload_part()
+
+            if upload_id is None:
+                await s3_client.put_object(**self._object_params(key), Body=bytes(buffer))
+                return
+
+            if buffer:
+                await upload_part()
+            await s3_client.complete_multipart_upload(
+                Bucket=self.bucket_name, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+            )
+        except BaseException:
+            # Parts of an upload that is never completed are stored, and billed, until it is aborted
+            if upload_id is not None:
+                with contextlib.suppress(Exception):
+                    await s3_client.abort_multipart_upload(Bucket=self.bucket_name, Key=key, UploadId=upload_id)
+            raise
+
     async def get_file(self, flow_id: str, file_name: str) -> bytes:
         """Retrieve a file from S3.
 
@@ -347,7 +423,12 @@ class S3StorageService(StorageService):
     async def teardown(self) -> None:
         """Perform any cleanup operations when the service is being torn down.
 
-        For S3, we don't need to do anything as aioboto3 handles cleanup
-        via context managers.
+        Closes the shared S3 client and its connections.
         """
+        context, loop = self._client_context, self._client_loop
+        self._client = self._client_context = self._client_loop = None
+        # A client left on another event loop cannot be closed from this one
+        if context is not None and loop is asyncio.get_running_loop():
+            with contextlib.suppress(Exception):
+                await context.__aexit__(None, None, None)
         logger.info("S3 storage service teardown complete")
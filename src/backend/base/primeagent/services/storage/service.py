@@ -10,7 +10,7 @@ import anyio
 from primeagent.services.base import Service
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator
+    from collections.abc import AsyncIterable, AsyncIterator
 
     from primeagent.services.session.service import SessionService
     from primeagent.services.settings.service import SettingsService
@@ -53,6 +53,22 @@ class StorageService(Service):
     async def save_file(self, flow_id: str, file_name: str, data: bytes, *, append: bool = False) -> None:
         raise NotImplementedError
 
+    async def save_file_stream(
+        self, flow_id: str, file_name: str, chunks: AsyncIterable[bytes], *, append: bool = False
+    ) -> None:
+        """Save a file from a stream of chunks.
+
+        Storage backends override this to write the file without holding all of it in memory. By default the
+        chunks are joined and saved with :meth:`save_file`.
+
+        Args:
+            flow_id: The flow/user identifier for namespacing
+            file_name: The name of the file to be saved
+            chunks: The byte content of the file, in chunks
+            append: If True, append to existing file; if False, overwrite.
+        """
+        await self.save_file(flow_id, file_name, b"".join([chunk async for chunk in chunks]), append=append)
+
     @abstractmethod
     async def get_file(self, flow_id: str, file_name: str) -> bytes:
         raise NotImplementedError
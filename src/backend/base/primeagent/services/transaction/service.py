@@ -10,8 +10,9 @@ from wfx.services.deps import session_scope
 from wfx.services.interfaces import TransactionServiceProtocol
 
 from primeagent.services.base import Service
-from primeagent.services.database.models.transactions.crud import log_transaction as crud_log_transaction
+from primeagent.services.database.models.transactions.crud import log_transactions as crud_log_transactions
 from primeagent.services.database.models.transactions.model import TransactionBase
+from primeagent.services.write_behind import WriteBehindBuffer
 
 if TYPE_CHECKING:
     from primeagent.services.settings.service import SettingsService
@@ -22,6 +23,11 @@ class TransactionService(Service, TransactionServiceProtocol):
 
     This service handles logging of component execution transactions to the database,
     tracking inputs, outputs, and status of each vertex build.
+
+    Transactions are queued in memory and written in bulk by a background task once
+    ``transactions_batch_size`` transactions are pending or every ``transactions_flush_interval`` seconds.
+    When ``transactions_queue_size`` transactions are pending, ``transactions_overflow_policy`` decides
+    whether new transactions are dropped or the caller waits for the next write.
     """
 
     name = "transaction_service"
@@ -33,6 +39,15 @@ class TransactionService(Service, TransactionServiceProtocol):
             settings_service: The settings service for checking if transactions are enabled.
         """
         self.settings_service = settings_service
+        settings = settings_service.settings
+        self.buffer: WriteBehindBuffer[TransactionBase] = WriteBehindBuffer(
+            "transaction",
+            self._write_transactions,
+            batch_size=settings.transactions_batch_size,
+            flush_interval=settings.transactions_flush_interval,
+            max_size=settings.transactions_queue_size,
+            overflow_policy=settings.transactions_overflow_policy,
+        )
 
     async def log_transaction(
         self,
@@ -71,12 +86,36 @@ class TransactionService(Service, TransactionServiceProtocol):
                 flow_id=flow_uuid,
             )
 
-            async with session_scope() as session:
-                await crud_log_transaction(session, transaction)
+            if not await self.buffer.put(transaction):
+                logger.debug("Transaction queue is full, dropping the transaction")
 
         except Exception as exc:  # noqa: BLE001
             logger.debug(f"Error logging transaction: {exc!s}")
 
+    @staticmethod
+    async def _write_transactions(transactions: list[TransactionBase]) -> None:
+        async with session_scope() as session:
+            await crud_log_transactions(session, transactions)
+
+    async def flush(self) -> int:
+        """Write every queued transaction to the database.
+
+        Returns:
+            The number of transactions written.
+        """
+        return await self.buffer.flush()
+
+    def discard_flow(self, flow_id: UUID) -> None:
+        """Drop the queued transactions of a flow, e.g. because the flow is being deleted."""
+        self.buffer.discard(lambda transaction: transaction.flow_id == flow_id)
+
+    def stats(self) -> dict[str, int]:
+        """Return the queue depth and the number of written and dropped transactions."""
+        return self.buffer.stats()
+
+    async def teardown(self) -> None:
+        await self.buffer.close()
+
     def is_enabled(self) -> bool:
         """Check if transaction logging is enabled.
 
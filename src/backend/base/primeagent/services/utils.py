@@ -224,6 +224,7 @@ def register_all_service_factories() -> None:
 
     service_manager = get_service_manager()
     from wfx.services.mcp_composer import factory as mcp_composer_factory
+    from wfx.services.output_cache import factory as output_cache_factory
     from wfx.services.settings import factory as settings_factory
 
     from primeagent.services.auth import factory as auth_factory
@@ -231,6 +232,7 @@ def register_all_service_factories() -> None:
     from primeagent.services.chat import factory as chat_factory
     from primeagent.services.database import factory as database_factory
     from primeagent.services.job_queue import factory as job_queue_factory
+    from primeagent.services.run_queue import factory as run_queue_factory
     from primeagent.services.session import factory as session_factory
     from primeagent.services.shared_component_cache import factory as shared_component_cache_factory
     from primeagent.services.state import factory as state_factory
@@ -241,6 +243,7 @@ def register_all_service_factories() -> None:
     from primeagent.services.tracing import factory as tracing_factory
     from primeagent.services.transaction import factory as transaction_factory
     from primeagent.services.variable import factory as variable_factory
+    from primeagent.services.vertex_build import factory as vertex_build_factory
 
     # Register all factories
     service_manager.register_factory(settings_factory.SettingsServiceFactory())
@@ -253,13 +256,16 @@ def register_all_service_factories() -> None:
     service_manager.register_factory(telemetry_factory.TelemetryServiceFactory())
     service_manager.register_factory(tracing_factory.TracingServiceFactory())
     service_manager.register_factory(transaction_factory.TransactionServiceFactory())
+    service_manager.register_factory(vertex_build_factory.VertexBuildServiceFactory())
     service_manager.register_factory(state_factory.StateServiceFactory())
     service_manager.register_factory(job_queue_factory.JobQueueServiceFactory())
+    service_manager.register_factory(run_queue_factory.RunQueueServiceFactory())
     service_manager.register_factory(task_factory.TaskServiceFactory())
     service_manager.register_factory(store_factory.StoreServiceFactory())
     service_manager.register_factory(shared_component_cache_factory.SharedComponentCacheServiceFactory())
     service_manager.register_factory(auth_factory.AuthServiceFactory())
     service_manager.register_factory(mcp_composer_factory.MCPComposerServiceFactory())
+    service_manager.register_factory(output_cache_factory.OutputCacheServiceFactory())
     service_manager.set_factory_registered()
 
 
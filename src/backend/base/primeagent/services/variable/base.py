@@ -1,6 +1,7 @@
 import abc
 from uuid import UUID
 
+from sqlmodel import delete
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from primeagent.services.base import Service
@@ -35,6 +36,16 @@ class VariableService(Service):
             The value of the variable.
         """
 
+    async def prefetch_variables(self, user_id: UUID | str, names: set[str], session: AsyncSession) -> None:  # noqa: ARG002
+        """Load several variables at once so that the following get_variable calls for them are cheap.
+
+        Args:
+            user_id: The user ID.
+            names: The names of the variables.
+            session: The database session.
+        """
+        return
+
     @abc.abstractmethod
     async def list_variables(self, user_id: UUID | str, session: AsyncSession) -> list[str | None]:
         """List all variables.
@@ -74,6 +85,15 @@ class VariableService(Service):
             The deleted variable.
         """
 
+    async def delete_user_variables(self, user_id: UUID | str, session: AsyncSession) -> None:
+        """Delete all the variables of a user.
+
+        Args:
+            user_id: The user ID.
+            session: The database session.
+        """
+        await session.exec(delete(Variable).where(Variable.user_id == user_id))
+
     @abc.abstractmethod
     async def delete_variable_by_id(self, user_id: UUID | str, variable_id: UUID, session: AsyncSession) -> None:
         """Delete a variable by ID.
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import os
+import time
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
-from sqlmodel import select
+from sqlmodel import col, select
 from wfx.log.logger import logger
 
 from primeagent.services.auth import utils as auth_utils
@@ -24,6 +25,27 @@ if TYPE_CHECKING:
 class DatabaseVariableService(VariableService, Service):
     def __init__(self, settings_service: SettingsService):
         self.settings_service = settings_service
+        # Decrypted values by (user id, name), with their type and expiry; never persisted
+        self._decrypted: dict[tuple[str, str], tuple[float, str | None, str]] = {}
+
+    def _get_decrypted(self, user_id: UUID | str, name: str) -> tuple[str | None, str] | None:
+        entry = self._decrypted.get((str(user_id), name))
+        if entry is None:
+            return None
+        expires_at, type_, value = entry
+        if time.monotonic() >= expires_at:
+            self._decrypted.pop((str(user_id), name), None)
+            return None
+        return type_, value
+
+    def _set_decrypted(self, user_id: UUID | str, name: str, type_: str | None, value: str) -> None:
+        ttl = self.settings_service.settings.variable_cache_ttl
+        if ttl > 0:
+            self._decrypted[str(user_id), name] = (time.monotonic() + ttl, type_, value)
+
+    def _invalidate(self, user_id: UUID | str, *names: str) -> None:
+        for name in names:
+            self._decrypted.pop((str(user_id), name), None)
 
     async def initialize_user_variables(self, user_id: UUID | str, session: AsyncSession) -> None:
         if not self.settings_service.settings.store_environment_variables:
@@ -165,19 +187,40 @@ class DatabaseVariableService(VariableService, Service):
         field: str,
         session: AsyncSession,
     ) -> str:
-        # we get the credential from the database
-        # credential = session.query(Variable).filter(Variable.user_id == user_id, Variable.name == name).first()
-        variable = await self.get_variable_object(user_id, name, session)
-
-        if variable.type == CREDENTIAL_TYPE and field == "session_id":
+        if cached := self._get_decrypted(user_id, name):
+            type_, value = cached
+        else:
+            # we get the credential from the database
+            variable = await self.get_variable_object(user_id, name, session)
+            type_ = variable.type
+            # we decrypt the value
+            value = auth_utils.decrypt_api_key(variable.value, settings_service=self.settings_service)
+            self._set_decrypted(user_id, name, type_, value)
+
+        if type_ == CREDENTIAL_TYPE and field == "session_id":
             msg = (
                 f"variable {name} of type 'Credential' cannot be used in a Session ID field "
                 "because its purpose is to prevent the exposure of values."
             )
             raise TypeError(msg)
 
-        # we decrypt the value
-        return auth_utils.decrypt_api_key(variable.value, settings_service=self.settings_service)
+        return value
+
+    async def prefetch_variables(self, user_id: UUID | str, names: set[str], session: AsyncSession) -> None:
+        missing = {name for name in names if self._get_decrypted(user_id, name) is None}
+        if not missing or self.settings_service.settings.variable_cache_ttl <= 0:
+            return
+        stmt = select(Variable).where(Variable.user_id == user_id, col(Variable.name).in_(missing))
+        for variable in (await session.exec(stmt)).all():
+            if not variable.value:
+                continue
+            try:
+                value = auth_utils.decrypt_api_key(variable.value, settings_service=self.settings_service)
+            except Exception as e:  # noqa: BLE001
+                # get_variable reports the error when the value is actually used
+                await logger.adebug(f"Could not prefetch variable '{variable.name}': {e}")
+                continue
+            self._set_decrypted(user_id, variable.name, variable.type, value)
 
     async def get_all(self, user_id: UUID | str, session: AsyncSession) -> list[VariableRead]:
         stmt = select(Variable).where(Variable.user_id == user_id)
@@ -238,6 +281,7 @@ class DatabaseVariableService(VariableService, Service):
         session.add(variable)
         await session.flush()
         await session.refresh(variable)
+        self._invalidate(user_id, name)
         return variable
 
     async def update_variable_fields(
@@ -249,6 +293,7 @@ class DatabaseVariableService(VariableService, Service):
     ):
         query = select(Variable).where(Variable.id == variable_id, Variable.user_id == user_id)
         db_variable = (await session.exec(query)).one()
+        previous_name = db_variable.name
         db_variable.updated_at = datetime.now(timezone.utc)
 
         # Use the variable's type if provided, otherwise use the db_variable's type
@@ -269,6 +314,7 @@ class DatabaseVariableService(VariableService, Service):
         session.add(db_variable)
         await session.flush()
         await session.refresh(db_variable)
+        self._invalidate(user_id, previous_name, db_variable.name)
         return db_variable
 
     async def delete_variable(
@@ -283,6 +329,12 @@ class DatabaseVariableService(VariableService, Service):
             msg = f"{name} variable not found."
             raise ValueError(msg)
         await session.delete(variable)
+        self._invalidate(user_id, name)
+
+    async def delete_user_variables(self, user_id: UUID | str, session: AsyncSession) -> None:
+        await super().delete_user_variables(user_id, session)
+        for key in [key for key in self._decrypted if key[0] == str(user_id)]:
+            del self._decrypted[key]
 
     async def delete_variable_by_id(self, user_id: UUID | str, variable_id: UUID, session: AsyncSession) -> None:
         stmt = select(Variable).where(Variable.user_id == user_id, Variable.id == variable_id)
@@ -291,6 +343,7 @@ class DatabaseVariableService(VariableService, Service):
             msg = f"{variable_id} variable not found."
             raise ValueError(msg)
         await session.delete(variable)
+        self._invalidate(user_id, variable.name)
 
     async def create_variable(
         self,
@@ -318,4 +371,5 @@ class DatabaseVariableService(VariableService, Service):
         session.add(variable)
         await session.flush()
         await session.refresh(variable)
+        self._invalidate(user_id, name)
         return variable
@@ -0,0 +1,6 @@
+"""Vertex build service module for primeagent."""
+
+from primeagent.services.vertex_build.factory import VertexBuildServiceFactory
+from primeagent.services.vertex_build.service import VertexBuildService
+
+__all__ = ["VertexBuildService", "VertexBuildServiceFactory"]
@@ -0,0 +1,29 @@
+"""Vertex build service factory for primeagent."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from primeagent.services.factory import ServiceFactory
+from primeagent.services.vertex_build.service import VertexBuildService
+
+if TYPE_CHECKING:
+    from wfx.services.settings.service import SettingsService
+
+
+class VertexBuildServiceFactory(ServiceFactory):
+    """Factory for creating VertexBuildService instances."""
+
+    def __init__(self):
+        super().__init__(VertexBuildService)
+
+    def create(self, settings_service: SettingsService):
+        """Create a new VertexBuildService instance.
+
+        Args:
+            settings_service: The settings service holding the batching and retention limits.
+
+        Returns:
+            A new VertexBuildService instance.
+        """
+        return VertexBuildService(settings_service)
@@ -0,0 +1,176 @@
+"""Write-behind persistence of vertex builds for primeagent."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import TYPE_CHECKING
+
+from sqlalchemy import and_, or_
+from sqlmodel import col, delete, select
+from wfx.log.logger import logger
+from wfx.services.deps import session_scope
+
+from primeagent.services.base import Service
+from primeagent.services.database.models.vertex_builds.model import VertexBuildBase, VertexBuildTable
+from primeagent.services.write_behind import WriteBehindBuffer
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from sqlmodel.ext.asyncio.session import AsyncSession
+    from wfx.services.settings.service import SettingsService
+
+# Pending builds are capped so a database outage cannot grow the buffer without bound
+MAX_PENDING_BATCHES = 50
+
+
+class VertexBuildService(Service):
+    """Buffers vertex builds in memory and writes them to the database in batches.
+
+    Builds are written with one multi-row insert once ``vertex_builds_batch_size`` builds are pending or
+    ``vertex_builds_flush_interval`` seconds after the last write. The ``max_vertex_builds_per_vertex`` and
+    ``max_vertex_builds_to_keep`` limits are enforced by a background sweeper every
+    ``vertex_builds_retention_interval`` seconds, so building a vertex never waits on the database.
+    """
+
+    name = "vertex_build_service"
+
+    def __init__(self, settings_service: SettingsService):
+        """Initialize the vertex build service.
+
+        Args:
+            settings_service: The settings service holding the batching and retention limits.
+        """
+        super().__init__()
+        self.settings_service = settings_service
+        settings = settings_service.settings
+        self.buffer: WriteBehindBuffer[VertexBuildTable] = WriteBehindBuffer(
+            "vertex build",
+            self._write_builds,
+            batch_size=settings.vertex_builds_batch_size,
+            flush_interval=settings.vertex_builds_flush_interval,
+            max_size=settings.vertex_builds_batch_size * MAX_PENDING_BATCHES,
+        )
+        # Vertices with new builds since the last sweep, the only ones that can exceed the per-vertex limit
+        self._dirty_vertices: set[tuple[UUID, str]] = set()
+        self._sweep_task: asyncio.Task | None = None
+        self._stopping = False
+        self.builds_swept = 0
+
+    def log_vertex_build(self, vertex_build: VertexBuildBase) -> None:
+        """Queues a vertex build to be written by the background writer.
+
+        Must be called from the event loop thread. Never waits on the database.
+        """
+        table = VertexBuildTable(**vertex_build.model_dump())
+        if not self.buffer.put_nowait(table):
+            logger.warning("Vertex build buffer is full, dropping the build")
+            return
+        self._dirty_vertices.add((table.flow_id, table.id))
+        self._ensure_sweeper()
+
+    def discard_flow(self, flow_id: UUID) -> None:
+        """Drops the builds of ``flow_id`` that were not written yet, e.g. because the flow is being deleted."""
+        self.buffer.discard(lambda build: build.flow_id == flow_id)
+        self._dirty_vertices = {key for key in self._dirty_vertices if key[0] != flow_id}
+
+    def _ensure_sweeper(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._stopping:
+            return
+        if self._sweep_task is None or self._sweep_task.done() or self._sweep_task.get_loop() is not loop:
+            self._sweep_task = loop.create_task(self._sweep_worker())
+
+    async def _sweep_worker(self) -> None:
+        while not self._stopping:
+            await asyncio.sleep(self.settings_service.settings.vertex_builds_retention_interval)
+            try:
+                await self.sweep()
+            except Exception as exc:  # noqa: BLE001
+                await logger.aerror(f"Error sweeping vertex builds: {exc!s}")
+
+    @staticmethod
+    async def _write_builds(builds: list[VertexBuildTable]) -> None:
+        async with session_scope() as session:
+            session.add_all(builds)
+
+    async def flush(self) -> int:
+        """Writes every pending build to the database.
+
+        Returns:
+            The number of builds written.
+        """
+        return await self.buffer.flush()
+
+    async def sweep(self) -> int:
+        """Deletes the builds beyond the per-vertex and global limits.
+
+        Returns:
+            The number of builds deleted.
+        """
+        settings = self.settings_service.settings
+        dirty_vertices, self._dirty_vertices = self._dirty_vertices, set()
+        deleted = 0
+        async with session_scope() as session:
+            for flow_id, vertex_id in dirty_vertices:
+                deleted += await self._delete_older_than_nth(
+                    session,
+                    settings.max_vertex_builds_per_vertex,
+                    VertexBuildTable.flow_id == flow_id,
+                    VertexBuildTable.id == vertex_id,
+                )
+            deleted += await self._delete_older_than_nth(session, settings.max_vertex_builds_to_keep)
+        self.builds_swept += deleted
+        if deleted:
+            await logger.adebug(f"Deleted {deleted} vertex builds beyond the retention limits")
+        return deleted
+
+    @staticmethod
+    async def _delete_older_than_nth(session: AsyncSession, keep: int, *conditions) -> int:
+        # Both lookups are range scans on the (flow_id, id, timestamp) and timestamp indexes. Builds with the
+        # same timestamp are ordered by build_id, so exactly ``keep`` builds are left when timestamps tie.
+        cutoff_stmt = (
+            select(VertexBuildTable.timestamp, VertexBuildTable.build_id)
+            .where(*conditions)
+            .order_by(col(VertexBuildTable.timestamp).desc(), col(VertexBuildTable.build_id).desc())
+            .offset(keep)
+            .limit(1)
+        )
+        cutoff = (await session.exec(cutoff_stmt)).first()
+        if cutoff is None:
+            return 0
+        cutoff_timestamp, cutoff_build_id = cutoff
+        result = await session.exec(
+            delete(VertexBuildTable)
+            .where(
+                *conditions,
+                or_(
+                    col(VertexBuildTable.timestamp) < cutoff_timestamp,
+                    and_(
+                        col(VertexBuildTable.timestamp) == cutoff_timestamp,
+                        col(VertexBuildTable.build_id) <= cutoff_build_id,
+                    ),
+                ),
+            )
+            # The cutoff read back from the database may be timezone-naive, which cannot be compared in Python
+            # with the timestamps of builds still loaded in the session
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount or 0
+
+    def stats(self) -> dict[str, int]:
+        return {**self.buffer.stats(), "swept": self.builds_swept}
+
+    async def teardown(self) -> None:
+        self._stopping = True
+        task = self._sweep_task
+        if task is not None and not task.done():
+            task.cancel()
+            if task.get_loop() is asyncio.get_running_loop():
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        await self.buffer.close()
@@ -0,0 +1,166 @@
+"""Bounded in-memory buffer for services that persist records in the background."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar
+
+from wfx.log.logger import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+T = TypeVar("T")
+OverflowPolicy = Literal["drop", "block"]
+
+
+class WriteBehindBuffer(Generic[T]):
+    """A bounded buffer of records written to storage in batches by a background task.
+
+    Records are written once ``batch_size`` records are pending or ``flush_interval`` seconds after the
+    previous write. When ``max_size`` records are pending, ``put`` drops the new record (``"drop"``) or
+    waits until the next write frees room (``"block"``). A batch that fails to write is dropped and counted.
+
+    Attributes:
+        written (int): Number of records written.
+        batches (int): Number of batches written.
+        dropped (int): Number of records dropped because the buffer was full or their batch failed.
+        errors (int): Number of failed batch writes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        write_batch: Callable[[list[T]], Awaitable[Any]],
+        *,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_size: int = 10_000,
+        overflow_policy: OverflowPolicy = "drop",
+    ) -> None:
+        if overflow_policy not in {"drop", "block"}:
+            msg = f"Invalid overflow policy: {overflow_policy}. Expected 'drop' or 'block'"
+            raise ValueError(msg)
+        self.name = name
+        self._write_batch = write_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self.overflow_policy = overflow_policy
+        self._pending: list[T] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._not_full: asyncio.Event | None = None
+        self._flush_lock: asyncio.Lock | None = None
+        self._task: asyncio.Task | None = None
+        self._closed = False
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def put_nowait(self, item: T) -> bool:
+        """Queues a record without waiting.
+
+        Returns:
+            False if the record was dropped because the buffer is full or closed.
+        """
+        if self._closed or len(self._pending) >= self.max_size:
+            self.dropped += 1
+            return False
+        self._pending.append(item)
+        self._ensure_started()
+        if len(self._pending) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    async def put(self, item: T) -> bool:
+        """Queues a record, waiting for room first if the buffer is full and the policy is ``"block"``."""
+        if self.overflow_policy == "block":
+            while len(self._pending) >= self.max_size and not self._closed:
+                self._ensure_started()
+                self._not_full.clear()
+                self._wakeup.set()
+                await self._not_full.wait()
+        return self.put_nowait(item)
+
+    def discard(self, predicate: Callable[[T], bool]) -> int:
+        """Drops the pending records matching ``predicate`` and returns how many were dropped."""
+        kept = [item for item in self._pending if not predicate(item)]
+        discarded = len(self._pending) - len(kept)
+        self._pending = kept
+        return discarded
+
+    def _ensure_started(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._closed or (self._loop is loop and self._task is not None and not self._task.done()):
+            return
+        # (Re)start the writer on the current loop, pending records are kept
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while not self._closed:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Writes every pending record.
+
+        Returns:
+            The number of records written.
+        """
+        lock = self._flush_lock or asyncio.Lock()
+        written = 0
+        async with lock:
+            while self._pending:
+                batch = self._pending[: self.batch_size]
+                del self._pending[: self.batch_size]
+                if self._not_full is not None:
+                    self._not_full.set()
+                try:
+                    await self._write_batch(batch)
+                except Exception as exc:  # noqa: BLE001
+                    self.errors += 1
+                    self.dropped += len(batch)
+                    await logger.aerror(f"Error writing {len(batch)} {self.name} records: {exc!s}")
+                    continue
+                written += len(batch)
+                self.written += len(batch)
+                self.batches += 1
+        return written
+
+    async def close(self) -> None:
+        """Stops the background writer and writes the remaining records."""
+        self._closed = True
+        task = self._task
+        if task is not None and not task.done():
+            task.cancel()
+            if task.get_loop() is asyncio.get_running_loop():
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        if self._not_full is not None:
+            self._not_full.set()
+        await self.flush()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "max_size": self.max_size,
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "errors": self.errors,
+        }
@@ -1,9 +1,18 @@
 import gzip
 import json
+import zlib
+from collections.abc import AsyncIterable, AsyncIterator
 from typing import Any
 
 from fastapi import Response
 from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+# Encoded items are compressed once this many bytes are pending, so each chunk sent is a useful size
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# zlib window bits for a gzip header and trailer
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
 
 
 def compress_response(data: Any) -> Response:
@@ -17,3 +26,33 @@ def compress_response(data: Any) -> Response:
         media_type="application/json",
         headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding", "Content-Length": str(len(compressed_data))},
     )
+
+
+async def gzip_json_array(items: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Join JSON-encoded items into a gzip-compressed JSON array, yielding it a chunk at a time."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, _GZIP_WBITS)
+    pending = bytearray(b"[")
+    first = True
+    async for item in items:
+        if not first:
+            pending += b","
+        pending += item
+        first = False
+        if len(pending) >= STREAM_CHUNK_SIZE:
+            if compressed := compressor.compress(bytes(pending)):
+                yield compressed
+            pending.clear()
+    pending += b"]"
+    yield compressor.compress(bytes(pending)) + compressor.flush()
+
+
+def compress_streaming_response(items: AsyncIterable[bytes], headers: dict[str, str] | None = None) -> Response:
+    """Stream JSON-encoded items to the client as a gzip-compressed JSON array.
+
+    Unlike :func:`compress_response`, the whole array is never held in memory.
+    """
+    return StreamingResponse(
+        gzip_json_array(items),
+        media_type="application/json",
+        headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding", **(headers or {})},
+    )
@@ -1,9 +1,10 @@
 import asyncio
 import base64
+from math import gcd
 from pathlib import Path
 
 import numpy as np
-from scipy.signal import resample
+from scipy.signal import firwin, resample, upfirdn
 from wfx.log import logger
 
 SAMPLE_RATE_24K = 24000
@@ -13,6 +14,11 @@ BYTES_PER_SAMPLE = 2
 
 BYTES_PER_24K_FRAME = int(SAMPLE_RATE_24K * FRAME_DURATION_MS / 1000) * BYTES_PER_SAMPLE
 BYTES_PER_16K_FRAME = int(VAD_SAMPLE_RATE_16K * FRAME_DURATION_MS / 1000) * BYTES_PER_SAMPLE
+SAMPLES_PER_16K_FRAME = BYTES_PER_16K_FRAME // BYTES_PER_SAMPLE
+
+# Same anti-aliasing filter as scipy.signal.resample_poly: 10 zero crossings per side, Kaiser beta 5
+RESAMPLER_HALF_LENGTH_FACTOR = 10
+RESAMPLER_KAISER_BETA = 5.0
 
 
 def resample_24k_to_16k(frame_24k_bytes):
@@ -43,6 +49,100 @@ def resample_24k_to_16k(frame_24k_bytes):
     return frame_16k.tobytes()
 
 
+class StreamingResampler:
+    """Polyphase FIR resampler for a stream of 16-bit PCM chunks of any size.
+
+    Each chunk is converted with one ``scipy.signal.upfirdn`` call over the chunk and the input samples
+    the filter still needs from earlier chunks. That history, the position of the next output sample and a
+    trailing odd byte are kept between calls, so feeding a stream in chunks gives the same output as
+    feeding it at once: the output of ``upfirdn(taps, x, up, down)``, rounded to int16.
+    """
+
+    def __init__(self, up: int = 2, down: int = 3, taps: np.ndarray | None = None) -> None:
+        if up < 1 or down < 1:
+            msg = f"Resampling factors must be positive, got up={up} and down={down}"
+            raise ValueError(msg)
+        if taps is None:
+            max_rate = max(up, down)
+            num_taps = 2 * RESAMPLER_HALF_LENGTH_FACTOR * max_rate + 1
+            taps = firwin(num_taps, 1 / max_rate, window=("kaiser", RESAMPLER_KAISER_BETA)) * up
+        self.up = up
+        self.down = down
+        self.taps = np.asarray(taps, dtype=np.float64)
+        # The buffer always starts on an input sample that falls on an output sample, so output k of
+        # upfirdn over the buffer is a whole number of outputs away from the stream position
+        self._alignment = down // gcd(up, down)
+        self._history = -(-len(self.taps) // up) - 1
+        self.reset()
+
+    def reset(self) -> None:
+        """Forgets the stream state, as if no sample had been processed."""
+        # Zero history so the first output samples see silence before the stream
+        self._buffer_start = -self._align(self._history + self._alignment - 1)
+        self._buffer = np.zeros(-self._buffer_start, dtype=np.float64)
+        self._next_output = 0
+        self._pending_byte = b""
+
+    def _align(self, index: int) -> int:
+        return index - index % self._alignment
+
+    def process(self, chunk: bytes) -> bytes:
+        """Resamples a chunk of 16-bit PCM audio and returns the output samples that are complete."""
+        data = self._pending_byte + chunk
+        if len(data) % BYTES_PER_SAMPLE:
+            self._pending_byte = data[-1:]
+            data = data[:-1]
+        else:
+            self._pending_byte = b""
+        return self.process_samples(np.frombuffer(data, dtype=np.int16)).tobytes()
+
+    def process_samples(self, samples: np.ndarray) -> np.ndarray:
+        """Resamples int16 samples and returns the int16 output samples that are complete."""
+        if len(samples):
+            self._buffer = np.concatenate((self._buffer, samples))
+        available = self._buffer_start + len(self._buffer)
+        # Output n reads input samples up to (n * down) // up, so it is complete once that sample arrived
+        end = -(-(available * self.up) // self.down)
+        if end <= self._next_output:
+            return np.empty(0, dtype=np.int16)
+
+        first = self._buffer_start * self.up // self.down
+        result = upfirdn(self.taps, self._buffer, self.up, self.down)[self._next_output - first : end - first]
+        self._next_output = end
+
+        # Keep the samples read by the next output and the ones before it within the filter length
+        oldest_needed = self._align((end * self.down) // self.up - self._history)
+        if oldest_needed > self._buffer_start:
+            self._buffer = self._buffer[oldest_needed - self._buffer_start :]
+            self._buffer_start = oldest_needed
+        return np.clip(np.rint(result), -32768, 32767).astype(np.int16)
+
+
+class StreamingVad:
+    """Voice activity detection over a stream of 24kHz PCM chunks.
+
+    Chunks are resampled to 16kHz with a :class:`StreamingResampler` and split into 20ms frames. Samples
+    that do not fill a frame are kept for the next chunk. :meth:`process` is CPU-bound and handles every
+    frame of a chunk in one call, so it is meant to run in a worker thread with one call per batch of
+    received chunks.
+    """
+
+    def __init__(self, vad) -> None:
+        self.vad = vad
+        self.resampler = StreamingResampler()
+        self._partial = b""
+
+    def process(self, chunk_24k: bytes) -> list[bool]:
+        """Returns whether each complete 20ms frame of the audio received so far contains speech."""
+        pcm_16k = self._partial + self.resampler.process(chunk_24k)
+        complete = len(pcm_16k) - len(pcm_16k) % BYTES_PER_16K_FRAME
+        self._partial = pcm_16k[complete:]
+        return [
+            self.vad.is_speech(pcm_16k[start : start + BYTES_PER_16K_FRAME], VAD_SAMPLE_RATE_16K)
+            for start in range(0, complete, BYTES_PER_16K_FRAME)
+        ]
+
+
 # def resample_24k_to_16k(frame_24k_bytes: bytes) -> bytes:
 #    """
 #    Convert one 20ms chunk (960 bytes @ 24kHz) to 20ms @ 16kHz (640 bytes).
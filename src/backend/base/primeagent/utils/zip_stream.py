@@ -0,0 +1,184 @@
+"""Write and read ZIP archives an entry at a time, without holding the archive in memory."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import zipfile
+from collections import deque
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable
+    from typing import BinaryIO
+
+# Entries fetched ahead of the one being written
+DEFAULT_PREFETCH = 4
+
+# Chunks each prefetched entry may buffer before its fetch waits for the writer
+PREFETCH_CHUNKS = 16
+
+
+class ZipEntry(NamedTuple):
+    """A file to write to an archive, with a callable that opens a stream of its content."""
+
+    name: str
+    open: Callable[[], AsyncIterable[bytes]]
+
+
+async def iter_bytes(data: bytes) -> AsyncIterator[bytes]:
+    """Stream content that is already in memory, as a single chunk."""
+    yield data
+
+
+class _ZipSink(io.RawIOBase):
+    """A write-only, unseekable file that keeps what is written until it is drained.
+
+    ``zipfile`` writes data descriptors after each entry when it cannot seek back, so entries can be written
+    without knowing their size up front.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+async def _prefetch(entry: ZipEntry, queue: asyncio.Queue) -> None:
+    stream = entry.open()
+    try:
+        async for chunk in stream:
+            await queue.put(chunk)
+    except Exception as exc:  # noqa: BLE001
+        await queue.put(exc)
+    else:
+        await queue.put(None)
+    finally:
+        # Close the source, e.g. an S3 body, even when the fetch is cancelled part way
+        if hasattr(stream, "aclose"):
+            await stream.aclose()
+
+
+async def _iter_entries(entries: Iterable[ZipEntry] | AsyncIterable[ZipEntry]) -> AsyncIterator[ZipEntry]:
+    if hasattr(entries, "__aiter__"):
+        async for entry in entries:
+            yield entry
+    else:
+        for entry in entries:
+            yield entry
+
+
+async def stream_zip(
+    entries: Iterable[ZipEntry] | AsyncIterable[ZipEntry],
+    *,
+    compression: int = zipfile.ZIP_STORED,
+    prefetch: int = DEFAULT_PREFETCH,
+) -> AsyncIterator[bytes]:
+    """Yield a ZIP archive of ``entries`` as it is written.
+
+    Entries are written in the order given, while the next ``prefetch`` are fetched concurrently. Each buffers
+    at most ``PREFETCH_CHUNKS`` chunks, so memory use does not grow with the size or number of entries.
+
+    Raises:
+        Exception: Whatever opening or reading an entry raised.
+    """
+    sink = _ZipSink()
+    pending = _iter_entries(entries)
+    window: deque[tuple[str, asyncio.Queue, asyncio.Task]] = deque()
+    # The fetch of the entry being written, which is no longer in the window
+    current: asyncio.Task | None = None
+
+    async def fill_window() -> None:
+        while len(window) < prefetch and (entry := await anext(pending, None)) is not None:
+            queue: asyncio.Queue = asyncio.Queue(maxsize=PREFETCH_CHUNKS)
+            window.append((entry.name, queue, asyncio.create_task(_prefetch(entry, queue))))
+
+    try:
+        with zipfile.ZipFile(sink, "w", compression=compression) as zip_file:
+            await fill_window()
+            while window:
+                name, queue, current = window.popleft()
+                await fill_window()
+                with zip_file.open(name, "w", force_zip64=True) as zip_entry:
+                    while (chunk := await queue.get()) is not None:
+                        if isinstance(chunk, Exception):
+                            raise chunk
+                        zip_entry.write(chunk)
+                        if data := sink.drain():
+                            yield data
+                await current
+                current = None
+                if data := sink.drain():
+                    yield data
+        # The central directory is written when the archive is closed
+        yield sink.drain()
+    finally:
+        # Fetches blocked on a full queue when the consumer stops, e.g. because the client disconnected
+        tasks = [task for _, _, task in window]
+        if current is not None:
+            tasks.append(current)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await pending.aclose()
+
+
+def _read_entry(zip_file: zipfile.ZipFile, info: zipfile.ZipInfo, max_size: int) -> bytes:
+    with zip_file.open(info) as entry:
+        data = entry.read(max_size + 1)
+    if len(data) > max_size:
+        msg = f"{info.filename} is larger than {max_size} bytes"
+        raise ValueError(msg)
+    return data
+
+
+async def iter_zip_entries(
+    file: BinaryIO,
+    *,
+    max_entry_size: int,
+    max_total_size: int | None = None,
+    max_entries: int | None = None,
+) -> AsyncIterator[tuple[str, bytes]]:
+    """Yield the name and content of each file in a ZIP archive, one at a time.
+
+    ``file`` must be seekable, e.g. an upload spooled to disk; only the entry being read is held in memory.
+
+    Raises:
+        zipfile.BadZipFile: If ``file`` is not a ZIP archive, or an entry is corrupt.
+        ValueError: If an entry is larger than ``max_entry_size`` bytes once uncompressed, all entries together are
+            larger than ``max_total_size`` bytes, or the archive has more than ``max_entries`` files.
+    """
+    zip_file = await asyncio.to_thread(zipfile.ZipFile, file)
+    try:
+        infos = [info for info in zip_file.infolist() if not info.is_dir()]
+        if max_entries is not None and len(infos) > max_entries:
+            msg = f"The archive has more than {max_entries} files"
+            raise ValueError(msg)
+        remaining = max_total_size
+        for info in infos:
+            if info.file_size > max_entry_size:
+                msg = f"{info.filename} is larger than {max_entry_size} bytes"
+                raise ValueError(msg)
+            if remaining is not None and info.file_size > remaining:
+                msg = f"The archive is larger than {max_total_size} bytes once uncompressed"
+                raise ValueError(msg)
+            # The recorded size is not trusted, the read stops just past the limit
+            content = await asyncio.to_thread(_read_entry, zip_file, info, max_entry_size)
+            if remaining is not None:
+                remaining -= len(content)
+                if remaining < 0:
+                    msg = f"The archive is larger than {max_total_size} bytes once uncompressed"
+                    raise ValueError(msg)
+            yield info.filename, content
+    finally:
+        zip_file.close()
@@ -73,6 +73,9 @@ def mock_settings_service():
     else:
         settings_service.settings.object_storage_tags = default_tags
 
+    settings_service.settings.object_storage_part_size = 5 * 1024 * 1024
+    settings_service.settings.object_storage_max_pool_connections = 10
+
     return settings_service
 
 
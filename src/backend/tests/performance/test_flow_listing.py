@@ -0,0 +1,96 @@
+# ruff: noqa: T201
+import gzip
+import json
+import time
+import tracemalloc
+from uuid import uuid4
+
+import pytest
+from primeagent.api.utils import validate_is_component
+from primeagent.api.v1.flows import _flow_list_columns, _iter_flow_list
+from primeagent.services.database.models.flow.model import Flow, FlowHeader, FlowRead
+from primeagent.utils.compression import compress_response, compress_streaming_response
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+FLOW_COUNT = 10_000
+NODES_PER_FLOW = 8
+
+
+def _flow_data(index: int) -> dict:
+    nodes = [
+        {
+            "id": f"node-{index}-{node}",
+            "data": {"type": "Component", "node": {"template": {"code": {"value": "x = 1\n" * 40}}}},
+        }
+        for node in range(NODES_PER_FLOW)
+    ]
+    return {"nodes": nodes, "edges": []}
+
+
+@pytest.fixture
+async def seeded_session(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'flows.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+        await connection.execute(
+            insert(Flow.__table__),
+            [
+                {
+                    "id": uuid4(),
+                    "name": f"flow {index}",
+                    "description": "A seeded flow",
+                    "data": _flow_data(index),
+                    # Every tenth flow is a component, and a few older ones do not say
+                    "is_component": None if index % 100 == 0 else index % 10 == 0,
+                    "tags": ["seeded"],
+                    "access_type": "PRIVATE",
+                }
+                for index in range(FLOW_COUNT)
+            ],
+        )
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+    await engine.dispose()
+
+
+async def _measure(func) -> tuple[bytes, float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    body = await func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return body, elapsed, peak / 1024 / 1024
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("header_flows", [True, False], ids=["headers", "full"])
+async def test_flow_listing(seeded_session, header_flows):
+    """Benchmark listing 10k flows: whole rows compressed in memory vs projected columns streamed."""
+    model = FlowHeader if header_flows else FlowRead
+
+    async def whole_rows() -> bytes:
+        flows = validate_is_component((await seeded_session.exec(select(Flow))).all())
+        response = compress_response([model.model_validate(flow, from_attributes=True) for flow in flows])
+        seeded_session.expunge_all()
+        return response.body
+
+    async def streamed() -> bytes:
+        stmt = select(Flow).with_only_columns(*_flow_list_columns(header_flows=header_flows))
+        response = compress_streaming_response(_iter_flow_list(seeded_session, stmt, header_flows=header_flows))
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    old_body, old_seconds, old_peak = await _measure(whole_rows)
+    new_body, new_seconds, new_peak = await _measure(streamed)
+
+    view = "headers" if header_flows else "full flows"
+    print(f"\n{FLOW_COUNT:,} {view}, whole rows: {old_seconds:.2f}s, peak {old_peak:,.0f} MiB")
+    print(f"{FLOW_COUNT:,} {view}, streamed: {new_seconds:.2f}s, peak {new_peak:,.0f} MiB")
+
+    def by_id(body: bytes) -> dict:
+        return {flow["id"]: flow for flow in json.loads(gzip.decompress(body))}
+
+    assert by_id(new_body) == by_id(old_body)
@@ -0,0 +1,44 @@
+# ruff: noqa: T201
+import time
+
+import numpy as np
+import pytest
+from primeagent.utils.voice_utils import BYTES_PER_24K_FRAME, SAMPLE_RATE_24K, StreamingResampler, resample_24k_to_16k
+
+# Realtime API audio deltas are typically around 100ms
+CHUNK_BYTES = BYTES_PER_24K_FRAME * 5
+SECONDS_OF_AUDIO = 10
+
+
+@pytest.fixture
+def audio():
+    rng = np.random.default_rng(0)
+    return rng.integers(-20000, 20000, SAMPLE_RATE_24K * SECONDS_OF_AUDIO, dtype=np.int16).tobytes()
+
+
+def _frames_per_second(func, audio: bytes) -> float:
+    start = time.perf_counter()
+    func(audio)
+    return (len(audio) // BYTES_PER_24K_FRAME) / (time.perf_counter() - start)
+
+
+@pytest.mark.benchmark
+def test_resampler_frames_per_second(audio):
+    """Benchmark 20ms frames resampled per second on one core, per frame FFT vs streaming polyphase."""
+
+    def per_frame_fft(data: bytes) -> None:
+        for offset in range(0, len(data) - BYTES_PER_24K_FRAME + 1, BYTES_PER_24K_FRAME):
+            resample_24k_to_16k(data[offset : offset + BYTES_PER_24K_FRAME])
+
+    def streaming(data: bytes) -> None:
+        resampler = StreamingResampler()
+        for offset in range(0, len(data), CHUNK_BYTES):
+            resampler.process(data[offset : offset + CHUNK_BYTES])
+
+    fft_rate = _frames_per_second(per_frame_fft, audio)
+    streaming_rate = _frames_per_second(streaming, audio)
+
+    # A realtime session produces 50 frames per second
+    print(f"\nper-frame FFT resample: {fft_rate:,.0f} frames/s, {fft_rate / 50:,.0f} realtime sessions per core")
+    print(f"streaming polyphase: {streaming_rate:,.0f} frames/s, {streaming_rate / 50:,.0f} realtime sessions per core")
+    assert streaming_rate > 50
@@ -229,14 +229,23 @@ class TestS3FileEndpoints:
             mock_file = MagicMock()
             mock_file.filename = "upload.txt"
             mock_file.size = 1024
-            mock_file.read = AsyncMock(return_value=b"file content")
+            mock_file.read = AsyncMock(side_effect=[b"file ", b"content", b""])
+
+            saved_chunks = []
+
+            async def save_file_stream(*, chunks, **_kwargs):
+                saved_chunks.extend([chunk async for chunk in chunks])
+
+            mock_storage_service.save_file_stream = AsyncMock(side_effect=save_file_stream)
 
             with patch("primeagent.api.v2.files.upload_user_file"):
                 from primeagent.api.v2.files import save_file_routine
 
                 await save_file_routine(mock_file, mock_storage_service, mock_user, file_name="upload.txt")
 
-                # Verify storage service was called
-                mock_storage_service.save_file.assert_called_once_with(
-                    flow_id="user_123", file_name="upload.txt", data=b"file content", append=False
-                )
+                # Verify the upload was streamed to the storage service
+                mock_storage_service.save_file_stream.assert_called_once()
+                assert mock_storage_service.save_file_stream.call_args.kwargs["flow_id"] == "user_123"
+                assert mock_storage_service.save_file_stream.call_args.kwargs["file_name"] == "upload.txt"
+                assert saved_chunks == [b"file ", b"content"]
+                mock_storage_service.save_file.assert_not_called()
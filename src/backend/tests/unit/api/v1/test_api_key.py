@@ -125,3 +125,28 @@ async def test_delete_api_key_route_unauthorized(client: AsyncClient, logged_in_
         user = await session.get(User, user2.id)
         if user:
             await session.delete(user)
+
+
+async def test_api_key_authentication_is_cached_until_the_key_is_deleted(client: AsyncClient, logged_in_headers):
+    from primeagent.services.deps import get_auth_service
+
+    response = await client.post("api/v1/api_key/", json={"name": "cached"}, headers=logged_in_headers)
+    created = response.json()
+    api_key_headers = {"x-api-key": created["api_key"]}
+
+    for _ in range(3):
+        response = await client.get("api/v1/api_key/", headers=api_key_headers)
+        assert response.status_code == status.HTTP_200_OK
+    assert get_auth_service().get_api_key_user(created["api_key"]) is not None
+
+    # Uses are written in one batch, not by each request
+    await get_auth_service().flush()
+    response = await client.get("api/v1/api_key/", headers=logged_in_headers)
+    stored = next(api_key for api_key in response.json()["api_keys"] if api_key["id"] == created["id"])
+    assert stored["total_uses"] == 4
+    assert stored["last_used_at"] is not None
+
+    response = await client.delete(f"api/v1/api_key/{created['id']}", headers=logged_in_headers)
+    assert response.status_code == status.HTTP_200_OK
+    response = await client.get("api/v1/api_key/", headers=api_key_headers)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -59,6 +59,63 @@ async def test_read_flows(client: AsyncClient, logged_in_headers):
     assert isinstance(result, list), "The result must be a list"
 
 
+async def test_read_flows_headers(client: AsyncClient, logged_in_headers):
+    from primeagent.services.database.models.flow.model import Flow, FlowHeader
+    from primeagent.services.deps import session_scope
+
+    component_data = {"nodes": [{"id": "node"}], "edges": []}
+    flows = [
+        {"name": "header_flow", "data": {"nodes": [], "edges": []}, "is_component": False},
+        {"name": "header_component", "data": component_data, "is_component": True},
+        {"name": "header_legacy_component", "data": component_data, "is_component": True},
+    ]
+    ids = {}
+    for flow in flows:
+        response = await client.post("api/v1/flows/", json=flow, headers=logged_in_headers)
+        assert response.status_code == status.HTTP_201_CREATED
+        ids[flow["name"]] = response.json()["id"]
+    # Flows saved before is_component was stored leave it unset
+    async with session_scope() as session:
+        legacy = await session.get(Flow, uuid.UUID(ids["header_legacy_component"]))
+        legacy.is_component = None
+
+    params = {"remove_example_flows": True, "header_flows": True}
+    response = await client.get("api/v1/flows/", params=params, headers=logged_in_headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    headers = {flow["name"]: flow for flow in response.json()}
+    assert set(headers["header_flow"]) == set(FlowHeader.model_fields)
+    assert headers["header_flow"]["data"] is None
+    assert headers["header_component"]["data"] == component_data
+    assert headers["header_legacy_component"]["is_component"] is True
+    assert headers["header_legacy_component"]["data"] == component_data
+
+
+async def test_read_flows_keyset_pagination(client: AsyncClient, logged_in_headers):
+    for i in range(5):
+        response = await client.post("api/v1/flows/", json={"name": f"page_flow_{i}"}, headers=logged_in_headers)
+        assert response.status_code == status.HTTP_201_CREATED
+
+    params = {"remove_example_flows": True, "header_flows": True}
+    response = await client.get("api/v1/flows/", params=params, headers=logged_in_headers)
+    all_ids = sorted(flow["id"] for flow in response.json())
+    assert "X-Next-Cursor" not in response.headers
+
+    pages = []
+    cursor = None
+    while True:
+        page_params = {**params, "limit": 2} | ({"cursor": cursor} if cursor else {})
+        response = await client.get("api/v1/flows/", params=page_params, headers=logged_in_headers)
+        assert response.status_code == status.HTTP_200_OK
+        pages.append([flow["id"] for flow in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [flow_id for page in pages for flow_id in page] == all_ids
+
+
 async def test_read_flow(client: AsyncClient, logged_in_headers):
     basic_case = {
         "name": "string",
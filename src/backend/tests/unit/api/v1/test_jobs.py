@@ -0,0 +1,87 @@
+from uuid import UUID, uuid4
+
+import orjson
+import pytest
+from fastapi import status
+from primeagent.api.v1.schemas import SimplifiedAPIRequest
+from primeagent.services.deps import get_run_queue_service
+
+
+@pytest.fixture
+async def stopped_workers(client):  # noqa: ARG001
+    """Stop the server's queue workers, so queued jobs stay queued."""
+    queue_service = get_run_queue_service()
+    await queue_service.teardown()
+    return queue_service
+
+
+async def test_enqueue_run(client, added_webhook_test, created_api_key, stopped_workers):  # noqa: ARG001
+    headers = {"x-api-key": created_api_key.api_key}
+
+    response = await client.post(
+        f"api/v1/jobs/run/{added_webhook_test['id']}", headers=headers, json={"input_value": "hello"}
+    )
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    job = response.json()
+    assert job["status"] == "queued"
+    assert job["kind"] == "run"
+    assert job["attempts"] == 0
+    assert job["flow_id"] == added_webhook_test["id"]
+
+    response = await client.get(f"api/v1/jobs/{job['id']}", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == job
+
+
+async def test_enqueue_run_by_endpoint_name(client, added_webhook_test, created_api_key, stopped_workers):  # noqa: ARG001
+    response = await client.post(
+        f"api/v1/jobs/run/{added_webhook_test['endpoint_name']}", headers={"x-api-key": created_api_key.api_key}
+    )
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.json()["flow_id"] == added_webhook_test["id"]
+
+
+async def test_enqueue_run_requires_api_key(client, added_webhook_test):
+    response = await client.post(f"api/v1/jobs/run/{added_webhook_test['id']}")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+async def test_enqueue_run_for_missing_flow(client, created_api_key):
+    response = await client.post(f"api/v1/jobs/run/{uuid4()}", headers={"x-api-key": created_api_key.api_key})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+async def test_get_missing_job(client, created_api_key):
+    response = await client.get(f"api/v1/jobs/{uuid4()}", headers={"x-api-key": created_api_key.api_key})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+async def test_job_of_another_user_is_not_found(client, added_webhook_test, created_api_key, stopped_workers):
+    job = await stopped_workers.enqueue(
+        UUID(added_webhook_test["id"]), SimplifiedAPIRequest(input_value="hello"), user_id=uuid4()
+    )
+
+    response = await client.get(f"api/v1/jobs/{job.id}", headers={"x-api-key": created_api_key.api_key})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+async def test_job_events_stream_until_the_job_finishes(client, added_webhook_test, created_api_key, stopped_workers):
+    headers = {"x-api-key": created_api_key.api_key}
+    response = await client.post(f"api/v1/jobs/run/{added_webhook_test['id']}", headers=headers)
+    job_id = response.json()["id"]
+    job = await stopped_workers.lease()
+    await stopped_workers.complete(job, {"outputs": []})
+
+    response = await client.get(f"api/v1/jobs/{job_id}/events", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [orjson.loads(line) for line in response.text.splitlines()]
+    assert [event["status"] for event in events] == ["succeeded"]
+    assert events[-1]["result"] == {"outputs": []}
@@ -81,3 +81,26 @@ async def test_delete_messages_session_with_valid_auth(client: AsyncClient, logg
     response = await client.delete("api/v1/monitor/messages/session/test-session", headers=logged_in_headers)
     # Should return 204 No Content
     assert response.status_code == status.HTTP_204_NO_CONTENT
+
+
+@pytest.mark.usefixtures("active_user")
+async def test_get_metrics_requires_superuser(client: AsyncClient, logged_in_headers):
+    """Test that GET /monitor/metrics is limited to superusers."""
+    response = await client.get("api/v1/monitor/metrics", headers=logged_in_headers)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+async def test_get_metrics_with_superuser(client: AsyncClient, logged_in_headers_super_user):
+    """Test that GET /monitor/metrics reports the footprint of the per-run services."""
+    response = await client.get("api/v1/monitor/metrics", headers=logged_in_headers_super_user)
+    assert response.status_code == status.HTTP_200_OK
+    result = response.json()
+    assert set(result) == {
+        "state_service",
+        "chat_service",
+        "vertex_build_service",
+        "transaction_service",
+        "output_cache_service",
+    }
+    assert "runs" in result["state_service"]
+    assert "async_cache_locks" in result["chat_service"]
@@ -7,6 +7,7 @@ from uuid import uuid4
 import pytest
 from fastapi import status
 from httpx import AsyncClient
+from primeagent.api.v1.projects import MAX_ZIP_ENTRIES
 from primeagent.initial_setup.constants import STARTER_FOLDER_NAME
 from primeagent.services.database.models.flow.model import Flow, FlowCreate
 from primeagent.services.deps import session_scope
@@ -1719,3 +1720,89 @@ async def test_download_file_starter_project(client: AsyncClient, logged_in_head
     # Clean up: delete the project (which will cascade delete flows)
     delete_response = await client.delete(f"api/v1/projects/{starter_project_id}", headers=logged_in_headers)
     assert delete_response.status_code == status.HTTP_204_NO_CONTENT
+
+
+async def test_upload_downloaded_project_zip(client: AsyncClient, logged_in_headers, active_user, json_flow):
+    """A project downloaded as a ZIP of flows can be uploaded again as a new project."""
+    create_response = await client.post(
+        "api/v1/projects/", json={"name": "Zipped Project", "description": ""}, headers=logged_in_headers
+    )
+    assert create_response.status_code == status.HTTP_201_CREATED
+    project_id = create_response.json()["id"]
+
+    flow_data = json.loads(json_flow).get("data", {})
+    async with session_scope() as session:
+        for i in range(3):
+            flow_create = FlowCreate(
+                name=f"Zipped Flow {i}", data=flow_data, folder_id=project_id, user_id=active_user.id
+            )
+            session.add(Flow.model_validate(flow_create, from_attributes=True))
+
+    download_response = await client.get(f"api/v1/projects/download/{project_id}", headers=logged_in_headers)
+    assert download_response.status_code == status.HTTP_200_OK, download_response.text
+
+    upload_response = await client.post(
+        "api/v1/projects/upload/",
+        files={"file": ("20250101_120000_Zipped Project_flows.zip", download_response.content, "application/zip")},
+        headers=logged_in_headers,
+    )
+    assert upload_response.status_code == status.HTTP_201_CREATED, upload_response.text
+    uploaded_flows = upload_response.json()
+    assert sorted(flow["name"] for flow in uploaded_flows) == [
+        "Zipped Flow 0 (1)",
+        "Zipped Flow 1 (1)",
+        "Zipped Flow 2 (1)",
+    ]
+    assert len({flow["folder_id"] for flow in uploaded_flows}) == 1
+
+    projects = (await client.get("api/v1/projects/", headers=logged_in_headers)).json()
+    uploaded_project = next(project for project in projects if project["id"] == uploaded_flows[0]["folder_id"])
+    assert uploaded_project["name"] == "Zipped Project (1)"
+
+
+async def test_upload_zip_without_flows(client: AsyncClient, logged_in_headers):
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        zip_file.writestr("notes.txt", "not a flow")
+
+    response = await client.post(
+        "api/v1/projects/upload/",
+        files={"file": ("project.zip", archive.getvalue(), "application/zip")},
+        headers=logged_in_headers,
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"] == "No flows found in the file"
+
+
+async def test_upload_corrupt_zip(client: AsyncClient, logged_in_headers):
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        zip_file.writestr("flow.json", '{"name": "flow"}')
+    # The stored content no longer matches its checksum
+    corrupt = archive.getvalue().replace(b'{"name": "flow"}', b'{"name": "flaw"}')
+
+    response = await client.post(
+        "api/v1/projects/upload/",
+        files={"file": ("project.zip", corrupt, "application/zip")},
+        headers=logged_in_headers,
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"].startswith("Invalid ZIP file")
+
+
+async def test_upload_zip_with_too_many_files(client: AsyncClient, logged_in_headers):
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        for index in range(MAX_ZIP_ENTRIES + 1):
+            zip_file.writestr(f"{index}.json", "{}")
+
+    response = await client.post(
+        "api/v1/projects/upload/",
+        files={"file": ("project.zip", archive.getvalue(), "application/zip")},
+        headers=logged_in_headers,
+    )
+
+    assert response.status_code == 413
+    assert f"more than {MAX_ZIP_ENTRIES} files" in response.json()["detail"]
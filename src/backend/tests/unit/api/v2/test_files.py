@@ -1,9 +1,11 @@
 import asyncio
 import contextlib
+import io
 import json
 import os
 import tempfile
 import uuid
+import zipfile
 from contextlib import suppress
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
@@ -181,6 +183,25 @@ async def test_download_file_not_found(files_client, files_created_api_key):
     assert "File not found" in error_response["detail"]
 
 
+async def test_download_files_batch(files_client, files_created_api_key):
+    headers = {"x-api-key": files_created_api_key.api_key}
+
+    file_ids = []
+    for name, content in [("first.txt", b"first content"), ("second.csv", b"a,b\n1,2\n")]:
+        response = await files_client.post("api/v2/files", files={"file": (name, content)}, headers=headers)
+        assert response.status_code == 201
+        file_ids.append(response.json()["id"])
+
+    response = await files_client.post("api/v2/files/batch/", json=file_ids, headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "application/x-zip-compressed"
+    with zipfile.ZipFile(io.BytesIO(response.content)) as zip_file:
+        assert sorted(zip_file.namelist()) == ["first.txt", "second.csv"]
+        assert zip_file.read("first.txt") == b"first content"
+        assert zip_file.read("second.csv") == b"a,b\n1,2\n"
+
+
 async def test_list_files(files_client, files_created_api_key):
     headers = {"x-api-key": files_created_api_key.api_key}
 
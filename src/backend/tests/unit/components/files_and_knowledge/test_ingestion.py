@@ -1,15 +1,35 @@
+import hashlib
 import json
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from primeagent.base.knowledge_bases.knowledge_base_utils import get_knowledge_bases
 from primeagent.schema.data import Data
 from primeagent.schema.dataframe import DataFrame
+from wfx.base.knowledge_bases.id_index import DocumentIdIndex
 from wfx.components.knowledge_bases.ingestion import KnowledgeIngestionComponent
 
 from tests.base import ComponentTestBaseWithClient
 
 
+class FakeCollection:
+    """The part of a Chroma collection used during ingestion."""
+
+    def __init__(self, metadatas: list[dict]):
+        self.metadatas = metadatas
+        self.added: list[dict] = []
+
+    def count(self):
+        return len(self.metadatas)
+
+    def get(self, include, limit, offset):  # noqa: ARG002
+        return {"metadatas": self.metadatas[offset : offset + limit]}
+
+    def add(self, **kwargs):
+        self.added.append(kwargs)
+        self.metadatas.extend(kwargs["metadatas"])
+
+
 class TestKnowledgeIngestionComponent(ComponentTestBaseWithClient):
     @pytest.fixture
     def component_class(self):
@@ -213,55 +233,53 @@ class TestKnowledgeIngestionComponent(ComponentTestBaseWithClient):
         assert "text" in metadata["summary"]["vectorized_columns"]
         assert "category" in metadata["summary"]["identifier_columns"]
 
-    async def test_convert_df_to_data_objects(self, component_class, default_kwargs):
+    def test_convert_df_to_data_objects(self, component_class, default_kwargs):
         """Test converting DataFrame to Data objects."""
         component = component_class(**default_kwargs)
         data_df = default_kwargs["input_df"]
-        config_list = default_kwargs["column_config"]
 
-        # Mock Chroma to avoid actual vector store operations
-        with patch("primeagent.components.knowledge_bases.ingestion.Chroma") as mock_chroma:
-            mock_chroma_instance = MagicMock()
-            mock_chroma_instance.get.return_value = {"metadatas": []}
-            mock_chroma.return_value = mock_chroma_instance
-
-            data_objects = await component._convert_df_to_data_objects(data_df, config_list)
+        data_objects = component._convert_df_to_data_objects(data_df, ["text"], ["category"])
 
         assert len(data_objects) == 2
         assert all(isinstance(obj, Data) for obj in data_objects)
 
         # Check first data object
         first_obj = data_objects[0]
-        assert "text" in first_obj.data
-        assert "title" in first_obj.data
-        assert "category" in first_obj.data
-        assert "_id" in first_obj.data
-
-    async def test_convert_df_to_data_objects_no_duplicates(self, component_class, default_kwargs):
-        """Test converting DataFrame to Data objects with duplicate prevention."""
-        default_kwargs["allow_duplicates"] = False
-        component = component_class(**default_kwargs)
-        data_df = default_kwargs["input_df"]
-        config_list = default_kwargs["column_config"]
+        assert first_obj.data["text"] == "Sample text 1"
+        assert first_obj.data["title"] == "Title 1"
+        assert first_obj.data["category"] == "cat1"
+        # The id hashes the identifier columns
+        assert first_obj.data["_id"] == hashlib.sha256(b"cat1").hexdigest()
 
-        # Mock Chroma with existing hash
-        with patch("primeagent.components.knowledge_bases.ingestion.Chroma") as mock_chroma:
-            # Simulate existing document with same hash
-            existing_hash = "some_existing_hash"
-            mock_chroma_instance = MagicMock()
-            mock_chroma_instance.get.return_value = {"metadatas": [{"_id": existing_hash}]}
-            mock_chroma.return_value = mock_chroma_instance
+    def test_convert_df_to_data_objects_skips_missing_values(self, component_class, default_kwargs):
+        component = component_class(**default_kwargs)
+        data_df = DataFrame({"a": ["x", None], "b": [None, 2.5], "c": ["meta", None]})
 
-            # Mock hashlib to return the existing hash for first row
-            with patch("primeagent.components.knowledge_bases.ingestion.hashlib.sha256") as mock_hash:
-                mock_hash_obj = MagicMock()
-                mock_hash_obj.hexdigest.side_effect = [existing_hash, "different_hash"]
-                mock_hash.return_value = mock_hash_obj
+        data_objects = component._convert_df_to_data_objects(data_df, ["a", "b"], [])
 
-                data_objects = await component._convert_df_to_data_objects(data_df, config_list)
+        assert [obj.data["text"] for obj in data_objects] == ["x", "2.5"]
+        assert data_objects[0].data["c"] == "meta"
+        assert "c" not in data_objects[1].data
+        assert data_objects[1].data["_id"] == hashlib.sha256(b"2.5").hexdigest()
 
-        # Should only return one object (second row) since first is duplicate
-        assert len(data_objects) == 1
+    async def test_ingest_skips_duplicates(self, component_class, default_kwargs, tmp_path):
+        """Rows already in the knowledge base, or repeated in the input, are not embedded again."""
+        default_kwargs["chunk_size"] = 1
+        component = component_class(**default_kwargs)
+        data_df = DataFrame({"text": ["a", "b", "c", "b"], "category": ["1", "2", "3", "2"]})
+        collection = FakeCollection([{"_id": hashlib.sha256(b"1").hexdigest()}])
+        embeddings = MagicMock()
+        embeddings.aembed_documents = AsyncMock(side_effect=lambda texts: [[0.0] for _ in texts])
+
+        id_index = DocumentIdIndex(tmp_path / "ids.sqlite3")
+        id_index.sync(collection)
+        added = await component._ingest(data_df, default_kwargs["column_config"], embeddings, collection, id_index)
+
+        assert added == 2
+        assert [doc for batch in collection.added for doc in batch["documents"]] == ["b", "c"]
+        assert embeddings.aembed_documents.await_count == 2
+        assert id_index.existing([hashlib.sha256(b"3").hexdigest()])
+        id_index.close()
 
     def test_is_valid_collection_name(self, component_class, default_kwargs):
         """Test collection name validation."""
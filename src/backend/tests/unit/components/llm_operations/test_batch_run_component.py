@@ -1,8 +1,14 @@
+import asyncio
+import os
 import re
+import time
 
 import pytest
+from tenacity import wait_none
+from wfx.components.llm_operations import batch_run
 from wfx.components.llm_operations.batch_run import BatchRunComponent
 from wfx.schema import DataFrame
+from wfx.services.deps import get_settings_service
 
 from tests.base import ComponentTestBaseWithoutClient
 
@@ -405,3 +411,141 @@ class TestBatchRunComponent(ComponentTestBaseWithoutClient):
         assert len(result) == 2
         assert "model_response" in result.columns
         assert all(isinstance(resp, str) for resp in result["model_response"])
+
+
+class FlakyModel:
+    """Answers each row with its content, failing the first ``failures[text]`` calls for that row."""
+
+    def __init__(self, failures=None):
+        self.failures = dict(failures or {})
+        self.calls: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def with_config(self, *_, **__):
+        return self
+
+    async def ainvoke(self, conversation):
+        from langchain_core.messages import AIMessage
+
+        text = conversation[-1]["content"]
+        self.calls.append(text)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0)
+            if self.failures.get(text, 0) > 0:
+                self.failures[text] -= 1
+                msg = f"429 rate limited: {text}"
+                raise RuntimeError(msg)
+            return AIMessage(content=f"Response to: {text}")
+        finally:
+            self.in_flight -= 1
+
+
+class TestBatchRunChunked:
+    @pytest.fixture(autouse=True)
+    def _setup(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(batch_run, "wait_exponential_jitter", lambda **_: wait_none())
+        monkeypatch.setattr(get_settings_service().settings, "config_dir", str(tmp_path))
+        self.checkpoint_dir = tmp_path / "batch_run_checkpoints"
+
+    def _component(self, model, texts, **kwargs):
+        return BatchRunComponent(
+            model=model,
+            df=DataFrame({"text": texts}),
+            column_name="text",
+            enable_metadata=kwargs.pop("enable_metadata", True),
+            chunk_size=kwargs.pop("chunk_size", 4),
+            **kwargs,
+        )
+
+    async def test_rows_keep_their_order_with_bounded_concurrency(self):
+        texts = [f"row {i}" for i in range(10)]
+        model = FlakyModel()
+
+        result = await self._component(model, texts, max_concurrency=3).run_batch()
+
+        assert list(result["model_response"]) == [f"Response to: {text}" for text in texts]
+        assert list(result["batch_index"]) == list(range(10))
+        assert model.max_in_flight <= 3
+        assert not list(self.checkpoint_dir.rglob("*.jsonl"))
+
+    async def test_failed_rows_are_retried(self):
+        model = FlakyModel(failures={"b": 2})
+
+        result = await self._component(model, ["a", "b"], max_retries=2).run_batch()
+
+        assert list(result["model_response"]) == ["Response to: a", "Response to: b"]
+        assert model.calls.count("b") == 3
+
+    async def test_failed_rows_are_reported_and_the_run_resumes_from_the_checkpoint(self):
+        texts = ["a", "b", "c", "d", "e"]
+        model = FlakyModel(failures={"d": 5})
+
+        result = await self._component(model, texts, chunk_size=2, max_retries=1).run_batch()
+
+        rows = result.to_dict("records")
+        assert rows[3]["model_response"] == ""
+        assert rows[3]["metadata"]["processing_status"] == "failed"
+        assert "429" in rows[3]["metadata"]["error"]
+        assert all(row["metadata"]["processing_status"] == "success" for i, row in enumerate(rows) if i != 3)
+        assert len(list(self.checkpoint_dir.rglob("*.jsonl"))) == 1
+
+        retry_model = FlakyModel()
+        result = await self._component(retry_model, texts, chunk_size=2).run_batch()
+
+        assert retry_model.calls == ["d"]
+        assert list(result["model_response"]) == [f"Response to: {text}" for text in texts]
+        assert not list(self.checkpoint_dir.rglob("*.jsonl"))
+
+    async def test_failed_rows_are_marked_without_metadata(self):
+        model = FlakyModel(failures={"b": 5})
+
+        result = await self._component(model, ["a", "b"], enable_metadata=False, max_retries=0).run_batch()
+
+        rows = result.to_dict("records")
+        assert "metadata" not in result.columns
+        assert [row["processing_status"] for row in rows] == ["success", "failed"]
+        assert rows[0]["error"] is None
+        assert "429" in rows[1]["error"]
+
+    async def test_checkpoints_are_kept_per_user(self):
+        model = FlakyModel(failures={"b": 5})
+        component = self._component(model, ["a", "b"], max_retries=0)
+        component._user_id = "user-1"
+        await component.run_batch()
+        assert [path.relative_to(self.checkpoint_dir).parts[0] for path in self.checkpoint_dir.rglob("*.jsonl")] == [
+            "user-1"
+        ]
+
+        other_user_model = FlakyModel()
+        component = self._component(other_user_model, ["a", "b"])
+        component._user_id = "user-2"
+        await component.run_batch()
+
+        # Another user's run does not resume from the first user's checkpoint
+        assert other_user_model.calls == ["a", "b"]
+
+    async def test_expired_checkpoints_are_removed(self):
+        expired = self.checkpoint_dir / "user" / "flow" / "expired.jsonl"
+        recent = self.checkpoint_dir / "user" / "flow" / "recent.jsonl"
+        expired.parent.mkdir(parents=True)
+        expired.write_text("{}\n")
+        recent.write_text("{}\n")
+        old = time.time() - batch_run.CHECKPOINT_TTL - 60
+        os.utime(expired, (old, old))
+
+        await self._component(FlakyModel(), ["a"]).run_batch()
+
+        assert not expired.exists()
+        assert recent.exists()
+
+    async def test_requests_per_minute_limit(self):
+        bucket = batch_run._TokenBucket(per_minute=60)
+        bucket.level = 0
+
+        start = time.monotonic()
+        await bucket.acquire()
+
+        assert time.monotonic() - start >= 0.9
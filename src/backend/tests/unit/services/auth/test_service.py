@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from primeagent.services.auth.service import AuthService
+from primeagent.services.database.models.user.model import UserRead
+
+
+def _settings_service(**overrides):
+    settings = {
+        "api_key_cache_ttl": 30,
+        "api_key_usage_flush_interval": 5.0,
+        "disable_track_apikey_usage": False,
+        **overrides,
+    }
+    return SimpleNamespace(settings=SimpleNamespace(**settings))
+
+
+def _user() -> UserRead:
+    return UserRead(
+        id=uuid4(),
+        username="user",
+        profile_image=None,
+        store_api_key=None,
+        is_active=True,
+        is_superuser=False,
+        create_at="2024-01-01T00:00:00Z",
+        updated_at="2024-01-01T00:00:00Z",
+        last_login_at=None,
+    )
+
+
+@pytest.fixture
+def auth_service():
+    return AuthService(_settings_service())
+
+
+def test_cached_user_is_returned_and_its_use_counted(auth_service):
+    user, api_key_id = _user(), uuid4()
+    auth_service.cache_api_key_user("sk-key", user, api_key_id)
+
+    assert auth_service.get_api_key_user("sk-key") == user
+    assert auth_service.get_api_key_user("sk-other") is None
+    assert len(auth_service.usage) == 1
+
+
+def test_cached_user_expires(auth_service):
+    auth_service.cache_api_key_user("sk-key", _user(), uuid4())
+
+    with patch("primeagent.services.auth.service.time.monotonic", return_value=float("inf")):
+        assert auth_service.get_api_key_user("sk-key") is None
+    assert auth_service.get_api_key_user("sk-key") is None
+
+
+def test_cache_disabled_with_zero_ttl():
+    auth_service = AuthService(_settings_service(api_key_cache_ttl=0))
+    auth_service.cache_api_key_user("sk-key", _user(), uuid4())
+
+    assert auth_service.get_api_key_user("sk-key") is None
+
+
+def test_usage_not_counted_when_tracking_is_disabled():
+    auth_service = AuthService(_settings_service(disable_track_apikey_usage=True))
+    auth_service.cache_api_key_user("sk-key", _user(), uuid4())
+
+    assert auth_service.get_api_key_user("sk-key") is not None
+    assert len(auth_service.usage) == 0
+
+
+def test_invalidation_by_key_and_by_user(auth_service):
+    user, other_user = _user(), _user()
+    deleted_key_id = uuid4()
+    auth_service.cache_api_key_user("sk-deleted", user, deleted_key_id)
+    auth_service.cache_api_key_user("sk-kept", user, uuid4())
+    auth_service.cache_api_key_user("sk-other", other_user, uuid4())
+
+    auth_service.invalidate_api_key(deleted_key_id)
+    assert auth_service.get_api_key_user("sk-deleted") is None
+    assert auth_service.get_api_key_user("sk-kept") == user
+
+    auth_service.invalidate_user(user.id)
+    assert auth_service.get_api_key_user("sk-kept") is None
+    assert auth_service.get_api_key_user("sk-other") == other_user
@@ -0,0 +1,261 @@
+import asyncio
+
+import dill
+import pytest
+from primeagent.services.cache.serializers import PickleSerializer
+from primeagent.services.cache.service import RedisCache
+from wfx.services.cache.utils import CACHE_MISS
+
+
+class FakeRedisServer:
+    """The subset of redis.asyncio used by RedisCache, shared between clients like a real server."""
+
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+        self.subscribers: list[asyncio.Queue] = []
+        self.reads = 0
+
+    def client(self):
+        return FakeRedisClient(self)
+
+
+class FakePubSub:
+    def __init__(self, server: FakeRedisServer):
+        self._server = server
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    async def subscribe(self, _channel):
+        self._server.subscribers.append(self._queue)
+
+    async def listen(self):
+        while True:
+            yield await self._queue.get()
+
+    async def aclose(self):
+        self._server.subscribers.remove(self._queue)
+
+
+class FakeRedisClient:
+    def __init__(self, server: FakeRedisServer):
+        self._server = server
+
+    async def get(self, key):
+        self._server.reads += 1
+        return self._server.data.get(key)
+
+    async def setex(self, key, _ttl, value):
+        self._server.data[key] = bytes(value)
+        return True
+
+    async def incr(self, key):
+        value = int(self._server.data.get(key, b"0")) + 1
+        self._server.data[key] = str(value).encode()
+        return value
+
+    async def delete(self, key):
+        self._server.data.pop(key, None)
+
+    async def exists(self, key):
+        return int(key in self._server.data)
+
+    async def flushdb(self):
+        self._server.data.clear()
+
+    async def publish(self, _channel, message):
+        for queue in self._server.subscribers:
+            queue.put_nowait({"type": "message", "data": message})
+
+    def pubsub(self):
+        return FakePubSub(self._server)
+
+
+@pytest.fixture
+def server():
+    return FakeRedisServer()
+
+
+@pytest.fixture
+async def workers(server):
+    caches = [RedisCache(client=server.client(), l1_max_size=2) for _ in range(2)]
+    yield caches
+    for cache in caches:
+        await cache.teardown()
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_without_l1_every_get_reads_redis(server):
+    cache = RedisCache(client=server.client())
+
+    await cache.set("a", {"x": 1})
+
+    assert await cache.get("a") == {"x": 1}
+    assert await cache.get("a") == {"x": 1}
+    assert await cache.get("missing") is CACHE_MISS
+    assert server.reads == 3
+
+
+async def test_l1_hit_skips_redis(server, workers):
+    first, second = workers
+    await first.set("a", 1)
+
+    assert await first.get("a") == 1
+    assert server.reads == 0
+    assert await second.get("a") == 1
+    assert await second.get("a") == 1
+    assert server.reads == 1
+
+    stats = second.stats()
+    assert (stats["l1_hits"], stats["l2_hits"], stats["misses"]) == (1, 1, 0)
+    assert stats["l1_hit_ratio"] == 0.5
+
+
+async def test_write_invalidates_other_workers(workers):
+    first, second = workers
+    await first.set("a", 1)
+    assert await second.get("a") == 1
+
+    await first.set("a", 2)
+    await _settle()
+
+    assert await second.get("a") == 2
+    assert await first.get("a") == 2
+
+
+async def test_delete_and_clear_invalidate_other_workers(workers):
+    first, second = workers
+    await first.set("a", 1)
+    await first.set("b", 1)
+    assert await second.get("a") == 1
+    assert await second.get("b") == 1
+
+    await first.delete("a")
+    await _settle()
+    assert await second.get("a") is CACHE_MISS
+
+    await first.clear()
+    await _settle()
+    assert await second.get("b") is CACHE_MISS
+
+
+async def test_read_racing_an_invalidation_is_not_cached(server, workers):
+    first, second = workers
+    await first.set("a", 1)
+    stale = server.data["a"]
+    read_started, finish_read = asyncio.Event(), asyncio.Event()
+
+    async def slow_get(_key):
+        read_started.set()
+        await finish_read.wait()
+        return stale
+
+    second._client.get = slow_get
+    read = asyncio.create_task(second.get("a"))
+    await read_started.wait()
+    # Another worker writes, and its invalidation arrives while the read is still in flight
+    await first.set("a", 2)
+    await _settle()
+    finish_read.set()
+    assert await read == 1
+
+    del second._client.get
+    assert await second.get("a") == 2
+
+
+async def test_l1_hits_return_their_own_copy(workers):
+    first, second = workers
+    await first.set("a", {"x": 1})
+    assert await second.get("a") == {"x": 1}
+
+    for cache in workers:
+        value = await cache.get("a")
+        value["x"] = 2
+        assert await cache.get("a") == {"x": 1}
+    assert cache.stats()["l1_hits"] == 2
+
+
+async def test_upsert_does_not_change_values_already_returned(workers):
+    cache, _ = workers
+    await cache.set("a", {"x": 1})
+    value = await cache.get("a")
+
+    await cache.upsert("a", {"y": 2})
+
+    assert value == {"x": 1}
+    assert await cache.get("a") == {"x": 1, "y": 2}
+
+
+async def test_writes_landing_out_of_order_are_not_served_from_l1(workers):
+    first, second = workers
+    await first.get("a")
+    await second.get("a")
+    write_started, finish_write = asyncio.Event(), asyncio.Event()
+    setex = first._client.setex
+
+    async def slow_setex(*args):
+        write_started.set()
+        await finish_write.wait()
+        return await setex(*args)
+
+    first._client.setex = slow_setex
+    # The first worker takes the older version, but its write reaches Redis last
+    older_write = asyncio.create_task(first.set("a", "older"))
+    await write_started.wait()
+    await second.set("a", "newer")
+    await _settle()
+    finish_write.set()
+    await older_write
+    await _settle()
+
+    del first._client.setex
+    assert await first.get("a") == "older"
+    assert await second.get("a") == "older"
+
+
+async def test_l1_is_bounded_lru(server, workers):
+    cache, _ = workers
+    for key in ("a", "b", "c"):
+        await cache.set(key, key)
+
+    assert cache.stats()["l1_entries"] == 2
+    assert await cache.get("a") == "a"
+    assert server.reads == 1
+
+
+async def test_l1_entries_expire(server):
+    cache = RedisCache(client=server.client(), l1_max_size=2, l1_ttl=0.01)
+    await cache.set("a", 1)
+    await asyncio.sleep(0.02)
+
+    assert await cache.get("a") == 1
+    assert server.reads == 1
+    await cache.teardown()
+
+
+async def test_entries_are_read_with_the_serializer_that_wrote_them(server):
+    await RedisCache(client=server.client(), serializer=PickleSerializer()).set("a", [1, 2])
+
+    cache = RedisCache(client=server.client())
+
+    assert await cache.get("a") == [1, 2]
+    assert cache.stats()["serializer"] == "dill"
+
+
+async def test_entries_without_a_header_are_a_miss(server):
+    # Written before entries had a header
+    server.data["a"] = dill.dumps({"x": 1})
+    cache = RedisCache(client=server.client())
+
+    assert await cache.get("a") is CACHE_MISS
+    assert "a" not in server.data
+    assert cache.stats()["misses"] == 1
+
+
+async def test_unserializable_value(server):
+    cache = RedisCache(client=server.client(), serializer=PickleSerializer())
+
+    with pytest.raises(TypeError, match="can be serialized with pickle"):
+        await cache.set("a", lambda: None)
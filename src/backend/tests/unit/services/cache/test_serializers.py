@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from primeagent.services.cache.serializers import DillSerializer, MsgpackSerializer, PickleSerializer, get_serializer
+
+
+@pytest.mark.parametrize("serializer", [DillSerializer(), PickleSerializer()])
+def test_round_trip_from_memoryview(serializer):
+    value = {"a": [1, 2.5, "x"], "b": b"bytes", "c": None}
+
+    data = serializer.dumps(value)
+
+    assert serializer.loads(memoryview(b"header" + data)[len(b"header") :]) == value
+
+
+def test_dill_serializes_closures():
+    offset = 3
+    serializer = DillSerializer()
+
+    assert serializer.loads(serializer.dumps(lambda x: x + offset))(1) == 4
+
+
+def test_pickle_keeps_large_buffers_out_of_band():
+    serializer = PickleSerializer(large_buffer_threshold=1024)
+    array = np.arange(10_000, dtype=np.int64)
+
+    data = serializer.dumps({"array": array})
+    loaded = serializer.loads(memoryview(data))["array"]
+
+    np.testing.assert_array_equal(loaded, array)
+    # The array is rebuilt on top of the serialized bytes instead of a copy
+    assert not loaded.flags.writeable
+
+
+def test_pickle_rejects_unpicklable_values():
+    with pytest.raises(TypeError):
+        PickleSerializer().dumps(lambda: None)
+
+
+def test_msgpack_plain_data_only():
+    pytest.importorskip("msgpack")
+    serializer = MsgpackSerializer()
+
+    assert serializer.loads(memoryview(serializer.dumps({"a": [1, "x", b"y"]}))) == {"a": [1, "x", b"y"]}
+    with pytest.raises(TypeError):
+        serializer.dumps(object())
+
+
+def test_unknown_serializer():
+    with pytest.raises(ValueError, match="Unknown cache serializer"):
+        get_serializer("json")
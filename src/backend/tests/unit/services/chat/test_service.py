@@ -0,0 +1,34 @@
+import asyncio
+import gc
+from unittest.mock import patch
+
+import pytest
+from primeagent.services.cache.service import AsyncInMemoryCache, ThreadingInMemoryCache
+from primeagent.services.chat.service import ChatService
+
+
+@pytest.mark.parametrize("cache_class", [AsyncInMemoryCache, ThreadingInMemoryCache])
+async def test_lock_tables_do_not_grow_with_keys(cache_class):
+    with patch("primeagent.services.chat.service.get_cache_service", return_value=cache_class()):
+        service = ChatService()
+
+    for index in range(100):
+        await service.set_cache(f"key-{index}", index)
+        assert await service.get_cache(f"key-{index}") == {"result": index, "type": int}
+        await service.clear_cache(f"key-{index}")
+    gc.collect()
+
+    assert service.stats() == {"async_cache_locks": 0, "sync_cache_locks": 0}
+
+
+async def test_concurrent_operations_share_the_key_lock():
+    with patch("primeagent.services.chat.service.get_cache_service", return_value=AsyncInMemoryCache()):
+        service = ChatService()
+
+    lock = service._async_lock("key")
+
+    assert service._async_lock("key") is lock
+    assert service._async_lock("other") is not lock
+    await asyncio.gather(*(service.set_cache("key", index) for index in range(10)))
+    # The lock stays in the table while it is referenced
+    assert service.async_cache_locks["key"] is lock
@@ -0,0 +1,341 @@
+"""Tests for RunQueueService."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+from primeagent.api.v1.schemas import SimplifiedAPIRequest
+from primeagent.services.database.models.job.model import Job, JobKind, JobStatus
+from primeagent.services.run_queue.service import JobError, RunQueueService
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+def _settings_service(**overrides) -> SimpleNamespace:
+    settings = {
+        "job_queue_workers": 1,
+        "job_queue_poll_interval": 0.05,
+        "job_queue_visibility_timeout": 60.0,
+        "job_queue_max_attempts": 3,
+        "job_queue_webhook_max_attempts": 1,
+        "job_queue_retry_delay": 10.0,
+        "job_queue_retention": 3600.0,
+    }
+    settings.update(overrides)
+    return SimpleNamespace(settings=SimpleNamespace(**settings))
+
+
+@pytest.fixture
+async def session_scope(tmp_path):
+    """Give each service call its own session on a shared database, like separate workers."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+
+    @asynccontextmanager
+    async def scope():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+            await session.commit()
+
+    with patch("primeagent.services.run_queue.service.session_scope", scope):
+        yield scope
+    await engine.dispose()
+
+
+@pytest.fixture
+async def services(session_scope):  # noqa: ARG001
+    created: list[RunQueueService] = []
+
+    def create(**overrides) -> RunQueueService:
+        service = RunQueueService(_settings_service(**overrides))
+        service._log_telemetry = AsyncMock()
+        created.append(service)
+        return service
+
+    yield create
+    for service in created:
+        await service.teardown()
+
+
+async def _enqueue(service: RunQueueService, **kwargs) -> Job:
+    return await service.enqueue(uuid4(), SimplifiedAPIRequest(input_value="hello"), **kwargs)
+
+
+async def _expire_lease(session_scope, job: Job) -> None:
+    async with session_scope() as session:
+        await session.exec(
+            update(Job).where(Job.id == job.id).values(lease_expires_at=datetime.now(timezone.utc) - timedelta(1))
+        )
+
+
+async def test_enqueue_stores_the_run_request(services):
+    service = services()
+
+    job = await _enqueue(service)
+
+    stored = await service.get_job(job.id)
+    assert stored.status == JobStatus.QUEUED.value
+    assert stored.kind == JobKind.RUN.value
+    assert stored.max_attempts == 3
+    assert SimplifiedAPIRequest.model_validate(stored.payload).input_value == "hello"
+
+
+async def test_webhook_jobs_are_not_retried_by_default(services):
+    service = services()
+
+    job = await _enqueue(service, kind=JobKind.WEBHOOK)
+    assert job.max_attempts == 1
+    await service.fail(await service.lease(), "boom")
+
+    stored = await service.get_job(job.id)
+    assert stored.status == JobStatus.FAILED.value
+    assert await service.lease() is None
+
+
+async def test_finished_jobs_drop_their_request(services):
+    service = services(job_queue_retry_delay=0)
+    succeeded, failed = await _enqueue(service), await _enqueue(service)
+
+    assert await service.complete(await service.lease(), {"outputs": []})
+    job = await service.lease()
+    await service.fail(job, "boom")
+    # A job queued for a retry still needs its request
+    assert (await service.get_job(failed.id)).payload
+    await service.fail(await service.lease(), "boom", retry=False)
+
+    assert (await service.get_job(succeeded.id)).payload == {}
+    assert (await service.get_job(failed.id)).payload == {}
+
+
+async def test_lease_takes_each_job_once(services):
+    first, second = services(), services()
+    jobs = [await _enqueue(first) for _ in range(3)]
+
+    leased = await asyncio.gather(*(worker.lease() for worker in [first, second, first, second]))
+
+    leased_ids = [job.id for job in leased if job is not None]
+    assert sorted(leased_ids) == sorted(job.id for job in jobs)
+    assert leased.count(None) == 1
+    for job in leased:
+        if job is not None:
+            assert job.status == JobStatus.RUNNING.value
+            assert job.attempts == 1
+
+
+async def test_expired_lease_is_taken_by_another_worker(services, session_scope):
+    first, second = services(), services()
+    await _enqueue(first)
+    job = await first.lease()
+    assert await second.lease() is None
+
+    await _expire_lease(session_scope, job)
+    retaken = await second.lease()
+
+    assert retaken.id == job.id
+    assert retaken.worker_id == second.worker_id
+    assert retaken.attempts == 2
+    # The first worker lost its lease, so it can no longer renew or complete the job
+    assert not await first.heartbeat(job)
+    assert not await first.complete(job, {"outputs": []})
+    assert await second.complete(retaken, {"outputs": []})
+    assert (await second.get_job(job.id)).status == JobStatus.SUCCEEDED.value
+
+
+async def test_heartbeat_extends_the_lease(services):
+    service = services()
+    await _enqueue(service)
+    job = await service.lease()
+
+    assert await service.heartbeat(job)
+
+    stored = await service.get_job(job.id)
+    assert stored.lease_expires_at.replace(tzinfo=None) > job.lease_expires_at.replace(tzinfo=None)
+
+
+async def test_failed_job_is_retried_with_backoff(services):
+    service = services(job_queue_max_attempts=2)
+    await _enqueue(service)
+    job = await service.lease()
+
+    assert await service.fail(job, "boom")
+
+    stored = await service.get_job(job.id)
+    assert stored.status == JobStatus.QUEUED.value
+    assert stored.error == "boom"
+    assert stored.available_at.replace(tzinfo=None) > datetime.now(timezone.utc).replace(tzinfo=None)
+    assert await service.lease() is None
+
+
+async def test_job_fails_when_attempts_run_out(services):
+    service = services(job_queue_max_attempts=2, job_queue_retry_delay=0)
+    await _enqueue(service)
+
+    await service.fail(await service.lease(), "first")
+    job = await service.lease()
+    assert job.attempts == 2
+    await service.fail(job, "second")
+
+    stored = await service.get_job(job.id)
+    assert stored.status == JobStatus.FAILED.value
+    assert stored.error == "second"
+    assert stored.finished_at is not None
+    assert await service.lease() is None
+
+
+async def test_expired_job_without_attempts_left_is_failed(services, session_scope):
+    service = services(job_queue_max_attempts=1)
+    await _enqueue(service)
+    job = await service.lease()
+
+    await _expire_lease(session_scope, job)
+
+    assert await service.lease() is None
+    stored = await service.get_job(job.id)
+    assert stored.status == JobStatus.FAILED.value
+    assert "stopped before it finished" in stored.error
+
+
+async def test_release_does_not_use_up_an_attempt(services):
+    service = services()
+    await _enqueue(service)
+    job = await service.lease()
+
+    assert await service.release(job)
+
+    released = await service.lease()
+    assert released.id == job.id
+    assert released.attempts == 1
+
+
+async def test_cleanup_deletes_old_finished_jobs(services, session_scope):
+    service = services()
+    old, recent, queued = await _enqueue(service), await _enqueue(service), await _enqueue(service)
+    now = datetime.now(timezone.utc)
+    async with session_scope() as session:
+        await session.exec(
+            update(Job)
+            .where(Job.id == old.id)
+            .values(status=JobStatus.SUCCEEDED.value, finished_at=now - timedelta(hours=2))
+        )
+        await session.exec(
+            update(Job).where(Job.id == recent.id).values(status=JobStatus.FAILED.value, finished_at=now)
+        )
+
+    assert await service.cleanup() == 1
+
+    assert await service.get_job(old.id) is None
+    assert await service.get_job(recent.id) is not None
+    assert await service.get_job(queued.id) is not None
+
+
+async def test_process_records_the_result(services):
+    service = services()
+    service.run_job = AsyncMock(return_value={"outputs": [], "session_id": "session"})
+    await _enqueue(service)
+
+    job = await service.lease()
+    await service.process(job)
+
+    stored = await service.get_job(job.id)
+    assert stored.status == JobStatus.SUCCEEDED.value
+    assert stored.result == {"outputs": [], "session_id": "session"}
+    service._log_telemetry.assert_awaited_once()
+
+
+async def test_process_retries_errors_but_not_job_errors(services):
+    service = services(job_queue_retry_delay=0)
+    service.run_job = AsyncMock(side_effect=[RuntimeError("flaky"), JobError("Flow not found")])
+    await _enqueue(service)
+
+    await service.process(await service.lease())
+    job = await service.lease()
+    assert job.error == "flaky"
+    await service.process(job)
+
+    stored = await service.get_job(job.id)
+    assert stored.status == JobStatus.FAILED.value
+    assert stored.error == "Flow not found"
+    assert stored.attempts == 2
+
+
+async def test_run_job_fails_for_a_missing_flow(services):
+    service = services()
+    await _enqueue(service)
+
+    with pytest.raises(JobError, match="not found"):
+        await service.run_job(await service.lease())
+
+
+async def test_workers_run_queued_jobs(services):
+    service = services(job_queue_workers=2)
+    ran = []
+
+    async def run_job(job):
+        ran.append(job.id)
+        return {"outputs": []}
+
+    service.run_job = run_job
+    service.start()
+    jobs = [await _enqueue(service) for _ in range(5)]
+
+    for _ in range(100):
+        statuses = [(await service.get_job(job.id)).status for job in jobs]
+        if all(status == JobStatus.SUCCEEDED.value for status in statuses):
+            break
+        await asyncio.sleep(0.05)
+
+    assert statuses == [JobStatus.SUCCEEDED.value] * 5
+    assert sorted(ran) == sorted(job.id for job in jobs)
+
+
+async def test_teardown_hands_running_jobs_back(services):
+    service = services()
+    started = asyncio.Event()
+
+    async def run_job(_job):
+        started.set()
+        await asyncio.Event().wait()
+
+    service.run_job = run_job
+    service.start()
+    job = await _enqueue(service)
+    await asyncio.wait_for(started.wait(), timeout=5)
+
+    await service.teardown()
+
+    stored = await service.get_job(job.id)
+    assert stored.status == JobStatus.QUEUED.value
+    assert stored.attempts == 0
+    assert stored.worker_id is None
+    assert not service.is_started()
+
+
+async def test_teardown_waits_for_the_run_to_stop_before_handing_the_job_back(services):
+    service = services()
+    started = asyncio.Event()
+    status_while_stopping = []
+
+    async def run_job(job):
+        started.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            # A run may take a while to clean up, the job must not be leased again meanwhile
+            await asyncio.sleep(0.2)
+            status_while_stopping.append((await service.get_job(job.id)).status)
+            raise
+
+    service.run_job = run_job
+    service.start()
+    await _enqueue(service)
+    await asyncio.wait_for(started.wait(), timeout=5)
+
+    await service.teardown()
+
+    assert status_while_stopping == [JobStatus.RUNNING.value]
@@ -0,0 +1,119 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from primeagent.services.state.service import InMemoryStateService
+from wfx.graph import Graph
+
+
+def _service(ttl=3600.0, max_runs=1000):
+    settings_service = SimpleNamespace(settings=SimpleNamespace(state_ttl=ttl, state_max_runs=max_runs))
+    return InMemoryStateService(settings_service)
+
+
+@pytest.fixture
+def service():
+    return _service()
+
+
+def test_state_is_scoped_to_run(service):
+    service.update_state("key", "a", run_id="run-1")
+    service.append_state("items", 1, run_id="run-1")
+    service.append_state("items", 2, run_id="run-1")
+
+    assert service.get_state("key", run_id="run-1") == "a"
+    assert service.get_state("items", run_id="run-1") == [1, 2]
+    assert service.get_state("key", run_id="run-2") == ""
+    assert service.stats()["runs"] == 1
+
+
+def test_release_run_drops_state_and_run_observers(service):
+    observer = MagicMock()
+    other_observer = MagicMock()
+    service.subscribe("key", observer, run_id="run-1")
+    service.subscribe("key", other_observer)
+    service.update_state("key", "a", run_id="run-1")
+
+    service.release_run("run-1")
+    service.release_run("run-1")
+
+    assert service.get_state("key", run_id="run-1") == ""
+    assert service.observers == {"key": [other_observer]}
+    stats = service.stats()
+    assert stats["runs"] == 0
+    assert stats["released_runs"] == 1
+
+
+def test_unsubscribe_drops_empty_observer_lists(service):
+    observer = MagicMock()
+    service.subscribe("key", observer)
+    service.unsubscribe("key", observer)
+    service.update_state("other", "a", run_id="run-1")
+
+    assert service.observers == {}
+
+
+def test_least_recently_used_runs_are_evicted():
+    service = _service(max_runs=2)
+    service.update_state("key", "a", run_id="run-1")
+    service.update_state("key", "b", run_id="run-2")
+    # Reading run-1 makes run-2 the least recently used
+    assert service.get_state("key", run_id="run-1") == "a"
+
+    service.update_state("key", "c", run_id="run-3")
+
+    assert service.get_state("key", run_id="run-2") == ""
+    assert service.get_state("key", run_id="run-1") == "a"
+    assert service.stats()["evicted_runs"] == 1
+
+
+def test_unused_runs_expire():
+    service = _service(ttl=10)
+    observer = MagicMock()
+    with patch("primeagent.services.state.service.time.monotonic", return_value=100.0):
+        service.subscribe("key", observer, run_id="run-1")
+        service.update_state("key", "a", run_id="run-1")
+
+    with patch("primeagent.services.state.service.time.monotonic", return_value=111.0):
+        assert service.get_state("key", run_id="run-1") == ""
+
+    assert service.observers == {}
+    assert service.stats()["evicted_runs"] == 1
+
+
+def test_observers_are_notified(service):
+    observer = MagicMock()
+    service.subscribe("key", observer)
+
+    service.update_state("key", "a", run_id="run-1")
+    service.append_state("key", "b", run_id="run-1")
+
+    observer.assert_any_call("key", "a", append=False)
+    observer.assert_any_call("key", "b", append=True)
+
+
+async def test_graph_end_releases_run_state(service):
+    graph = Graph()
+    graph.set_run_id("00000000-0000-0000-0000-000000000001")
+    service.update_state("key", "a", run_id=graph.run_id)
+
+    with patch("wfx.graph.graph.base.get_state_service", return_value=service):
+        await graph.end_all_traces()
+
+    assert service.get_state("key", run_id=graph.run_id) == ""
+    assert service.stats()["released_runs"] == 1
+
+
+async def test_graph_end_releases_subscriptions_of_the_run(service):
+    graph = Graph()
+    graph.set_run_id("00000000-0000-0000-0000-000000000002")
+    observer = MagicMock()
+
+    with patch("wfx.graph.graph.base.get_state_service", return_value=service):
+        graph.subscribe_state("key", observer)
+        service.update_state("key", "a", run_id=graph.run_id)
+        await graph.end_all_traces()
+
+    observer.assert_called_once_with("key", "a", append=False)
+    assert service.observers == {}
+    assert service.stats()["runs"] == 0
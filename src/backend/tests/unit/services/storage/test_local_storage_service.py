@@ -1,5 +1,6 @@
 """Tests for LocalStorageService."""
 
+import asyncio
 from unittest.mock import Mock
 
 import anyio
@@ -142,6 +143,67 @@ class TestLocalStorageServiceFileOperations:
         assert retrieved == data
 
 
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+class TestLocalStorageServiceStreamOperations:
+    """Test streaming saves and reads in LocalStorageService."""
+
+    async def test_save_file_stream_and_get_file_stream(self, local_storage_service):
+        """Test saving a file from chunks and reading it back as a stream."""
+        await local_storage_service.save_file_stream("stream_flow", "stream.bin", _chunks(b"a" * 10_000, b"b" * 5))
+
+        chunks = [chunk async for chunk in local_storage_service.get_file_stream("stream_flow", "stream.bin", 4096)]
+
+        assert b"".join(chunks) == b"a" * 10_000 + b"b" * 5
+        assert max(len(chunk) for chunk in chunks) == 4096
+
+    async def test_save_file_stream_append(self, local_storage_service):
+        """Test appending chunks to an existing file."""
+        await local_storage_service.save_file("stream_flow", "log.txt", b"first\n")
+        await local_storage_service.save_file_stream("stream_flow", "log.txt", _chunks(b"second\n"), append=True)
+
+        assert await local_storage_service.get_file("stream_flow", "log.txt") == b"first\nsecond\n"
+
+    async def test_failed_save_keeps_existing_file(self, local_storage_service):
+        """Test that a save that fails part way leaves the previous file and no temporary file behind."""
+        await local_storage_service.save_file("stream_flow", "doc.txt", b"original")
+
+        async def failing_chunks():
+            yield b"partial"
+            msg = "upload interrupted"
+            raise ConnectionError(msg)
+
+        with pytest.raises(ConnectionError, match="upload interrupted"):
+            await local_storage_service.save_file_stream("stream_flow", "doc.txt", failing_chunks())
+
+        assert await local_storage_service.get_file("stream_flow", "doc.txt") == b"original"
+        assert [path.name async for path in (local_storage_service.data_dir / "stream_flow").iterdir()] == ["doc.txt"]
+
+    async def test_list_files_skips_files_being_written(self, local_storage_service):
+        """Test that files still being written are not listed."""
+        written = asyncio.Event()
+        finish = asyncio.Event()
+
+        async def slow_chunks():
+            yield b"partial"
+            written.set()
+            await finish.wait()
+            yield b" content"
+
+        save = asyncio.create_task(local_storage_service.save_file_stream("stream_flow", "slow.txt", slow_chunks()))
+        await written.wait()
+
+        assert await local_storage_service.list_files("stream_flow") == []
+
+        finish.set()
+        await save
+        assert await local_storage_service.list_files("stream_flow") == ["slow.txt"]
+
+
 @pytest.mark.asyncio
 class TestLocalStorageServiceListOperations:
     """Test list operations in LocalStorageService."""
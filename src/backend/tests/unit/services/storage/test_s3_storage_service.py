@@ -0,0 +1,167 @@
+"""Tests for S3StorageService against a local moto S3 server."""
+
+import uuid
+from unittest.mock import Mock
+
+import pytest
+
+pytest.importorskip("aioboto3")
+moto_server = pytest.importorskip("moto.server")
+
+from primeagent.services.storage.s3 import S3StorageService  # noqa: E402
+
+PART_SIZE = 5 * 1024 * 1024
+
+
+@pytest.fixture(scope="module")
+def s3_endpoint():
+    """Run a moto S3 server for the tests in this module."""
+    server = moto_server.ThreadedMotoServer(ip_address="127.0.0.1", port=0, verbose=False)
+    server.start()
+    host, port = server.get_host_and_port()
+    yield f"http://{host}:{port}"
+    server.stop()
+
+
+@pytest.fixture
+def mock_settings_service(tmp_path):
+    """Create a mock settings service with S3 configuration."""
+    settings_service = Mock()
+    settings_service.settings.config_dir = str(tmp_path)
+    settings_service.settings.object_storage_bucket_name = f"primeagent-test-{uuid.uuid4().hex[:8]}"
+    settings_service.settings.object_storage_prefix = "files"
+    settings_service.settings.object_storage_tags = {"env": "test"}
+    settings_service.settings.object_storage_part_size = PART_SIZE
+    settings_service.settings.object_storage_max_pool_connections = 10
+    return settings_service
+
+
+@pytest.fixture
+async def s3_storage_service(monkeypatch, s3_endpoint, mock_settings_service):
+    """Create an S3StorageService backed by the moto server, with an empty bucket."""
+    monkeypatch.setenv("AWS_ENDPOINT_URL_S3", s3_endpoint)
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    service = S3StorageService(Mock(), mock_settings_service)
+    async with service._get_client() as s3_client:
+        await s3_client.create_bucket(Bucket=service.bucket_name)
+    yield service
+    await service.teardown()
+
+
+async def _chunks(data: bytes, chunk_size: int = 1024 * 1024):
+    for start in range(0, len(data), chunk_size):
+        yield data[start : start + chunk_size]
+
+
+async def _head(service: S3StorageService, flow_id: str, file_name: str) -> dict:
+    async with service._get_client() as s3_client:
+        return await s3_client.head_object(Bucket=service.bucket_name, Key=service.build_full_path(flow_id, file_name))
+
+
+async def _tags(service: S3StorageService, flow_id: str, file_name: str) -> dict[str, str]:
+    async with service._get_client() as s3_client:
+        response = await s3_client.get_object_tagging(
+            Bucket=service.bucket_name, Key=service.build_full_path(flow_id, file_name)
+        )
+    return {tag["Key"]: tag["Value"] for tag in response["TagSet"]}
+
+
+@pytest.mark.asyncio
+class TestS3StorageServiceSave:
+    """Test saving files to S3."""
+
+    async def test_save_and_get_file(self, s3_storage_service):
+        """Test saving a file and reading it back whole and as a stream."""
+        await s3_storage_service.save_file("flow", "hello.txt", b"Hello, World!")
+
+        assert await s3_storage_service.get_file("flow", "hello.txt") == b"Hello, World!"
+        chunks = [chunk async for chunk in s3_storage_service.get_file_stream("flow", "hello.txt", chunk_size=5)]
+        assert b"".join(chunks) == b"Hello, World!"
+        assert await s3_storage_service.get_file_size("flow", "hello.txt") == 13
+        assert await _tags(s3_storage_service, "flow", "hello.txt") == {"env": "test"}
+
+    async def test_small_stream_is_saved_in_one_request(self, s3_storage_service):
+        """Test that a stream smaller than a part is saved as a single object."""
+        data = b"x" * (PART_SIZE - 1)
+
+        await s3_storage_service.save_file_stream("flow", "small.bin", _chunks(data))
+
+        head = await _head(s3_storage_service, "flow", "small.bin")
+        assert "-" not in head["ETag"]
+        assert await s3_storage_service.get_file("flow", "small.bin") == data
+
+    async def test_large_stream_is_saved_in_parts(self, s3_storage_service):
+        """Test that a stream larger than a part is saved as a multipart upload."""
+        data = bytes(range(256)) * (PART_SIZE * 2 // 256) + b"tail"
+
+        await s3_storage_service.save_file_stream("flow", "large.bin", _chunks(data))
+
+        head = await _head(s3_storage_service, "flow", "large.bin")
+        # Multipart uploads have an ETag ending in the number of parts
+        assert head["ETag"].strip('"').endswith("-3")
+        assert head["ContentLength"] == len(data)
+        assert await s3_storage_service.get_file("flow", "large.bin") == data
+        assert await _tags(s3_storage_service, "flow", "large.bin") == {"env": "test"}
+
+    async def test_failed_stream_aborts_upload(self, s3_storage_service):
+        """Test that a stream that fails part way aborts the multipart upload and saves nothing."""
+
+        async def failing_chunks():
+            yield b"x" * PART_SIZE
+            msg = "upload interrupted"
+            raise ConnectionError(msg)
+
+        with pytest.raises(RuntimeError, match="upload interrupted"):
+            await s3_storage_service.save_file_stream("flow", "broken.bin", failing_chunks())
+
+        async with s3_storage_service._get_client() as s3_client:
+            uploads = await s3_client.list_multipart_uploads(Bucket=s3_storage_service.bucket_name)
+        assert uploads.get("Uploads", []) == []
+        assert await s3_storage_service.list_files("flow") == []
+
+    async def test_append_is_not_supported(self, s3_storage_service):
+        """Test that appending raises NotImplementedError."""
+        with pytest.raises(NotImplementedError):
+            await s3_storage_service.save_file_stream("flow", "log.txt", _chunks(b"line"), append=True)
+
+    async def test_missing_bucket(self, s3_storage_service):
+        """Test that saving to a bucket that does not exist raises FileNotFoundError."""
+        s3_storage_service.bucket_name = "primeagent-missing-bucket"
+
+        with pytest.raises(FileNotFoundError, match="does not exist"):
+            await s3_storage_service.save_file("flow", "file.txt", b"data")
+
+
+@pytest.mark.asyncio
+class TestS3StorageServiceClient:
+    """Test the shared S3 client."""
+
+    async def test_client_is_shared(self, s3_storage_service):
+        """Test that every call uses the same client."""
+        async with s3_storage_service._get_client() as first, s3_storage_service._get_client() as second:
+            assert first is second
+
+        await s3_storage_service.save_file("flow", "a.txt", b"a")
+        async with s3_storage_service._get_client() as client:
+            assert client is first
+
+    async def test_teardown_closes_client(self, s3_storage_service):
+        """Test that teardown closes the client and a later call creates a new one."""
+        async with s3_storage_service._get_client() as first:
+            pass
+
+        await s3_storage_service.teardown()
+
+        assert s3_storage_service._client is None
+        async with s3_storage_service._get_client() as second:
+            assert second is not first
+        assert await s3_storage_service.list_files("flow") == []
+
+    async def test_get_missing_file(self, s3_storage_service):
+        """Test that reading a missing file raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            await s3_storage_service.get_file("flow", "missing.txt")
+        with pytest.raises(FileNotFoundError):
+            await s3_storage_service.get_file_size("flow", "missing.txt")
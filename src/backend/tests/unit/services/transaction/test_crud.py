@@ -0,0 +1,46 @@
+"""Tests for the batched transaction crud."""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+from uuid import uuid4
+
+from primeagent.services.database.models.transactions.crud import log_transactions
+from primeagent.services.database.models.transactions.model import TransactionBase, TransactionTable
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import func, select
+
+
+def _transaction(flow_id, offset_seconds: int) -> TransactionBase:
+    return TransactionBase(
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=offset_seconds),
+        vertex_id=f"vertex-{offset_seconds}",
+        inputs=None,
+        outputs=None,
+        status="success",
+        flow_id=flow_id,
+    )
+
+
+async def test_log_transactions_keeps_newest_per_flow(async_session: AsyncSession):
+    flow_a, flow_b = uuid4(), uuid4()
+    batch = [_transaction(flow_a, i) for i in range(5)] + [_transaction(flow_b, i) for i in range(2)]
+    settings_service = SimpleNamespace(settings=SimpleNamespace(max_transactions_to_keep=3))
+
+    with patch(
+        "primeagent.services.database.models.transactions.crud.get_settings_service", return_value=settings_service
+    ):
+        tables = await log_transactions(async_session, batch)
+
+    assert len(tables) == 7
+
+    async def count(flow_id) -> int:
+        stmt = select(func.count()).select_from(TransactionTable).where(TransactionTable.flow_id == flow_id)
+        return (await async_session.exec(stmt)).one()
+
+    assert await count(flow_a) == 3
+    assert await count(flow_b) == 2
+    vertex_ids = (
+        await async_session.exec(select(TransactionTable.vertex_id).where(TransactionTable.flow_id == flow_a))
+    ).all()
+    assert sorted(vertex_ids) == ["vertex-2", "vertex-3", "vertex-4"]
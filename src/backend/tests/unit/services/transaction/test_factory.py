@@ -23,6 +23,10 @@ class TestTransactionServiceFactory:
         settings_service = MagicMock()
         settings_service.settings = MagicMock()
         settings_service.settings.transactions_storage_enabled = True
+        settings_service.settings.transactions_batch_size = 100
+        settings_service.settings.transactions_flush_interval = 1.0
+        settings_service.settings.transactions_queue_size = 10_000
+        settings_service.settings.transactions_overflow_policy = "drop"
         return settings_service
 
     def test_should_extend_service_factory(self, factory: TransactionServiceFactory) -> None:
@@ -17,6 +17,10 @@ class TestTransactionService:
         settings_service = MagicMock()
         settings_service.settings = MagicMock()
         settings_service.settings.transactions_storage_enabled = True
+        settings_service.settings.transactions_batch_size = 100
+        settings_service.settings.transactions_flush_interval = 60.0
+        settings_service.settings.transactions_queue_size = 10
+        settings_service.settings.transactions_overflow_policy = "drop"
         return settings_service
 
     @pytest.fixture
@@ -25,12 +29,19 @@ class TestTransactionService:
         settings_service = MagicMock()
         settings_service.settings = MagicMock()
         settings_service.settings.transactions_storage_enabled = False
+        settings_service.settings.transactions_batch_size = 100
+        settings_service.settings.transactions_flush_interval = 60.0
+        settings_service.settings.transactions_queue_size = 10
+        settings_service.settings.transactions_overflow_policy = "drop"
         return settings_service
 
     @pytest.fixture
-    def service(self, mock_settings_service: MagicMock) -> TransactionService:
+    def service(self, mock_settings_service: MagicMock):
         """Create a TransactionService instance for testing."""
-        return TransactionService(mock_settings_service)
+        service = TransactionService(mock_settings_service)
+        yield service
+        if service.buffer._task is not None:
+            service.buffer._task.cancel()
 
     @pytest.fixture
     def service_disabled(self, mock_settings_service_disabled: MagicMock) -> TransactionService:
@@ -74,7 +85,7 @@ class TestTransactionService:
 
         with (
             patch("primeagent.services.transaction.service.session_scope") as mock_session_scope,
-            patch("primeagent.services.transaction.service.crud_log_transaction", mock_crud) as mock_log,
+            patch("primeagent.services.transaction.service.crud_log_transactions", mock_crud) as mock_log,
         ):
             mock_session_scope.return_value.__aenter__ = AsyncMock(return_value=mock_session)
             mock_session_scope.return_value.__aexit__ = AsyncMock(return_value=None)
@@ -86,10 +97,11 @@ class TestTransactionService:
                 outputs={"result": "output"},
                 status="success",
             )
+            await service.flush()
 
             mock_log.assert_called_once()
             call_args = mock_log.call_args
-            transaction = call_args[0][1]
+            transaction = call_args[0][1][0]
             assert transaction.vertex_id == "test-vertex-id"
             assert transaction.status == "success"
             assert transaction.flow_id == UUID("550e8400-e29b-41d4-a716-446655440000")
@@ -102,7 +114,7 @@ class TestTransactionService:
 
         with (
             patch("primeagent.services.transaction.service.session_scope") as mock_session_scope,
-            patch("primeagent.services.transaction.service.crud_log_transaction", mock_crud),
+            patch("primeagent.services.transaction.service.crud_log_transactions", mock_crud),
         ):
             mock_session_scope.return_value.__aenter__ = AsyncMock(return_value=mock_session)
             mock_session_scope.return_value.__aexit__ = AsyncMock(return_value=None)
@@ -114,9 +126,10 @@ class TestTransactionService:
                 outputs=None,
                 status="success",
             )
+            await service.flush()
 
             call_args = mock_crud.call_args
-            transaction = call_args[0][1]
+            transaction = call_args[0][1][0]
             assert isinstance(transaction.flow_id, UUID)
 
     @pytest.mark.asyncio
@@ -127,7 +140,7 @@ class TestTransactionService:
 
         with (
             patch("primeagent.services.transaction.service.session_scope") as mock_session_scope,
-            patch("primeagent.services.transaction.service.crud_log_transaction", mock_crud),
+            patch("primeagent.services.transaction.service.crud_log_transactions", mock_crud),
         ):
             mock_session_scope.return_value.__aenter__ = AsyncMock(return_value=mock_session)
             mock_session_scope.return_value.__aexit__ = AsyncMock(return_value=None)
@@ -140,9 +153,10 @@ class TestTransactionService:
                 status="error",
                 error="Something went wrong",
             )
+            await service.flush()
 
             call_args = mock_crud.call_args
-            transaction = call_args[0][1]
+            transaction = call_args[0][1][0]
             assert transaction.status == "error"
             assert transaction.error == "Something went wrong"
 
@@ -154,7 +168,7 @@ class TestTransactionService:
 
         with (
             patch("primeagent.services.transaction.service.session_scope") as mock_session_scope,
-            patch("primeagent.services.transaction.service.crud_log_transaction", mock_crud),
+            patch("primeagent.services.transaction.service.crud_log_transactions", mock_crud),
         ):
             mock_session_scope.return_value.__aenter__ = AsyncMock(return_value=mock_session)
             mock_session_scope.return_value.__aexit__ = AsyncMock(return_value=None)
@@ -167,9 +181,10 @@ class TestTransactionService:
                 status="success",
                 target_id="target-vertex-id",
             )
+            await service.flush()
 
             call_args = mock_crud.call_args
-            transaction = call_args[0][1]
+            transaction = call_args[0][1][0]
             assert transaction.target_id == "target-vertex-id"
 
     @pytest.mark.asyncio
@@ -186,3 +201,122 @@ class TestTransactionService:
                 outputs={"result": "output"},
                 status="success",
             )
+            await service.flush()
+
+        stats = service.stats()
+        assert stats["errors"] == 1
+        assert stats["dropped"] == 1
+        assert stats["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_should_write_queued_transactions_in_one_batch(self, service: TransactionService) -> None:
+        """Verify queued transactions are written with a single bulk insert."""
+        mock_crud = AsyncMock()
+
+        with (
+            patch("primeagent.services.transaction.service.session_scope") as mock_session_scope,
+            patch("primeagent.services.transaction.service.crud_log_transactions", mock_crud),
+        ):
+            mock_session_scope.return_value.__aenter__ = AsyncMock(return_value=AsyncMock())
+            mock_session_scope.return_value.__aexit__ = AsyncMock(return_value=None)
+
+            for i in range(3):
+                await service.log_transaction(
+                    flow_id="550e8400-e29b-41d4-a716-446655440000",
+                    vertex_id=f"vertex-{i}",
+                    inputs=None,
+                    outputs=None,
+                    status="success",
+                )
+            mock_crud.assert_not_called()
+            assert service.stats()["pending"] == 3
+
+            assert await service.flush() == 3
+
+        mock_crud.assert_called_once()
+        assert [transaction.vertex_id for transaction in mock_crud.call_args[0][1]] == [
+            "vertex-0",
+            "vertex-1",
+            "vertex-2",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_should_drop_transactions_when_queue_is_full(self, service: TransactionService) -> None:
+        """Verify the drop policy counts transactions that do not fit in the queue."""
+        for i in range(12):
+            await service.log_transaction(
+                flow_id="550e8400-e29b-41d4-a716-446655440000",
+                vertex_id=f"vertex-{i}",
+                inputs=None,
+                outputs=None,
+                status="success",
+            )
+
+        stats = service.stats()
+        assert stats["pending"] == 10
+        assert stats["dropped"] == 2
+
+    @pytest.mark.asyncio
+    async def test_should_block_until_queue_has_room(self, mock_settings_service: MagicMock) -> None:
+        """Verify the block policy makes the caller wait for the next write instead of dropping."""
+        mock_settings_service.settings.transactions_queue_size = 1
+        mock_settings_service.settings.transactions_overflow_policy = "block"
+        service = TransactionService(mock_settings_service)
+        mock_crud = AsyncMock()
+
+        with (
+            patch("primeagent.services.transaction.service.session_scope") as mock_session_scope,
+            patch("primeagent.services.transaction.service.crud_log_transactions", mock_crud),
+        ):
+            mock_session_scope.return_value.__aenter__ = AsyncMock(return_value=AsyncMock())
+            mock_session_scope.return_value.__aexit__ = AsyncMock(return_value=None)
+
+            for i in range(3):
+                await service.log_transaction(
+                    flow_id="550e8400-e29b-41d4-a716-446655440000",
+                    vertex_id=f"vertex-{i}",
+                    inputs=None,
+                    outputs=None,
+                    status="success",
+                )
+            await service.teardown()
+
+        stats = service.stats()
+        assert stats["dropped"] == 0
+        assert stats["written"] == 3
+
+    @pytest.mark.asyncio
+    async def test_should_discard_queued_transactions_of_deleted_flow(self, service: TransactionService) -> None:
+        """Verify discard_flow drops only the queued transactions of that flow."""
+        for flow_id in ("550e8400-e29b-41d4-a716-446655440000", "650e8400-e29b-41d4-a716-446655440000"):
+            await service.log_transaction(
+                flow_id=flow_id, vertex_id="vertex", inputs=None, outputs=None, status="success"
+            )
+
+        service.discard_flow(UUID("550e8400-e29b-41d4-a716-446655440000"))
+
+        assert service.stats()["pending"] == 1
+
+    @pytest.mark.asyncio
+    async def test_should_flush_on_teardown(self, service: TransactionService) -> None:
+        """Verify teardown writes the transactions still in the queue."""
+        mock_crud = AsyncMock()
+
+        with (
+            patch("primeagent.services.transaction.service.session_scope") as mock_session_scope,
+            patch("primeagent.services.transaction.service.crud_log_transactions", mock_crud),
+        ):
+            mock_session_scope.return_value.__aenter__ = AsyncMock(return_value=AsyncMock())
+            mock_session_scope.return_value.__aexit__ = AsyncMock(return_value=None)
+
+            await service.log_transaction(
+                flow_id="550e8400-e29b-41d4-a716-446655440000",
+                vertex_id="test-vertex-id",
+                inputs=None,
+                outputs=None,
+                status="success",
+            )
+            await service.teardown()
+
+        mock_crud.assert_called_once()
+        assert service.stats()["pending"] == 0
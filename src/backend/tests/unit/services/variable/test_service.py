@@ -3,6 +3,7 @@ from unittest.mock import patch
 from uuid import uuid4
 
 import pytest
+from primeagent.services.auth import utils as auth_utils
 from primeagent.services.database.models.variable.model import VariableUpdate
 from primeagent.services.deps import get_settings_service
 from primeagent.services.variable.constants import CREDENTIAL_TYPE
@@ -240,3 +241,83 @@ async def test_create_variable(service, session: AsyncSession):
     assert result.type == CREDENTIAL_TYPE
     assert isinstance(result.created_at, datetime)
     assert result.updated_at is None  # Should be None on creation
+
+
+async def test_get_variable__decrypted_value_is_cached(service, session: AsyncSession):
+    user_id = uuid4()
+    await service.create_variable(user_id, "name", "value", session=session)
+
+    with (
+        patch.object(session, "exec", wraps=session.exec) as exec_,
+        patch("primeagent.services.auth.utils.decrypt_api_key", wraps=auth_utils.decrypt_api_key) as decrypt,
+    ):
+        assert await service.get_variable(user_id, "name", "", session=session) == "value"
+        assert await service.get_variable(user_id, "name", "", session=session) == "value"
+
+    assert exec_.call_count == 1
+    assert decrypt.call_count == 1
+    with pytest.raises(TypeError):
+        await service.get_variable(user_id, "name", "session_id", session=session)
+
+
+async def test_prefetch_variables__single_query(service, session: AsyncSession):
+    user_id = uuid4()
+    for name in ("A", "B", "C"):
+        await service.create_variable(user_id, name, f"value-{name}", session=session)
+    await service.create_variable(uuid4(), "D", "other user", session=session)
+
+    with patch.object(session, "exec", wraps=session.exec) as exec_:
+        await service.prefetch_variables(user_id, {"A", "B", "D", "missing"}, session=session)
+        assert await service.get_variable(user_id, "A", "", session=session) == "value-A"
+        assert await service.get_variable(user_id, "B", "", session=session) == "value-B"
+
+    assert exec_.call_count == 1
+    with pytest.raises(ValueError, match=r"D variable not found\."):
+        await service.get_variable(user_id, "D", "", session=session)
+
+
+async def test_variable_cache__invalidated_on_update(service, session: AsyncSession):
+    user_id = uuid4()
+    saved = await service.create_variable(user_id, "name", "value", session=session)
+    await service.get_variable(user_id, "name", "", session=session)
+
+    await service.update_variable(user_id, "name", "updated", session=session)
+    assert await service.get_variable(user_id, "name", "", session=session) == "updated"
+
+    await service.update_variable_fields(
+        user_id=user_id,
+        variable_id=saved.id,
+        variable=VariableUpdate(id=saved.id, name="renamed", value="again"),
+        session=session,
+    )
+    assert await service.get_variable(user_id, "renamed", "", session=session) == "again"
+    with pytest.raises(ValueError, match=r"name variable not found\."):
+        await service.get_variable(user_id, "name", "", session=session)
+
+
+async def test_delete_user_variables__clears_cache(service, session: AsyncSession):
+    user_id, other_user_id = uuid4(), uuid4()
+    await service.create_variable(user_id, "name", "value", session=session)
+    await service.create_variable(other_user_id, "name", "other", session=session)
+    await service.get_variable(user_id, "name", "", session=session)
+    await service.get_variable(other_user_id, "name", "", session=session)
+
+    await service.delete_user_variables(user_id, session=session)
+
+    assert await service.list_variables(user_id, session=session) == []
+    with pytest.raises(ValueError, match=r"name variable not found\."):
+        await service.get_variable(user_id, "name", "", session=session)
+    assert await service.get_variable(other_user_id, "name", "", session=session) == "other"
+
+
+async def test_variable_cache__disabled(service, session: AsyncSession, monkeypatch):
+    monkeypatch.setattr(service.settings_service.settings, "variable_cache_ttl", 0)
+    user_id = uuid4()
+    await service.create_variable(user_id, "name", "value", session=session)
+
+    with patch.object(session, "exec", wraps=session.exec) as exec_:
+        await service.prefetch_variables(user_id, {"name"}, session=session)
+        await service.get_variable(user_id, "name", "", session=session)
+        await service.get_variable(user_id, "name", "", session=session)
+
+    assert exec_.call_count == 2
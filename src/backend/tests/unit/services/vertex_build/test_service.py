@@ -0,0 +1,157 @@
+"""Tests for VertexBuildService."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from primeagent.services.database.models.vertex_builds.model import VertexBuildBase, VertexBuildTable
+from primeagent.services.vertex_build.service import VertexBuildService
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import func, select
+
+
+def _settings_service(**overrides) -> SimpleNamespace:
+    settings = {
+        "max_vertex_builds_to_keep": 5,
+        "max_vertex_builds_per_vertex": 2,
+        "vertex_builds_batch_size": 2,
+        "vertex_builds_flush_interval": 60.0,
+        "vertex_builds_retention_interval": 60.0,
+    }
+    settings.update(overrides)
+    return SimpleNamespace(settings=SimpleNamespace(**settings))
+
+
+def _build(flow_id, vertex_id: str, offset_seconds: int = 0) -> VertexBuildBase:
+    return VertexBuildBase(
+        id=vertex_id,
+        flow_id=flow_id,
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=offset_seconds),
+        artifacts={},
+        valid=True,
+    )
+
+
+async def _count(session: AsyncSession, *conditions) -> int:
+    return (await session.exec(select(func.count()).select_from(VertexBuildTable).where(*conditions))).one()
+
+
+@pytest.fixture
+def use_test_session(async_session: AsyncSession):
+    @asynccontextmanager
+    async def session_scope():
+        yield async_session
+        await async_session.commit()
+
+    with patch("primeagent.services.vertex_build.service.session_scope", session_scope):
+        yield async_session
+
+
+@pytest.fixture
+async def service():
+    service = VertexBuildService(_settings_service())
+    yield service
+    service._stopping = True
+    service.buffer._closed = True
+    for task in (service.buffer._task, service._sweep_task):
+        if task is not None:
+            task.cancel()
+
+
+async def test_log_vertex_build_is_buffered_until_flush(service, use_test_session):
+    flow_id = uuid4()
+    for i in range(5):
+        service.log_vertex_build(_build(flow_id, f"vertex-{i}", i))
+
+    assert await _count(use_test_session) == 0
+
+    await service.flush()
+
+    assert await _count(use_test_session) == 5
+    assert service.stats()["pending"] == 0
+    assert service.buffer.written == 5
+
+
+async def test_flush_writes_in_batches(service, use_test_session):
+    flow_id = uuid4()
+    service.buffer._pending = [VertexBuildTable(**_build(flow_id, f"vertex-{i}", i).model_dump()) for i in range(5)]
+
+    assert await service.flush() == 5
+    assert service.buffer.batches == 3
+    assert await _count(use_test_session, VertexBuildTable.flow_id == flow_id) == 5
+
+
+async def test_full_batch_wakes_the_writer(service, use_test_session):
+    flow_id = uuid4()
+    service.log_vertex_build(_build(flow_id, "vertex", 0))
+    service.log_vertex_build(_build(flow_id, "vertex", 1))
+
+    for _ in range(50):
+        if service.buffer.written == 2:
+            break
+        await asyncio.sleep(0.01)
+
+    assert service.buffer.written == 2
+    assert await _count(use_test_session, VertexBuildTable.flow_id == flow_id) == 2
+
+
+async def test_sweep_enforces_retention_limits(service, use_test_session):
+    flow_id = uuid4()
+    for i in range(4):
+        service.log_vertex_build(_build(flow_id, "vertex-a", i))
+    for i in range(4):
+        service.log_vertex_build(_build(flow_id, "vertex-b", 10 + i))
+    await service.flush()
+
+    deleted = await service.sweep()
+
+    # Two builds are kept per vertex, then only the five newest globally would be kept
+    assert deleted == 4
+    assert await _count(use_test_session, VertexBuildTable.id == "vertex-a") == 2
+    assert await _count(use_test_session, VertexBuildTable.id == "vertex-b") == 2
+    newest_a = (
+        await use_test_session.exec(
+            select(func.max(VertexBuildTable.timestamp)).where(VertexBuildTable.id == "vertex-a")
+        )
+    ).one()
+    assert newest_a.replace(tzinfo=timezone.utc) == datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=3)
+
+
+async def test_sweep_enforces_global_limit(service, use_test_session):
+    flow_id = uuid4()
+    for i in range(8):
+        service.log_vertex_build(_build(flow_id, f"vertex-{i}", i))
+    await service.flush()
+
+    await service.sweep()
+
+    assert await _count(use_test_session) == 5
+
+
+async def test_discard_flow_drops_pending_builds(service, use_test_session):
+    kept_flow, deleted_flow = uuid4(), uuid4()
+    service.buffer._pending = [
+        VertexBuildTable(**_build(kept_flow, "vertex").model_dump()),
+        VertexBuildTable(**_build(deleted_flow, "vertex").model_dump()),
+    ]
+
+    service.discard_flow(deleted_flow)
+    await service.flush()
+
+    assert await _count(use_test_session, VertexBuildTable.flow_id == kept_flow) == 1
+    assert await _count(use_test_session, VertexBuildTable.flow_id == deleted_flow) == 0
+
+
+async def test_teardown_flushes_pending_builds(use_test_session):
+    service = VertexBuildService(_settings_service())
+    flow_id = uuid4()
+    service.log_vertex_build(_build(flow_id, "vertex"))
+
+    await service.teardown()
+
+    assert service.buffer._task.done()
+    assert await _count(use_test_session, VertexBuildTable.flow_id == flow_id) == 1
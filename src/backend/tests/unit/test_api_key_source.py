@@ -50,6 +50,14 @@ def mock_inactive_user():
     return user
 
 
+@pytest.fixture(autouse=True)
+def mock_auth_service():
+    """Replace the auth service that caches API key users and counts their uses."""
+    auth_service = MagicMock()
+    with patch("primeagent.services.database.models.api_key.crud.get_auth_service", return_value=auth_service):
+        yield auth_service
+
+
 @pytest.fixture
 def mock_session():
     """Create a mock async database session."""
@@ -197,8 +205,8 @@ class TestCheckKeyFromDb:
     """Tests for database-based API key validation."""
 
     @pytest.mark.asyncio
-    async def test_valid_key_returns_user(self, mock_session, mock_user, mock_settings_service_db):
-        """Valid API key should return the associated user."""
+    async def test_valid_key_returns_user(self, mock_session, mock_user, mock_settings_service_db, mock_auth_service):
+        """Valid API key should return the associated user and cache it."""
         mock_api_key = MagicMock()
         mock_api_key.user = mock_user
         mock_api_key.total_uses = 0
@@ -210,7 +218,7 @@ class TestCheckKeyFromDb:
         result = await _check_key_from_db(mock_session, "sk-valid-key", mock_settings_service_db)
 
         assert result == mock_user
-        assert mock_api_key.total_uses == 1
+        mock_auth_service.cache_api_key_user.assert_called_once_with("sk-valid-key", mock_user, mock_api_key.id)
 
     @pytest.mark.asyncio
     async def test_invalid_key_returns_none(self, mock_session, mock_settings_service_db):
@@ -224,8 +232,10 @@ class TestCheckKeyFromDb:
         assert result is None
 
     @pytest.mark.asyncio
-    async def test_usage_tracking_increments(self, mock_session, mock_user, mock_settings_service_db):
-        """API key usage should be tracked when not disabled."""
+    async def test_usage_tracking_increments(
+        self, mock_session, mock_user, mock_settings_service_db, mock_auth_service
+    ):
+        """API key usage should be recorded for a batched write, not written by the request."""
         mock_api_key = MagicMock()
         mock_api_key.user = mock_user
         mock_api_key.total_uses = 5
@@ -236,12 +246,12 @@ class TestCheckKeyFromDb:
 
         await _check_key_from_db(mock_session, "sk-valid-key", mock_settings_service_db)
 
-        assert mock_api_key.total_uses == 6
-        mock_session.add.assert_called_once_with(mock_api_key)
-        mock_session.flush.assert_called_once()
+        mock_auth_service.record_api_key_use.assert_called_once_with(mock_api_key.id)
+        mock_session.add.assert_not_called()
+        mock_session.flush.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_usage_tracking_disabled(self, mock_session, mock_user, mock_settings_service_db):
+    async def test_usage_tracking_disabled(self, mock_session, mock_user, mock_settings_service_db, mock_auth_service):
         """API key usage should not be tracked when disabled."""
         mock_settings_service_db.settings.disable_track_apikey_usage = True
 
@@ -255,7 +265,7 @@ class TestCheckKeyFromDb:
 
         await _check_key_from_db(mock_session, "sk-valid-key", mock_settings_service_db)
 
-        assert mock_api_key.total_uses == 5  # Not incremented
+        mock_auth_service.record_api_key_use.assert_not_called()
         mock_session.add.assert_not_called()
 
     @pytest.mark.asyncio
@@ -0,0 +1,75 @@
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from primeagent.processing.graph_templates import (
+    GraphTemplateCache,
+    build_graph_from_flow,
+    graph_template_cache,
+    invalidate_graph_templates,
+)
+
+
+@pytest.fixture
+def flow(json_memory_chatbot_no_llm):
+    return SimpleNamespace(
+        id=uuid4(),
+        name="Memory Chatbot",
+        data=json.loads(json_memory_chatbot_no_llm)["data"],
+        updated_at=datetime.now(timezone.utc),
+    )
+
+
+@pytest.fixture(autouse=True)
+def _clear_graph_templates():
+    graph_template_cache.clear()
+    yield
+    graph_template_cache.clear()
+
+
+def test_same_flow_version_is_compiled_once(flow):
+    first = build_graph_from_flow(flow, {}, user_id="user")
+    second = build_graph_from_flow(flow, {}, user_id="user")
+
+    assert first is not second
+    assert [vertex.id for vertex in first.vertices] == [vertex.id for vertex in second.vertices]
+    assert first.vertices[0] is not second.vertices[0]
+    assert graph_template_cache.stats()["size"] == 1
+
+
+def test_tweaks_stream_and_updates_use_different_templates(flow):
+    build_graph_from_flow(flow, {})
+    build_graph_from_flow(flow, {}, stream=True)
+    build_graph_from_flow(flow, {"ChatInput": {"input_value": "hi"}})
+    flow.updated_at += timedelta(seconds=1)
+    build_graph_from_flow(flow, {})
+
+    assert graph_template_cache.stats()["size"] == 4
+
+
+def test_invalidate_drops_every_template_of_the_flow(flow):
+    build_graph_from_flow(flow, {})
+    build_graph_from_flow(flow, {}, stream=True)
+
+    invalidate_graph_templates(flow.id)
+
+    assert len(graph_template_cache) == 0
+
+
+def test_cache_is_bounded():
+    cache = GraphTemplateCache(max_size=2)
+    cache.set(("a", "", "", False), "template-a")
+    cache.set(("b", "", "", False), "template-b")
+    cache.set(("c", "", "", False), "template-c")
+
+    assert cache.get(("a", "", "", False)) is None
+    assert cache.get(("c", "", "", False)) == "template-c"
+
+
+def test_flow_without_data_raises(flow):
+    flow.data = None
+
+    with pytest.raises(ValueError, match="has no data"):
+        build_graph_from_flow(flow, {})
@@ -11,6 +11,18 @@ def _check_openai_api_key_in_environment_variables():
     pass
 
 
+async def _wait_for_first_attempt(client, job_id: str, api_key: str, polls: int = 100) -> dict:
+    """Poll a queued webhook run until its first attempt has ended, successfully or not."""
+    for _ in range(polls):
+        response = await client.get(f"api/v1/jobs/{job_id}", headers={"x-api-key": api_key})
+        assert response.status_code == 200
+        job = response.json()
+        if job["attempts"] >= 1 and job["status"] != "running":
+            return job
+        await asyncio.sleep(0.1)
+    pytest.fail(f"Job {job_id} was not run")
+
+
 # =============================================================================
 # SUCCESS TESTS
 # =============================================================================
@@ -27,6 +39,7 @@ async def test_webhook_endpoint_returns_202_accepted(client, added_webhook_test,
     assert response.status_code == 202
     assert response.json()["message"] == "Task started in the background"
     assert response.json()["status"] == "in progress"
+    assert response.json()["job_id"]
 
 
 async def test_webhook_endpoint_by_flow_id(client, added_webhook_test, created_api_key):
@@ -90,6 +103,7 @@ async def test_webhook_endpoint_with_valid_api_key(client, added_webhook_test, c
         # Should work with valid API key
         response = await client.post(endpoint, headers={"x-api-key": created_api_key.api_key}, json=payload)
         assert response.status_code == 202
+        await _wait_for_first_attempt(client, response.json()["job_id"], created_api_key.api_key)
         assert await file_path.exists(), f"File {file_path} does not exist"
 
     file_does_not_exist = not await file_path.exists()
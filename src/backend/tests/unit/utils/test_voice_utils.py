@@ -10,10 +10,13 @@ from primeagent.utils.voice_utils import (
     FRAME_DURATION_MS,
     SAMPLE_RATE_24K,
     VAD_SAMPLE_RATE_16K,
+    StreamingResampler,
+    StreamingVad,
     _write_bytes_to_file,
     resample_24k_to_16k,
     write_audio_to_file,
 )
+from scipy.signal import upfirdn
 
 
 class TestConstants:
@@ -172,6 +175,86 @@ class TestResample24kTo16k:
         assert target_samples == 320  # int(480 * 2 / 3)
 
 
+class TestStreamingResampler:
+    """Test cases for StreamingResampler."""
+
+    @staticmethod
+    def _signal(seconds=1.0):
+        rng = np.random.default_rng(0)
+        return rng.integers(-20000, 20000, int(SAMPLE_RATE_24K * seconds), dtype=np.int16)
+
+    def test_matches_upfirdn(self):
+        """Test that the streamed output equals a one-shot polyphase filter."""
+        samples = self._signal()
+        resampler = StreamingResampler()
+
+        result = np.frombuffer(resampler.process(samples.tobytes()), dtype=np.int16)
+
+        expected = upfirdn(resampler.taps, samples.astype(np.float64), 2, 3)
+        assert len(result) == len(samples) * 2 // 3
+        np.testing.assert_array_equal(result, np.rint(expected[: len(result)]).astype(np.int16))
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 960, 1001])
+    def test_output_does_not_depend_on_chunking(self, chunk_size):
+        """Test that filter state is kept across chunks, including odd byte counts."""
+        audio = self._signal().tobytes()
+        whole = StreamingResampler().process(audio)
+
+        resampler = StreamingResampler()
+        chunked = b"".join(resampler.process(audio[i : i + chunk_size]) for i in range(0, len(audio), chunk_size))
+
+        assert chunked == whole
+
+    def test_preserves_in_band_sine(self):
+        """Test that a 1kHz tone keeps its amplitude."""
+        t = np.arange(SAMPLE_RATE_24K) / SAMPLE_RATE_24K
+        samples = (np.sin(2 * np.pi * 1000 * t) * 16384).astype(np.int16)
+
+        result = np.frombuffer(StreamingResampler().process(samples.tobytes()), dtype=np.int16)
+
+        assert abs(int(np.max(result[100:])) - 16384) < 500
+
+    def test_reset(self):
+        """Test that reset starts a new stream."""
+        audio = self._signal(0.1).tobytes()
+        resampler = StreamingResampler()
+        first = resampler.process(audio)
+        resampler.reset()
+
+        assert resampler.process(audio) == first
+
+    def test_invalid_factors(self):
+        """Test that non-positive factors are rejected."""
+        with pytest.raises(ValueError, match="Resampling factors must be positive"):
+            StreamingResampler(up=0)
+
+
+class TestStreamingVad:
+    """Test cases for StreamingVad."""
+
+    def test_returns_one_flag_per_complete_frame(self):
+        """Test that partial frames are carried over to the next chunk."""
+        vad = MagicMock()
+        vad.is_speech.return_value = False
+        stream = StreamingVad(vad)
+
+        # 30ms of audio yields one 20ms frame, the next 30ms completes two more
+        assert stream.process(b"\x00" * (BYTES_PER_24K_FRAME * 3 // 2)) == [False]
+        assert stream.process(b"\x00" * (BYTES_PER_24K_FRAME * 3 // 2)) == [False, False]
+
+        for call in vad.is_speech.call_args_list:
+            frame, sample_rate = call.args
+            assert len(frame) == BYTES_PER_16K_FRAME
+            assert sample_rate == VAD_SAMPLE_RATE_16K
+
+    def test_reports_speech_per_frame(self):
+        """Test that the VAD result of each frame is returned in order."""
+        vad = MagicMock()
+        vad.is_speech.side_effect = [False, True, False]
+
+        assert StreamingVad(vad).process(b"\x00" * BYTES_PER_24K_FRAME * 3) == [False, True, False]
+
+
 class TestWriteAudioToFile:
     """Test cases for write_audio_to_file function."""
 
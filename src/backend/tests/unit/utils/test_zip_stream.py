@@ -0,0 +1,172 @@
+import asyncio
+import io
+import tracemalloc
+import zipfile
+from functools import partial
+
+import pytest
+from primeagent.utils.zip_stream import ZipEntry, iter_bytes, iter_zip_entries, stream_zip
+
+CHUNK_SIZE = 64 * 1024
+
+
+async def _chunks(data: bytes, chunk_size: int = CHUNK_SIZE):
+    for start in range(0, len(data), chunk_size):
+        await asyncio.sleep(0)
+        yield data[start : start + chunk_size]
+
+
+async def _collect(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+class TestStreamZip:
+    """Test cases for stream_zip."""
+
+    async def test_writes_entries_in_order(self):
+        contents = {f"file_{index}.bin": bytes([index]) * (CHUNK_SIZE * 3 + index) for index in range(10)}
+        entries = [ZipEntry(name, partial(_chunks, data)) for name, data in contents.items()]
+
+        archive = await _collect(stream_zip(entries, prefetch=3))
+
+        with zipfile.ZipFile(io.BytesIO(archive)) as zip_file:
+            assert zip_file.namelist() == list(contents)
+            for name, data in contents.items():
+                assert zip_file.read(name) == data
+
+    async def test_accepts_async_entries_and_compression(self):
+        async def entries():
+            for index in range(3):
+                yield ZipEntry(f"{index}.json", partial(iter_bytes, b'{"flow": %d}' % index))
+
+        archive = await _collect(stream_zip(entries(), compression=zipfile.ZIP_DEFLATED))
+
+        with zipfile.ZipFile(io.BytesIO(archive)) as zip_file:
+            assert [info.compress_type for info in zip_file.infolist()] == [zipfile.ZIP_DEFLATED] * 3
+            assert zip_file.read("2.json") == b'{"flow": 2}'
+
+    async def test_empty_archive(self):
+        archive = await _collect(stream_zip([]))
+
+        with zipfile.ZipFile(io.BytesIO(archive)) as zip_file:
+            assert zip_file.namelist() == []
+
+    async def test_fetches_at_most_prefetch_entries_ahead(self):
+        open_entries = 0
+        most_open = 0
+
+        async def content():
+            nonlocal open_entries, most_open
+            open_entries += 1
+            most_open = max(most_open, open_entries)
+            try:
+                async for chunk in _chunks(b"x" * CHUNK_SIZE * 4):
+                    yield chunk
+            finally:
+                open_entries -= 1
+
+        await _collect(stream_zip([ZipEntry(f"{index}.bin", content) for index in range(20)], prefetch=4))
+
+        # The entry being written, and the four fetched ahead of it
+        assert most_open == 5
+
+    async def test_raises_entry_error(self):
+        async def missing():
+            msg = "gone.bin"
+            raise FileNotFoundError(msg)
+            yield b""
+
+        entries = [ZipEntry("ok.bin", partial(iter_bytes, b"ok")), ZipEntry("gone.bin", missing)]
+
+        with pytest.raises(FileNotFoundError, match=r"gone\.bin"):
+            await _collect(stream_zip(entries))
+
+    async def test_closing_early_closes_every_source(self):
+        closed = []
+
+        async def content(index: int):
+            try:
+                while True:
+                    await asyncio.sleep(0)
+                    yield b"x" * CHUNK_SIZE
+            finally:
+                closed.append(index)
+
+        entries = [ZipEntry(f"{index}.bin", partial(content, index)) for index in range(3)]
+        archive = stream_zip(entries, prefetch=2)
+
+        # The consumer stops part way through the first entry, e.g. because the client disconnected
+        await anext(archive)
+        await archive.aclose()
+
+        assert sorted(closed) == [0, 1, 2]
+        current = asyncio.current_task()
+        assert [task for task in asyncio.all_tasks() if task is not current] == []
+
+    async def test_memory_does_not_grow_with_archive_size(self):
+        entry_size = 4 * 1024 * 1024
+        payload = b"p" * CHUNK_SIZE
+
+        async def content():
+            for _ in range(entry_size // CHUNK_SIZE):
+                await asyncio.sleep(0)
+                yield payload
+
+        async def peak_for(entry_count: int) -> int:
+            tracemalloc.start()
+            written = 0
+            async for chunk in stream_zip([ZipEntry(f"{index}.bin", content) for index in range(entry_count)]):
+                written += len(chunk)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            assert written > entry_count * entry_size
+            return peak
+
+        small, large = await peak_for(2), await peak_for(16)
+
+        # 64 MiB are written, but no more than the prefetch window is ever buffered
+        assert large < 8 * 1024 * 1024
+        assert large < small * 2
+
+
+class TestIterZipEntries:
+    """Test cases for iter_zip_entries."""
+
+    @staticmethod
+    def _archive(files: dict[str, bytes]) -> io.BytesIO:
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
+            zip_file.writestr("nested/", b"")
+            for name, data in files.items():
+                zip_file.writestr(name, data)
+        buffer.seek(0)
+        return buffer
+
+    async def test_reads_each_file(self):
+        files = {"a.json": b"{}", "nested/b.json": b"[]"}
+
+        entries = [entry async for entry in iter_zip_entries(self._archive(files), max_entry_size=1024)]
+
+        assert entries == list(files.items())
+
+    async def test_rejects_entries_over_the_limit(self):
+        archive = self._archive({"small.json": b"{}", "large.json": b"0" * 2048})
+
+        with pytest.raises(ValueError, match=r"large\.json is larger than 1024 bytes"):
+            _ = [entry async for entry in iter_zip_entries(archive, max_entry_size=1024)]
+
+    async def test_rejects_archives_over_the_total_limit(self):
+        archive = self._archive({f"{index}.json": b"0" * 600 for index in range(3)})
+
+        with pytest.raises(ValueError, match="larger than 1024 bytes once uncompressed"):
+            _ = [entry async for entry in iter_zip_entries(archive, max_entry_size=1024, max_total_size=1024)]
+
+    async def test_rejects_archives_with_too_many_entries(self):
+        archive = self._archive({f"{index}.json": b"{}" for index in range(4)})
+
+        with pytest.raises(ValueError, match="more than 3 files"):
+            _ = [entry async for entry in iter_zip_entries(archive, max_entry_size=1024, max_entries=3)]
+
+    async def test_rejects_non_zip_files(self):
+        with pytest.raises(zipfile.BadZipFile):
+            _ = [entry async for entry in iter_zip_entries(io.BytesIO(b"{}"), max_entry_size=1024)]
@@ -0,0 +1,91 @@
+import { useMessagesStore } from "@/stores/messagesStore";
+import type { Message } from "@/types/messages";
+import { useHandleWebsocketMessage } from "../use-handle-websocket-message";
+
+const agentMessage: Message = {
+  id: "msg-1",
+  text: "",
+  sender: "Machine",
+  sender_name: "AI",
+  session_id: "session-1",
+  timestamp: "2023-01-01T00:00:00Z",
+  files: [],
+  edit: false,
+  background_color: "",
+  text_color: "",
+  flow_id: "flow-1",
+  version: 1,
+  content_blocks: [
+    {
+      title: "Agent Steps",
+      contents: [{ type: "text", text: "thinking" }],
+      allow_markdown: true,
+    } as any,
+  ],
+};
+
+function buildEvent(event: string, data: unknown): MessageEvent {
+  return {
+    data: JSON.stringify({
+      type: "flow.build.progress",
+      data: { event, data },
+    }),
+  } as MessageEvent;
+}
+
+function handle(event: MessageEvent) {
+  useHandleWebsocketMessage(
+    event,
+    jest.fn(),
+    { current: null },
+    { current: [] },
+    { current: false },
+    jest.fn(),
+    jest.fn(),
+    jest.fn(),
+    jest.fn(),
+    jest.fn(),
+    [],
+    jest.fn(),
+    useMessagesStore.getState(),
+    jest.fn(),
+    jest.fn(),
+    jest.fn(),
+    jest.fn(),
+    true,
+    jest.fn(),
+  );
+}
+
+describe("useHandleWebsocketMessage", () => {
+  beforeEach(() => {
+    useMessagesStore.setState({ messages: [], displayLoadingMessage: false });
+  });
+
+  it("should apply streamed agent updates to the added message", () => {
+    handle(buildEvent("add_message", agentMessage));
+    handle(
+      buildEvent("message_update", {
+        id: agentMessage.id,
+        version: 2,
+        base_version: 1,
+        ops: [
+          {
+            op: "add",
+            path: "/content_blocks/0/contents/-",
+            value: { type: "tool_use", name: "search" },
+          },
+          { op: "replace", path: "/text", value: "answer" },
+        ],
+      }),
+    );
+
+    const [message] = useMessagesStore.getState().messages;
+    expect(message.version).toBe(2);
+    expect(message.text).toBe("answer");
+    expect(message.content_blocks?.[0].contents).toEqual([
+      { type: "text", text: "thinking" },
+      { type: "tool_use", name: "search" },
+    ]);
+  });
+});
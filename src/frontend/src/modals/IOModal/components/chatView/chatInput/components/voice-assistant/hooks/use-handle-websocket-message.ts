@@ -115,6 +115,11 @@ export const useHandleWebsocketMessage = (
         case "add_message":
           messagesStore.addMessage(buildData.data);
           break;
+
+        case "message_update":
+          // Agents re-send their message as changes to the copy added before
+          messagesStore.applyMessageUpdate(buildData.data);
+          break;
       }
       break;
     }
@@ -471,6 +471,97 @@ describe("useMessagesStore", () => {
     });
   });
 
+  describe("applyMessageUpdate", () => {
+    const versionedMessage: Message = {
+      ...mockMachineMessage,
+      version: 1,
+      content_blocks: [
+        {
+          title: "Agent Steps",
+          contents: [{ type: "text", text: "thinking" }],
+          allow_markdown: true,
+        } as any,
+      ],
+    };
+
+    it("should apply operations when the base version matches", () => {
+      const { result } = renderHook(() => useMessagesStore());
+
+      act(() => {
+        result.current.setMessages([versionedMessage]);
+      });
+
+      act(() => {
+        result.current.applyMessageUpdate({
+          id: versionedMessage.id,
+          version: 2,
+          base_version: 1,
+          ops: [
+            {
+              op: "replace",
+              path: "/content_blocks/0/contents/0",
+              value: { type: "text", text: "done" },
+            },
+            {
+              op: "add",
+              path: "/content_blocks/0/contents/-",
+              value: { type: "tool_use", name: "search" },
+            },
+            { op: "replace", path: "/text", value: "answer" },
+          ],
+        });
+      });
+
+      const message = result.current.messages[0];
+      expect(message.version).toBe(2);
+      expect(message.text).toBe("answer");
+      expect(message.content_blocks?.[0].contents).toEqual([
+        { type: "text", text: "done" },
+        { type: "tool_use", name: "search" },
+      ]);
+      // The previous message object is left untouched
+      expect(versionedMessage.content_blocks?.[0].contents).toHaveLength(1);
+    });
+
+    it("should ignore an update with a version gap", () => {
+      const { result } = renderHook(() => useMessagesStore());
+
+      act(() => {
+        result.current.setMessages([versionedMessage]);
+      });
+
+      act(() => {
+        result.current.applyMessageUpdate({
+          id: versionedMessage.id,
+          version: 4,
+          base_version: 3,
+          ops: [{ op: "replace", path: "/text", value: "answer" }],
+        });
+      });
+
+      expect(result.current.messages[0]).toEqual(versionedMessage);
+    });
+
+    it("should ignore an update for a non-existent message", () => {
+      const { result } = renderHook(() => useMessagesStore());
+
+      act(() => {
+        result.current.setMessages([mockMessage]);
+      });
+
+      act(() => {
+        result.current.applyMessageUpdate({
+          id: "non-existent",
+          version: 2,
+          base_version: 1,
+          ops: [{ op: "replace", path: "/text", value: "answer" }],
+        });
+      });
+
+      expect(result.current.messages).toEqual([mockMessage]);
+    });
+  });
+
   describe("clearMessages", () => {
     it("should clear all messages", () => {
       const { result } = renderHook(() => useMessagesStore());
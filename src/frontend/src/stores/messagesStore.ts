@@ -1,6 +1,39 @@
 import { create } from "zustand";
+import type {
+  Message,
+  MessageUpdateOperation,
+} from "../types/messages";
 import type { MessagesStoreType } from "../types/zustand/messages";
 
+// Applies add/replace JSON Patch operations, copying every container on the path.
+function applyOperations(
+  message: Message,
+  ops: MessageUpdateOperation[],
+): Message {
+  const root: any = { ...message };
+  for (const { op, path, value } of ops) {
+    const keys = path.split("/").slice(1);
+    let parent = root;
+    for (const key of keys.slice(0, -1)) {
+      const child = parent[key];
+      parent[key] = Array.isArray(child) ? [...child] : { ...child };
+      parent = parent[key];
+    }
+    const last = keys[keys.length - 1];
+    if (op === "add" && Array.isArray(parent)) {
+      if (last === "-") {
+        parent.push(value);
+      } else {
+        parent.splice(Number(last), 0, value);
+      }
+    } else {
+      parent[last] = value;
+    }
+  }
+  return root;
+}
+
+
 export const useMessagesStore = create<MessagesStoreType>((set, get) => ({
   displayLoadingMessage: false,
   deleteSession: (id) => {
@@ -77,6 +110,29 @@ export const useMessagesStore = create<MessagesStoreType>((set, get) => ({
       return { messages: updatedMessages };
     });
   },
+  applyMessageUpdate: (update) => {
+    set((state) => {
+      // look for the message list backwards to find the message faster
+      let index = state.messages.length - 1;
+      while (index >= 0 && state.messages[index].id !== update.id) {
+        index--;
+      }
+      // A missing message or version gap means an event was lost; the next
+      // full add_message event brings the message back in sync.
+      if (
+        index === -1 ||
+        state.messages[index].version !== update.base_version
+      ) {
+        return state;
+      }
+      const updatedMessages = [...state.messages];
+      updatedMessages[index] = {
+        ...applyOperations(state.messages[index], update.ops),
+        version: update.version,
+      };
+      return { messages: updatedMessages };
+    });
+  },
   clearMessages: () => {
     set(() => ({ messages: [] }));
   },
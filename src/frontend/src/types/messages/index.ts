@@ -15,6 +15,20 @@ type Message = {
   category?: string;
   properties?: any;
   content_blocks?: ContentBlock[];
+  version?: number;
 };
 
-export type { Message };
+type MessageUpdateOperation = {
+  op: "add" | "replace";
+  path: string;
+  value: unknown;
+};
+
+type MessageUpdate = {
+  id: string;
+  version: number;
+  base_version: number;
+  ops: MessageUpdateOperation[];
+};
+
+export type { Message, MessageUpdate, MessageUpdateOperation };
@@ -1,4 +1,4 @@
-import type { Message } from "../../messages";
+import type { Message, MessageUpdate } from "../../messages";
 
 export type MessagesStoreType = {
   messages: Message[];
@@ -8,6 +8,7 @@ export type MessagesStoreType = {
   updateMessage: (message: Message) => void;
   updateMessagePartial: (message: Partial<Message>) => void;
   updateMessageText: (id: string, chunk: string) => void;
+  applyMessageUpdate: (update: MessageUpdate) => void;
   clearMessages: () => void;
   removeMessages: (ids: string[]) => void;
   deleteSession: (id: string) => void;
@@ -560,6 +560,11 @@ async function onEvent(
       useMessagesStore.getState().addMessage(data);
       return true;
     }
+    case "message_update": {
+      // Apply the changes to a message that was already added.
+      useMessagesStore.getState().applyMessageUpdate(data);
+      return true;
+    }
     case "token": {
       // Use flushSync with a timeout to avoid React batching issues.
       setTimeout(() => {
@@ -0,0 +1,275 @@
+"""A persistent, content-addressed cache for embeddings.
+
+Knowledge base ingestion, retrieval and the vector store components embed the same texts again on every run.
+:class:`CachedEmbeddings` wraps any LangChain ``Embeddings`` and looks vectors up in an :class:`EmbeddingCache`
+first, sending only the texts it has not seen to the provider.
+
+Vectors are keyed by the provider, model, dimension, endpoint and the SHA-256 of the text, and stored as float32
+in a SQLite file in the config directory, so they are shared by every flow and user and survive restarts. Vectors
+are returned with float32 precision whether they came from the cache or the provider. The cache is off unless
+``embedding_cache_max_entries`` is set.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from wfx.log.logger import logger
+from wfx.services.deps import get_settings_service
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+EMBEDDING_CACHE_FILENAME = "embedding_cache.sqlite3"
+
+# Stays below SQLite's default limit on the number of parameters in a statement
+_MAX_QUERY_PARAMETERS = 900
+
+# Evicting a little more than needed keeps eviction from running on every insert once the cache is full
+_EVICTION_SLACK = 0.05
+
+_MODEL_ATTRIBUTES = ("model", "model_name", "model_id", "deployment")
+
+# Client settings that select which server, and so which embedding space, answers; secrets are never read
+_ENDPOINT_ATTRIBUTES = (
+    "base_url",
+    "openai_api_base",
+    "azure_endpoint",
+    "endpoint",
+    "endpoint_url",
+    "api_url",
+    "api_base",
+    "region_name",
+    "location",
+    "project",
+)
+
+
+def _text_hash(text: str) -> bytes:
+    return hashlib.sha256(text.encode()).digest()
+
+
+def _as_float32(vector: list[float]) -> list[float]:
+    return np.asarray(vector, dtype=np.float32).tolist()
+
+
+class EmbeddingCache:
+    """Embeddings stored in SQLite, with the least recently used evicted beyond ``max_entries``.
+
+    Methods are blocking and safe to call from several threads.
+    """
+
+    def __init__(self, path: str | Path, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "namespace TEXT NOT NULL, text_hash BLOB NOT NULL, vector BLOB NOT NULL, last_used REAL NOT NULL, "
+                "PRIMARY KEY (namespace, text_hash)) WITHOUT ROWID"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+        self._entries = self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_many(self, namespace: str, text_hashes: Iterable[bytes]) -> dict[bytes, list[float]]:
+        """Return the cached vectors for the given text hashes, marking them as recently used."""
+        text_hashes = list(text_hashes)
+        found: dict[bytes, list[float]] = {}
+        with self._lock:
+            for start in range(0, len(text_hashes), _MAX_QUERY_PARAMETERS):
+                chunk = text_hashes[start : start + _MAX_QUERY_PARAMETERS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE namespace = ? AND text_hash IN ({placeholders})",  # noqa: S608
+                    (namespace, *chunk),
+                )
+                for text_hash, vector in rows:
+                    found[text_hash] = np.frombuffer(vector, dtype=np.float32).tolist()
+            if found:
+                now = time.time()
+                with self._connection:
+                    self._connection.executemany(
+                        "UPDATE embeddings SET last_used = ? WHERE namespace = ? AND text_hash = ?",
+                        ((now, namespace, text_hash) for text_hash in found),
+                    )
+            self.hits += len(found)
+            self.misses += len(text_hashes) - len(found)
+        return found
+
+    def put_many(self, namespace: str, vectors: dict[bytes, list[float]]) -> None:
+        """Store vectors by text hash, evicting the least recently used entries if the cache is full."""
+        now = time.time()
+        with self._lock:
+            with self._connection:
+                cursor = self._connection.executemany(
+                    "INSERT OR IGNORE INTO embeddings (namespace, text_hash, vector, last_used) VALUES (?, ?, ?, ?)",
+                    (
+                        (namespace, text_hash, np.asarray(vector, dtype=np.float32).tobytes(), now)
+                        for text_hash, vector in vectors.items()
+                    ),
+                )
+            self._entries += max(cursor.rowcount, 0)
+            if self._entries > self.max_entries:
+                self._evict()
+
+    def _evict(self) -> None:
+        target = int(self.max_entries * (1 - _EVICTION_SLACK))
+        with self._connection:
+            cursor = self._connection.execute(
+                "DELETE FROM embeddings WHERE (namespace, text_hash) IN "
+                "(SELECT namespace, text_hash FROM embeddings ORDER BY last_used LIMIT ?)",
+                (self._entries - target,),
+            )
+        self.evictions += max(cursor.rowcount, 0)
+        # Other processes may share the file, so count again rather than trust the running total
+        self._entries = self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM embeddings")
+            self._entries = 0
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """Wraps an ``Embeddings`` so that only texts missing from the cache are sent to the provider.
+
+    Document and query embeddings are cached separately, since some providers embed them differently.
+    Attributes not defined here are read from the wrapped embeddings.
+    """
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache, namespace: str | None = None) -> None:
+        self.embeddings = embeddings
+        self.cache = cache
+        self.namespace = namespace or self.default_namespace(embeddings)
+
+    @staticmethod
+    def default_namespace(embeddings: Embeddings) -> str:
+        """Build the cache namespace from the provider class, model, dimension and endpoint of the embeddings.
+
+        The endpoint settings are hashed, so URLs that embed credentials are not written to the cache file.
+        """
+        provider = f"{type(embeddings).__module__}.{type(embeddings).__qualname__}"
+        model = next((str(value) for name in _MODEL_ATTRIBUTES if (value := getattr(embeddings, name, None))), "")
+        dimension = getattr(embeddings, "dimensions", None) or getattr(embeddings, "dimension", None) or ""
+        endpoint = "\n".join(
+            f"{name}={value}" for name in _ENDPOINT_ATTRIBUTES if (value := getattr(embeddings, name, None))
+        )
+        endpoint_hash = hashlib.sha256(endpoint.encode()).hexdigest()[:16] if endpoint else ""
+        return f"{provider}|{model}|{dimension}|{endpoint_hash}"
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "embeddings":
+            raise AttributeError(name)
+        return getattr(self.embeddings, name)
+
+    def _lookup(self, namespace: str, texts: list[str]) -> tuple[list[bytes], dict[bytes, list[float]], list[str]]:
+        text_hashes = [_text_hash(text) for text in texts]
+        found = self.cache.get_many(namespace, set(text_hashes))
+        missing: dict[bytes, str] = {}
+        for text_hash, text in zip(text_hashes, texts, strict=True):
+            if text_hash not in found:
+                missing.setdefault(text_hash, text)
+        return text_hashes, found, list(missing.values())
+
+    def _store(self, namespace: str, found: dict[bytes, list[float]], texts: list[str], vectors: list[list[float]]):
+        # Rounded like the stored vectors, so a text embeds the same whether or not it was cached
+        computed = {_text_hash(text): _as_float32(vector) for text, vector in zip(texts, vectors, strict=True)}
+        try:
+            self.cache.put_many(namespace, computed)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not write to the embedding cache: {e}")
+        found.update(computed)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        text_hashes, found, missing = self._lookup(self.namespace, texts)
+        if missing:
+            self._store(self.namespace, found, missing, self.embeddings.embed_documents(missing))
+        return [found[text_hash] for text_hash in text_hashes]
+
+    def embed_query(self, text: str) -> list[float]:
+        namespace = f"{self.namespace}|query"
+        text_hashes, found, missing = self._lookup(namespace, [text])
+        if missing:
+            self._store(namespace, found, missing, [self.embeddings.embed_query(text)])
+        return found[text_hashes[0]]
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        text_hashes, found, missing = await asyncio.to_thread(self._lookup, self.namespace, texts)
+        if missing:
+            vectors = await self.embeddings.aembed_documents(missing)
+            await asyncio.to_thread(self._store, self.namespace, found, missing, vectors)
+        return [found[text_hash] for text_hash in text_hashes]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        namespace = f"{self.namespace}|query"
+        text_hashes, found, missing = await asyncio.to_thread(self._lookup, namespace, [text])
+        if missing:
+            vector = await self.embeddings.aembed_query(text)
+            await asyncio.to_thread(self._store, namespace, found, missing, [vector])
+        return found[text_hashes[0]]
+
+
+_EMBEDDING_CACHE: EmbeddingCache | None = None
+_EMBEDDING_CACHE_LOCK = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache | None:
+    """Return the embedding cache shared by all components, or None if it is disabled."""
+    global _EMBEDDING_CACHE  # noqa: PLW0603
+    if _EMBEDDING_CACHE is not None:
+        return _EMBEDDING_CACHE
+    settings = get_settings_service().settings
+    if not settings.embedding_cache_max_entries or not settings.config_dir:
+        return None
+    with _EMBEDDING_CACHE_LOCK:
+        if _EMBEDDING_CACHE is None:
+            path = Path(settings.config_dir) / EMBEDDING_CACHE_FILENAME
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                _EMBEDDING_CACHE = EmbeddingCache(path, settings.embedding_cache_max_entries)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Embedding cache disabled, could not open {path}: {e}")
+                return None
+    return _EMBEDDING_CACHE
+
+
+def cached_embeddings(embeddings: Any) -> Any:
+    """Wrap ``embeddings`` with the shared embedding cache.
+
+    Anything that is not an ``Embeddings``, or is already wrapped, is returned unchanged, as is everything
+    when the cache is disabled.
+    """
+    if not isinstance(embeddings, Embeddings) or isinstance(embeddings, CachedEmbeddings):
+        return embeddings
+    cache = get_embedding_cache()
+    if cache is None:
+        return embeddings
+    return CachedEmbeddings(embeddings, cache)
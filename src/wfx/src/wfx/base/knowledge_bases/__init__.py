@@ -1,3 +1,4 @@
+from .id_index import DocumentIdIndex
 from .knowledge_base_utils import compute_bm25, compute_tfidf, get_knowledge_bases
 
-__all__ = ["compute_bm25", "compute_tfidf", "get_knowledge_bases"]
+__all__ = ["DocumentIdIndex", "compute_bm25", "compute_tfidf", "get_knowledge_bases"]
@@ -0,0 +1,86 @@
+"""On-disk index of the document ids stored in a knowledge base.
+
+Checking incoming rows for duplicates used to load every document and its metadata from Chroma. The index
+keeps only the ``_id`` hashes, in a SQLite file next to the vector store, so each batch of rows is checked
+with an indexed query however large the knowledge base is.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+ID_INDEX_FILENAME = "document_ids.sqlite3"
+
+# Documents read from the collection per request when the index is rebuilt
+SYNC_PAGE_SIZE = 5000
+
+# Stays below SQLite's default limit on the number of parameters in a statement
+_MAX_QUERY_PARAMETERS = 900
+
+
+class DocumentIdIndex:
+    """The set of ``_id`` values stored in a knowledge base's collection.
+
+    The index records how many documents it has seen. When that differs from the collection's count,
+    for example because documents were added or removed by something else, :meth:`sync` rebuilds it
+    from the collection one page at a time.
+
+    Methods are blocking and safe to call from worker threads.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("CREATE TABLE IF NOT EXISTS ids (id TEXT PRIMARY KEY) WITHOUT ROWID")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value INTEGER)")
+
+    def _document_count(self) -> int | None:
+        row = self._connection.execute("SELECT value FROM state WHERE key = 'document_count'").fetchone()
+        return None if row is None else row[0]
+
+    def _set_document_count(self, count: int) -> None:
+        self._connection.execute("INSERT OR REPLACE INTO state (key, value) VALUES ('document_count', ?)", (count,))
+
+    def sync(self, collection: Any) -> None:
+        """Rebuild the index from a Chroma collection unless it already covers every document."""
+        count = collection.count()
+        with self._lock:
+            if self._document_count() == count:
+                return
+            with self._connection:
+                self._connection.execute("DELETE FROM ids")
+                for offset in range(0, count, SYNC_PAGE_SIZE):
+                    page = collection.get(include=["metadatas"], limit=SYNC_PAGE_SIZE, offset=offset)
+                    self._connection.executemany(
+                        "INSERT OR IGNORE INTO ids (id) VALUES (?)",
+                        ((metadata["_id"],) for metadata in page["metadatas"] if metadata and metadata.get("_id")),
+                    )
+                self._set_document_count(count)
+
+    def existing(self, ids: Iterable[str]) -> set[str]:
+        """Return the given ids that are already in the index."""
+        ids = list(ids)
+        found: set[str] = set()
+        with self._lock:
+            for start in range(0, len(ids), _MAX_QUERY_PARAMETERS):
+                chunk = ids[start : start + _MAX_QUERY_PARAMETERS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._connection.execute(f"SELECT id FROM ids WHERE id IN ({placeholders})", chunk)  # noqa: S608
+                found.update(row[0] for row in rows)
+        return found
+
+    def add(self, ids: list[str]) -> None:
+        """Record the ids of documents that were just added to the collection."""
+        with self._lock, self._connection:
+            self._connection.executemany("INSERT OR IGNORE INTO ids (id) VALUES (?)", ((id_,) for id_ in ids))
+            self._set_document_count((self._document_count() or 0) + len(ids))
+
+    def close(self) -> None:
+        self._connection.close()
@@ -2,6 +2,7 @@ from abc import abstractmethod
 from functools import wraps
 from typing import TYPE_CHECKING, Any
 
+from wfx.base.embeddings.cache import cached_embeddings
 from wfx.custom.custom_component.component import Component
 from wfx.field_typing import Text, VectorStore
 from wfx.helpers.data import docs_to_data
@@ -21,6 +22,9 @@ def check_cached_vector_store(f):
     across separate invocations of the component. This method exists so that components with
     multiple output methods share the same vector store during the same invocation of the
     component.
+
+    Before the vector store is built, its embedding input is wrapped with the shared embedding
+    cache, which does persist, so texts embedded in earlier runs are not sent to the provider again.
     """
 
     @wraps(f)
@@ -30,6 +34,7 @@ def check_cached_vector_store(f):
         if should_cache and self._cached_vector_store is not None:
             return self._cached_vector_store
 
+        self._use_embedding_cache()
         result = f(self, *args, **kwargs)
         self._cached_vector_store = result
         return result
@@ -104,6 +109,15 @@ class LCVectorStoreComponent(Component):
                 msg = f"Method '{method_name}' must be defined."
                 raise ValueError(msg)
 
+    def _use_embedding_cache(self) -> None:
+        """Wrap the embedding input, a single embeddings model or a list of them, with the embedding cache."""
+        attributes = self.__dict__.get("_attributes", {})
+        embedding = attributes.get("embedding")
+        if isinstance(embedding, list):
+            attributes["embedding"] = [cached_embeddings(item) for item in embedding]
+        elif embedding is not None:
+            attributes["embedding"] = cached_embeddings(embedding)
+
     def _prepare_ingest_data(self) -> list[Any]:
         """Prepares ingest_data by converting DataFrame to Data if needed."""
         ingest_data: list | Data | DataFrame = self.ingest_data
@@ -25,6 +25,7 @@ from wfx.cli.common import (
     is_port_in_use,
     load_graph_from_path,
 )
+from wfx.cli.graph_pool import DEFAULT_POOL_SIZE
 from wfx.cli.serve_app import FlowMeta, create_multi_serve_app
 
 # Initialize console
@@ -72,6 +73,20 @@ async def serve_command(
         "--check-variables/--no-check-variables",
         help="Check global variables for environment compatibility",
     ),
+    pool_size: int = typer.Option(
+        DEFAULT_POOL_SIZE,
+        "--pool-size",
+        min=1,
+        help="Number of pre-built graph instances reused across concurrent requests",
+    ),
+    pool_overflow: str = typer.Option(
+        "create",
+        "--pool-overflow",
+        help=(
+            "When all graph instances are busy: 'create' a temporary instance, or 'wait' for one, "
+            "which caps concurrent runs of each flow at --pool-size"
+        ),
+    ),
 ) -> None:
     """Serve WFX flows as a web API.
 
@@ -122,6 +137,10 @@ async def serve_command(
         typer.echo("Set the PRIMEAGENT_API_KEY environment variable before serving.", err=True)
         raise typer.Exit(1) from e
 
+    if pool_overflow not in {"wait", "create"}:
+        verbose_print(f"Error: Invalid pool overflow '{pool_overflow}'. Must be one of: create, wait")
+        raise typer.Exit(1)
+
     # Validate log level
     valid_log_levels = {"debug", "info", "warning", "error", "critical"}
     if log_level.lower() not in valid_log_levels:
@@ -272,6 +291,8 @@ async def serve_command(
             graphs=graphs,
             metas=metas,
             verbose_print=verbose_print,
+            pool_size=pool_size,
+            pool_overflow=pool_overflow,
         )
 
         verbose_print("🚀 Starting single-flow server...")
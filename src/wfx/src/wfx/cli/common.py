@@ -12,9 +12,11 @@ import socket
 import subprocess
 import sys
 import tempfile
+import threading
 import uuid
 import zipfile
-from io import StringIO
+from collections import deque
+from contextvars import ContextVar
 from pathlib import Path
 from shutil import which
 from typing import TYPE_CHECKING
@@ -293,12 +295,134 @@ def prepare_graph(graph, verbose_print):
         raise typer.Exit(1) from e
 
 
-async def execute_graph_with_capture(graph, input_value: str | None):
+class _BoundedBuffer:
+    """Text buffer that keeps only the last ``max_chars`` characters written to it."""
+
+    def __init__(self, max_chars: int) -> None:
+        self.max_chars = max_chars
+        self._chunks: deque[str] = deque()
+        self._size = 0
+        self.truncated = 0
+
+    def write(self, text: str) -> int:
+        if not text:
+            return 0
+        self._chunks.append(text)
+        self._size += len(text)
+        while self._size > self.max_chars:
+            overflow = self._size - self.max_chars
+            head = self._chunks[0]
+            if len(head) <= overflow:
+                self._chunks.popleft()
+                self._size -= len(head)
+                self.truncated += len(head)
+            else:
+                self._chunks[0] = head[overflow:]
+                self._size -= overflow
+                self.truncated += overflow
+        return len(text)
+
+    def getvalue(self) -> str:
+        value = "".join(self._chunks)
+        if self.truncated:
+            return f"[{self.truncated} earlier characters truncated]\n{value}"
+        return value
+
+
+class _ContextStream(io.TextIOBase):
+    """Stand-in for ``sys.stdout``/``sys.stderr`` that routes writes to the current context's capture.
+
+    Writes from code running inside :func:`capture_output` go to that call's buffer, everything else goes
+    to the stream that was replaced. Because the buffer lives in a context variable, concurrent graph runs
+    on the same event loop (and the threads they start with ``asyncio.to_thread``) never see each other's
+    output.
+    """
+
+    def __init__(self, wrapped, stream_name: str) -> None:
+        super().__init__()
+        self.wrapped = wrapped
+        self.stream_name = stream_name
+
+    def _target(self):
+        buffers = _capture_buffers.get()
+        if buffers is None:
+            return self.wrapped
+        return buffers[0] if self.stream_name == "stdout" else buffers[1]
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        target = self._target()
+        if target is self.wrapped:
+            self.wrapped.flush()
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return _capture_buffers.get() is None and self.wrapped.isatty()
+
+    def fileno(self) -> int:
+        return self.wrapped.fileno()
+
+    @property
+    def encoding(self):  # type: ignore[override]
+        return getattr(self.wrapped, "encoding", "utf-8")
+
+    def __getattr__(self, name: str):
+        return getattr(self.wrapped, name)
+
+
+_capture_buffers: ContextVar[tuple[_BoundedBuffer, _BoundedBuffer] | None] = ContextVar(
+    "wfx_capture_buffers", default=None
+)
+_install_lock = threading.Lock()
+
+# Upper bound on the output kept per stream for a single graph run
+MAX_CAPTURED_OUTPUT_CHARS = 1_000_000
+
+
+def _install_context_streams() -> None:
+    """Replaces ``sys.stdout``/``sys.stderr`` with context-routing proxies, once per replacement."""
+    with _install_lock:
+        if not isinstance(sys.stdout, _ContextStream):
+            sys.stdout = _ContextStream(sys.stdout, "stdout")
+        if not isinstance(sys.stderr, _ContextStream):
+            sys.stderr = _ContextStream(sys.stderr, "stderr")
+
+
+@contextlib.contextmanager
+def capture_output(max_chars: int = MAX_CAPTURED_OUTPUT_CHARS):
+    """Captures what the current context writes to stdout and stderr.
+
+    Unlike swapping ``sys.stdout`` for a ``StringIO``, the capture is scoped to the current context, so
+    concurrent captures do not steal each other's output and output from unrelated tasks is not captured.
+    Each stream keeps at most ``max_chars`` characters, dropping the oldest output first.
+
+    Yields:
+        A ``(stdout, stderr)`` pair of buffers with a ``getvalue()`` method.
+    """
+    _install_context_streams()
+    buffers = (_BoundedBuffer(max_chars), _BoundedBuffer(max_chars))
+    token = _capture_buffers.set(buffers)
+    try:
+        yield buffers
+    finally:
+        _capture_buffers.reset(token)
+
+
+async def execute_graph_with_capture(
+    graph, input_value: str | None, *, max_output_chars: int = MAX_CAPTURED_OUTPUT_CHARS
+):
     """Execute a graph and capture output.
 
+    Output is captured per call, so concurrent executions on the same event loop are safe.
+
     Args:
         graph: Graph object to execute
         input_value: Input value to pass to the graph
+        max_output_chars: Maximum number of characters kept per stream; older output is dropped first
 
     Returns:
         Tuple of (results, captured_logs)
@@ -309,29 +433,16 @@ async def execute_graph_with_capture(graph, input_value: str | None):
     # Create input request
     inputs = InputValueRequest(input_value=input_value) if input_value else None
 
-    # Capture output during execution
-    captured_stdout = StringIO()
-    captured_stderr = StringIO()
-
-    # Redirect stdout and stderr during graph execution
-    original_stdout = sys.stdout
-    original_stderr = sys.stderr
-
-    try:
-        sys.stdout = captured_stdout
-        sys.stderr = captured_stderr
-        results = [result async for result in graph.async_start(inputs)]
-    except Exception as exc:
-        # Capture any error output that was written to stderr
-        error_output = captured_stderr.getvalue()
-        if error_output:
-            # Add error output to the exception for better debugging
-            exc.args = (f"{exc.args[0] if exc.args else str(exc)}\n\nCaptured stderr:\n{error_output}",)
-        raise
-    finally:
-        # Restore original stdout/stderr
-        sys.stdout = original_stdout
-        sys.stderr = original_stderr
+    with capture_output(max_output_chars) as (captured_stdout, captured_stderr):
+        try:
+            results = [result async for result in graph.async_start(inputs)]
+        except Exception as exc:
+            # Capture any error output that was written to stderr
+            error_output = captured_stderr.getvalue()
+            if error_output:
+                # Add error output to the exception for better debugging
+                exc.args = (f"{exc.args[0] if exc.args else str(exc)}\n\nCaptured stderr:\n{error_output}",)
+            raise
 
     # Get captured logs
     captured_logs = captured_stdout.getvalue() + captured_stderr.getvalue()
@@ -0,0 +1,105 @@
+"""Pool of pre-built graph instances reused across ``wfx serve`` requests.
+
+Building a graph with ``copy.deepcopy`` re-creates every vertex, component instance and parameter
+dictionary, which dominated the cost of small flows when it was done for every request. A
+:class:`GraphPool` builds ``size`` copies up front and hands them out one request at a time; a
+returned instance is made reusable with :meth:`wfx.graph.Graph.reset_run_state`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Literal
+
+from wfx.log.logger import logger
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from wfx.graph import Graph
+
+PoolOverflow = Literal["wait", "create"]
+
+DEFAULT_POOL_SIZE = 4
+
+
+class GraphPool:
+    """A fixed set of reusable copies of one graph.
+
+    Each request checks out an idle instance for the duration of its run. When every instance is in use,
+    ``overflow="create"`` builds a temporary copy that is discarded after the run, so concurrency is not
+    limited, and ``overflow="wait"`` makes the request wait for one to be returned.
+
+    Attributes:
+        size (int): Number of pooled instances.
+        overflow (str): ``"wait"`` or ``"create"``.
+        created (int): Number of instances built, including temporary ones.
+        returned (int): Number of instances reset and returned to the pool after a run.
+        discarded (int): Number of instances thrown away because resetting them failed.
+    """
+
+    def __init__(self, graph: Graph, *, size: int = DEFAULT_POOL_SIZE, overflow: PoolOverflow = "create") -> None:
+        if size < 1:
+            msg = f"Graph pool size must be at least 1, got {size}"
+            raise ValueError(msg)
+        if overflow not in {"wait", "create"}:
+            msg = f"Invalid pool overflow: {overflow}. Expected 'wait' or 'create'"
+            raise ValueError(msg)
+        self._template = graph
+        self.size = size
+        self.overflow = overflow
+        self.created = 0
+        self.returned = 0
+        self.discarded = 0
+        self._idle: asyncio.LifoQueue[Graph] = asyncio.LifoQueue()
+        for _ in range(size):
+            self._idle.put_nowait(self._build())
+
+    def _build(self) -> Graph:
+        self.created += 1
+        return copy.deepcopy(self._template)
+
+    @property
+    def idle(self) -> int:
+        """Number of instances ready to be checked out."""
+        return self._idle.qsize()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Graph]:
+        """Checks out an instance for one run and returns it to the pool afterwards."""
+        if self._idle.empty() and self.overflow == "create":
+            # Temporary instances are not returned to the pool
+            yield self._build()
+            return
+
+        graph = await self._idle.get()
+        try:
+            yield graph
+        finally:
+            self._release(graph)
+
+    def _release(self, graph: Graph) -> None:
+        try:
+            graph.reset_run_state()
+            # Copies start with an empty context, so a reused instance must too
+            graph.context = {}
+        except Exception as exc:  # noqa: BLE001
+            # A graph that cannot be reset is replaced instead of being reused with stale state
+            logger.warning(f"Discarding pooled graph after failed reset: {exc!s}")
+            self.discarded += 1
+            graph = self._build()
+        else:
+            self.returned += 1
+        self._idle.put_nowait(graph)
+
+    def stats(self) -> dict[str, int | str]:
+        return {
+            "size": self.size,
+            "idle": self.idle,
+            "overflow": self.overflow,
+            "created": self.created,
+            "returned": self.returned,
+            "discarded": self.discarded,
+        }
@@ -19,7 +19,6 @@ from __future__ import annotations
 
 import asyncio
 import time
-from copy import deepcopy
 from typing import TYPE_CHECKING, Annotated, Any
 
 from fastapi import APIRouter, Depends, FastAPI, HTTPException, Security
@@ -28,6 +27,7 @@ from fastapi.security import APIKeyHeader, APIKeyQuery
 from pydantic import BaseModel, Field
 
 from wfx.cli.common import execute_graph_with_capture, extract_result_data, get_api_key
+from wfx.cli.graph_pool import DEFAULT_POOL_SIZE, GraphPool, PoolOverflow
 from wfx.log.logger import logger
 
 if TYPE_CHECKING:
@@ -294,7 +294,7 @@ async def consume_and_yield(queue: asyncio.Queue, client_consumed_queue: asyncio
 
 
 async def run_flow_generator_for_serve(
-    graph: Graph,
+    graph: Graph | GraphPool,
     input_request: StreamRequest,
     flow_id: str,
     event_manager,
@@ -306,7 +306,7 @@ async def run_flow_generator_for_serve(
     including success completion and error scenarios.
 
     Args:
-        graph (Graph): The graph to execute
+        graph (Graph | GraphPool): The graph to execute, or the pool to check an instance out of
         input_request (StreamRequest): The input parameters for the flow
         flow_id (str): The ID of the flow being executed
         event_manager: Manages the streaming of events to the client
@@ -328,8 +328,14 @@ async def run_flow_generator_for_serve(
         # For the serve app, we'll use execute_graph_with_capture with streaming
         # Note: This is a simplified version. In a full implementation, you might want
         # to integrate with the full WFX streaming pipeline from endpoints.py
-        results, logs = await execute_graph_with_capture(graph, input_request.input_value)
-        result_data = extract_result_data(results, logs)
+        if isinstance(graph, GraphPool):
+            # Results refer to the graph's vertices, so they are read before the graph is reset for the next run
+            async with graph.acquire() as pooled_graph:
+                results, logs = await execute_graph_with_capture(pooled_graph, input_request.input_value)
+                result_data = extract_result_data(results, logs)
+        else:
+            results, logs = await execute_graph_with_capture(graph, input_request.input_value)
+            result_data = extract_result_data(results, logs)
 
         # Send the final result
         event_manager.on_end(data={"result": result_data})
@@ -352,6 +358,8 @@ def create_multi_serve_app(
     graphs: dict[str, Graph],
     metas: dict[str, FlowMeta],
     verbose_print: Callable[[str], None],  # noqa: ARG001
+    pool_size: int = DEFAULT_POOL_SIZE,
+    pool_overflow: PoolOverflow = "create",
 ) -> FastAPI:
     """Create a FastAPI app exposing multiple WFX flows.
 
@@ -366,6 +374,11 @@ def create_multi_serve_app(
         Mapping ``flow_id -> FlowMeta`` containing metadata for each flow.
     verbose_print
         Diagnostic printer inherited from the CLI (unused, kept for backward compatibility).
+    pool_size
+        Number of pre-built instances of each graph reused across requests.
+    pool_overflow
+        What a request does when every instance of its graph is busy: ``"create"`` a temporary
+        instance, or ``"wait"`` for one to be returned, which limits concurrent runs to ``pool_size``.
     """
     if set(graphs) != set(metas):  # pragma: no cover - sanity check
         msg = "graphs and metas must contain the same keys"
@@ -397,10 +410,15 @@ def create_multi_serve_app(
     # Per-flow routers
     # ------------------------------------------------------------------
 
+    pools: dict[str, GraphPool] = {}
+    app.state.graph_pools = pools
+
     def create_flow_router(flow_id: str, graph: Graph, meta: FlowMeta) -> APIRouter:
         """Create a router for a specific flow to avoid loop variable binding issues."""
         analysis = _analyze_graph_structure(graph)
         run_description = _generate_dynamic_run_description(graph)
+        pool = GraphPool(graph, size=pool_size, overflow=pool_overflow)
+        pools[flow_id] = pool
 
         router = APIRouter(
             prefix=f"/flows/{flow_id}",
@@ -419,9 +437,9 @@ def create_multi_serve_app(
             request: RunRequest,
         ) -> RunResponse:
             try:
-                graph_copy = deepcopy(graph)
-                results, logs = await execute_graph_with_capture(graph_copy, request.input_value)
-                result_data = extract_result_data(results, logs)
+                async with pool.acquire() as pooled_graph:
+                    results, logs = await execute_graph_with_capture(pooled_graph, request.input_value)
+                    result_data = extract_result_data(results, logs)
 
                 # Debug logging
                 logger.debug(f"Flow {flow_id} execution completed: {len(results)} results, {len(logs)} log chars")
@@ -494,7 +512,7 @@ def create_multi_serve_app(
 
                 main_task = asyncio.create_task(
                     run_flow_generator_for_serve(
-                        graph=graph,
+                        graph=pool,
                         input_request=request,
                         flow_id=flow_id,
                         event_manager=event_manager,
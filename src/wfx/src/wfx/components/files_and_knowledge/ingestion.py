@@ -11,12 +11,15 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
 import pandas as pd
 from cryptography.fernet import InvalidToken
 from langchain_chroma import Chroma
 from primeagent.services.auth.utils import decrypt_api_key, encrypt_api_key
 from primeagent.services.database.models.user.crud import get_user_by_id
 
+from wfx.base.embeddings.cache import cached_embeddings
+from wfx.base.knowledge_bases.id_index import ID_INDEX_FILENAME, DocumentIdIndex
 from wfx.base.knowledge_bases.knowledge_base_utils import get_knowledge_bases
 from wfx.base.models.openai_constants import OPENAI_EMBEDDING_MODEL_NAMES
 from wfx.components.processing.converter import convert_to_dataframe
@@ -41,6 +44,8 @@ from wfx.services.deps import (
 from wfx.utils.validate_cloud import raise_error_if_astra_cloud_disable_component
 
 if TYPE_CHECKING:
+    from langchain_core.embeddings import Embeddings
+
     from wfx.schema.dataframe import DataFrame
 
 HUGGINGFACE_MODEL_NAMES = [
@@ -55,6 +60,20 @@ _KNOWLEDGE_BASES_ROOT_PATH: Path | None = None
 astra_error_msg = "Knowledge ingestion is not supported in Astra cloud environment."
 
 
+def _join_columns(df: pd.DataFrame, columns: list[str]) -> pd.Series:
+    """Join the non-null values of ``columns`` with spaces, row by row, one column at a time."""
+    joined = pd.Series("", index=df.index, dtype=object)
+    has_value = pd.Series(data=False, index=df.index)
+    for column in columns:
+        if column not in df.columns:
+            continue
+        present = df[column].notna()
+        values = df[column].map(str).where(present, "")
+        joined = joined + np.where(has_value & present, " ", "") + values
+        has_value |= present
+    return joined
+
+
 def _get_knowledge_bases_root_path() -> Path:
     """Lazy load the knowledge bases root path from settings."""
     global _KNOWLEDGE_BASES_ROOT_PATH  # noqa: PLW0603
@@ -193,6 +212,13 @@ class KnowledgeIngestionComponent(Component):
             advanced=True,
             value=1000,
         ),
+        IntInput(
+            name="max_concurrency",
+            display_name="Embedding Concurrency",
+            info="Maximum number of batches embedded at the same time.",
+            advanced=True,
+            value=4,
+        ),
         SecretStrInput(
             name="api_key",
             display_name="Embedding Provider API Key",
@@ -387,11 +413,8 @@ class KnowledgeIngestionComponent(Component):
                 raise ValueError(msg)
             vector_store_dir.mkdir(parents=True, exist_ok=True)
 
-            # Create embeddings model
-            embedding_function = self._build_embeddings(embedding_model, api_key)
-
-            # Convert DataFrame to Data objects (following Local DB pattern)
-            data_objects = await self._convert_df_to_data_objects(df_source, config_list)
+            # Create embeddings model, reusing embeddings of texts seen before
+            embedding_function = cached_embeddings(self._build_embeddings(embedding_model, api_key))
 
             # Create vector store
             chroma = Chroma(
@@ -399,43 +422,22 @@ class KnowledgeIngestionComponent(Component):
                 embedding_function=embedding_function,
                 collection_name=self.knowledge_base,
             )
+            collection = chroma._collection  # noqa: SLF001
 
-            # Convert Data objects to LangChain Documents
-            documents = []
-            for data_obj in data_objects:
-                doc = data_obj.to_lc_document()
-                documents.append(doc)
-
-            # Add documents to vector store
-            if documents:
-                chroma.add_documents(documents)
-                self.log(f"Added {len(documents)} documents to vector store '{self.knowledge_base}'")
+            id_index = DocumentIdIndex(vector_store_dir / ID_INDEX_FILENAME)
+            try:
+                await asyncio.to_thread(id_index.sync, collection)
+                added = await self._ingest(df_source, config_list, embedding_function, collection, id_index)
+            finally:
+                id_index.close()
+            if added:
+                self.log(f"Added {added} documents to vector store '{self.knowledge_base}'")
 
         except (OSError, ValueError, RuntimeError) as e:
             self.log(f"Error creating vector store: {e}")
 
-    async def _convert_df_to_data_objects(
-        self, df_source: pd.DataFrame, config_list: list[dict[str, Any]]
-    ) -> list[Data]:
-        """Convert DataFrame to Data objects for vector store."""
-        data_objects: list[Data] = []
-
-        # Set up vector store directory
-        kb_path = await self._kb_path()
-
-        # If we don't allow duplicates, we need to get the existing hashes
-        chroma = Chroma(
-            persist_directory=str(kb_path),
-            collection_name=self.knowledge_base,
-        )
-
-        # Get all documents and their metadata
-        all_docs = chroma.get()
-
-        # Extract all _id values from metadata
-        id_list = [metadata.get("_id") for metadata in all_docs["metadatas"] if metadata.get("_id")]
-
-        # Get column roles
+    def _get_column_roles(self, config_list: list[dict[str, Any]]) -> tuple[list[str], list[str]]:
+        """Return the vectorized columns and the identifier columns that are not vectorized."""
         content_cols = []
         identifier_cols = []
 
@@ -448,46 +450,117 @@ class KnowledgeIngestionComponent(Component):
                 content_cols.append(col_name)
             elif identifier:
                 identifier_cols.append(col_name)
+        return content_cols, identifier_cols
 
-        # Convert each row to a Data object
-        for _, row in df_source.iterrows():
-            # Build content text from identifier columns using list comprehension
-            identifier_parts = [str(row[col]) for col in content_cols if col in row and pd.notna(row[col])]
-
-            # Join all parts into a single string
-            page_content = " ".join(identifier_parts)
-
-            # Build metadata from NON-vectorized columns only (simple key-value pairs)
-            data_dict = {
-                "text": page_content,  # Main content for vectorization
-            }
-
-            # Add identifier columns if they exist
-            if identifier_cols:
-                identifier_parts = [str(row[col]) for col in identifier_cols if col in row and pd.notna(row[col])]
-                page_content = " ".join(identifier_parts)
+    def _convert_df_to_data_objects(
+        self, df_source: pd.DataFrame, content_cols: list[str], identifier_cols: list[str]
+    ) -> list[Data]:
+        """Convert DataFrame rows to Data objects for the vector store.
 
-            # Add metadata columns as simple key-value pairs
-            for col in df_source.columns:
-                if col not in content_cols and col in row and pd.notna(row[col]):
-                    # Convert to simple types for Chroma metadata
-                    value = row[col]
-                    data_dict[col] = str(value)  # Convert complex types to string
+        The text is built from the vectorized columns and every other column becomes metadata. ``_id``
+        hashes the identifier columns, or the text if there are none.
+        """
+        texts = _join_columns(df_source, content_cols)
+        keys = _join_columns(df_source, identifier_cols) if identifier_cols else texts
+        ids = [hashlib.sha256(key.encode()).hexdigest() for key in keys]
+
+        metadata_cols = [col for col in df_source.columns if col not in content_cols]
+        metadata = pd.DataFrame(
+            {col: df_source[col].map(str).where(df_source[col].notna(), None) for col in metadata_cols},
+            index=df_source.index,
+        )
 
-            # Hash the page_content for unique ID
-            page_content_hash = hashlib.sha256(page_content.encode()).hexdigest()
-            data_dict["_id"] = page_content_hash
+        data_objects: list[Data] = []
+        for text, row_metadata, id_ in zip(texts, metadata.to_dict("records"), ids, strict=True):
+            # Everything except "text" becomes metadata
+            data_dict = {"text": text}
+            data_dict.update({key: value for key, value in row_metadata.items() if value is not None})
+            data_dict["_id"] = id_
+            data_objects.append(Data(data=data_dict))
+        return data_objects
 
-            # If duplicates are disallowed, and hash exists, prevent adding this row
-            if not self.allow_duplicates and page_content_hash in id_list:
-                self.log(f"Skipping duplicate row with hash {page_content_hash}")
-                continue
+    async def _ingest(
+        self,
+        df_source: pd.DataFrame,
+        config_list: list[dict[str, Any]],
+        embedding_function: Embeddings,
+        collection: Any,
+        id_index: DocumentIdIndex,
+    ) -> int:
+        """Add the rows to the collection in batches of ``chunk_size`` and return how many were added.
+
+        Rows are converted and checked for duplicates one batch at a time. Up to ``max_concurrency``
+        batches are embedded at once, and the collection and id index are written from a worker thread,
+        one batch at a time.
+        """
+        content_cols, identifier_cols = self._get_column_roles(config_list)
+        batch_size = max(1, self.chunk_size or 1)
+        total_rows = len(df_source)
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency or 1))
+        write_lock = asyncio.Lock()
+        # Ids taken by earlier batches of this run, which may not be written to the index yet
+        claimed: set[str] = set()
+        counts = {"added": 0, "skipped": 0, "done": 0}
+
+        def write(data_objects: list[Data], embeddings: list[list[float]]) -> None:
+            documents = [data_obj.to_lc_document() for data_obj in data_objects]
+            collection.add(
+                ids=[str(uuid.uuid4()) for _ in documents],
+                embeddings=embeddings,
+                documents=[doc.page_content for doc in documents],
+                metadatas=[doc.metadata for doc in documents],
+            )
+            id_index.add([data_obj.data["_id"] for data_obj in data_objects])
 
-            # Create Data object - everything except "text" becomes metadata
-            data_obj = Data(data=data_dict)
-            data_objects.append(data_obj)
+        async def embed_and_write(data_objects: list[Data], rows: int) -> None:
+            try:
+                texts = [data_obj.data["text"] for data_obj in data_objects]
+                embeddings = await embedding_function.aembed_documents(texts)
+                async with write_lock:
+                    await asyncio.to_thread(write, data_objects, embeddings)
+                    counts["added"] += len(data_objects)
+                    counts["done"] += rows
+                    self.log(
+                        f"Ingested {counts['done']}/{total_rows} rows: {counts['added']} added, "
+                        f"{counts['skipped']} duplicates skipped",
+                        name="progress",
+                    )
+            finally:
+                semaphore.release()
 
-        return data_objects
+        tasks: list[asyncio.Task] = []
+        try:
+            for start in range(0, total_rows, batch_size):
+                batch = df_source.iloc[start : start + batch_size]
+                data_objects = self._convert_df_to_data_objects(batch, content_cols, identifier_cols)
+                if not self.allow_duplicates:
+                    existing = await asyncio.to_thread(
+                        id_index.existing, [data_obj.data["_id"] for data_obj in data_objects]
+                    )
+                    unique = []
+                    for data_obj in data_objects:
+                        id_ = data_obj.data["_id"]
+                        if id_ in existing or id_ in claimed:
+                            counts["skipped"] += 1
+                            continue
+                        claimed.add(id_)
+                        unique.append(data_obj)
+                    data_objects = unique
+                if not data_objects:
+                    counts["done"] += len(batch)
+                    continue
+                # Wait for a free slot before converting more rows, so only a few batches are held in memory
+                await semaphore.acquire()
+                tasks.append(asyncio.create_task(embed_and_write(data_objects, len(batch))))
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        if counts["skipped"]:
+            self.log(f"Skipped {counts['skipped']} duplicate rows")
+        return counts["added"]
 
     def is_valid_collection_name(self, name, min_length: int = 3, max_length: int = 63) -> bool:
         """Validates collection name against conditions 1-3.
@@ -8,6 +8,7 @@ from primeagent.services.auth.utils import decrypt_api_key
 from primeagent.services.database.models.user.crud import get_user_by_id
 from pydantic import SecretStr
 
+from wfx.base.embeddings.cache import cached_embeddings
 from wfx.base.knowledge_bases.knowledge_base_utils import get_knowledge_bases
 from wfx.custom import Component
 from wfx.io import BoolInput, DropdownInput, IntInput, MessageTextInput, Output, SecretStrInput
@@ -211,8 +212,8 @@ class KnowledgeRetrievalComponent(Component):
             msg = f"Metadata not found for knowledge base: {self.knowledge_base}. Ensure it has been indexed."
             raise ValueError(msg)
 
-        # Build the embedder for the knowledge base
-        embedding_function = self._build_embeddings(metadata)
+        # Build the embedder for the knowledge base, reusing embeddings of queries seen before
+        embedding_function = cached_embeddings(self._build_embeddings(metadata))
 
         # Load vector store
         chroma = Chroma(
@@ -1,11 +1,17 @@
+import asyncio
+import copy
+
 from wfx.components.processing.converter import convert_to_data
 from wfx.custom.custom_component.component import Component
-from wfx.inputs.inputs import HandleInput
+from wfx.inputs.inputs import DropdownInput, HandleInput, IntInput
 from wfx.schema.data import Data
 from wfx.schema.dataframe import DataFrame
 from wfx.schema.message import Message
 from wfx.template.field.base import Output
 
+SEQUENTIAL_MODE = "Sequential"
+MAP_MODE = "Parallel Map"
+
 
 class LoopComponent(Component):
     display_name = "Loop"
@@ -24,6 +30,25 @@ class LoopComponent(Component):
             info="The initial DataFrame to iterate over.",
             input_types=["DataFrame"],
         ),
+        DropdownInput(
+            name="mode",
+            display_name="Mode",
+            options=[SEQUENTIAL_MODE, MAP_MODE],
+            value=SEQUENTIAL_MODE,
+            info=(
+                "Sequential runs the loop body once per item, one item at a time. Parallel Map runs the loop "
+                "body for several items at once and outputs the results in the input order on Done. Use it "
+                "only when items do not depend on each other."
+            ),
+            advanced=True,
+        ),
+        IntInput(
+            name="max_concurrency",
+            display_name="Max Concurrency",
+            info="Maximum number of items processed at the same time in Parallel Map mode.",
+            value=4,
+            advanced=True,
+        ),
     ]
 
     outputs = [
@@ -88,11 +113,17 @@ class LoopComponent(Component):
         data_length = len(self.ctx.get(f"{self._id}_data", []))
         return current_index > data_length
 
-    def item_output(self) -> Data:
+    async def item_output(self) -> Data:
         """Output the next item in the list or stop if done."""
         self.initialize_data()
         current_item = Data(text="")
 
+        if self._is_map_mode():
+            # The loop body runs once per item in its own graph instead of through this output
+            await self._ensure_mapped()
+            self.stop("item")
+            return current_item
+
         if self.evaluate_stop_loop():
             self.stop("item")
         else:
@@ -120,10 +151,13 @@ class LoopComponent(Component):
             if self._id not in self.graph.run_manager.run_map[item_dependency_id]:
                 self.graph.run_manager.run_map[item_dependency_id].append(self._id)
 
-    def done_output(self) -> DataFrame:
+    async def done_output(self) -> DataFrame:
         """Trigger the done output when iteration is complete."""
         self.initialize_data()
 
+        if self._is_map_mode():
+            await self._ensure_mapped()
+
         if self.evaluate_stop_loop():
             self.stop("item")
             self.start("done")
@@ -161,3 +195,169 @@ class LoopComponent(Component):
             aggregated.append(loop_input)
             self.update_ctx({f"{self._id}_aggregated": aggregated})
         return aggregated
+
+    def _is_map_mode(self) -> bool:
+        return getattr(self, "mode", SEQUENTIAL_MODE) == MAP_MODE
+
+    def _loop_body_ids(self) -> set[str]:
+        """Return the vertices that run once per item.
+
+        The body is everything reachable from the Item output that is not reachable from the Done output.
+        """
+        graph = self.graph
+
+        def reachable(output_name: str) -> set[str]:
+            seen: set[str] = set()
+            stack = [
+                edge.target_id
+                for edge in graph.edges
+                if edge.source_id == self._id and edge.source_handle.name == output_name
+            ]
+            while stack:
+                vertex_id = stack.pop()
+                if vertex_id in seen or vertex_id == self._id:
+                    continue
+                seen.add(vertex_id)
+                stack.extend(graph.successor_map.get(vertex_id, []))
+            return seen
+
+        return reachable("item") - reachable("done")
+
+    def _loop_body_payload(self, body_ids: set[str]) -> dict:
+        """Build a flow containing this loop, in sequential mode, and its body only."""
+        raw_data = self.graph.dump()["data"]
+        nodes = []
+        for node in raw_data["nodes"]:
+            if node["id"] == self._id:
+                node = copy.deepcopy(node)  # noqa: PLW2901
+                template = node["data"]["node"]["template"]
+                if "mode" in template:
+                    template["mode"]["value"] = SEQUENTIAL_MODE
+                nodes.append(node)
+            elif node["id"] in body_ids:
+                nodes.append(node)
+
+        edges = []
+        for edge in raw_data["edges"]:
+            source, target = edge["source"], edge["target"]
+            if source == self._id:
+                keep = target in body_ids and edge["data"]["sourceHandle"]["name"] == "item"
+            elif target == self._id:
+                # The body feeds back through a loop handle named "item", unlike the "data" input field
+                target_handle = edge["data"]["targetHandle"]
+                keep = source in body_ids and target_handle.get("fieldName", target_handle.get("name")) == "item"
+            else:
+                keep = source in body_ids and target in body_ids
+            if keep:
+                edges.append(edge)
+        return {"nodes": nodes, "edges": edges}
+
+    async def _loop_body_inputs(self, body_ids: set[str]) -> dict[str, dict]:
+        """Return the values the body receives from outside the loop, keyed by body vertex and field.
+
+        These come from what the vertices outside the loop built in this run, so run inputs and tweaks are kept
+        instead of re-running those vertices from their saved values.
+        """
+        graph = self.graph
+        inputs: dict[str, dict] = {}
+        for edge in graph.edges:
+            if edge.target_id not in body_ids or edge.source_id in body_ids or edge.source_id == self._id:
+                continue
+            source = graph.get_vertex(edge.source_id)
+            if not source.built:
+                msg = f"The loop body uses {source.display_name}, which has not run before the loop."
+                raise ValueError(msg)
+            field_name = edge.target_handle.field_name
+            value = await source.get_result(graph.get_vertex(edge.target_id), target_handle_name=field_name)
+            fields = inputs.setdefault(edge.target_id, {})
+            if field_name in fields:
+                # Several vertices feed the same list input
+                previous = fields[field_name] if isinstance(fields[field_name], list) else [fields[field_name]]
+                value = [*previous, *(value if isinstance(value, list) else [value])]
+            fields[field_name] = value
+        return inputs
+
+    async def _run_item(self, payload: dict, body_inputs: dict[str, dict], item: Data) -> Data:
+        """Run the loop body for a single item and return what it fed back to the loop."""
+        from wfx.graph.graph.base import Graph
+        from wfx.graph.graph.constants import Finish
+
+        prefix = f"{self._id}_"
+        context = {key: value for key, value in self.ctx.items() if not key.startswith(prefix)}
+        context.update(
+            {
+                f"{self._id}_data": [item],
+                f"{self._id}_index": 0,
+                f"{self._id}_aggregated": [],
+                f"{self._id}_initialized": True,
+            }
+        )
+        subgraph = Graph.from_payload(
+            copy.deepcopy(payload),
+            flow_id=self.graph.flow_id,
+            flow_name=self.graph.flow_name,
+            user_id=self.graph.user_id,
+            context=context,
+        )
+        # Start from the loop so the body never runs before it has received the item
+        subgraph.prepare(start_component_id=self._id)
+        # Preparing builds the params from the payload, so the run's own values are set afterwards
+        for vertex_id, fields in body_inputs.items():
+            subgraph.get_vertex(vertex_id).update_raw_params(fields, overwrite=True)
+        session_id = self.graph.session_id
+        subgraph.session_id = session_id
+        for vertex_id in subgraph.has_session_id_vertices:
+            vertex = subgraph.get_vertex(vertex_id)
+            if session_id and not vertex.raw_params.get("session_id"):
+                vertex.update_raw_params({"session_id": session_id}, overwrite=True)
+        loop_builds = 0
+        # Stop once the loop has received the body's result; the body must not run again on an empty item
+        while loop_builds < 2:  # noqa: PLR2004
+            result = await subgraph.astep()
+            if isinstance(result, Finish):
+                break
+            if result.vertex.id == self._id:
+                loop_builds += 1
+        aggregated = subgraph.context.get(f"{self._id}_aggregated", [])
+        if loop_builds < 2 or not aggregated:  # noqa: PLR2004
+            msg = "The loop body did not return a result to the loop's Item input."
+            raise ValueError(msg)
+        return aggregated[-1]
+
+    async def _ensure_mapped(self) -> None:
+        """Run the loop body for all items once, storing the results as the aggregated list."""
+        if self.evaluate_stop_loop():
+            return
+        data_list = self.ctx.get(f"{self._id}_data", [])
+        results = await self._run_map()
+        self.update_ctx({f"{self._id}_aggregated": results, f"{self._id}_index": len(data_list) + 1})
+
+    async def _run_map(self) -> list[Data]:
+        """Run the loop body for every item concurrently, keeping results in the input order.
+
+        A failing item does not stop the others; its position holds a Data with the error instead.
+        """
+        data_list = self.ctx.get(f"{self._id}_data", [])
+        if not data_list:
+            return []
+        body_ids = self._loop_body_ids()
+        payload = self._loop_body_payload(body_ids)
+        body_inputs = await self._loop_body_inputs(body_ids)
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency or 1))
+        total = len(data_list)
+        failed: list[int] = []
+
+        async def run(index: int, item: Data) -> Data:
+            async with semaphore:
+                try:
+                    result = await self._run_item(payload, body_inputs, item)
+                except Exception as e:  # noqa: BLE001
+                    failed.append(index)
+                    result = Data(data={"error": str(e), "index": index})
+            self.log(result, name=f"Item {index + 1}/{total}")
+            return result
+
+        results = await asyncio.gather(*(run(index, item) for index, item in enumerate(data_list)))
+        if failed:
+            self.status = f"{len(failed)} of {total} items failed."
+        return list(results)
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import time
+from pathlib import Path
 from typing import TYPE_CHECKING, Any, cast
 
 import toml  # type: ignore[import-untyped]
+from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential_jitter
 
 from wfx.base.models.unified_models import (
     get_language_model_options,
@@ -10,13 +16,107 @@ from wfx.base.models.unified_models import (
     update_model_options_in_build_config,
 )
 from wfx.custom.custom_component.component import Component
-from wfx.io import BoolInput, DataFrameInput, MessageTextInput, ModelInput, MultilineInput, Output, SecretStrInput
+from wfx.io import (
+    BoolInput,
+    DataFrameInput,
+    IntInput,
+    MessageTextInput,
+    ModelInput,
+    MultilineInput,
+    Output,
+    SecretStrInput,
+)
 from wfx.log.logger import logger
 from wfx.schema.dataframe import DataFrame
+from wfx.services.deps import get_settings_service
 
 if TYPE_CHECKING:
     from langchain_core.runnables import Runnable
 
+# Rough token estimate used for the tokens per minute limit before the provider reports usage
+CHARS_PER_TOKEN = 4
+
+# Checkpoints of runs that were never resumed are deleted after this many seconds
+CHECKPOINT_TTL = 7 * 24 * 3600
+
+
+class _TokenBucket:
+    """Allows ``per_minute`` units per minute, refilled continuously; waiters are served in order."""
+
+    def __init__(self, per_minute: int) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60
+        self.level = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, amount: float = 1) -> None:
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.level < amount:
+                await asyncio.sleep((amount - self.level) / self.rate)
+                self._refill()
+            self.level -= amount
+
+    def charge(self, amount: float) -> None:
+        """Takes units that were used beyond what was acquired; later requests wait for them."""
+        self._refill()
+        self.level -= amount
+
+
+class _Checkpoint:
+    """Responses of completed rows, appended to a JSON lines file after every chunk."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def load(self) -> dict[int, str]:
+        if not self.path.exists():
+            return {}
+        responses: dict[int, str] = {}
+        with self.path.open(encoding="utf-8") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A line cut short by a crash; its row runs again
+                    continue
+                responses[entry["index"]] = entry["response"]
+        return responses
+
+    def append(self, responses: dict[int, str]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as file:
+            file.writelines(
+                json.dumps({"index": index, "response": response}) + "\n" for index, response in responses.items()
+            )
+
+    def remove(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+    @staticmethod
+    def remove_expired(directory: Path, ttl: float) -> int:
+        """Deletes the checkpoints under ``directory`` that were last written more than ``ttl`` seconds ago."""
+        if not directory.exists():
+            return 0
+        cutoff = time.time() - ttl
+        removed = 0
+        for path in directory.rglob("*.jsonl"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                # Removed by a concurrent run
+                continue
+        return removed
+
 
 class BatchRunComponent(Component):
     display_name = "Batch Run"
@@ -77,6 +177,48 @@ class BatchRunComponent(Component):
             required=False,
             advanced=True,
         ),
+        IntInput(
+            name="chunk_size",
+            display_name="Chunk Size",
+            info=(
+                "Number of rows processed per chunk. Progress is reported and completed rows are checkpointed "
+                "after each chunk, so a failed run resumes where it stopped. Rows that fail are marked in the "
+                "'processing_status' and 'error' columns. 0 sends all rows in a single batch."
+            ),
+            value=0,
+            advanced=True,
+        ),
+        IntInput(
+            name="max_concurrency",
+            display_name="Max Concurrency",
+            info="Maximum number of rows sent to the model at the same time when Chunk Size is set.",
+            value=8,
+            advanced=True,
+        ),
+        IntInput(
+            name="requests_per_minute",
+            display_name="Requests per Minute",
+            info="Maximum requests sent to the model per minute when Chunk Size is set. 0 means no limit.",
+            value=0,
+            advanced=True,
+        ),
+        IntInput(
+            name="tokens_per_minute",
+            display_name="Tokens per Minute",
+            info=(
+                "Maximum tokens sent to the model per minute when Chunk Size is set, estimated from the prompt "
+                "length and corrected with the usage the provider reports. 0 means no limit."
+            ),
+            value=0,
+            advanced=True,
+        ),
+        IntInput(
+            name="max_retries",
+            display_name="Max Retries",
+            info="Times a failed row is retried, with exponential backoff, when Chunk Size is set.",
+            value=3,
+            advanced=True,
+        ),
     ]
 
     outputs = [
@@ -133,6 +275,94 @@ class BatchRunComponent(Component):
                 "processing_status": "failed",
             }
 
+    @staticmethod
+    def _response_text(response: Any) -> str:
+        return response.content if hasattr(response, "content") else str(response)
+
+    @staticmethod
+    def _checkpoint_root() -> Path | None:
+        settings_service = get_settings_service()
+        config_dir = settings_service.settings.config_dir if settings_service else None
+        return Path(config_dir) / "batch_run_checkpoints" if config_dir else None
+
+    def _checkpoint_path(self, root: Path, conversations: list[list[dict[str, str]]]) -> Path:
+        """Returns where the completed rows of these exact conversations are checkpointed.
+
+        Checkpoints are kept per user and flow, so a run only resumes from rows completed by the same flow.
+        """
+        graph = self._vertex.graph if self._vertex else None
+        user_id = getattr(self, "_user_id", None) or (graph.user_id if graph else None)
+        flow_id = graph.flow_id if graph else None
+        model_name = self.model[0].get("name") if isinstance(self.model, list) else type(self.model).__name__
+        digest = hashlib.sha256(json.dumps([model_name, conversations], sort_keys=True).encode())
+        return root / str(user_id or "anonymous") / str(flow_id or "no_flow") / f"{digest.hexdigest()}.jsonl"
+
+    async def _run_chunked(
+        self, model: Runnable, conversations: list[list[dict[str, str]]], errors: dict[int, str]
+    ) -> list[str | None]:
+        """Runs the conversations chunk by chunk with bounded concurrency, rate limits and per row retries.
+
+        Rows that still fail after the retries are recorded in ``errors`` and get no response. Their checkpoint is
+        kept, so running the same rows again only sends the failed ones, until it expires after ``CHECKPOINT_TTL``.
+        """
+        total_rows = len(conversations)
+        checkpoint_root = self._checkpoint_root()
+        checkpoint = None
+        if checkpoint_root:
+            await asyncio.to_thread(_Checkpoint.remove_expired, checkpoint_root, CHECKPOINT_TTL)
+            checkpoint = _Checkpoint(self._checkpoint_path(checkpoint_root, conversations))
+        responses: list[str | None] = [None] * total_rows
+        if checkpoint:
+            for index, response in (await asyncio.to_thread(checkpoint.load)).items():
+                if 0 <= index < total_rows:
+                    responses[index] = response
+            if resumed := sum(response is not None for response in responses):
+                await logger.ainfo(f"Resuming batch run with {resumed}/{total_rows} rows from the checkpoint")
+
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency or 1))
+        request_bucket = _TokenBucket(self.requests_per_minute) if self.requests_per_minute else None
+        token_bucket = _TokenBucket(self.tokens_per_minute) if self.tokens_per_minute else None
+
+        async def run_row(index: int) -> None:
+            conversation = conversations[index]
+            estimated_tokens = sum(len(message["content"]) for message in conversation) // CHARS_PER_TOKEN + 1
+            async with semaphore:
+                try:
+                    async for attempt in AsyncRetrying(
+                        stop=stop_after_attempt(max(0, self.max_retries or 0) + 1),
+                        wait=wait_exponential_jitter(initial=1, max=60),
+                        reraise=True,
+                    ):
+                        with attempt:
+                            if request_bucket:
+                                await request_bucket.acquire()
+                            if token_bucket:
+                                await token_bucket.acquire(estimated_tokens)
+                            response = await model.ainvoke(conversation)
+                except Exception as e:  # noqa: BLE001
+                    errors[index] = str(e)
+                    await logger.awarning(f"Row {index} failed after retries: {e!s}")
+                    return
+            usage = getattr(response, "usage_metadata", None) or {}
+            if token_bucket and usage.get("total_tokens", 0) > estimated_tokens:
+                token_bucket.charge(usage["total_tokens"] - estimated_tokens)
+            responses[index] = self._response_text(response)
+
+        for start in range(0, total_rows, self.chunk_size):
+            pending = [
+                index for index in range(start, min(start + self.chunk_size, total_rows)) if responses[index] is None
+            ]
+            await asyncio.gather(*(run_row(index) for index in pending))
+            completed = {index: responses[index] for index in pending if responses[index] is not None}
+            if checkpoint and completed:
+                await asyncio.to_thread(checkpoint.append, completed)
+            processed = min(start + self.chunk_size, total_rows)
+            self.log(f"Processed {processed}/{total_rows} rows, {len(errors)} failed", name="Batch Run Progress")
+
+        if checkpoint and not errors:
+            await asyncio.to_thread(checkpoint.remove)
+        return responses
+
     async def run_batch(self) -> DataFrame:
         """Process each row in df[column_name] with the language model asynchronously."""
         # Check if model is already an instance (for testing) or needs to be instantiated
@@ -221,28 +451,29 @@ class BatchRunComponent(Component):
                     f"Could not configure model with callbacks and project info: {e!s}. "
                     "Proceeding with batch processing without configuration."
                 )
-            # Process batches and track progress
-            responses_with_idx = list(
-                zip(
-                    range(len(conversations)),
-                    await model.abatch(list(conversations)),
-                    strict=True,
-                )
-            )
-
-            # Sort by index to maintain order
-            responses_with_idx.sort(key=lambda x: x[0])
+            errors: dict[int, str] = {}
+            chunked = bool(self.chunk_size and self.chunk_size > 0)
+            if chunked:
+                response_texts = await self._run_chunked(model, conversations, errors)
+            else:
+                response_texts = [self._response_text(response) for response in await model.abatch(list(conversations))]
 
             # Build the final data with enhanced metadata
             rows: list[dict[str, Any]] = []
-            for idx, (original_row, response) in enumerate(
-                zip(df.to_dict(orient="records"), responses_with_idx, strict=False)
+            for idx, (original_row, response_text) in enumerate(
+                zip(df.to_dict(orient="records"), response_texts, strict=False)
             ):
-                response_text = response[1].content if hasattr(response[1], "content") else str(response[1])
                 row = self._create_base_row(
-                    cast("dict[str, Any]", original_row), model_response=response_text, batch_index=idx
+                    cast("dict[str, Any]", original_row), model_response=response_text or "", batch_index=idx
                 )
-                self._add_metadata(row, success=True, system_msg=system_msg)
+                if idx in errors:
+                    self._add_metadata(row, success=False, error=errors[idx])
+                else:
+                    self._add_metadata(row, success=True, system_msg=system_msg)
+                if chunked:
+                    # Failed rows keep running, so they are always marked, not only with metadata enabled
+                    row["processing_status"] = "failed" if idx in errors else "success"
+                    row["error"] = errors.get(idx)
                 rows.append(row)
 
                 # Log progress
@@ -22,6 +22,8 @@ from wfx.base.tools.constants import (
     TOOLS_METADATA_INPUT_NAME,
 )
 from wfx.custom.tree_visitor import RequiredInputsVisitor
+from wfx.events.event_manager import EventManager
+from wfx.events.message_delta import MessageDeltaEncoder
 from wfx.exceptions.component import StreamingError
 from wfx.field_typing import Tool  # noqa: TC001
 
@@ -30,6 +32,7 @@ from wfx.field_typing import Tool  # noqa: TC001
 # Lazy import to avoid circular dependency
 # from wfx.graph.utils import has_chat_output
 from wfx.helpers.custom import format_type
+from wfx.log.logger import logger
 from wfx.memory import astore_message, aupdate_messages, delete_message
 from wfx.schema.artifact import get_artifact_type, post_process_raw
 from wfx.schema.data import Data
@@ -37,9 +40,12 @@ from wfx.schema.log import Log
 from wfx.schema.message import ErrorMessage, Message
 from wfx.schema.properties import Source
 from wfx.serialization.serialization import serialize
+from wfx.services.cache.utils import CACHE_MISS
+from wfx.services.deps import get_output_cache_service
+from wfx.services.output_cache.service import UnhashableValueError, build_output_cache_key
 from wfx.template.field.base import UNDEFINED, Input, Output
 from wfx.template.frontend_node.custom_components import ComponentFrontendNode
-from wfx.utils.async_helpers import run_until_complete
+from wfx.utils.async_helpers import iterate_in_thread, monitor_loop_lag, run_until_complete
 from wfx.utils.util import find_closest_match
 
 from .custom_component import CustomComponent
@@ -48,7 +54,6 @@ if TYPE_CHECKING:
     from collections.abc import Callable
 
     from wfx.base.tools.component_tool import ComponentToolkit
-    from wfx.events.event_manager import EventManager
     from wfx.graph.edge.schema import EdgeData
     from wfx.graph.vertex.base import Vertex
     from wfx.inputs.inputs import InputTypes
@@ -114,6 +119,9 @@ class Component(CustomComponent):
     outputs: list[Output] = []
     selected_output: str | None = None
     code_class_base_inheritance: ClassVar[str] = "Component"
+    deterministic: ClassVar[bool] = False
+    """Whether every output depends only on the component code and its input values. Outputs of deterministic
+    components are memoized across runs and sessions by the output cache service."""
 
     def __init__(self, **kwargs) -> None:
         # Initialize instance-specific attributes first
@@ -137,6 +145,9 @@ class Component(CustomComponent):
         self._event_manager: EventManager | None = None
         self._state_model = None
         self._telemetry_input_values: dict[str, Any] | None = None
+        # Seconds the event loop was blocked while this component streamed messages
+        self._stream_loop_blocked_time: float = 0.0
+        self._message_deltas = MessageDeltaEncoder()
 
         # Process input kwargs
         inputs = {}
@@ -340,6 +351,21 @@ class Component(CustomComponent):
 
         self.graph.context.update(value_dict)
 
+    def subscribe_state(self, key: str, observer: Callable) -> None:
+        """Subscribe to changes of a state key until the current run of the graph ends.
+
+        Args:
+            key (str): The state key to observe.
+            observer (Callable): Called with the key, the new state and ``append``.
+
+        Raises:
+            ValueError: If the graph is not built.
+        """
+        if not hasattr(self, "graph") or self.graph is None:
+            msg = "Graph not found. Please build the graph first."
+            raise ValueError(msg)
+        self.graph.subscribe_state(key, observer)
+
     def _pre_run_setup(self):
         pass
 
@@ -352,6 +378,18 @@ class Component(CustomComponent):
             for output in self._outputs_map.values():
                 output.value = UNDEFINED
 
+    def reset_run_state(self) -> None:
+        """Clears the results, logs and status left by a previous run, so the instance can be run again."""
+        self.reset_all_output_values()
+        self._results = {}
+        self._artifacts = {}
+        self._logs = []
+        self._output_logs = {}
+        self._current_output = ""
+        self._stream_loop_blocked_time = 0.0
+        self._message_deltas = MessageDeltaEncoder()
+        self.status = None
+
     def _build_state_model(self):
         if self._state_model:
             return self._state_model
@@ -854,7 +892,8 @@ class Component(CustomComponent):
         except KeyError:
             input_ = self._get_fallback_input(name=key, display_name=key)
             self._inputs[key] = input_
-            self.inputs.append(input_)
+            # Rebinds instead of appending, as the list may be the class attribute shared by every instance
+            self.inputs = [*self.inputs, input_]
             return input_
 
     def _connect_to_component(self, key, value, input_) -> None:
@@ -1222,7 +1261,8 @@ class Component(CustomComponent):
         """Computes and returns the result for a given output, applying caching and output options.
 
         If the output is cached and a value is already defined, returns the cached value. Otherwise,
-        invokes the associated output method asynchronously, applies output options, updates the cache,
+        invokes the associated output method asynchronously, or reuses the value memoized for the same
+        code and inputs if the component is deterministic, applies output options, updates the cache,
         and returns the result. Raises a ValueError if the output method is not defined, or a TypeError
         if the method invocation fails.
         """
@@ -1233,12 +1273,20 @@ class Component(CustomComponent):
             msg = f'Output "{output.name}" does not have a method defined.'
             raise ValueError(msg)
 
-        method = getattr(self, output.method)
-        try:
-            result = await method() if inspect.iscoroutinefunction(method) else await asyncio.to_thread(method)
-        except TypeError as e:
-            msg = f'Error running method "{output.method}": {e}'
-            raise TypeError(msg) from e
+        memo_key = self._get_output_memo_key(output)
+        output_cache = get_output_cache_service() if memo_key else None
+        memoized = output_cache.get_output(memo_key) if output_cache is not None else CACHE_MISS
+        if memoized is not CACHE_MISS:
+            result, self.status = memoized
+        else:
+            method = getattr(self, output.method)
+            try:
+                result = await method() if inspect.iscoroutinefunction(method) else await asyncio.to_thread(method)
+            except TypeError as e:
+                msg = f'Error running method "{output.method}": {e}'
+                raise TypeError(msg) from e
+            if output_cache is not None:
+                output_cache.set_output(memo_key, (result, self.status))
 
         if (
             self._vertex is not None
@@ -1252,6 +1300,17 @@ class Component(CustomComponent):
 
         return result
 
+    def _get_output_memo_key(self, output: Output) -> str | None:
+        """Returns the key memoizing an output of a deterministic component, or None if it is not memoized."""
+        if not self.deterministic:
+            return None
+        code = self._code or f"{type(self).__module__}.{type(self).__qualname__}"
+        try:
+            return build_output_cache_key(code, self._attributes, output.name)
+        except UnhashableValueError as e:
+            logger.debug(f"Not memoizing output {output.name} of {self.display_name}: {e} inputs cannot be hashed")
+            return None
+
     async def resolve_output(self, output_name: str) -> Any:
         """Resolves and returns the value for a specified output by name.
 
@@ -1541,14 +1600,15 @@ class Component(CustomComponent):
 
     def _append_tool_output(self) -> None:
         if next((output for output in self.outputs if output.name == TOOL_OUTPUT_NAME), None) is None:
-            self.outputs.append(
+            self.outputs = [
+                *self.outputs,
                 Output(
                     name=TOOL_OUTPUT_NAME,
                     display_name=TOOL_OUTPUT_DISPLAY_NAME,
                     method="to_toolkit",
                     types=["Tool"],
-                )
-            )
+                ),
+            ]
 
     def is_connected_to_chat_output(self) -> bool:
         # Lazy import to avoid circular dependency
@@ -1667,12 +1727,13 @@ class Component(CustomComponent):
                 )
                 raise ValueError(msg)
 
-            # Create a fresh Message instance for consistency with normal flow
-            stored_message = await Message.create(**message.model_dump())
+            # The message is updated in place and only what changed since the last send is emitted,
+            # so repeated sends of a growing message (e.g. agent tool calls) stay cheap
+            stored_message = message
             self._stored_message_id = stored_message.get_id()
             # Still send the event to update the client in real-time
             # Note: If this fails, we don't need DB cleanup since we didn't write to DB
-            await self._send_message_event(stored_message, id_=id_)
+            await self._send_message_update_event(stored_message, id_=id_)
         else:
             # Normal flow: store/update in database
             stored_message = await self._store_message(message)
@@ -1720,18 +1781,41 @@ class Component(CustomComponent):
         stored_message = stored_messages[0]
         return await Message.create(**stored_message.model_dump())
 
+    def _supports_message_updates(self) -> bool:
+        return bool(self._event_manager and "on_message_update" in getattr(self._event_manager, "events", {}))
+
+    @staticmethod
+    def _message_event_data(message: Message, id_: str | None = None) -> dict:
+        # Use full model_dump() to include all Message fields (content_blocks, properties, etc.)
+        data_dict = message.model_dump()
+
+        # The message ID is stored in message.data["id"], which ends up in data_dict["data"]["id"]
+        # But the frontend expects it at data_dict["id"], so we need to copy it to the top level
+        message_id = id_ or data_dict.get("data", {}).get("id") or getattr(message, "id", None)
+        if message_id and not data_dict.get("id"):
+            data_dict["id"] = message_id
+        return data_dict
+
+    async def _send_message_update_event(self, message: Message, id_: str | None = None) -> None:
+        """Sends only what changed in a message since it was last sent, or the full message if needed."""
+        if not (hasattr(self, "_event_manager") and self._supports_message_updates()):
+            await self._send_message_event(message, id_=id_)
+            return
+        data_dict = self._message_event_data(message, id_)
+        message_id = data_dict.get("id")
+        update = self._message_deltas.encode_update(str(message_id), data_dict) if message_id else None
+        if update is None:
+            await self._send_message_event(message, id_=id_)
+            return
+        await asyncio.to_thread(self._event_manager.on_message_update, data=update)
+
     async def _send_message_event(self, message: Message, id_: str | None = None, category: str | None = None) -> None:
         if hasattr(self, "_event_manager") and self._event_manager:
-            # Use full model_dump() to include all Message fields (content_blocks, properties, etc.)
-            data_dict = message.model_dump()
-
-            # The message ID is stored in message.data["id"], which ends up in data_dict["data"]["id"]
-            # But the frontend expects it at data_dict["id"], so we need to copy it to the top level
-            message_id = id_ or data_dict.get("data", {}).get("id") or getattr(message, "id", None)
-            if message_id and not data_dict.get("id"):
-                data_dict["id"] = message_id
-
+            data_dict = self._message_event_data(message, id_)
             category = category or data_dict.get("category", None)
+            if category not in {"error", "remove_message"} and data_dict.get("id") and self._supports_message_updates():
+                # Full sends carry the version later updates are based on
+                data_dict["version"] = self._message_deltas.record_full(str(data_dict["id"]), data_dict.copy())
 
             def _send_event():
                 match category:
@@ -1788,20 +1872,36 @@ class Component(CustomComponent):
             msg = "Message must have an ID to stream. Messages only have IDs after being stored in the database."
             raise ValueError(msg)
 
-        if isinstance(iterator, AsyncIterator):
-            return await self._handle_async_iterator(iterator, message_id, message)
         try:
-            complete_message = ""
-            first_chunk = True
-            for chunk in iterator:
-                complete_message = await self._process_chunk(
-                    chunk.content, complete_message, message_id, message, first_chunk=first_chunk
+            async with monitor_loop_lag() as loop_lag:
+                if isinstance(iterator, AsyncIterator):
+                    return await self._handle_async_iterator(iterator, message_id, message)
+                # Synchronous streams block on network reads, so they are pulled from a worker thread
+                stream = iterate_in_thread(iterator, buffer_size=self._get_stream_buffer_size())
+                try:
+                    return await self._handle_async_iterator(stream, message_id, message)
+                except Exception as e:
+                    raise StreamingError(cause=e, source=message.properties.source) from e
+                finally:
+                    # Stops the worker thread and closes the iterator if the stream ended early
+                    await stream.aclose()
+        finally:
+            self._stream_loop_blocked_time += loop_lag.blocked_time
+            if loop_lag.blocked_time:
+                logger.debug(
+                    f"Streaming in {self.display_name} blocked the event loop for {loop_lag.blocked_time:.4f}s "
+                    f"(longest {loop_lag.max_lag:.4f}s)"
                 )
-                first_chunk = False
-        except Exception as e:
-            raise StreamingError(cause=e, source=message.properties.source) from e
-        else:
-            return complete_message
+            if isinstance(self._event_manager, EventManager):
+                self._event_manager.close_token_stream(str(message_id))
+
+    @staticmethod
+    def _get_stream_buffer_size() -> int:
+        from wfx.services.deps import get_settings_service
+
+        settings_service = get_settings_service()
+        settings = settings_service.settings if settings_service else None
+        return getattr(settings, "stream_iterator_buffer_size", 64)
 
     async def _handle_async_iterator(self, iterator: AsyncIterator, message_id: str, message: Message) -> str:
         complete_message = ""
@@ -1823,13 +1923,17 @@ class Component(CustomComponent):
                 msg_copy = message.model_copy()
                 msg_copy.text = complete_message
                 await self._send_message_event(msg_copy, id_=message_id)
-            await asyncio.to_thread(
-                self._event_manager.on_token,
-                data={
-                    "chunk": chunk,
-                    "id": str(message_id),
-                },
-            )
+            if isinstance(self._event_manager, EventManager) and self._event_manager.batches_tokens:
+                # Coalesced on the loop and encoded once per batch, no thread hop per token
+                self._event_manager.add_token(chunk, message_id=str(message_id))
+            else:
+                await asyncio.to_thread(
+                    self._event_manager.on_token,
+                    data={
+                        "chunk": chunk,
+                        "id": str(message_id),
+                    },
+                )
         return complete_message
 
     async def send_error(
@@ -1,3 +1,6 @@
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import TYPE_CHECKING
 
 from wfx.custom import validate
@@ -5,8 +8,110 @@ from wfx.custom import validate
 if TYPE_CHECKING:
     from wfx.custom.custom_component.custom_component import CustomComponent
 
+COMPONENT_CLASS_CACHE_MAX_SIZE = 512
+
+
+class ComponentClassCache:
+    """A thread-safe, bounded LRU cache of compiled component classes keyed by the SHA-256 digest of their source code.
+
+    Compiling a component (AST parse, global scope preparation and ``exec``) is expensive and happens
+    every time a vertex is instantiated, so identical source code is only compiled once per process.
+
+    Attributes:
+        max_size (int): Maximum number of classes kept in the cache.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that required compiling the code.
+        evictions (int): Number of classes evicted because the cache was full.
+    """
+
+    def __init__(self, max_size: int = COMPONENT_CLASS_CACHE_MAX_SIZE) -> None:
+        self._cache: OrderedDict[str, type] = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(code: str) -> str:
+        # The full digest: a truncated one could hand one component's class to different code
+        if not isinstance(code, str):
+            msg = "Source code must be a string"
+            raise TypeError(msg)
+        return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> type | None:
+        with self._lock:
+            class_object = self._cache.get(key)
+            if class_object is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return class_object
+
+    def set(self, key: str, class_object: type) -> None:
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+            elif len(self._cache) >= self.max_size:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+            self._cache[key] = class_object
+
+    def invalidate(self, code: str | None = None) -> None:
+        """Removes the class compiled from ``code``, or every class if no code is given."""
+        with self._lock:
+            if code is None:
+                self._cache.clear()
+                return
+            try:
+                key = self.make_key(code)
+            except (TypeError, ValueError):
+                return
+            self._cache.pop(key, None)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._cache),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+component_class_cache = ComponentClassCache()
+
+
+def invalidate_component_class_cache(code: str | None = None) -> None:
+    """Invalidates the compiled class for ``code``, or the whole cache if no code is given.
+
+    Must be called whenever the result of compiling the same source can change, e.g. when a user
+    installs a dependency the component imports. Edited code has a new key and needs no invalidation.
+    """
+    component_class_cache.invalidate(code)
+
 
 def eval_custom_component_code(code: str) -> type["CustomComponent"]:
-    """Evaluate custom component code."""
+    """Evaluate custom component code.
+
+    The resulting class is cached by a hash of the source, so evaluating the same code again
+    returns the already compiled class.
+    """
+    try:
+        key = component_class_cache.make_key(code)
+    except (TypeError, ValueError):
+        key = None
+    if key is not None and (class_object := component_class_cache.get(key)) is not None:
+        return class_object
+
     class_name = validate.extract_class_name(code)
-    return validate.create_class(code, class_name)
+    class_object = validate.create_class(code, class_name)
+    if key is not None:
+        component_class_cache.set(key, class_object)
+    return class_object
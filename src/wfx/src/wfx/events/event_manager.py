@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import inspect
 import json
+import threading
 import time
 import uuid
+from dataclasses import dataclass, field
 from functools import partial
 from typing import TYPE_CHECKING
 
+import orjson
 from fastapi.encoders import jsonable_encoder
 from typing_extensions import Protocol
 
@@ -25,10 +29,73 @@ class PartialEventCallback(Protocol):
     def __call__(self, *, data: LoggableType): ...
 
 
+@dataclass
+class TokenStreamStats:
+    """Throughput counters of a single streamed message.
+
+    ``lag`` is the time a token waited in its batch before the batch was put on the queue.
+    """
+
+    message_id: str
+    started_at: float = field(default_factory=time.perf_counter)
+    tokens: int = 0
+    batches: int = 0
+    total_lag: float = 0.0
+    max_lag: float = 0.0
+
+    @property
+    def tokens_per_second(self) -> float:
+        elapsed = time.perf_counter() - self.started_at
+        return self.tokens / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def mean_lag(self) -> float:
+        return self.total_lag / self.batches if self.batches else 0.0
+
+    def to_dict(self) -> dict[str, float | int | str]:
+        return {
+            "message_id": self.message_id,
+            "tokens": self.tokens,
+            "batches": self.batches,
+            "tokens_per_second": round(self.tokens_per_second, 2),
+            "mean_lag_ms": round(self.mean_lag * 1000, 3),
+            "max_lag_ms": round(self.max_lag * 1000, 3),
+        }
+
+
+@dataclass
+class _TokenBatch:
+    chunks: list[str] = field(default_factory=list)
+    first_token_at: float = 0.0
+    timer: asyncio.TimerHandle | None = None
+
+
+def _get_token_batch_settings() -> tuple[int, float]:
+    from wfx.services.deps import get_settings_service
+
+    settings_service = get_settings_service()
+    settings = settings_service.settings if settings_service else None
+    batch_size = getattr(settings, "token_batch_size", 16)
+    window_ms = getattr(settings, "token_batch_window_ms", 20)
+    return batch_size, window_ms / 1000
+
+
 class EventManager:
-    def __init__(self, queue):
+    def __init__(self, queue, *, token_batch_size: int | None = None, token_batch_window: float | None = None):
         self.queue = queue
         self.events: dict[str, PartialEventCallback] = {}
+        # Event names registered without a custom callback, mapped to their event type
+        self._default_events: dict[str, str] = {}
+        if token_batch_size is None or token_batch_window is None:
+            default_size, default_window = _get_token_batch_settings()
+            token_batch_size = default_size if token_batch_size is None else token_batch_size
+            token_batch_window = default_window if token_batch_window is None else token_batch_window
+        self.token_batch_size = max(1, token_batch_size)
+        self.token_batch_window = max(0.0, token_batch_window)
+        self._token_batches: dict[str, _TokenBatch] = {}
+        self._token_stats: dict[str, TokenStreamStats] = {}
+        # Tokens are added on the event loop, while other events may be sent from worker threads
+        self._token_lock = threading.Lock()
 
     @staticmethod
     def _validate_callback(callback: EventCallback) -> None:
@@ -59,11 +126,16 @@ class EventManager:
             raise ValueError(msg)
         if callback is None:
             callback_ = partial(self.send_event, event_type=event_type)
+            self._default_events[name] = event_type
         else:
             callback_ = partial(callback, manager=self, event_type=event_type)
+            self._default_events.pop(name, None)
         self.events[name] = callback_
 
     def send_event(self, *, event_type: str, data: LoggableType):
+        if self._token_batches:
+            # Keep the stream ordered: buffered tokens go out before any other event
+            self.flush_tokens()
         try:
             # Simple event creation without heavy dependencies
             if isinstance(data, dict) and event_type in {"message", "error", "warning", "info", "token"}:
@@ -81,6 +153,99 @@ class EventManager:
             except Exception:  # noqa: BLE001
                 logger.debug("Queue not available for event")
 
+    @property
+    def batches_tokens(self) -> bool:
+        """Whether ``add_token`` can coalesce tokens, i.e. ``on_token`` uses the default queue sender."""
+        return "on_token" in self._default_events and self.queue is not None
+
+    def add_token(self, chunk: str, *, message_id: str) -> None:
+        """Buffers a streamed token of ``message_id`` and sends it as part of a batched token event.
+
+        Must be called from the event loop thread. A batch is sent once it holds ``token_batch_size``
+        tokens or ``token_batch_window`` seconds after its first token, whichever comes first, and
+        the remaining tokens are sent by ``close_token_stream``.
+        """
+        if not self.batches_tokens:
+            self.on_token(data={"chunk": chunk, "id": message_id})
+            return
+        now = time.perf_counter()
+        with self._token_lock:
+            stats = self._token_stats.get(message_id)
+            if stats is None:
+                stats = self._token_stats[message_id] = TokenStreamStats(message_id=message_id)
+            batch = self._token_batches.get(message_id)
+            if batch is None:
+                batch = self._token_batches[message_id] = _TokenBatch(first_token_at=now)
+            batch.chunks.append(chunk)
+            stats.tokens += 1
+            if len(batch.chunks) < self.token_batch_size and now - batch.first_token_at < self.token_batch_window:
+                if batch.timer is None:
+                    batch.timer = self._schedule_flush(message_id)
+                return
+            self._flush_batch(message_id, now)
+
+    def _schedule_flush(self, message_id: str) -> asyncio.TimerHandle | None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+        return loop.call_later(self.token_batch_window, self.flush_tokens, message_id)
+
+    def flush_tokens(self, message_id: str | None = None) -> None:
+        """Sends the buffered tokens of ``message_id``, or of every stream if no id is given."""
+        now = time.perf_counter()
+        with self._token_lock:
+            message_ids = list(self._token_batches) if message_id is None else [message_id]
+            for id_ in message_ids:
+                self._flush_batch(id_, now)
+
+    def close_token_stream(self, message_id: str) -> TokenStreamStats | None:
+        """Sends the remaining tokens of ``message_id`` and returns the stream's counters."""
+        self.flush_tokens(message_id)
+        with self._token_lock:
+            stats = self._token_stats.pop(message_id, None)
+        if stats is not None:
+            logger.debug(f"Token stream finished: {stats.to_dict()}")
+        return stats
+
+    def get_token_stats(self, message_id: str) -> TokenStreamStats | None:
+        return self._token_stats.get(message_id)
+
+    def _flush_batch(self, message_id: str, now: float) -> None:
+        # Callers must hold self._token_lock
+        batch = self._token_batches.pop(message_id, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        if not batch.chunks:
+            return
+        stats = self._token_stats.get(message_id)
+        if stats is not None:
+            lag = now - batch.first_token_at
+            stats.batches += 1
+            stats.total_lag += lag
+            stats.max_lag = max(stats.max_lag, lag)
+        self._put_frame(f"token-{uuid.uuid4()}", self._encode_token_frame(message_id, "".join(batch.chunks)))
+
+    def _encode_token_frame(self, message_id: str, chunk: str) -> bytes:
+        event_type = self._default_events["on_token"]
+        return (
+            b'{"event":'
+            + orjson.dumps(event_type)
+            + b',"data":{"chunk":'
+            + orjson.dumps(chunk)
+            + b',"id":'
+            + orjson.dumps(message_id)
+            + b"}}\n\n"
+        )
+
+    def _put_frame(self, event_id: str, frame: bytes) -> None:
+        try:
+            self.queue.put_nowait((event_id, frame, time.time()))
+        except Exception:  # noqa: BLE001
+            logger.debug("Queue not available for event")
+
     def noop(self, *, data: LoggableType) -> None:
         pass
 
@@ -95,6 +260,7 @@ def create_default_event_manager(queue=None):
     manager.register_event("on_error", "error")
     manager.register_event("on_end", "end")
     manager.register_event("on_message", "add_message")
+    manager.register_event("on_message_update", "message_update")
     manager.register_event("on_remove_message", "remove_message")
     manager.register_event("on_end_vertex", "end_vertex")
     manager.register_event("on_build_start", "build_start")
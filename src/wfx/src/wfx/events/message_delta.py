@@ -0,0 +1,135 @@
+"""Incremental ``message_update`` events for messages that are re-sent while they change.
+
+Agents re-send their message on every tool start, end and error. Sending the whole message each time
+makes the event stream grow quadratically with the number of tool calls, because every event repeats all
+the content blocks accumulated so far. :class:`MessageDeltaEncoder` remembers what was last sent for each
+message and encodes the next send as the list of changes, using the ``add``/``replace`` operations of
+JSON Patch (RFC 6902)::
+
+    {
+        "id": "<message id>",
+        "version": 7,
+        "base_version": 6,
+        "ops": [
+            {"op": "replace", "path": "/content_blocks/0/contents/3", "value": {...}},
+            {"op": "add", "path": "/content_blocks/0/contents/-", "value": {...}},
+        ],
+    }
+
+Every ``add_message`` event of a tracked message carries its ``version`` too. A client applies an update
+only when ``base_version`` matches the version it holds; otherwise it missed an event and must wait for the
+next full ``add_message``, which is sent every ``keyframe_interval`` updates and when the message is stored.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+CONTENT_BLOCKS_KEY = "content_blocks"
+CONTENTS_KEY = "contents"
+
+# Number of consecutive updates after which the full message is sent again
+DEFAULT_KEYFRAME_INTERVAL = 50
+
+
+@dataclass
+class _SentMessage:
+    data: dict[str, Any]
+    version: int = 0
+    updates_since_full: int = 0
+
+
+def _diff_contents(block_index: int, previous: list, current: list) -> list[dict[str, Any]] | None:
+    if len(current) < len(previous):
+        return None
+    base = f"/{CONTENT_BLOCKS_KEY}/{block_index}/{CONTENTS_KEY}"
+    ops = [
+        {"op": "replace", "path": f"{base}/{index}", "value": content}
+        for index, (old, content) in enumerate(zip(previous, current, strict=False))
+        if old != content
+    ]
+    ops.extend({"op": "add", "path": f"{base}/-", "value": content} for content in current[len(previous) :])
+    return ops
+
+
+def _diff_blocks(previous: list, current: list) -> list[dict[str, Any]]:
+    ops: list[dict[str, Any]] = []
+    for index, block in enumerate(current):
+        if index >= len(previous):
+            ops.append({"op": "add", "path": f"/{CONTENT_BLOCKS_KEY}/-", "value": block})
+            continue
+        old = previous[index]
+        if old == block:
+            continue
+        content_ops = None
+        if isinstance(old, dict) and isinstance(block, dict):
+            old_rest = {key: value for key, value in old.items() if key != CONTENTS_KEY}
+            rest = {key: value for key, value in block.items() if key != CONTENTS_KEY}
+            if old_rest == rest:
+                content_ops = _diff_contents(index, old.get(CONTENTS_KEY) or [], block.get(CONTENTS_KEY) or [])
+        if content_ops is None:
+            ops.append({"op": "replace", "path": f"/{CONTENT_BLOCKS_KEY}/{index}", "value": block})
+        else:
+            ops.extend(content_ops)
+    return ops
+
+
+def diff_message(previous: dict[str, Any], current: dict[str, Any]) -> list[dict[str, Any]] | None:
+    """Returns the JSON Patch operations turning ``previous`` into ``current``.
+
+    Returns:
+        The operations, or None if the change cannot be expressed with ``add`` and ``replace``
+        (a field or content block was removed).
+    """
+    if previous.keys() - current.keys():
+        return None
+    ops: list[dict[str, Any]] = []
+    for key, value in current.items():
+        old = previous.get(key)
+        if key == CONTENT_BLOCKS_KEY and isinstance(old, list) and isinstance(value, list):
+            if len(value) < len(old):
+                return None
+            ops.extend(_diff_blocks(old, value))
+        elif key not in previous:
+            ops.append({"op": "add", "path": f"/{key}", "value": value})
+        elif old != value:
+            ops.append({"op": "replace", "path": f"/{key}", "value": value})
+    return ops
+
+
+@dataclass
+class MessageDeltaEncoder:
+    """Tracks the last version sent of each message and encodes re-sends as ``message_update`` payloads."""
+
+    keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL
+    _sent: dict[str, _SentMessage] = field(default_factory=dict)
+
+    def record_full(self, message_id: str, data: dict[str, Any]) -> int:
+        """Records that the full message was sent and returns the version to send it with."""
+        sent = self._sent.get(message_id)
+        version = sent.version + 1 if sent else 1
+        self._sent[message_id] = _SentMessage(data=data, version=version)
+        return version
+
+    def encode_update(self, message_id: str, data: dict[str, Any]) -> dict[str, Any] | None:
+        """Encodes ``data`` as the changes since the last version sent of the message.
+
+        Returns:
+            The ``message_update`` payload, or None if the full message must be sent instead: the message
+            was never sent in full, a keyframe is due, or the change cannot be expressed as a patch.
+        """
+        sent = self._sent.get(message_id)
+        if sent is None or sent.updates_since_full + 1 >= self.keyframe_interval:
+            return None
+        ops = diff_message(sent.data, data)
+        if ops is None:
+            return None
+        base_version = sent.version
+        sent.data = data
+        sent.version += 1
+        sent.updates_since_full += 1
+        return {"id": message_id, "version": sent.version, "base_version": base_version, "ops": ops}
+
+    def forget(self, message_id: str) -> None:
+        self._sent.pop(message_id, None)
@@ -13,7 +13,7 @@ from collections import defaultdict, deque
 from datetime import datetime, timezone
 from functools import partial
 from itertools import chain
-from typing import TYPE_CHECKING, Any, cast
+from typing import TYPE_CHECKING, Any, Literal, cast
 
 from ag_ui.core import RunFinishedEvent, RunStartedEvent
 
@@ -41,7 +41,15 @@ from wfx.log.logger import LogConfig, configure, logger
 from wfx.schema.dotdict import dotdict
 from wfx.schema.schema import INPUT_FIELD_NAME, InputType, OutputValue
 from wfx.services.cache.utils import CacheMiss
-from wfx.services.deps import get_chat_service, get_tracing_service
+from wfx.services.deps import (
+    get_chat_service,
+    get_settings_service,
+    get_state_service,
+    get_tracing_service,
+    get_variable_service,
+    session_scope,
+)
+from wfx.services.session import NoopSession
 from wfx.utils.async_helpers import run_until_complete
 
 if TYPE_CHECKING:
@@ -269,6 +277,30 @@ class Graph:
         self._edges = self._graph_data["edges"]
         self.initialize()
 
+    def add_processed_nodes_and_edges(
+        self, raw_graph_data: GraphData, graph_data: GraphData, cycle_vertices: Iterable[str]
+    ) -> None:
+        """Initializes the graph from data that was already ungrouped by ``process_flow``.
+
+        This is the counterpart of ``add_nodes_and_edges`` used by ``GraphTemplate`` to skip
+        flattening group nodes and cycle detection when the same flow is instantiated repeatedly.
+
+        Args:
+            raw_graph_data: The graph data as stored in the flow, before ungrouping.
+            graph_data: The graph data returned by ``process_flow`` for ``raw_graph_data``.
+            cycle_vertices: The cycle vertices previously computed for ``raw_graph_data``.
+        """
+        self.raw_graph_data = raw_graph_data
+        self._cycle_vertices = set(cycle_vertices)
+        self.top_level_vertices = [node["id"] for node in raw_graph_data["nodes"] if node.get("id")]
+        for vertex_id in self.top_level_vertices:
+            if vertex_id in self._cycle_vertices:
+                self.run_manager.add_to_cycle_vertices(vertex_id)
+        self._graph_data = graph_data
+        self._vertices = graph_data["nodes"]
+        self._edges = graph_data["edges"]
+        self.initialize()
+
     def add_component(self, component: Component, component_id: str | None = None) -> str:
         component_id = component_id or component.get_id()
         if component_id in self.vertex_map:
@@ -407,6 +439,51 @@ class Graph:
                 continue
             vertex.custom_component.reset_all_output_values()
 
+    def reset_run_state(self) -> None:
+        """Clears the state left by a previous run so this instance can be started again.
+
+        Vertices and edges are kept, which makes reusing a graph much cheaper than building a copy of it
+        with ``copy.deepcopy``. Component instances built from a vertex's code are dropped, as components
+        may keep any state between runs, and are built again on the next run. Instances given with
+        :meth:`add_component` cannot be rebuilt, so only their results, logs and status are cleared.
+        """
+        for vertex in self.vertices:
+            if vertex.component_instance_given:
+                vertex.custom_component.reset_run_state()
+            else:
+                vertex.custom_component = None
+            # Parameters set from the previous run's inputs must be rebuilt from the template
+            vertex.updated_raw_params = False
+            vertex._reset()  # noqa: SLF001
+            vertex.result = None
+            vertex.results = {}
+            vertex.outputs_logs = {}
+            vertex.logs = {}
+            vertex.state = VertexStates.ACTIVE
+        for edge in self.edges:
+            if isinstance(edge, CycleEdge):
+                edge.is_fulfilled = False
+                edge.result = None
+
+        self.run_manager = RunnableVerticesManager()
+        for vertex in self.vertices:
+            if vertex.id in self.cycle_vertices:
+                self.run_manager.add_to_cycle_vertices(vertex.id)
+        self.inactivated_vertices = set()
+        self.activated_vertices = []
+        self.vertices_layers = []
+        self.vertices_to_run = set()
+        self.inactive_vertices = set()
+        self.conditionally_excluded_vertices = set()
+        self.conditional_exclusion_sources = {}
+        self.stop_vertex = None
+        self._run_queue = deque()
+        self._first_layer = []
+        self._call_order = []
+        self._snapshots = []
+        self._prepared = False
+        self._run_id = ""
+
     def start(
         self,
         inputs: list[dict] | None = None,
@@ -645,6 +722,7 @@ class Graph:
     async def initialize_run(self) -> None:
         if not self._run_id:
             self.set_run_id()
+        await self._prefetch_variables()
         if self.tracing_service:
             run_name = f"{self.flow_name} - {self.flow_id}"
             await self.tracing_service.start_tracers(
@@ -654,6 +732,47 @@ class Graph:
                 session_id=self.session_id,
             )
 
+    def _get_load_from_db_variable_names(self) -> set[str]:
+        """Returns the names of the global variables referenced by the load_from_db fields of all vertices."""
+        request_variables = (self.context or {}).get("request_variables") or {}
+        names: set[str] = set()
+        for vertex in self.vertices:
+            for field in vertex.load_from_db_fields:
+                if field.startswith("table:"):
+                    table_field_name = field[6:]
+                    columns = vertex.params.get(f"{table_field_name}_load_from_db_columns") or []
+                    rows = vertex.params.get(table_field_name) or []
+                    values = [row.get(column) for row in rows if isinstance(row, dict) for column in columns]
+                else:
+                    values = [vertex.params.get(field)]
+                names.update(value for value in values if value and isinstance(value, str))
+        return names - request_variables.keys()
+
+    async def _prefetch_variables(self) -> None:
+        """Loads the variables of every load_from_db field in a single query before the run starts.
+
+        The variable service keeps the decrypted values for a short time, so the vertices resolving their fields
+        during the run neither query the database nor decrypt again.
+        """
+        if not self.user_id:
+            return
+        variable_service = get_variable_service()
+        prefetch = getattr(variable_service, "prefetch_variables", None)
+        if prefetch is None:
+            return
+        names = self._get_load_from_db_variable_names()
+        if not names:
+            return
+        try:
+            user_id = self.user_id if isinstance(self.user_id, uuid.UUID) else uuid.UUID(str(self.user_id))
+            async with session_scope() as session:
+                if isinstance(session, NoopSession):
+                    return
+                await prefetch(user_id=user_id, names=names, session=session)
+        except Exception:  # noqa: BLE001
+            # The vertices still load their variables one by one
+            logger.exception("Error prefetching variables")
+
     def _end_all_traces_async(self, outputs: dict[str, Any] | None = None, error: Exception | None = None) -> None:
         task = asyncio.create_task(self.end_all_traces(outputs, error))
         self._end_trace_tasks.add(task)
@@ -673,6 +792,8 @@ class Graph:
         return async_end_traces_func
 
     async def end_all_traces(self, outputs: dict[str, Any] | None = None, error: Exception | None = None) -> None:
+        # The traces end when the run does, so the state kept for the run is no longer needed
+        self._release_run_state()
         if not self.tracing_service:
             return
         self._end_time = datetime.now(timezone.utc)
@@ -681,6 +802,27 @@ class Graph:
         outputs |= self.metadata
         await self.tracing_service.end_tracers(outputs, error)
 
+    def _release_run_state(self) -> None:
+        if not self._run_id:
+            return
+        try:
+            state_service = get_state_service()
+            if state_service is not None:
+                state_service.release_run(self._run_id)
+        except Exception:  # noqa: BLE001
+            logger.exception("Error releasing run state")
+
+    def subscribe_state(self, key: str, observer: Callable) -> None:
+        """Subscribes an observer to changes of a state key for the current run.
+
+        The observer is unsubscribed when the run ends, so observers do not outlive the run that added them.
+        """
+        if not self._run_id:
+            self.set_run_id()
+        state_service = get_state_service()
+        if state_service is not None:
+            state_service.subscribe(key, observer, run_id=self._run_id)
+
     @property
     def sorted_vertices_layers(self) -> list[list[str]]:
         """Returns the sorted layers of vertex IDs by type.
@@ -1028,10 +1170,8 @@ class Graph:
 
     def get_edge(self, source_id: str, target_id: str) -> CycleEdge | None:
         """Returns the edge between two vertices."""
-        for edge in self.edges:
-            if edge.source_id == source_id and edge.target_id == target_id:
-                return edge
-        return None
+        edges = self._edge_pair_index.get((source_id, target_id))
+        return edges[0] if edges else None
 
     def build_parent_child_map(self, vertices: list[Vertex]):
         parent_child_map = defaultdict(list)
@@ -1118,7 +1258,9 @@ class Graph:
             state["run_manager"] = run_manager
         else:
             state["run_manager"] = RunnableVerticesManager.from_dict(run_manager)
+        edges = state.pop("edges", [])
         self.__dict__.update(state)
+        self.edges = edges
         self.vertex_map = {vertex.id: vertex for vertex in self.vertices}
         # Tracing service will be lazily initialized via property when needed
         self.set_run_id(self._run_id)
@@ -1290,8 +1432,12 @@ class Graph:
         """Updates the edges of a vertex."""
         # Vertex has edges, so we need to update the edges
         for edge in vertex.edges:
-            if edge not in self.edges and edge.source_id in self.vertex_map and edge.target_id in self.vertex_map:
-                self.edges.append(edge)
+            if (
+                edge not in self._edge_pair_index.get((edge.source_id, edge.target_id), [])
+                and edge.source_id in self.vertex_map
+                and edge.target_id in self.vertex_map
+            ):
+                self._add_edge_to_index(edge)
 
     def _build_graph(self) -> None:
         """Builds the graph from the vertices and edges."""
@@ -1597,6 +1743,39 @@ class Graph:
             result_dict=result_dict, params=params, valid=valid, artifacts=artifacts, vertex=vertex
         )
 
+    @property
+    def edges(self) -> list[CycleEdge]:
+        """The edges of the graph.
+
+        The list must not be mutated in place; assign a new list or use ``_add_edge_to_index``
+        so the adjacency index stays consistent.
+        """
+        return self._edge_list
+
+    @edges.setter
+    def edges(self, edges: list[CycleEdge]) -> None:
+        self._edge_list = edges
+        self._reindex_edges()
+
+    def _reindex_edges(self) -> None:
+        """Rebuilds the per-vertex and per-pair edge indexes from ``self.edges``."""
+        self._vertex_edges_index: dict[str, list[CycleEdge]] = defaultdict(list)
+        self._edge_pair_index: dict[tuple[str, str], list[CycleEdge]] = defaultdict(list)
+        for edge in self._edge_list:
+            self._index_edge(edge)
+
+    def _index_edge(self, edge: CycleEdge) -> None:
+        # Both lists keep the order of self.edges, so lookups return edges in the same order a scan would
+        self._vertex_edges_index[edge.source_id].append(edge)
+        if edge.target_id != edge.source_id:
+            self._vertex_edges_index[edge.target_id].append(edge)
+        self._edge_pair_index[edge.source_id, edge.target_id].append(edge)
+
+    def _add_edge_to_index(self, edge: CycleEdge) -> None:
+        """Appends an edge to the graph and indexes it."""
+        self._edge_list.append(edge)
+        self._index_edge(edge)
+
     def get_vertex_edges(
         self,
         vertex_id: str,
@@ -1607,9 +1786,12 @@ class Graph:
         """Returns a list of edges for a given vertex."""
         # The idea here is to return the edges that have the vertex_id as source or target
         # or both
+        edges = self._vertex_edges_index.get(vertex_id, [])
+        if is_source is not False and is_target is not False:
+            return list(edges)
         return [
             edge
-            for edge in self.edges
+            for edge in edges
             if (edge.source_id == vertex_id and is_source is not False)
             or (edge.target_id == vertex_id and is_target is not False)
         ]
@@ -1617,7 +1799,7 @@ class Graph:
     def get_vertices_with_target(self, vertex_id: str) -> list[Vertex]:
         """Returns the vertices connected to a vertex."""
         vertices: list[Vertex] = []
-        for edge in self.edges:
+        for edge in self._vertex_edges_index.get(vertex_id, []):
             if edge.target_id == vertex_id:
                 vertex = self.get_vertex(edge.source_id)
                 if vertex is None:
@@ -1631,8 +1813,24 @@ class Graph:
         fallback_to_env_vars: bool,
         start_component_id: str | None = None,
         event_manager: EventManager | None = None,
+        execution_mode: Literal["layered", "dataflow"] | None = None,
+        max_concurrency: int | None = None,
     ) -> Graph:
-        """Processes the graph with vertices in each layer run in parallel."""
+        """Processes the graph.
+
+        In ``layered`` mode the vertices in each layer run in parallel and the next layer is only
+        computed once the whole layer finished. In ``dataflow`` mode each vertex is dispatched as soon
+        as its predecessors are fulfilled, bounded by ``max_concurrency``.
+
+        Args:
+            fallback_to_env_vars: Whether to fallback to environment variables.
+            start_component_id: The ID of the component to start from.
+            event_manager: The event manager for the graph.
+            execution_mode: ``layered`` or ``dataflow``. Defaults to the ``graph_execution_mode`` setting.
+            max_concurrency: Maximum number of vertices built at once in ``dataflow`` mode.
+                Defaults to the ``graph_max_concurrency`` setting. ``0`` or ``None`` means unbounded.
+        """
+        execution_mode, max_concurrency = self._resolve_execution_options(execution_mode, max_concurrency)
         has_webhook_component = "webhook" in start_component_id.lower() if start_component_id else False
         first_layer = self.sort_vertices(start_component_id=start_component_id)
         vertex_task_run_count: dict[str, int] = {}
@@ -1654,6 +1852,24 @@ class Graph:
 
         await self.initialize_run()
         lock = asyncio.Lock()
+        if execution_mode == "dataflow":
+            await self._process_dataflow(
+                first_layer,
+                lock=lock,
+                max_concurrency=max_concurrency,
+                has_webhook_component=has_webhook_component,
+                build_kwargs={
+                    "user_id": self.user_id,
+                    "inputs_dict": {},
+                    "fallback_to_env_vars": fallback_to_env_vars,
+                    "get_cache": get_cache_func,
+                    "set_cache": set_cache_func,
+                    "event_manager": event_manager,
+                },
+            )
+            await logger.adebug("Graph processing complete")
+            return self
+
         while to_process:
             current_batch = list(to_process)  # Copy current deque items to a list
             to_process.clear()  # Clear the deque for new items
@@ -1691,6 +1907,124 @@ class Graph:
         await logger.adebug("Graph processing complete")
         return self
 
+    def _resolve_execution_options(
+        self, execution_mode: str | None, max_concurrency: int | None
+    ) -> tuple[str, int | None]:
+        """Fills in the execution mode and concurrency limit from the settings when not given explicitly.
+
+        Cyclic graphs always run in layered mode because loop iterations rely on the layer barrier.
+        """
+        if execution_mode is None or max_concurrency is None:
+            settings_service = get_settings_service()
+            settings = settings_service.settings if settings_service else None
+            if execution_mode is None:
+                execution_mode = getattr(settings, "graph_execution_mode", "layered")
+            if max_concurrency is None:
+                max_concurrency = getattr(settings, "graph_max_concurrency", 0)
+        if execution_mode not in {"layered", "dataflow"}:
+            msg = f"Invalid execution mode: {execution_mode}. Expected 'layered' or 'dataflow'"
+            raise ValueError(msg)
+        if execution_mode == "dataflow" and self.is_cyclic:
+            logger.debug("Graph has cycles, falling back to layered execution")
+            execution_mode = "layered"
+        return execution_mode, max_concurrency or None
+
+    async def _process_dataflow(
+        self,
+        first_layer: list[str],
+        *,
+        lock: asyncio.Lock,
+        build_kwargs: dict[str, Any],
+        max_concurrency: int | None = None,
+        has_webhook_component: bool = False,
+    ) -> None:
+        """Runs the graph as a ready queue instead of layer by layer.
+
+        Every vertex is started as soon as the RunnableVerticesManager reports all of its
+        predecessors as fulfilled, so a slow vertex only delays its own successors.
+
+        Args:
+            first_layer: The IDs of the vertices to start with.
+            lock: Async lock for synchronization.
+            build_kwargs: Keyword arguments forwarded to ``build_vertex``.
+            max_concurrency: Maximum number of vertices built at the same time. None means unbounded.
+            has_webhook_component: Whether the graph has a webhook component.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        vertex_task_run_count: dict[str, int] = {}
+        running: dict[asyncio.Task, str] = {}
+        # Vertices that became runnable again while a previous build of theirs was still running
+        deferred: set[str] = set()
+
+        async def _build(vertex_id: str) -> VertexBuildResult:
+            if semaphore is None:
+                return await self.build_vertex(vertex_id=vertex_id, **build_kwargs)
+            async with semaphore:
+                return await self.build_vertex(vertex_id=vertex_id, **build_kwargs)
+
+        def _dispatch(vertex_id: str) -> None:
+            if vertex_id in running.values():
+                deferred.add(vertex_id)
+                return
+            task = asyncio.create_task(
+                _build(vertex_id),
+                name=f"{vertex_id} Run {vertex_task_run_count.get(vertex_id, 0)}",
+            )
+            vertex_task_run_count[vertex_id] = vertex_task_run_count.get(vertex_id, 0) + 1
+            running[task] = vertex_id
+
+        for vertex_id in first_layer:
+            _dispatch(vertex_id)
+        await logger.adebug(f"Dispatched {len(running)} vertices: {first_layer}")
+
+        try:
+            while running:
+                done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    vertex_id = running.pop(task)
+                    next_runnable_vertices = await self._handle_task_result(
+                        task, lock=lock, has_webhook_component=has_webhook_component
+                    )
+                    if vertex_id in deferred:
+                        deferred.discard(vertex_id)
+                        _dispatch(vertex_id)
+                    for next_vertex_id in next_runnable_vertices:
+                        _dispatch(next_vertex_id)
+        except BaseException:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            raise
+
+    async def _handle_task_result(
+        self, task: asyncio.Task, *, lock: asyncio.Lock, has_webhook_component: bool = False
+    ) -> list[str]:
+        """Records the result of a single finished vertex task and returns the vertices it unblocked."""
+        task_name = task.get_name()
+        vertex_id = task_name.split(" ")[0]
+        result = task.exception() or task.result()
+        if isinstance(result, Exception):
+            await logger.aerror(f"Task {task_name} failed with exception: {result}")
+            if has_webhook_component:
+                await self._log_vertex_build_from_exception(vertex_id, result)
+            raise result
+        if not isinstance(result, VertexBuildResult):
+            msg = f"Invalid result from task {task_name}: {result}"
+            raise TypeError(msg)
+        if self.flow_id is not None:
+            await log_vertex_build(
+                flow_id=self.flow_id,
+                vertex_id=result.vertex.id,
+                valid=result.valid,
+                params=result.params,
+                data=result.result_dict,
+                artifacts=result.artifacts,
+            )
+        vertex = result.vertex
+        self.run_manager.remove_vertex_from_runnables(vertex.id)
+        await logger.adebug(f"Vertex {vertex.id}, result: {vertex.built_result}, object: {vertex.built_object}")
+        return list(dict.fromkeys(await self.get_next_runnable_vertices(lock, vertex=vertex, cache=False)))
+
     def find_next_runnable_vertices(self, vertex_successors_ids: list[str]) -> list[str]:
         """Determines the next set of runnable vertices from a list of successor vertex IDs.
 
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import orjson
+
+from wfx.graph.graph.base import Graph
+
+if TYPE_CHECKING:
+    from wfx.graph.graph.schema import GraphData
+
+
+class GraphTemplate:
+    """A flow payload compiled once and instantiated into fresh graphs on demand.
+
+    Compiling validates the payload by building a graph from it, then keeps the ungrouped graph
+    data and the cycle analysis. ``instantiate`` only has to decode that data and build the
+    vertices, skipping ``process_flow`` and cycle detection. Every instance gets its own copy of
+    the data, so runs never share mutable state with the template or with each other.
+
+    Example:
+        template = GraphTemplate.compile(flow.data, flow_id=str(flow.id), flow_name=flow.name)
+        graph = template.instantiate(user_id=str(user.id))
+    """
+
+    def __init__(
+        self,
+        *,
+        raw_graph_data: bytes,
+        graph_data: bytes,
+        cycle_vertices: frozenset[str],
+        flow_id: str | None = None,
+        flow_name: str | None = None,
+    ) -> None:
+        self._raw_graph_data = raw_graph_data
+        self._graph_data = graph_data
+        self.cycle_vertices = cycle_vertices
+        self.flow_id = flow_id
+        self.flow_name = flow_name
+
+    @classmethod
+    def compile(cls, payload: dict, flow_id: str | None = None, flow_name: str | None = None) -> GraphTemplate:
+        """Compiles a flow payload into a template.
+
+        Raises:
+            ValueError: If the payload is not a valid graph.
+            TypeError: If the payload is not JSON serializable.
+        """
+        graph = Graph.from_payload(payload, flow_id=flow_id, flow_name=flow_name)
+        return cls(
+            raw_graph_data=orjson.dumps(graph.raw_graph_data),
+            graph_data=orjson.dumps(graph._graph_data),  # noqa: SLF001
+            cycle_vertices=frozenset(graph.cycle_vertices),
+            flow_id=flow_id,
+            flow_name=flow_name,
+        )
+
+    def instantiate(self, user_id: str | None = None, context: dict[str, Any] | None = None) -> Graph:
+        """Creates a new graph, ready to run, from the template."""
+        raw_graph_data: GraphData = orjson.loads(self._raw_graph_data)
+        graph_data: GraphData = orjson.loads(self._graph_data)
+        graph = Graph(flow_id=self.flow_id, flow_name=self.flow_name, user_id=user_id, context=context)
+        graph.add_processed_nodes_and_edges(raw_graph_data, graph_data, self.cycle_vertices)
+        return graph
+
+    @property
+    def size(self) -> int:
+        """The number of bytes held by the template."""
+        return len(self._raw_graph_data) + len(self._graph_data)
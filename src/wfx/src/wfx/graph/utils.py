@@ -183,14 +183,15 @@ async def log_vertex_build(
     """Asynchronously logs a vertex build record if vertex build storage is enabled.
 
     This is a lightweight implementation that only logs if database service is available.
-    When running within primeagent, it will use primeagent's database service to persist the build.
+    When running within primeagent, the build is queued on primeagent's vertex build service, which
+    persists it in the background.
     When running standalone (wfx only), it will only log debug messages.
     """
     try:
         # Try to use primeagent's services if available (when running within primeagent)
         try:
-            from primeagent.services.deps import get_db_service as primeagent_get_db_service
             from primeagent.services.deps import get_settings_service as primeagent_get_settings_service
+            from primeagent.services.deps import get_vertex_build_service
 
             settings_service = primeagent_get_settings_service()
             if not settings_service:
@@ -201,9 +202,6 @@ async def log_vertex_build(
             if isinstance(flow_id, str):
                 flow_id = UUID(flow_id)
 
-            from primeagent.services.database.models.vertex_builds.crud import (
-                log_vertex_build as crud_log_vertex_build,
-            )
             from primeagent.services.database.models.vertex_builds.model import VertexBuildBase
 
             # Convert data to dict if it's a pydantic model
@@ -230,12 +228,8 @@ async def log_vertex_build(
                 artifacts=artifacts_dict,
             )
 
-            db_service = primeagent_get_db_service()
-            if db_service is None:
-                return
-
-            async with db_service._with_session() as session:  # noqa: SLF001
-                await crud_log_vertex_build(session, vertex_build)
+            # Written in batches by the write-behind service, retention is enforced in the background
+            get_vertex_build_service().log_vertex_build(vertex_build)
 
         except ImportError:
             # Fallback for standalone wfx usage (without primeagent)
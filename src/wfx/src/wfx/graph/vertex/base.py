@@ -72,6 +72,8 @@ class Vertex:
         self._is_loop = None
         self.has_session_id = None
         self.custom_component = None
+        # Whether custom_component was given with add_component_instance rather than built from the vertex's code
+        self.component_instance_given = False
         self.has_external_input = False
         self.has_external_output = False
         self.graph = graph
@@ -140,6 +142,7 @@ class Vertex:
     def add_component_instance(self, component_instance: Component) -> None:
         component_instance.set_vertex(self)
         self.custom_component = component_instance
+        self.component_instance_given = True
 
     def add_result(self, name: str, result: Any) -> None:
         self.results[name] = result
@@ -794,7 +797,7 @@ class Vertex:
             return self.built_object
 
         # Get the requester edge
-        requester_edge = next((edge for edge in self.edges if edge.target_id == requester.id), None)
+        requester_edge = self.graph.get_edge(self.id, requester.id)
         # Return the result of the requester edge
         return (
             None
@@ -22,11 +22,13 @@ if TYPE_CHECKING:
         ChatServiceProtocol,
         DatabaseServiceProtocol,
         SettingsServiceProtocol,
+        StateServiceProtocol,
         StorageServiceProtocol,
         TracingServiceProtocol,
         TransactionServiceProtocol,
         VariableServiceProtocol,
     )
+    from wfx.services.output_cache.service import OutputCacheService
 
 
 def get_service(service_type: ServiceType, default=None):
@@ -105,6 +107,13 @@ def get_shared_component_cache_service() -> CacheServiceProtocol | None:
     return get_service(ServiceType.SHARED_COMPONENT_CACHE_SERVICE, SharedComponentCacheServiceFactory())
 
 
+def get_output_cache_service() -> OutputCacheService | None:
+    """Retrieves the cache of memoized outputs of deterministic components."""
+    from wfx.services.output_cache.factory import OutputCacheServiceFactory
+
+    return get_service(ServiceType.OUTPUT_CACHE_SERVICE, OutputCacheServiceFactory())
+
+
 def get_chat_service() -> ChatServiceProtocol | None:
     """Retrieves the chat service instance."""
     from wfx.services.schema import ServiceType
@@ -130,6 +139,16 @@ def get_transaction_service() -> TransactionServiceProtocol | None:
     return get_service(ServiceType.TRANSACTION_SERVICE)
 
 
+def get_state_service() -> StateServiceProtocol | None:
+    """Retrieves the state service instance.
+
+    Returns None if no state service is registered.
+    """
+    from wfx.services.schema import ServiceType
+
+    return get_service(ServiceType.STATE_SERVICE)
+
+
 async def get_session():
     msg = "get_session is deprecated, use session_scope instead"
     logger.warning(msg)
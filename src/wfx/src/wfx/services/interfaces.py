@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING, Any, Protocol, runtime_checkable
 
 if TYPE_CHECKING:
     import asyncio
+    from collections.abc import Callable
 
 
 class DatabaseServiceProtocol(Protocol):
@@ -148,3 +149,17 @@ class TransactionServiceProtocol(Protocol):
             True if transaction logging is enabled, False otherwise.
         """
         ...
+
+
+class StateServiceProtocol(Protocol):
+    """Protocol for the run-scoped state service."""
+
+    @abstractmethod
+    def subscribe(self, key, observer: Callable, run_id: str | None = None) -> None:
+        """Subscribe an observer to a key, until the run is released when a run ID is given."""
+        ...
+
+    @abstractmethod
+    def release_run(self, run_id: str) -> None:
+        """Drop the state kept for a run that ended."""
+        ...
@@ -0,0 +1 @@
+"""Output cache service module."""
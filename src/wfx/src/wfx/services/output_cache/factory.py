@@ -0,0 +1,25 @@
+"""Factory for creating output cache service."""
+
+from typing import TYPE_CHECKING
+
+from wfx.services.factory import ServiceFactory
+from wfx.services.output_cache.service import OutputCacheService
+
+if TYPE_CHECKING:
+    from wfx.services.base import Service
+
+
+class OutputCacheServiceFactory(ServiceFactory):
+    """Factory for creating OutputCacheService instances."""
+
+    def __init__(self) -> None:
+        """Initialize the factory."""
+        super().__init__()
+        self.service_class = OutputCacheService
+
+    def create(self, **kwargs) -> "Service":  # noqa: ARG002
+        """Create an OutputCacheService instance sized by the output cache settings."""
+        from wfx.services.deps import get_settings_service
+
+        settings = get_settings_service().settings
+        return OutputCacheService(max_size=settings.output_cache_max_size, expiration_time=settings.output_cache_ttl)
@@ -0,0 +1,119 @@
+"""Output cache service implementation.
+
+Components that set ``deterministic = True`` declare that each output depends only on their code and
+their input values. Their output values are memoized here, across runs and sessions, under a key built by
+:func:`build_output_cache_key` from the component code, the resolved input values and the output name.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import pickle
+from typing import Any
+
+from pydantic import BaseModel
+
+from wfx.services.base import Service
+from wfx.services.cache.service import ThreadingInMemoryCache
+from wfx.services.cache.utils import CACHE_MISS
+
+# Message metadata that records where and when a value was created rather than what it contains.
+# Leaving it out of the key lets runs and sessions with identical upstream content share outputs.
+VOLATILE_FIELDS = frozenset({"id", "timestamp", "flow_id", "session_id"})
+
+
+class UnhashableValueError(TypeError):
+    """Raised when an input value has no stable representation to build a cache key from."""
+
+
+def _canonical(value: Any) -> Any:
+    if value is None or isinstance(value, str | bool | int):
+        return value
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, bytes):
+        return ["bytes", hashlib.sha256(value).hexdigest()]
+    if isinstance(value, list | tuple):
+        return [_canonical(item) for item in value]
+    if isinstance(value, set | frozenset):
+        return sorted(json.dumps(_canonical(item), sort_keys=True) for item in value)
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, BaseModel):
+        try:
+            dumped = value.model_dump(mode="json")
+        except Exception as e:
+            raise UnhashableValueError(type(value).__name__) from e
+        if isinstance(dumped, dict):
+            # Filtered after dumping because Message serializes itself regardless of ``exclude``
+            dumped = {key: item for key, item in dumped.items() if key not in VOLATILE_FIELDS}
+        return [type(value).__qualname__, _canonical(dumped)]
+    if hasattr(value, "to_json") and hasattr(value, "columns"):
+        # pandas DataFrames, including the wfx DataFrame
+        return [type(value).__qualname__, value.to_json(orient="split", date_format="iso")]
+    raise UnhashableValueError(type(value).__name__)
+
+
+def build_output_cache_key(code: str, parameters: dict[str, Any], output_name: str) -> str:
+    """Builds the cache key of an output from the component code, its resolved inputs and the output name.
+
+    Raises:
+        UnhashableValueError: If an input value has no stable representation, such as a model client.
+    """
+    payload = json.dumps(
+        [hashlib.sha256(code.encode()).hexdigest(), output_name, _canonical(parameters)],
+        sort_keys=True,
+    )
+    return f"output:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+
+class OutputCacheService(ThreadingInMemoryCache, Service):
+    """Memoized output values of deterministic components, bounded by entry count and age.
+
+    Values are stored pickled, so every hit returns a new copy that the caller may modify.
+    """
+
+    name = "output_cache_service"
+
+    def __init__(self, max_size=None, expiration_time=60 * 60) -> None:
+        super().__init__(max_size=max_size, expiration_time=expiration_time)
+        Service.__init__(self)
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.skipped = 0
+
+    def get_output(self, key: str) -> Any:
+        """Returns the memoized value, or CACHE_MISS."""
+        value = self.get(key)
+        if value is CACHE_MISS:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set_output(self, key: str, value: Any) -> bool:
+        """Memoizes a value. Returns False if the value cannot be pickled, such as a stream."""
+        try:
+            payload = pickle.dumps(value)
+        except Exception:  # noqa: BLE001
+            self.skipped += 1
+            return False
+        self.set(key, payload)
+        self.stores += 1
+        return True
+
+    async def teardown(self) -> None:
+        self.clear()
+
+    def stats(self) -> dict[str, int | float | None]:
+        return {
+            "entries": len(self),
+            "max_size": self.max_size,
+            "ttl": self.expiration_time,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "skipped": self.skipped,
+        }
@@ -18,5 +18,7 @@ class ServiceType(str, Enum):
     STORE_SERVICE = "store_service"
     JOB_QUEUE_SERVICE = "job_queue_service"
     SHARED_COMPONENT_CACHE_SERVICE = "shared_component_cache_service"
+    OUTPUT_CACHE_SERVICE = "output_cache_service"
     MCP_COMPOSER_SERVICE = "mcp_composer_service"
     TRANSACTION_SERVICE = "transaction_service"
+    VERTEX_BUILD_SERVICE = "vertex_build_service"
@@ -160,6 +160,12 @@ class Settings(BaseSettings):
     """The port on which Primeagent will expose Prometheus metrics. 9090 is the default port."""
 
     disable_track_apikey_usage: bool = False
+    api_key_cache_ttl: float = Field(default=30, ge=0)
+    """Seconds the user an API key authenticates as is kept in memory, so repeated requests with the key skip the
+    database. Deleting the key or changing its user clears it on this worker right away. Set to 0 to disable."""
+    api_key_usage_flush_interval: float = Field(default=5.0, gt=0)
+    """The maximum time in seconds API key usage counts are kept in memory before they are written to the
+    database."""
     remove_api_keys: bool = False
     components_path: list[str] = []
     components_index_path: str | None = None
@@ -179,6 +185,12 @@ class Settings(BaseSettings):
     redis_db: int = 0
     redis_url: str | None = None
     redis_cache_expire: int = 3600
+    redis_cache_serializer: Literal["dill", "pickle", "msgpack"] = "dill"
+    """Serializer for values stored in the Redis cache. 'msgpack' only accepts plain data and needs msgpack."""
+    redis_l1_max_size: int = Field(default=1024, ge=0)
+    """Decoded values each worker keeps in memory in front of the Redis cache. Set to 0 to disable the L1 tier."""
+    redis_l1_ttl: float = Field(default=30, gt=0)
+    """Seconds an L1 entry is served without hearing from Redis, bounding staleness if an invalidation is missed."""
 
     # Sentry
     sentry_dsn: str | None = None
@@ -198,6 +210,11 @@ class Settings(BaseSettings):
     """Object storage prefix for file storage. Defaults to 'files'."""
     object_storage_tags: dict[str, str] | None = None
     """Object storage tags for file storage."""
+    object_storage_part_size: int = Field(default=8 * 1024 * 1024, ge=5 * 1024 * 1024)
+    """Size in bytes of the parts files are uploaded to object storage in. Files up to this size are uploaded in
+    one request, and at most one part of a file is held in memory while it is uploaded. S3 requires at least 5 MiB."""
+    object_storage_max_pool_connections: int = Field(default=50, ge=1)
+    """The maximum number of connections the object storage client keeps open and shares between requests."""
 
     celery_enabled: bool = False
 
@@ -209,6 +226,10 @@ class Settings(BaseSettings):
     """Whether to store environment variables as Global Variables in the database."""
     variables_to_get_from_environment: list[str] = VARIABLES_TO_GET_FROM_ENVIRONMENT
     """List of environment variables to get from the environment and store in the database."""
+    variable_cache_ttl: float = Field(default=60, ge=0)
+    """Seconds a decrypted variable value is kept in memory for the user it belongs to. Changing or deleting the
+    variable clears it on this worker right away; other workers may serve the old value until it expires. Set to 0
+    to disable."""
     worker_timeout: int = 300
     """Timeout for the API calls in seconds."""
     frontend_timeout: int = 0
@@ -274,10 +295,57 @@ class Settings(BaseSettings):
     """If set to True, tracing will be deactivated."""
     max_transactions_to_keep: int = 3000
     """The maximum number of transactions to keep in the database."""
+    transactions_batch_size: int = Field(default=100, ge=1)
+    """The maximum number of transactions written to the database in a single insert."""
+    transactions_flush_interval: float = Field(default=1.0, gt=0)
+    """The maximum time in seconds a transaction waits in memory before it is written to the database."""
+    transactions_queue_size: int = Field(default=10_000, ge=1)
+    """The maximum number of transactions waiting in memory to be written to the database."""
+    transactions_overflow_policy: Literal["drop", "block"] = "drop"
+    """What to do when the transaction queue is full: drop the new transaction, or block the caller until
+    the queue has room."""
     max_vertex_builds_to_keep: int = 3000
     """The maximum number of vertex builds to keep in the database."""
     max_vertex_builds_per_vertex: int = 2
     """The maximum number of builds to keep per vertex. Older builds will be deleted."""
+    vertex_builds_batch_size: int = Field(default=100, ge=1)
+    """The maximum number of vertex builds written to the database in a single insert."""
+    vertex_builds_flush_interval: float = Field(default=1.0, gt=0)
+    """The maximum time in seconds a vertex build waits in memory before it is written to the database."""
+    vertex_builds_retention_interval: float = Field(default=60.0, gt=0)
+    """The interval in seconds at which builds beyond the vertex build limits are deleted."""
+    output_cache_ttl: float = Field(default=3600.0, gt=0)
+    """The time in seconds that memoized outputs of deterministic components are kept."""
+    output_cache_max_size: int = Field(default=1000, ge=1)
+    """The maximum number of memoized outputs of deterministic components. The least recently used outputs are
+    evicted first."""
+    state_ttl: float = Field(default=3600.0, gt=0)
+    """The time in seconds after its last use that the state of a run is evicted if it was not released
+    when the run ended."""
+    state_max_runs: int = Field(default=1000, ge=1)
+    """The maximum number of runs whose state is kept in memory. The least recently used runs are evicted
+    first."""
+    embedding_cache_max_entries: int = Field(default=0, ge=0)
+    """The maximum number of embeddings kept in the embedding cache in the config directory, which knowledge
+    base and vector store components share. The least recently used embeddings are evicted first. The cache is
+    shared by every user, so it is disabled by default; set above 0 to enable it."""
+    job_queue_workers: int = Field(default=10, ge=0)
+    """The number of queued runs, such as webhook runs, that the server runs at once. Further runs wait in the
+    queue until a worker is free. Set to 0 to leave queued runs to separate `primeagent worker` processes."""
+    job_queue_poll_interval: float = Field(default=1.0, gt=0)
+    """The interval in seconds at which idle workers check the job queue for new runs."""
+    job_queue_visibility_timeout: float = Field(default=300.0, gt=0)
+    """The time in seconds a worker holds a run without renewing its lease. Runs whose worker stopped renewing
+    the lease, e.g. because it crashed, are given to another worker after this time."""
+    job_queue_max_attempts: int = Field(default=3, ge=1)
+    """The number of times a queued run is attempted before it is marked as failed."""
+    job_queue_webhook_max_attempts: int = Field(default=1, ge=1)
+    """The number of times a webhook run is attempted before it is marked as failed. Webhook flows often have
+    side effects outside Primeagent, which a retry would repeat, so they are not retried by default."""
+    job_queue_retry_delay: float = Field(default=10.0, ge=0)
+    """The time in seconds before a failed run is retried. It doubles with each attempt."""
+    job_queue_retention: float = Field(default=7 * 24 * 3600.0, gt=0)
+    """The time in seconds that finished runs are kept in the job queue before they are deleted."""
     webhook_polling_interval: int = 5000
     """The polling interval for the webhook in ms."""
     fs_flows_polling_interval: int = 10000
@@ -326,6 +394,26 @@ class Settings(BaseSettings):
     Default is 24 hours (86400 seconds). Minimum is 600 seconds (10 minutes)."""
     event_delivery: Literal["polling", "streaming", "direct"] = "streaming"
     """How to deliver build events to the frontend. Can be 'polling', 'streaming' or 'direct'."""
+    graph_execution_mode: Literal["layered", "dataflow"] = "layered"
+    """How Graph.process schedules vertices. 'layered' runs one layer at a time and waits for the whole layer
+    to finish before starting the next one. 'dataflow' dispatches each vertex as soon as its predecessors are
+    fulfilled, so independent branches do not wait on each other. Graphs with cycles always run 'layered'."""
+    graph_max_concurrency: int = Field(default=0, ge=0)
+    """Maximum number of vertices built concurrently in a single graph run when using the 'dataflow'
+    execution mode. 0 means unbounded."""
+    graph_template_cache_size: int = Field(default=100, ge=0)
+    """Maximum number of compiled flow graphs each worker keeps to serve /api/v1/run without rebuilding
+    the graph from the flow payload. 0 disables the cache."""
+    token_batch_size: int = Field(default=16, ge=1)
+    """Maximum number of streamed LLM tokens coalesced into a single token event. 1 sends every token on its own."""
+    token_batch_window_ms: float = Field(default=20, ge=0)
+    """Maximum time in milliseconds a streamed token waits to be coalesced with the following ones before its
+    token event is sent."""
+    stream_iterator_max_workers: int = Field(default=32, ge=1)
+    """Number of threads used to pull chunks from synchronous LLM streams so they never block the event loop.
+    Streams beyond this number wait for a free thread."""
+    stream_iterator_buffer_size: int = Field(default=64, ge=1)
+    """Maximum number of chunks a synchronous stream may read ahead of the component consuming it."""
     lazy_load_components: bool = False
     """If set to True, Primeagent will only partially load components at startup and fully load them on demand.
     This significantly reduces startup time but may cause a slight delay when a component is first used."""
@@ -1,5 +1,15 @@
 import asyncio
-from contextlib import asynccontextmanager
+import contextvars
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+from typing import TypeVar
+
+T = TypeVar("T")
 
 if hasattr(asyncio, "timeout"):
 
@@ -40,3 +50,127 @@ def run_until_complete(coro):
     with concurrent.futures.ThreadPoolExecutor() as executor:
         future = executor.submit(run_in_new_loop)
         return future.result()
+
+
+_stream_executor: ThreadPoolExecutor | None = None
+_stream_executor_lock = threading.Lock()
+_DONE = object()
+
+
+def get_stream_executor() -> ThreadPoolExecutor:
+    """Returns the bounded thread pool that pumps synchronous iterators, sized by ``stream_iterator_max_workers``."""
+    global _stream_executor  # noqa: PLW0603
+    if _stream_executor is None:
+        with _stream_executor_lock:
+            if _stream_executor is None:
+                from wfx.services.deps import get_settings_service
+
+                settings_service = get_settings_service()
+                settings = settings_service.settings if settings_service else None
+                max_workers = getattr(settings, "stream_iterator_max_workers", 32)
+                _stream_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="wfx-stream")
+    return _stream_executor
+
+
+async def iterate_in_thread(
+    iterator: Iterator[T], *, buffer_size: int = 64, executor: ThreadPoolExecutor | None = None
+) -> AsyncIterator[T]:
+    """Consumes a synchronous iterator from a worker thread and yields its items asynchronously.
+
+    The thread reads ahead at most ``buffer_size`` items and then waits for the consumer, so a slow
+    consumer applies backpressure to the producer. Exceptions raised by the iterator are re-raised
+    to the consumer. If the consumer stops early, the thread stops after the item it is reading and
+    closes the iterator. The iterator runs in a copy of the caller's context, so context variables
+    set by the caller are visible to it.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+    stopped = threading.Event()
+
+    def _put(item) -> bool:
+        try:
+            future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        except RuntimeError:
+            # The loop is closed, nobody is consuming anymore
+            return False
+        while True:
+            try:
+                future.result(timeout=0.1)
+            except FutureTimeoutError:
+                if stopped.is_set():
+                    future.cancel()
+                    return False
+            else:
+                return True
+
+    def _pump() -> None:
+        try:
+            for item in iterator:
+                if stopped.is_set() or not _put((item, None)):
+                    break
+            else:
+                _put((_DONE, None))
+                return
+        except Exception as exc:  # noqa: BLE001
+            _put((_DONE, exc))
+            return
+        # Nobody reads the rest, let the iterator release what it holds, e.g. an HTTP response
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            with suppress(Exception):
+                close()
+
+    ctx = contextvars.copy_context()
+    pump = loop.run_in_executor(executor or get_stream_executor(), ctx.run, _pump)
+    try:
+        while True:
+            item, exc = await queue.get()
+            if item is _DONE:
+                if exc is not None:
+                    raise exc
+                break
+            yield item
+    finally:
+        stopped.set()
+        if pump.done():
+            await pump
+
+
+@dataclass
+class LoopLagStats:
+    """Time the event loop was blocked while a monitor was active.
+
+    Attributes:
+        blocked_time (float): Total seconds the loop woke up later than expected.
+        max_lag (float): Longest single delay, in seconds.
+    """
+
+    blocked_time: float = 0.0
+    max_lag: float = 0.0
+
+
+@asynccontextmanager
+async def monitor_loop_lag(interval: float = 0.05, threshold: float = 0.005):
+    """Measures how long the event loop is blocked while the context is active.
+
+    A probe task sleeps for ``interval`` seconds at a time; a wake-up more than ``threshold`` seconds late
+    means the loop could not run other tasks for that long.
+    """
+    stats = LoopLagStats()
+
+    async def _probe() -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lag = time.perf_counter() - start - interval
+            if lag > threshold:
+                stats.blocked_time += lag
+                stats.max_lag = max(stats.max_lag, lag)
+
+    probe = asyncio.create_task(_probe())
+    try:
+        yield stats
+    finally:
+        probe.cancel()
+        with suppress(asyncio.CancelledError):
+            await probe
@@ -0,0 +1,132 @@
+import pytest
+from langchain_core.embeddings import Embeddings
+from wfx.base.embeddings.cache import CachedEmbeddings, EmbeddingCache
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self, model: str = "test-model"):
+        self.model = model
+        self.embedded: list[str] = []
+        self.queries: list[str] = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return [float(len(text)), 2.0]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = EmbeddingCache(tmp_path / "embeddings.sqlite3", max_entries=100)
+    yield cache
+    cache.close()
+
+
+def test_only_misses_are_sent_to_the_provider(cache):
+    provider = CountingEmbeddings()
+    embeddings = CachedEmbeddings(provider, cache)
+
+    assert embeddings.embed_documents(["a", "bb"]) == [[1.0, 1.0], [2.0, 1.0]]
+    assert embeddings.embed_documents(["bb", "ccc", "ccc", "a"]) == [[2.0, 1.0], [3.0, 1.0], [3.0, 1.0], [1.0, 1.0]]
+
+    assert provider.embedded == ["a", "bb", "ccc"]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 3, 3)
+
+
+def test_queries_are_cached_apart_from_documents(cache):
+    provider = CountingEmbeddings()
+    embeddings = CachedEmbeddings(provider, cache)
+
+    embeddings.embed_documents(["a"])
+    assert embeddings.embed_query("a") == [1.0, 2.0]
+    assert embeddings.embed_query("a") == [1.0, 2.0]
+
+    assert provider.queries == ["a"]
+
+
+async def test_async_methods_use_the_cache(cache):
+    provider = CountingEmbeddings()
+    embeddings = CachedEmbeddings(provider, cache)
+
+    await embeddings.aembed_documents(["a", "bb"])
+    assert await embeddings.aembed_documents(["bb"]) == [[2.0, 1.0]]
+    assert await embeddings.aembed_query("q") == await embeddings.aembed_query("q")
+
+    assert provider.embedded == ["a", "bb"]
+    assert provider.queries == ["q"]
+
+
+def test_models_do_not_share_entries(cache):
+    first = CountingEmbeddings("first")
+    second = CountingEmbeddings("second")
+
+    CachedEmbeddings(first, cache).embed_documents(["a"])
+    CachedEmbeddings(second, cache).embed_documents(["a"])
+
+    assert second.embedded == ["a"]
+
+
+def test_endpoints_do_not_share_entries(cache):
+    first = CountingEmbeddings()
+    first.base_url = "http://localhost:11434"
+    second = CountingEmbeddings()
+    second.base_url = "http://gpu-host:11434"
+
+    CachedEmbeddings(first, cache).embed_documents(["a"])
+    CachedEmbeddings(second, cache).embed_documents(["a"])
+
+    assert second.embedded == ["a"]
+    assert "gpu-host" not in CachedEmbeddings(second, cache).namespace
+
+
+def test_hits_and_misses_return_the_same_vector(cache):
+    class PreciseEmbeddings(CountingEmbeddings):
+        def embed_documents(self, texts):
+            self.embedded.extend(texts)
+            return [[0.1, 1 / 3] for _ in texts]
+
+    embeddings = CachedEmbeddings(PreciseEmbeddings(), cache)
+
+    assert embeddings.embed_documents(["a"]) == embeddings.embed_documents(["a"])
+
+
+def test_entries_persist_across_instances(tmp_path):
+    path = tmp_path / "embeddings.sqlite3"
+    first = EmbeddingCache(path, max_entries=100)
+    CachedEmbeddings(CountingEmbeddings(), first).embed_documents(["a"])
+    first.close()
+
+    provider = CountingEmbeddings()
+    second = EmbeddingCache(path, max_entries=100)
+    CachedEmbeddings(provider, second).embed_documents(["a"])
+    second.close()
+
+    assert provider.embedded == []
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = EmbeddingCache(tmp_path / "embeddings.sqlite3", max_entries=3)
+    provider = CountingEmbeddings()
+    embeddings = CachedEmbeddings(provider, cache)
+
+    embeddings.embed_documents(["a", "b", "c"])
+    embeddings.embed_documents(["a"])
+    embeddings.embed_documents(["d"])
+
+    assert cache.stats()["entries"] <= 3
+    assert cache.stats()["evictions"] >= 1
+    provider.embedded.clear()
+    embeddings.embed_documents(["a", "d"])
+    assert provider.embedded == []
+    cache.close()
+
+
+def test_attributes_come_from_the_wrapped_embeddings(cache):
+    embeddings = CachedEmbeddings(CountingEmbeddings("my-model"), cache)
+
+    assert embeddings.model == "my-model"
+    assert "my-model" in embeddings.namespace
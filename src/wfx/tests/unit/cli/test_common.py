@@ -1,5 +1,6 @@
 """Unit tests for WFX CLI common utilities."""
 
+import asyncio
 import os
 import socket
 import sys
@@ -10,6 +11,7 @@ from unittest.mock import MagicMock, Mock, patch
 import pytest
 import typer
 from wfx.cli.common import (
+    capture_output,
     create_verbose_printer,
     execute_graph_with_capture,
     extract_result_data,
@@ -255,6 +257,63 @@ class TestGraphExecution:
         with pytest.raises(RuntimeError, match="Execution failed"):
             await execute_graph_with_capture(mock_graph, "test input")
 
+    @pytest.mark.asyncio
+    async def test_execute_graph_with_capture_error_includes_stderr(self):
+        """Test that stderr written before an error is attached to the exception."""
+
+        async def mock_async_start_error(inputs):  # noqa: ARG001
+            print("component warning", file=sys.stderr)  # noqa: T201
+            msg = "Execution failed"
+            raise RuntimeError(msg)
+            yield
+
+        mock_graph = MagicMock()
+        mock_graph.async_start = mock_async_start_error
+
+        with pytest.raises(RuntimeError, match="Captured stderr:\ncomponent warning"):
+            await execute_graph_with_capture(mock_graph, "test input")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_executions_capture_their_own_output(self):
+        """Test that concurrent executions on one loop do not capture each other's output."""
+
+        def make_graph(name: str):
+            async def mock_async_start(inputs):  # noqa: ARG001
+                for i in range(3):
+                    print(f"{name}-{i}")  # noqa: T201
+                    await asyncio.to_thread(print, f"{name}-thread-{i}", file=sys.stderr)
+                    await asyncio.sleep(0)
+                yield MagicMock()
+
+            graph = MagicMock()
+            graph.async_start = mock_async_start
+            return graph
+
+        (_, logs_a), (_, logs_b) = await asyncio.gather(
+            execute_graph_with_capture(make_graph("a"), "input"),
+            execute_graph_with_capture(make_graph("b"), "input"),
+        )
+
+        assert logs_a == "a-0\na-1\na-2\na-thread-0\na-thread-1\na-thread-2\n"
+        assert logs_b == "b-0\nb-1\nb-2\nb-thread-0\nb-thread-1\nb-thread-2\n"
+
+    def test_capture_output_is_bounded(self):
+        """Test that only the most recent output is kept once the limit is reached."""
+        with capture_output(max_chars=10) as (stdout, _):
+            sys.stdout.write("0123456789")
+            sys.stdout.write("abcde")
+
+        assert stdout.getvalue() == "[5 earlier characters truncated]\n56789abcde"
+
+    def test_output_outside_capture_reaches_original_stream(self, capsys):
+        """Test that writes outside a capture are not swallowed."""
+        with capture_output() as (stdout, _):
+            print("captured")  # noqa: T201
+        print("not captured")  # noqa: T201
+
+        assert stdout.getvalue() == "captured\n"
+        assert capsys.readouterr().out == "not captured\n"
+
 
 class TestResultExtraction:
     """Test result data extraction."""
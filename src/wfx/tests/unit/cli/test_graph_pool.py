@@ -0,0 +1,114 @@
+"""Unit tests for the graph instance pool used by ``wfx serve``."""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+from wfx.cli.common import execute_graph_with_capture, extract_result_data
+from wfx.cli.graph_pool import GraphPool
+from wfx.components.input_output import ChatInput, ChatOutput
+from wfx.graph import Graph
+from wfx.template.field.base import UNDEFINED
+
+
+@pytest.fixture
+def graph():
+    json_path = Path(__file__).parent.parent.parent / "data" / "simple_chat_no_llm.json"
+    with json_path.open() as f:
+        return Graph.from_payload(json.load(f), flow_id="test-flow-id")
+
+
+async def _run(pool: GraphPool, input_value: str) -> dict:
+    async with pool.acquire() as pooled_graph:
+        results, logs = await execute_graph_with_capture(pooled_graph, input_value)
+        return extract_result_data(results, logs)
+
+
+class TestGraphPool:
+    def test_prebuilds_instances(self, graph):
+        pool = GraphPool(graph, size=3)
+
+        assert pool.idle == 3
+        assert pool.created == 3
+
+    @pytest.mark.parametrize(("size", "overflow"), [(0, "wait"), (1, "grow")])
+    def test_rejects_invalid_configuration(self, graph, size, overflow):
+        with pytest.raises(ValueError, match="pool"):
+            GraphPool(graph, size=size, overflow=overflow)
+
+    async def test_reused_instance_does_not_keep_previous_run_state(self, graph):
+        pool = GraphPool(graph, size=1)
+
+        first = await _run(pool, "first message")
+        second = await _run(pool, "second message")
+
+        assert first["result"] == "first message"
+        assert second["result"] == "second message"
+        assert pool.created == 1
+        assert pool.stats()["returned"] == 2
+
+    async def test_reset_rebuilds_params_from_template(self, graph):
+        pool = GraphPool(graph, size=1)
+        await _run(pool, "first message")
+
+        async with pool.acquire() as pooled_graph:
+            chat_input = next(vertex for vertex in pooled_graph.vertices if vertex.id.startswith("ChatInput"))
+            assert not chat_input.built
+            assert chat_input.raw_params.get("input_value") != "first message"
+            assert not pooled_graph.run_manager.vertices_being_run
+
+    async def test_reset_drops_components_built_by_the_previous_run(self, graph):
+        pool = GraphPool(graph, size=1)
+        async with pool.acquire() as pooled_graph:
+            await execute_graph_with_capture(pooled_graph, "first message")
+            first_components = {vertex.id: vertex.custom_component for vertex in pooled_graph.vertices}
+        assert all(component is not None for component in first_components.values())
+
+        async with pool.acquire() as pooled_graph:
+            assert all(vertex.custom_component is None for vertex in pooled_graph.vertices)
+            await execute_graph_with_capture(pooled_graph, "second message")
+            for vertex in pooled_graph.vertices:
+                assert vertex.custom_component is not first_components[vertex.id]
+                assert "first message" not in str(vertex.custom_component.status)
+
+    async def test_reset_clears_run_state_of_given_components(self):
+        chat_input = ChatInput(_id="chat_input")
+        chat_output = ChatOutput(_id="chat_output")
+        chat_output.set(input_value=chat_input.message_response)
+        pool = GraphPool(Graph(chat_input, chat_output), size=1)
+        first = await _run(pool, "first message")
+
+        async with pool.acquire() as pooled_graph:
+            for vertex in pooled_graph.vertices:
+                # Given components cannot be rebuilt from code, so the same instances are reused
+                assert vertex.custom_component is not None
+                assert vertex.custom_component.status is None
+                assert vertex.custom_component.get_results() == {}
+                assert all(output.value is UNDEFINED for output in vertex.custom_component.get_outputs_map().values())
+        second = await _run(pool, "second message")
+
+        assert first["result"] == "first message"
+        assert second["result"] == "second message"
+
+    async def test_wait_overflow_serializes_runs(self, graph):
+        pool = GraphPool(graph, size=1, overflow="wait")
+
+        async with pool.acquire():
+            waiter = asyncio.create_task(_run(pool, "queued"))
+            await asyncio.sleep(0.01)
+            assert not waiter.done()
+
+        assert (await waiter)["result"] == "queued"
+        assert pool.created == 1
+
+    async def test_create_overflow_builds_temporary_instance(self, graph):
+        pool = GraphPool(graph, size=1, overflow="create")
+
+        async with pool.acquire():
+            result = await _run(pool, "overflow")
+            assert pool.idle == 0
+
+        assert result["result"] == "overflow"
+        assert pool.created == 2
+        assert pool.idle == 1
@@ -0,0 +1,101 @@
+import inspect
+import json
+
+from wfx.components.flow_controls import LoopComponent
+from wfx.components.input_output import ChatInput
+from wfx.graph import Graph
+from wfx.schema.schema import InputValueRequest
+
+LOOP_ID = "LoopComponent-PTNzd"
+
+
+def loop_test_payload(json_loop_test, mode, items="[Data(q=i) for i in range(10)]", parse_template="THIS IS Q ==> {q}"):
+    """LoopTest.json with the current Loop code, without the nodes after Done."""
+    data = json.loads(json_loop_test)["data"]
+    data["nodes"] = [node for node in data["nodes"] if not node["id"].startswith(("MyZipper", "ChatOutput"))]
+    node_ids = {node["id"] for node in data["nodes"]}
+    data["edges"] = [edge for edge in data["edges"] if edge["source"] in node_ids and edge["target"] in node_ids]
+    for node in data["nodes"]:
+        template = node["data"]["node"]["template"]
+        if node["id"] == LOOP_ID:
+            template["code"]["value"] = inspect.getsource(inspect.getmodule(LoopComponent))
+            template["mode"] = {"name": "mode", "type": "str", "value": mode, "show": True}
+            template["max_concurrency"] = {"name": "max_concurrency", "type": "int", "value": 3, "show": True}
+        elif node["id"].startswith("CustomComponent"):
+            template["code"]["value"] = template["code"]["value"].replace("[Data(q=i) for i in range(10)]", items)
+        elif node["id"].startswith("ParseData"):
+            template["template"]["value"] = parse_template
+    return data
+
+
+def add_chat_input_template(payload, saved_template):
+    """Feed ParseData's template, inside the loop body, from a ChatInput outside the loop."""
+    chat_input_id = "ChatInput-k3Yw1"
+    node = ChatInput(_id=chat_input_id).to_frontend_node()
+    node["data"]["node"]["template"]["input_value"]["value"] = saved_template
+    node["data"]["node"]["template"]["should_store_message"]["value"] = False
+    payload["nodes"].append(node)
+    parse_data_id = next(node["id"] for node in payload["nodes"] if node["id"].startswith("ParseData"))
+    payload["edges"].append(
+        {
+            "source": chat_input_id,
+            "target": parse_data_id,
+            "data": {
+                "sourceHandle": {
+                    "dataType": "ChatInput",
+                    "id": chat_input_id,
+                    "name": "message",
+                    "output_types": ["Message"],
+                },
+                "targetHandle": {
+                    "fieldName": "template",
+                    "id": parse_data_id,
+                    "inputTypes": ["Message"],
+                    "type": "str",
+                },
+            },
+        }
+    )
+    return payload
+
+
+async def run_loop_test(payload, inputs=None):
+    graph = Graph.from_payload(payload, flow_id="flow")
+    built = [result.vertex.id async for result in graph.async_start(inputs) if hasattr(result, "vertex")]
+    return built, graph.context[f"{LOOP_ID}_aggregated"]
+
+
+async def test_parallel_map_matches_sequential(json_loop_test):
+    _, sequential = await run_loop_test(loop_test_payload(json_loop_test, "Sequential"))
+    built, mapped = await run_loop_test(loop_test_payload(json_loop_test, "Parallel Map"))
+
+    assert [item.text for item in mapped] == [f"THIS IS Q ==> {i}" for i in range(10)]
+    assert [item.text for item in mapped] == [item.text for item in sequential]
+    # The loop body runs in a graph of its own for each item, not in the flow itself
+    assert built == ["CustomComponent-y0t72", LOOP_ID]
+
+
+async def test_parallel_map_collects_item_errors(json_loop_test):
+    payload = loop_test_payload(
+        json_loop_test,
+        "Parallel Map",
+        items="[Data(q=0), Data(q='one'), Data(q=2)]",
+        parse_template="THIS IS Q ==> {q:d}",
+    )
+
+    _, mapped = await run_loop_test(payload)
+
+    assert mapped[0].text == "THIS IS Q ==> 0"
+    assert mapped[1].data["index"] == 1
+    assert "Unknown format code" in mapped[1].data["error"]
+    assert mapped[2].text == "THIS IS Q ==> 2"
+
+
+async def test_parallel_map_uses_run_inputs_from_outside_the_loop(json_loop_test):
+    payload = add_chat_input_template(loop_test_payload(json_loop_test, "Parallel Map"), "SAVED {q}")
+
+    built, mapped = await run_loop_test(payload, InputValueRequest(input_value="FROM THE RUN {q}"))
+
+    assert [item.text for item in mapped] == [f"FROM THE RUN {i}" for i in range(10)]
+    # The ChatInput runs once, in the flow, rather than again from its saved value for each item
+    assert built.count("ChatInput-k3Yw1") == 1
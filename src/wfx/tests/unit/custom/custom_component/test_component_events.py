@@ -1,4 +1,5 @@
 import asyncio
+import json
 import time
 from typing import Any
 from unittest.mock import MagicMock
@@ -6,7 +7,7 @@ from uuid import uuid4
 
 import pytest
 from wfx.custom.custom_component.component import Component
-from wfx.events.event_manager import EventManager
+from wfx.events.event_manager import EventManager, create_default_event_manager
 from wfx.schema.content_block import ContentBlock
 from wfx.schema.content_types import TextContent, ToolContent
 from wfx.schema.message import Message
@@ -261,3 +262,116 @@ async def test_component_streaming_message():
             tokens.append(event)
 
     assert len(tokens) > 0
+
+
+@pytest.mark.asyncio
+async def test_component_streaming_sync_iterator_does_not_block_loop():
+    """Test that synchronous streams are pulled off the event loop."""
+    queue = asyncio.Queue()
+    event_manager = create_default_event_manager(queue)
+
+    vertex = MagicMock()
+    vertex.graph = MagicMock()
+    vertex.graph.flow_id = str(uuid4())
+
+    component = ComponentForTesting(_vertex=vertex)
+    component.set_event_manager(event_manager)
+
+    class StreamChunk:
+        def __init__(self, content: str):
+            self.content = content
+
+    def blocking_generator():
+        for chunk in ["Hello", " ", "World"]:
+            time.sleep(0.05)
+            yield StreamChunk(chunk)
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    ticker_task = asyncio.create_task(ticker())
+    try:
+        message = Message(
+            sender="test_sender",
+            session_id="test_session",
+            sender_name="test_sender_name",
+            text=blocking_generator(),
+            properties=Properties(),
+        )
+        sent_message = await component.send_message(message)
+    finally:
+        ticker_task.cancel()
+
+    assert sent_message.text == "Hello World"
+    assert ticks > 10
+    assert component._stream_loop_blocked_time < 0.1
+
+
+def _drain_events(queue: asyncio.Queue) -> list[dict]:
+    events = []
+    while not queue.empty():
+        _, value, _ = queue.get_nowait()
+        events.append(json.loads(value))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_component_resends_only_changed_content_blocks():
+    """Test that re-sending a stored message emits a message_update with the changes only."""
+    queue = asyncio.Queue()
+    event_manager = create_default_event_manager(queue)
+    component = ComponentForTesting()
+    component.set_event_manager(event_manager)
+
+    message = Message(
+        sender="test_sender",
+        session_id="test_session",
+        sender_name="test_sender_name",
+        content_blocks=[ContentBlock(title="Agent Steps", contents=[TextContent(type="text", text="Input")])],
+        properties=Properties(),
+    )
+    message = await component.send_message(message)
+    full_event = _drain_events(queue)[-1]
+    assert full_event["event"] == "add_message"
+    assert full_event["data"]["version"] == 1
+
+    tool = ToolContent(type="tool_use", name="search", tool_input={"query": "test"})
+    message.content_blocks[0].contents.append(tool)
+    message = await component.send_message(message, skip_db_update=True)
+    tool.output = {"result": "found"}
+    await component.send_message(message, skip_db_update=True)
+
+    first_update, second_update = [event["data"] for event in _drain_events(queue)]
+    assert first_update["id"] == full_event["data"]["id"]
+    assert (first_update["base_version"], first_update["version"]) == (1, 2)
+    assert [op["op"] for op in first_update["ops"]] == ["add"]
+    assert first_update["ops"][0]["path"] == "/content_blocks/0/contents/-"
+    assert first_update["ops"][0]["value"]["name"] == "search"
+    assert (second_update["base_version"], second_update["version"]) == (2, 3)
+    assert second_update["ops"] == [
+        {"op": "replace", "path": "/content_blocks/0/contents/1", "value": tool.model_dump(mode="json")}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_component_resends_full_message_without_update_event():
+    """Test that event managers without message_update keep receiving full messages."""
+    queue = asyncio.Queue()
+    event_manager = EventManager(queue)
+    event_manager.register_event("on_message", "add_message")
+    component = ComponentForTesting()
+    component.set_event_manager(event_manager)
+
+    message = await component.send_message(
+        Message(sender="test_sender", session_id="test_session", sender_name="test_sender_name", text="hi")
+    )
+    await component.send_message(message, skip_db_update=True)
+
+    events = _drain_events(queue)
+    assert [event["event"] for event in events] == ["add_message", "add_message"]
+    assert "version" not in events[-1]["data"]
@@ -0,0 +1,84 @@
+"""Tests for memoizing the outputs of deterministic components across runs."""
+
+from unittest.mock import patch
+
+import pytest
+from wfx.custom.custom_component.component import Component
+from wfx.io import HandleInput, MessageTextInput, Output
+from wfx.schema.data import Data
+from wfx.schema.message import Message
+from wfx.services.output_cache.service import OutputCacheService
+
+calls: list[str] = []
+
+
+class UpperComponent(Component):
+    deterministic = True
+    inputs = [MessageTextInput(name="text"), HandleInput(name="extra", input_types=["Data"])]
+    outputs = [Output(name="upper", method="build_upper")]
+
+    def build_upper(self) -> Message:
+        text = self.text.text if isinstance(self.text, Message) else self.text
+        calls.append(text)
+        return Message(text=text.upper())
+
+
+class NondeterministicUpperComponent(UpperComponent):
+    deterministic = False
+
+
+@pytest.fixture
+def output_cache():
+    calls.clear()
+    cache = OutputCacheService(max_size=10)
+    with patch("wfx.custom.custom_component.component.get_output_cache_service", return_value=cache):
+        yield cache
+
+
+async def _run(component_class, **inputs):
+    component = component_class(**inputs)
+    results, _ = await component.build_results()
+    return component, results["upper"]
+
+
+async def test_deterministic_outputs_are_reused_across_instances(output_cache):
+    _, first = await _run(UpperComponent, text="hello")
+    _, second = await _run(UpperComponent, text="hello")
+
+    assert calls == ["hello"]
+    assert second.text == "HELLO"
+    assert second is not first
+    assert output_cache.stats()["hits"] == 1
+
+
+@pytest.mark.usefixtures("output_cache")
+async def test_different_inputs_are_computed():
+    await _run(UpperComponent, text="hello")
+    await _run(UpperComponent, text="world")
+    await _run(UpperComponent, text="hello", extra=Data(data={"a": 1}))
+
+    assert calls == ["hello", "world", "hello"]
+
+
+@pytest.mark.usefixtures("output_cache")
+async def test_message_identity_is_not_part_of_the_key():
+    await _run(UpperComponent, text=Message(text="hello", session_id="session-1"))
+    await _run(UpperComponent, text=Message(text="hello", session_id="session-2"))
+
+    assert len(calls) == 1
+
+
+async def test_components_are_not_memoized_by_default(output_cache):
+    await _run(NondeterministicUpperComponent, text="hello")
+    await _run(NondeterministicUpperComponent, text="hello")
+
+    assert calls == ["hello", "hello"]
+    assert output_cache.stats()["entries"] == 0
+
+
+async def test_unhashable_inputs_are_not_memoized(output_cache):
+    await _run(UpperComponent, text="hello", extra=object())
+    await _run(UpperComponent, text="hello", extra=object())
+
+    assert calls == ["hello", "hello"]
+    assert output_cache.stats()["entries"] == 0
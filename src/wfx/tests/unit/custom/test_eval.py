@@ -0,0 +1,91 @@
+"""Test the compiled component class cache used by eval_custom_component_code."""
+
+import hashlib
+from unittest.mock import patch
+
+import pytest
+from wfx.custom import validate
+from wfx.custom.eval import ComponentClassCache, eval_custom_component_code, invalidate_component_class_cache
+
+COMPONENT_CODE = """
+from wfx.custom.custom_component.component import Component
+
+
+class CachedComponent(Component):
+    display_name = "Cached"
+"""
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    invalidate_component_class_cache()
+    yield
+    invalidate_component_class_cache()
+
+
+class TestEvalCustomComponentCode:
+    def test_same_code_is_compiled_once(self):
+        with patch.object(validate, "create_class", wraps=validate.create_class) as create_class:
+            first = eval_custom_component_code(COMPONENT_CODE)
+            second = eval_custom_component_code(COMPONENT_CODE)
+
+        assert first is second
+        assert first.__name__ == "CachedComponent"
+        assert create_class.call_count == 1
+
+    def test_edited_code_is_recompiled(self):
+        first = eval_custom_component_code(COMPONENT_CODE)
+        second = eval_custom_component_code(COMPONENT_CODE.replace('"Cached"', '"Edited"'))
+
+        assert first is not second
+        assert second.display_name == "Edited"
+
+    def test_invalidate_forces_recompile(self):
+        first = eval_custom_component_code(COMPONENT_CODE)
+        invalidate_component_class_cache(COMPONENT_CODE)
+
+        assert eval_custom_component_code(COMPONENT_CODE) is not first
+
+    def test_instances_of_a_cached_class_do_not_share_added_inputs(self):
+        component_class = eval_custom_component_code(COMPONENT_CODE)
+        first = component_class()
+        first._get_or_create_input("extra")
+        first._append_tool_output()
+
+        second = eval_custom_component_code(COMPONENT_CODE)()
+
+        assert [input_.name for input_ in first.inputs] == ["extra"]
+        assert second.inputs == []
+        assert second.outputs == []
+        assert component_class.inputs == []
+        assert component_class.outputs == []
+
+    def test_errors_are_not_cached(self):
+        broken = "class Broken(:\n    pass"
+        with pytest.raises(ValueError, match="Invalid Python code"):
+            eval_custom_component_code(broken)
+        with pytest.raises(ValueError, match="Invalid Python code"):
+            eval_custom_component_code(broken)
+
+
+class TestComponentClassCache:
+    def test_lru_eviction_and_counters(self):
+        cache = ComponentClassCache(max_size=2)
+        cache.set("a", int)
+        cache.set("b", str)
+        assert cache.get("a") is int  # "b" is now the least recently used
+        cache.set("c", float)
+
+        assert cache.get("b") is None
+        assert cache.get("c") is float
+        assert cache.stats() == {"size": 2, "max_size": 2, "hits": 2, "misses": 1, "evictions": 1}
+
+    def test_invalidate_all(self):
+        cache = ComponentClassCache()
+        cache.set(cache.make_key(COMPONENT_CODE), int)
+        cache.invalidate()
+
+        assert len(cache) == 0
+
+    def test_key_is_the_full_sha256_digest(self):
+        assert ComponentClassCache.make_key(COMPONENT_CODE) == hashlib.sha256(COMPONENT_CODE.encode()).hexdigest()
@@ -368,3 +368,80 @@ class TestEventManagerAsync:
         for sent, received in zip(events_to_send, received_events, strict=False):
             assert sent[0] == received[0]  # event type
             assert sent[1] == received[1]  # data
+
+
+def _drain(queue: asyncio.Queue) -> list[dict]:
+    events = []
+    while not queue.empty():
+        _, data_bytes, _ = queue.get_nowait()
+        events.append(json.loads(data_bytes.decode("utf-8")))
+    return events
+
+
+class TestTokenBatching:
+    """Test cases for coalescing streamed tokens into batched token events."""
+
+    async def test_tokens_are_batched_by_size(self):
+        queue = asyncio.Queue()
+        manager = EventManager(queue, token_batch_size=3, token_batch_window=60)
+        manager.register_event("on_token", "token")
+
+        for chunk in ["a", "b", "c", "d"]:
+            manager.add_token(chunk, message_id="msg")
+
+        assert _drain(queue) == [{"event": "token", "data": {"chunk": "abc", "id": "msg"}}]
+        stats = manager.close_token_stream("msg")
+        assert _drain(queue) == [{"event": "token", "data": {"chunk": "d", "id": "msg"}}]
+        assert stats.tokens == 4
+        assert stats.batches == 2
+        assert manager.get_token_stats("msg") is None
+
+    async def test_tokens_are_flushed_after_window(self):
+        queue = asyncio.Queue()
+        manager = EventManager(queue, token_batch_size=100, token_batch_window=0.01)
+        manager.register_event("on_token", "token")
+
+        manager.add_token("hel", message_id="msg")
+        manager.add_token("lo", message_id="msg")
+        assert queue.empty()
+
+        await asyncio.sleep(0.05)
+        assert _drain(queue) == [{"event": "token", "data": {"chunk": "hello", "id": "msg"}}]
+
+    async def test_other_events_flush_pending_tokens(self):
+        queue = asyncio.Queue()
+        manager = create_default_event_manager(queue)
+        manager.token_batch_window = 60
+
+        manager.add_token("partial", message_id="msg")
+        manager.on_end(data={"status": "done"})
+
+        assert [event["event"] for event in _drain(queue)] == ["token", "end"]
+
+    async def test_batch_size_one_sends_every_token(self):
+        queue = asyncio.Queue()
+        manager = EventManager(queue, token_batch_size=1, token_batch_window=60)
+        manager.register_event("on_token", "token")
+
+        manager.add_token("a", message_id="msg")
+        manager.add_token("b", message_id="msg")
+
+        assert [event["data"]["chunk"] for event in _drain(queue)] == ["a", "b"]
+
+    def test_custom_token_callback_is_not_batched(self):
+        received = []
+
+        def on_token(*, manager, event_type, data):  # noqa: ARG001
+            received.append(data)
+
+        manager = EventManager(asyncio.Queue(), token_batch_size=16, token_batch_window=60)
+        manager.register_event("on_token", "token", on_token)
+
+        assert not manager.batches_tokens
+        manager.add_token("a", message_id="msg")
+        assert received == [{"chunk": "a", "id": "msg"}]
+
+    def test_batch_settings_default_to_settings(self):
+        manager = EventManager(None)
+        assert manager.token_batch_size == 16
+        assert manager.token_batch_window == pytest.approx(0.02)
@@ -0,0 +1,82 @@
+from wfx.events.message_delta import MessageDeltaEncoder, diff_message
+
+
+def _message(*contents, text="", title="Agent Steps"):
+    return {"id": "m1", "text": text, "content_blocks": [{"title": title, "contents": list(contents)}]}
+
+
+class TestDiffMessage:
+    def test_unchanged_message_has_no_ops(self):
+        assert diff_message(_message({"a": 1}), _message({"a": 1})) == []
+
+    def test_appended_and_changed_contents(self):
+        ops = diff_message(_message({"a": 1}), _message({"a": 2}, {"b": 1}))
+
+        assert ops == [
+            {"op": "replace", "path": "/content_blocks/0/contents/0", "value": {"a": 2}},
+            {"op": "add", "path": "/content_blocks/0/contents/-", "value": {"b": 1}},
+        ]
+
+    def test_changed_field_and_block_metadata(self):
+        ops = diff_message(_message({"a": 1}), _message({"a": 1}, text="done", title="Steps"))
+
+        assert ops == [
+            {"op": "replace", "path": "/text", "value": "done"},
+            {"op": "replace", "path": "/content_blocks/0", "value": {"title": "Steps", "contents": [{"a": 1}]}},
+        ]
+
+    def test_added_block(self):
+        current = _message({"a": 1})
+        current["content_blocks"].append({"title": "More", "contents": []})
+
+        ops = diff_message(_message({"a": 1}), current)
+
+        assert ops == [{"op": "add", "path": "/content_blocks/-", "value": {"title": "More", "contents": []}}]
+
+    def test_removed_contents_replace_the_block(self):
+        ops = diff_message(_message({"a": 1}, {"b": 1}), _message({"a": 1}))
+
+        assert ops == [
+            {"op": "replace", "path": "/content_blocks/0", "value": {"title": "Agent Steps", "contents": [{"a": 1}]}}
+        ]
+
+    def test_removals_cannot_be_patched(self):
+        previous = _message({"a": 1})
+        previous["content_blocks"].append({"title": "More", "contents": []})
+
+        assert diff_message(previous, _message({"a": 1})) is None
+        assert diff_message(_message(), {"id": "m1"}) is None
+
+
+class TestMessageDeltaEncoder:
+    def test_update_requires_full_send_first(self):
+        encoder = MessageDeltaEncoder()
+
+        assert encoder.encode_update("m1", _message()) is None
+
+    def test_versions_chain_from_full_send(self):
+        encoder = MessageDeltaEncoder()
+        assert encoder.record_full("m1", _message()) == 1
+
+        first = encoder.encode_update("m1", _message({"a": 1}))
+        second = encoder.encode_update("m1", _message({"a": 1}, {"b": 1}))
+
+        assert (first["base_version"], first["version"]) == (1, 2)
+        assert (second["base_version"], second["version"]) == (2, 3)
+        assert second["ops"] == [{"op": "add", "path": "/content_blocks/0/contents/-", "value": {"b": 1}}]
+        assert encoder.record_full("m1", _message()) == 4
+
+    def test_keyframe_interval_forces_full_send(self):
+        encoder = MessageDeltaEncoder(keyframe_interval=3)
+        encoder.record_full("m1", _message())
+
+        assert encoder.encode_update("m1", _message({"a": 1})) is not None
+        assert encoder.encode_update("m1", _message({"a": 2})) is not None
+        assert encoder.encode_update("m1", _message({"a": 3})) is None
+
+    def test_forget(self):
+        encoder = MessageDeltaEncoder()
+        encoder.record_full("m1", _message())
+        encoder.forget("m1")
+
+        assert encoder.encode_update("m1", _message({"a": 1})) is None
@@ -1,4 +1,7 @@
+import contextlib
+import uuid
 from collections import deque
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from ag_ui.core import RunFinishedEvent, RunStartedEvent
@@ -362,3 +365,36 @@ def test_graph_raw_event_metrics_no_optional_fields():
 
     # Assert only timestamp is present (no optional fields)
     assert len(metrics) == 1
+
+
+@pytest.mark.asyncio
+async def test_initialize_run_prefetches_load_from_db_variables():
+    chat_input = ChatInput(_id="chat_input")
+    chat_output = ChatOutput(input_value="test", _id="chat_output")
+    chat_output.set(sender_name=chat_input.message_response)
+    user_id = uuid.uuid4()
+    graph = Graph(chat_input, chat_output, user_id=str(user_id))
+    graph.context = {"request_variables": {"OVERRIDDEN": "value"}}
+    first, second = graph.vertices
+    first.load_from_db_fields = ["input_value", "sender", "session_id"]
+    first.params.update(input_value="API_KEY", sender="OVERRIDDEN", session_id="")
+    second.load_from_db_fields = ["table:headers"]
+    second.params["headers"] = [{"key": "a", "value": "HEADER_KEY"}, {"key": "b", "value": ""}]
+    second.params["headers_load_from_db_columns"] = ["value"]
+
+    variable_service = MagicMock(prefetch_variables=AsyncMock())
+    session = object()
+
+    @contextlib.asynccontextmanager
+    async def session_scope():
+        yield session
+
+    with (
+        patch("wfx.graph.graph.base.get_variable_service", return_value=variable_service),
+        patch("wfx.graph.graph.base.session_scope", session_scope),
+    ):
+        await graph.initialize_run()
+
+    variable_service.prefetch_variables.assert_awaited_once_with(
+        user_id=user_id, names={"API_KEY", "HEADER_KEY"}, session=session
+    )
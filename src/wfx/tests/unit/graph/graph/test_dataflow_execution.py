@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+from wfx.custom.custom_component.component import Component
+from wfx.graph.graph.base import Graph
+from wfx.io import FloatInput, MessageTextInput, Output
+from wfx.schema.message import Message
+
+
+class Echo(Component):
+    display_name = "Echo"
+    build_order: list[str] = []
+
+    inputs = [
+        MessageTextInput(name="text", display_name="Text"),
+        FloatInput(name="delay", display_name="Delay", value=0.0),
+    ]
+    outputs = [Output(display_name="Message", name="message", method="echo")]
+
+    async def echo(self) -> Message:
+        await asyncio.sleep(self.delay)
+        self.build_order.append(self._id)
+        return Message(text=self.text or self._id)
+
+
+class Join(Component):
+    display_name = "Join"
+
+    inputs = [
+        MessageTextInput(name="first", display_name="First"),
+        MessageTextInput(name="second", display_name="Second"),
+    ]
+    outputs = [Output(display_name="Message", name="message", method="join")]
+
+    def join(self) -> Message:
+        return Message(text=f"{self.first}|{self.second}")
+
+
+def _fan_out_graph(build_order: list[str]) -> Graph:
+    Echo.build_order = build_order
+    source = Echo(_id="source", text="hello")
+    slow = Echo(_id="slow", delay=0.3)
+    slow.set(text=source.echo)
+    fast = Echo(_id="fast")
+    fast.set(text=source.echo)
+    fast_child = Echo(_id="fast_child")
+    fast_child.set(text=fast.echo)
+    join = Join(_id="join")
+    join.set(first=slow.echo, second=fast_child.echo)
+    return Graph(source, join)
+
+
+async def test_layered_mode_waits_for_the_whole_layer():
+    build_order: list[str] = []
+    graph = _fan_out_graph(build_order)
+
+    await graph.process(fallback_to_env_vars=False, execution_mode="layered")
+
+    assert build_order.index("slow") < build_order.index("fast_child")
+
+
+async def test_dataflow_mode_does_not_wait_for_slow_siblings():
+    build_order: list[str] = []
+    graph = _fan_out_graph(build_order)
+
+    await graph.process(fallback_to_env_vars=False, execution_mode="dataflow")
+
+    assert build_order == ["source", "fast", "fast_child", "slow"]
+    join = graph.get_vertex("join")
+    assert join.built
+    assert join.built_object["message"].text == "hello|hello"
+
+
+async def test_dataflow_mode_respects_max_concurrency():
+    build_order: list[str] = []
+    graph = _fan_out_graph(build_order)
+    running = 0
+    max_running = 0
+    build_vertex = graph.build_vertex
+
+    async def counting_build_vertex(*args, **kwargs):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        try:
+            return await build_vertex(*args, **kwargs)
+        finally:
+            running -= 1
+
+    graph.build_vertex = counting_build_vertex
+
+    await graph.process(fallback_to_env_vars=False, execution_mode="dataflow", max_concurrency=1)
+
+    assert max_running == 1
+    assert graph.get_vertex("join").built
+
+
+async def test_dataflow_mode_propagates_errors():
+    build_order: list[str] = []
+    graph = _fan_out_graph(build_order)
+
+    async def failing_echo():
+        msg = "boom"
+        raise RuntimeError(msg)
+
+    graph.get_vertex("fast_child").custom_component.echo = failing_echo
+
+    with pytest.raises(Exception, match="boom"):
+        await graph.process(fallback_to_env_vars=False, execution_mode="dataflow")
+    assert "slow" not in build_order
+
+
+def test_invalid_execution_mode():
+    graph = _fan_out_graph([])
+
+    with pytest.raises(ValueError, match="Invalid execution mode"):
+        graph._resolve_execution_options("parallel", None)
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+from wfx.graph.graph.base import Graph
+
+
+@pytest.fixture
+def graph(json_loop_test):
+    return Graph.from_payload(json.loads(json_loop_test)["data"], flow_id="flow")
+
+
+def _scan_vertex_edges(graph: Graph, vertex_id: str, *, is_target=None, is_source=None):
+    return [
+        edge
+        for edge in graph.edges
+        if (edge.source_id == vertex_id and is_source is not False)
+        or (edge.target_id == vertex_id and is_target is not False)
+    ]
+
+
+def _assert_index_matches_edges(graph: Graph):
+    for vertex in graph.vertices:
+        assert graph.get_vertex_edges(vertex.id) == _scan_vertex_edges(graph, vertex.id)
+        assert graph.get_vertex_edges(vertex.id, is_target=False) == _scan_vertex_edges(
+            graph, vertex.id, is_target=False
+        )
+        assert graph.get_vertex_edges(vertex.id, is_source=False) == _scan_vertex_edges(
+            graph, vertex.id, is_source=False
+        )
+        assert [v.id for v in graph.get_vertices_with_target(vertex.id)] == [
+            edge.source_id for edge in graph.edges if edge.target_id == vertex.id
+        ]
+    for edge in graph.edges:
+        assert graph.get_edge(edge.source_id, edge.target_id) is edge
+
+
+def test_index_matches_edges_after_build(graph):
+    assert graph.edges
+    _assert_index_matches_edges(graph)
+    assert graph.get_vertex_edges("missing") == []
+    assert graph.get_edge("missing", "missing") is None
+
+
+def test_index_after_remove_vertex(graph):
+    vertex_id = graph.edges[0].source_id
+    graph.remove_vertex(vertex_id)
+
+    assert graph.get_vertex_edges(vertex_id) == []
+    assert all(vertex_id not in {edge.source_id, edge.target_id} for edge in graph.edges)
+    _assert_index_matches_edges(graph)
+
+
+def test_index_after_update(graph, json_loop_test):
+    other = Graph.from_payload(json.loads(json_loop_test)["data"], flow_id="flow")
+    graph.update(other)
+
+    _assert_index_matches_edges(graph)
+
+
+def test_index_after_setstate(graph):
+    restored = Graph.__new__(Graph)
+    restored.__setstate__(graph.__getstate__())
+
+    assert len(restored.edges) == len(graph.edges)
+    _assert_index_matches_edges(restored)
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+from wfx.graph.graph.base import Graph
+from wfx.graph.graph.template import GraphTemplate
+
+
+@pytest.fixture
+def loop_flow_payload(json_loop_test):
+    return json.loads(json_loop_test)["data"]
+
+
+def _edge_ids(graph: Graph) -> list[tuple[str, str]]:
+    return sorted((edge.source_id, edge.target_id) for edge in graph.edges)
+
+
+def test_instantiate_matches_from_payload(loop_flow_payload):
+    expected = Graph.from_payload(loop_flow_payload, flow_id="flow", flow_name="Loop")
+    template = GraphTemplate.compile(loop_flow_payload, flow_id="flow", flow_name="Loop")
+
+    graph = template.instantiate(user_id="user")
+
+    assert graph.flow_id == "flow"
+    assert graph.user_id == "user"
+    assert [vertex.id for vertex in graph.vertices] == [vertex.id for vertex in expected.vertices]
+    assert _edge_ids(graph) == _edge_ids(expected)
+    assert graph.cycle_vertices == expected.cycle_vertices
+    assert graph.run_manager.cycle_vertices == expected.run_manager.cycle_vertices
+    assert graph.top_level_vertices == expected.top_level_vertices
+    assert graph.sort_vertices() == expected.sort_vertices()
+
+
+def test_instances_do_not_share_state(loop_flow_payload):
+    template = GraphTemplate.compile(loop_flow_payload)
+
+    first = template.instantiate()
+    second = template.instantiate()
+    first.vertices[0].data["node"]["template"]["mutated"] = True
+
+    assert first.vertices[0] is not second.vertices[0]
+    assert "mutated" not in second.vertices[0].data["node"]["template"]
+    first.raw_graph_data["nodes"].clear()
+    assert second.raw_graph_data["nodes"]
+
+
+def test_compile_invalid_payload():
+    with pytest.raises(ValueError, match="Invalid payload"):
+        GraphTemplate.compile({"foo": []})
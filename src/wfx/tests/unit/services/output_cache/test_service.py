@@ -0,0 +1,76 @@
+"""Tests for the output cache of deterministic components."""
+
+import pandas as pd
+import pytest
+from wfx.schema.data import Data
+from wfx.schema.message import Message
+from wfx.services.cache.utils import CACHE_MISS
+from wfx.services.output_cache.service import OutputCacheService, UnhashableValueError, build_output_cache_key
+
+
+class TestBuildOutputCacheKey:
+    def test_key_depends_on_code_inputs_and_output(self):
+        key = build_output_cache_key("code", {"a": 1}, "out")
+
+        assert key == build_output_cache_key("code", {"a": 1}, "out")
+        assert key != build_output_cache_key("other code", {"a": 1}, "out")
+        assert key != build_output_cache_key("code", {"a": 2}, "out")
+        assert key != build_output_cache_key("code", {"a": 1}, "other")
+
+    def test_key_ignores_dict_order_and_message_identity(self):
+        first = Message(text="hi", session_id="s1")
+        second = Message(text="hi", session_id="s2")
+
+        assert build_output_cache_key("code", {"a": first, "b": {1, 2}}, "out") == build_output_cache_key(
+            "code", {"b": {2, 1}, "a": second}, "out"
+        )
+
+    def test_key_supports_data_and_dataframes(self):
+        frame = pd.DataFrame({"x": [1, 2]})
+
+        key = build_output_cache_key("code", {"data": Data(data={"x": 1}), "frame": frame}, "out")
+
+        assert key != build_output_cache_key("code", {"data": Data(data={"x": 1}), "frame": frame.head(1)}, "out")
+
+    def test_unhashable_values_are_rejected(self):
+        with pytest.raises(UnhashableValueError, match="object"):
+            build_output_cache_key("code", {"client": object()}, "out")
+
+
+class TestOutputCacheService:
+    def test_hits_return_copies(self):
+        cache = OutputCacheService(max_size=2)
+        value = {"items": [1]}
+        cache.set_output("key", value)
+
+        hit = cache.get_output("key")
+        hit["items"].append(2)
+
+        assert cache.get_output("key") == {"items": [1]}
+        assert cache.get_output("missing") is CACHE_MISS
+        assert cache.stats() | {"ttl": None} == {
+            "entries": 1,
+            "max_size": 2,
+            "ttl": None,
+            "hits": 2,
+            "misses": 1,
+            "stores": 1,
+            "skipped": 0,
+        }
+
+    def test_unpicklable_values_are_skipped(self):
+        cache = OutputCacheService()
+
+        assert not cache.set_output("key", (item for item in range(3)))
+        assert cache.stats()["skipped"] == 1
+        assert cache.get_output("key") is CACHE_MISS
+
+    def test_size_limit_evicts_least_recently_used(self):
+        cache = OutputCacheService(max_size=2)
+        cache.set_output("a", 1)
+        cache.set_output("b", 2)
+        cache.get_output("a")
+        cache.set_output("c", 3)
+
+        assert cache.get_output("b") is CACHE_MISS
+        assert cache.get_output("a") == 1
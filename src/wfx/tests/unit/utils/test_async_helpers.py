@@ -0,0 +1,117 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+from wfx.utils.async_helpers import iterate_in_thread, monitor_loop_lag
+
+
+async def test_iterate_in_thread_yields_all_items():
+    items = [item async for item in iterate_in_thread(iter(range(100)), buffer_size=4)]
+    assert items == list(range(100))
+
+
+async def test_iterate_in_thread_does_not_block_loop():
+    def slow_chunks():
+        for chunk in ["a", "b", "c"]:
+            time.sleep(0.05)
+            yield chunk
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    ticker_task = asyncio.create_task(ticker())
+    try:
+        async with monitor_loop_lag(interval=0.01) as loop_lag:
+            chunks = [chunk async for chunk in iterate_in_thread(slow_chunks())]
+    finally:
+        ticker_task.cancel()
+
+    assert chunks == ["a", "b", "c"]
+    assert ticks > 10
+    assert loop_lag.blocked_time < 0.05
+
+
+async def test_iterate_in_thread_reraises_errors():
+    def failing():
+        yield 1
+        msg = "boom"
+        raise RuntimeError(msg)
+
+    received = []
+
+    async def consume():
+        async for item in iterate_in_thread(failing()):
+            received.append(item)  # noqa: PERF401
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await consume()
+    assert received == [1]
+
+
+async def test_iterate_in_thread_applies_backpressure_and_stops_early():
+    produced = 0
+    finished = threading.Event()
+
+    def counting():
+        nonlocal produced
+        try:
+            for i in range(1000):
+                produced += 1
+                yield i
+        finally:
+            finished.set()
+
+    async for item in iterate_in_thread(counting(), buffer_size=2):
+        if item == 0:
+            await asyncio.sleep(0.05)
+            # The producer can only be a bounded number of items ahead of the consumer
+            assert produced <= 4
+            break
+
+    await asyncio.sleep(0.3)
+    assert produced < 1000
+
+
+async def test_iterate_in_thread_closes_the_iterator_when_stopped_early():
+    closed = threading.Event()
+
+    def endless():
+        try:
+            while True:
+                yield "chunk"
+        finally:
+            closed.set()
+
+    # Still referenced here, so only an explicit close runs its cleanup
+    iterator = endless()
+    stream = iterate_in_thread(iterator, buffer_size=2)
+    assert await anext(stream) == "chunk"
+    await stream.aclose()
+
+    assert await asyncio.to_thread(closed.wait, 5)
+
+
+async def test_iterate_in_thread_sees_the_callers_context():
+    request_id = contextvars.ContextVar("request_id", default=None)
+    request_id.set("abc")
+
+    def read_context():
+        yield request_id.get()
+
+    assert [item async for item in iterate_in_thread(read_context())] == ["abc"]
+
+
+async def test_monitor_loop_lag_measures_blocking():
+    async with monitor_loop_lag(interval=0.01) as loop_lag:
+        await asyncio.sleep(0.02)
+        time.sleep(0.1)  # noqa: ASYNC251
+        await asyncio.sleep(0.02)
+    assert loop_lag.blocked_time >= 0.05
+    assert loop_lag.max_lag >= 0.05